@@ -2,7 +2,7 @@ import matplotlib.pyplot as plt
 
 from wisdem.glue_code.runWISDEM import load_wisdem
 
-refturb, _, _ = load_wisdem("outputs/refturb_output.pkl")
+refturb, _, _ = load_wisdem("outputs/refturb_output")
 xs = refturb["blade.outer_shape_bem.s_default"]
 ys = refturb["rotorse.rp.powercurve.ax_induct_regII"]
 fig, ax = plt.subplots(nrows=1, ncols=1, figsize=(10, 5))
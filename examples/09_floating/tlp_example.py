@@ -37,6 +37,7 @@ opt["WISDEM"]["FloatingSE"] = {}
 opt["WISDEM"]["FloatingSE"]["frame3dd"] = {}
 opt["WISDEM"]["FloatingSE"]["frame3dd"]["shear"] = False
 opt["WISDEM"]["FloatingSE"]["frame3dd"]["geom"] = False
+opt["WISDEM"]["FloatingSE"]["frame3dd"]["sparse"] = False
 opt["WISDEM"]["FloatingSE"]["frame3dd"]["modal_method"] = 2
 opt["WISDEM"]["FloatingSE"]["frame3dd"]["tol"] = 1e-6
 opt["WISDEM"]["FloatingSE"]["gamma_f"] = 1.35  # Safety factor on loads
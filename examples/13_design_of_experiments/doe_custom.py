@@ -2,14 +2,10 @@ import os
 import numpy as np
 import multiprocessing as mp
 import time
-from wisdem import run_wisdem
+from wisdem import WisdemSession
 
 parallel_flag = True
 
-def parallel_runner(k, fgeom, fmodel, fanal, dover):
-    iwt_opt, _, _ = run_wisdem(fgeom, fmodel, fanal, overridden_values=dover)
-    return k, float(iwt_opt['financese.turbine_aep'][0])
-
 def driver():
     start = time.time()
 
@@ -19,9 +15,9 @@ def driver():
     fname_modeling_options = os.path.join(mydir, "02_reference_turbines", "modeling_options_iea15.yaml")
     fname_analysis_options = os.path.join(mydir, "02_reference_turbines", "analysis_options.yaml")
 
-    # Initial run
-    wt_opt, modeling_options, analysis_options = run_wisdem(fname_wt_input, fname_modeling_options,
-                                                            fname_analysis_options)
+    # Load the inputs and set up the problem once, for all of the runs below
+    session = WisdemSession(fname_wt_input, fname_modeling_options, fname_analysis_options,
+                            outputs=['financese.turbine_aep'])
 
     # Set parametric values
     blade_cones = np.deg2rad( np.arange(0, 5, 2) )
@@ -34,26 +30,14 @@ def driver():
     npts = Blades.size
 
     # Run parametric loop with overrides
-    aep_output = np.zeros( npts ) # Initialize output container
-    myargs = [] # Container for parallel run arguments
-    for k in range(npts):
-        overrides = {'hub.cone':Blades[k], 'drivetrain.uptilt': Shafts[k]}
-        myargs.append([k, fname_wt_input, fname_modeling_options, fname_analysis_options, overrides])
-
-        # Run cases in serial this way
-        if not parallel_flag:
-            iwt_opt, _, _ = run_wisdem(fname_wt_input, fname_modeling_options,
-                                       fname_analysis_options, overridden_values=overrides)
-            aep_output[k] = float(iwt_opt['financese.turbine_aep'][0])
-
-    # Run cases in parallel this way
-    if parallel_flag:
-        ncore = max(1, mp.cpu_count() - 2)
-        pool = mp.Pool(processes=ncore)
-        results = pool.starmap(parallel_runner, myargs)
-        for k in results:
-            aep_output[ k[0] ] = k[1]
-    
+    cases = [{'hub.cone':Blades[k], 'drivetrain.uptilt': Shafts[k]} for k in range(npts)]
+
+    # Run cases in parallel, each worker process sets up its own copy of the problem once
+    ncore = max(1, mp.cpu_count() - 2) if parallel_flag else 0
+    with session:
+        results = session.run(cases, n_workers=ncore)
+    aep_output = np.array([float(res['financese.turbine_aep'][0]) for res in results])
+
     print(aep_output)
     finish = time.time()
     print((finish-start)/60.0)
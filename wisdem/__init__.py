@@ -1,5 +1,12 @@
 from importlib.metadata import version
 
-from wisdem.glue_code.runWISDEM import run_wisdem
-
 __version__ = version("wisdem")
+
+
+def __getattr__(name):
+    # Only import the glue code, and with it OpenMDAO, when it is used
+    if name in ["run_wisdem", "WisdemSession"]:
+        from wisdem.glue_code import runWISDEM
+
+        return getattr(runWISDEM, name)
+    raise AttributeError(f"module 'wisdem' has no attribute '{name}'")
@@ -21,25 +21,166 @@ limitations under the License.
 """
 
 import os
+import math
+import hashlib
 import warnings
 import multiprocessing as mp
+from collections import OrderedDict, deque
 
 import numpy as np
 from scipy.optimize import brentq
-from scipy.interpolate import RectBivariateSpline, bisplev
+from scipy.interpolate import BSpline, RectBivariateSpline, bisplev
 
 import wisdem.ccblade._bem as _bem
 
+# ------------------
+#  Root finding
+# ------------------
+
+
+def brentq_vec(f, xa, xb, fa=None, fb=None, xtol=2e-12, rtol=4 * np.finfo(float).eps, maxiter=100):
+    """Element-wise Brent's method for many independent bracketed roots at once.
+
+    This is a direct port of the scalar algorithm used by scipy.optimize.brentq,
+    applied with masks so that every element follows exactly the same iterates
+    it would in a scalar call.  Elements that have converged are frozen while the
+    remaining ones continue to iterate.
+
+    Parameters
+    ----------
+    f : callable
+        function of an array x returning an array of residuals of the same shape
+    xa, xb : array_like
+        lower and upper bracket for each element
+    fa, fb : array_like, optional
+        residuals already evaluated at xa and xb
+    xtol, rtol : float, optional
+        absolute and relative convergence tolerance (same meaning as brentq)
+    maxiter : int, optional
+        maximum number of iterations
+
+    Returns
+    -------
+    x : ndarray
+        root for each element (last iterate if maxiter is reached)
+    bracketed : ndarray of bool
+        False where f(xa) and f(xb) did not have opposite signs (x is meaningless there)
+    """
+
+    xpre = np.array(xa, dtype=float)
+    xcur = np.array(xb, dtype=float)
+    fpre = np.array(f(xpre) if fa is None else fa, dtype=float)
+    fcur = np.array(f(xcur) if fb is None else fb, dtype=float)
+
+    x = np.where(fpre == 0.0, xpre, xcur)
+    bracketed = (fpre == 0.0) | (fcur == 0.0) | (np.signbit(fpre) != np.signbit(fcur))
+    active = bracketed & (fpre != 0.0) & (fcur != 0.0)
+
+    xblk = np.zeros_like(xcur)
+    fblk = np.zeros_like(xcur)
+    spre = np.zeros_like(xcur)
+    scur = np.zeros_like(xcur)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for _ in range(maxiter):
+            if not np.any(active):
+                break
+
+            # root is bracketed by xpre and xcur
+            m = active & (fpre != 0.0) & (fcur != 0.0) & (np.signbit(fpre) != np.signbit(fcur))
+            xblk = np.where(m, xpre, xblk)
+            fblk = np.where(m, fpre, fblk)
+            spre = np.where(m, xcur - xpre, spre)
+            scur = np.where(m, xcur - xpre, scur)
+
+            # keep the best estimate in xcur
+            m = active & (np.abs(fblk) < np.abs(fcur))
+            xpre, xcur, xblk = np.where(m, xcur, xpre), np.where(m, xblk, xcur), np.where(m, xcur, xblk)
+            fpre, fcur, fblk = np.where(m, fcur, fpre), np.where(m, fblk, fcur), np.where(m, fcur, fblk)
+
+            delta = 0.5 * (xtol + rtol * np.abs(xcur))
+            sbis = 0.5 * (xblk - xcur)
+            done = active & ((fcur == 0.0) | (np.abs(sbis) < delta))
+            x = np.where(done, xcur, x)
+            active = active & ~done
+
+            # interpolate or extrapolate, otherwise bisect
+            dpre = (fpre - fcur) / (xpre - xcur)
+            dblk = (fblk - fcur) / (xblk - xcur)
+            stry = np.where(
+                xpre == xblk,
+                -fcur * (xcur - xpre) / (fcur - fpre),
+                -fcur * (fblk * dblk - fpre * dpre) / (dblk * dpre * (fblk - fpre)),
+            )
+            good = (
+                (np.abs(spre) > delta)
+                & (np.abs(fcur) < np.abs(fpre))
+                & (2.0 * np.abs(stry) < np.minimum(np.abs(spre), 3.0 * np.abs(sbis) - delta))
+            )
+            spre = np.where(active, np.where(good, scur, sbis), spre)
+            scur = np.where(active, np.where(good, stry, sbis), scur)
+
+            xpre = np.where(active, xcur, xpre)
+            fpre = np.where(active, fcur, fpre)
+            step = np.where(np.abs(scur) > delta, scur, np.where(sbis > 0, delta, -delta))
+            xcur = np.where(active, xcur + step, xcur)
+            fcur = np.where(active, f(xcur), fcur)
+
+    x = np.where(active, xcur, x)
+
+    return x, bracketed
+
+
 # ------------------
 #  Airfoil Class
 # ------------------
 
 
+def tabulate_splines(splines):
+    """Convert tensor product splines to piecewise polynomial form.
+
+    Parameters
+    ----------
+    splines : list of RectBivariateSpline
+        splines defined over the same rectangle and with the same degrees
+
+    Returns
+    -------
+    xb, yb : ndarray
+        breakpoints in x and y (the union of the knots of all splines)
+    coef : ndarray, shape (kx+1, ky+1, len(splines), len(xb)-1, len(yb)-1)
+        coef[p, q, k, i, j] multiplies (x - xb[i])**p * (y - yb[j])**q for spline k.
+        Stored in Fortran order so that it can be passed to ``_bem.evalairfoiltable`` without a copy.
+    """
+
+    kx, ky = splines[0].degrees
+    knots = [spl.get_knots() for spl in splines]
+    xb = np.unique(np.concatenate([tx for tx, _ in knots]))
+    yb = np.unique(np.concatenate([ty for _, ty in knots]))
+
+    def local_basis(t, k, b):
+        # Taylor coefficients of each B-spline basis function at the left end of every interval
+        nb = len(t) - k - 1
+        basis = BSpline(t, np.eye(nb), k)
+        return np.array([basis(b[:-1], nu=d) / math.factorial(d) for d in range(k + 1)])
+
+    coef = []
+    for spl in splines:
+        tx, ty = spl.get_knots()
+        Px = local_basis(tx, kx, xb)
+        Py = local_basis(ty, ky, yb)
+        c = spl.get_coeffs().reshape(Px.shape[2], Py.shape[2])
+        coef.append(np.einsum("pia,ab,qjb->pqij", Px, c, Py))
+
+    return xb, yb, np.asfortranarray(np.stack(coef, axis=2))
+
+
+
 class CCAirfoil(object):
     """A helper class to evaluate airfoil data using a continuously
     differentiable cubic spline"""
 
-    def __init__(self, alpha, Re, cl, cd, cm=[], x=[], y=[], AFName="DEFAULTAF"):
+    def __init__(self, alpha, Re, cl, cd, cm=[], x=[], y=[], AFName="DEFAULTAF", tabulated=False):
         """Setup CCAirfoil from raw airfoil data on a grid.
         Parameters
         ----------
@@ -55,6 +196,9 @@ class CCAirfoil(object):
         cd : array_like
             drag coefficient 2-D array with shape (alpha.size, Re.size)
             cd[i, j] is the drag coefficient at alpha[i] and Re[j]
+        tabulated : bool, optional
+            if True, the fitted splines are also converted to piecewise polynomial form and
+            evaluate/derivatives use a compiled table lookup instead of the FITPACK routines
         """
 
         alpha = np.deg2rad(alpha)
@@ -92,6 +236,13 @@ class CCAirfoil(object):
         if self.use_cm > 0:
             self.cm_spline = RectBivariateSpline(alpha, Re, cm, kx=kx, ky=ky, s=0.0001)
 
+        self.tabulated = tabulated
+        if tabulated:
+            splines = [self.cl_spline, self.cd_spline]
+            if self.use_cm:
+                splines.append(self.cm_spline)
+            self.table = tabulate_splines(splines)
+
     def max_eff(self, Re):
         # Get the angle of attack, cl and cd at max airfoil efficiency. For a cylinder, set the angle of attack to 0
 
@@ -175,6 +326,13 @@ class CCAirfoil(object):
         also uses a small amount of smoothing to help remove spurious multiple solutions.
         """
 
+        if self.tabulated:
+            coeffs = self.__evaluateTable(alpha, Re)[0]
+            if self.use_cm and return_cm:
+                return coeffs[0], coeffs[1], coeffs[2]
+            else:
+                return coeffs[0], coeffs[1]
+
         cl = self.cl_spline.ev(alpha, Re)
         cd = self.cd_spline.ev(alpha, Re)
 
@@ -184,7 +342,72 @@ class CCAirfoil(object):
         else:
             return cl, cd
 
+    def evaluate_all(self, alpha, Re):
+        """Get all airfoil coefficients and their derivatives at once.
+
+        Parameters
+        ----------
+        alpha : float or array_like (rad)
+            angle of attack
+        Re : float or array_like
+            Reynolds number (broadcast against alpha)
+
+        Returns
+        -------
+        coeffs : ndarray
+            [cl, cd] or [cl, cd, cm] if moment data was given, stacked along the first axis
+        dcoeffs_dalpha : ndarray
+            derivatives of coeffs with respect to angle of attack
+        dcoeffs_dRe : ndarray
+            derivatives of coeffs with respect to Reynolds number
+        """
+
+        if self.tabulated:
+            f, df_dalpha, df_dRe = self.__evaluateTable(alpha, Re)
+
+        else:
+            splines = [self.cl_spline, self.cd_spline]
+            if self.use_cm:
+                splines.append(self.cm_spline)
+            alpha, Re = np.broadcast_arrays(np.asarray(alpha, dtype=float), np.asarray(Re, dtype=float))
+            f = np.array([spl.ev(alpha, Re) for spl in splines])
+
+            # derivatives are zero where the spline is clamped (outside of the data)
+            tx, ty = self.cl_spline.get_knots()
+            alpha_c = np.clip(alpha, tx[0], tx[-1])
+            Re_c = np.clip(Re, ty[0], ty[-1])
+            df_dalpha = np.array([spl.ev(alpha_c, Re_c, dx=1) * (alpha == alpha_c) for spl in splines])
+            try:
+                df_dRe = np.array([spl.ev(alpha_c, Re_c, dy=1) * (Re == Re_c) for spl in splines])
+            except ValueError:  # linear in Re
+                df_dRe = np.zeros_like(f)
+
+        if self.one_Re:
+            df_dRe = np.zeros_like(f)
+
+        return f, df_dalpha, df_dRe
+
+    def __evaluateTable(self, alpha, Re):
+        """compiled lookup in the piecewise polynomial table, outputs have shape (ncoeffs,) + alpha.shape"""
+
+        alpha = np.asarray(alpha, dtype=float)
+        Re = np.asarray(Re, dtype=float)
+        if alpha.shape != Re.shape:
+            alpha, Re = np.broadcast_arrays(alpha, Re)
+
+        xb, yb, coef = self.table
+        out = _bem.evalairfoiltable(xb, yb, coef, alpha.ravel(), Re.ravel())
+
+        shape = (-1,) + alpha.shape
+        return [val.reshape(shape) for val in out]
+
     def derivatives(self, alpha, Re):
+        if self.tabulated:
+            _, df_dalpha, df_dRe = self.__evaluateTable(alpha, Re)
+            if self.one_Re:
+                return df_dalpha[0], 0.0, df_dalpha[1], 0.0
+            return df_dalpha[0], df_dRe[0], df_dalpha[1], df_dRe[1]
+
         # note: direct call to bisplev will be unnecessary with latest scipy update (add derivative method)
         tck_cl = self.cl_spline.tck[:3] + self.cl_spline.degrees  # concatenate lists
         tck_cd = self.cd_spline.tck[:3] + self.cd_spline.degrees
@@ -434,6 +657,59 @@ class CCAirfoil(object):
             os.remove(NUL_fname)
 
 
+class CCAirfoilCache(object):
+    """Bounded cache of CCAirfoil instances keyed by a hash of their polar data.
+
+    Fitting the airfoil splines is repeated work whenever the polars do not change between
+    evaluations (e.g., an optimization that only changes chord and twist).  The least recently
+    used airfoil is discarded once more than ``maxsize`` are stored.  Cached instances are shared,
+    so they must be treated as read-only.
+    """
+
+    def __init__(self, maxsize=256):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._airfoils = OrderedDict()
+
+    def __len__(self):
+        return len(self._airfoils)
+
+    def get(self, alpha, Re, cl, cd, cm=[], tabulated=False):
+        """Return a CCAirfoil for this polar data, building it only if it is not already cached.
+        Arguments are the same as for CCAirfoil."""
+
+        h = hashlib.sha1()
+        for val in (alpha, Re, cl, cd, cm):
+            val = np.ascontiguousarray(val, dtype=np.float64)
+            h.update(str(val.shape).encode())
+            h.update(val.tobytes())
+        h.update(b"tabulated" if tabulated else b"spline")
+        key = h.hexdigest()
+
+        if key in self._airfoils:
+            self.hits += 1
+            self._airfoils.move_to_end(key)
+            return self._airfoils[key]
+
+        self.misses += 1
+        af = CCAirfoil(alpha, Re, cl, cd, cm, tabulated=tabulated)
+        self._airfoils[key] = af
+        while len(self._airfoils) > self.maxsize:
+            self._airfoils.popitem(last=False)
+
+        return af
+
+    def clear(self):
+        self.hits = 0
+        self.misses = 0
+        self._airfoils.clear()
+
+
+# airfoils shared by all of the CCBlade components in a model
+airfoil_cache = CCAirfoilCache()
+
+
 # ------------------
 #  Main Class: CCBlade
 # ------------------
@@ -467,6 +743,8 @@ class CCBlade(object):
         usecd=True,
         iterRe=1,
         derivatives=False,
+        vectorized=False,
+        warm_start=False,
     ):
         """Constructor for aerodynamic rotor analysis
 
@@ -530,6 +808,18 @@ class CCBlade(object):
             should not be necessary.  Gradients have only been implemented for the case iterRe=1.
         derivatives : boolean, optional
             if True, derivatives along with function values will be returned for the various methods
+        vectorized : boolean, optional
+            if True, the BEM residual is solved for all blade sections simultaneously with an
+            element-wise Brent's method instead of one scipy brentq call per section.
+            :meth:`evaluate` also solves all operating conditions and azimuthal sectors together.
+            The iterates are the same as in the scalar solver, so results are unchanged.
+        warm_start : boolean, optional
+            if True (vectorized only), the inflow angles from recent batched solutions at nearly the same
+            inflow conditions are used to bracket the solution more tightly.  This pays off when the
+            same operating points are solved repeatedly with small changes, e.g. under finite differencing.
+            Solutions agree with a cold start to solver tolerance.  The recent solutions are kept for the
+            lifetime of the instance (see :attr:`phi_warm`), so use a new instance, or clear it, where results
+            must not depend on the order of earlier evaluations.
         """
         r = np.array(r)
         self.r = r.copy()
@@ -549,6 +839,9 @@ class CCBlade(object):
         self.bemoptions = dict(usecd=usecd, tiploss=tiploss, hubloss=hubloss, wakerotation=wakerotation)
         self.iterRe = iterRe
         self.derivatives = derivatives
+        self.vectorized = vectorized
+        self.warm_start = warm_start
+        self.phi_warm = deque(maxlen=256)  # recent batched solutions: (signature, Vx, Vy, pitch, phi)
 
         # check if no precurve / presweep
         if precurve is None:
@@ -785,6 +1078,219 @@ class CCBlade(object):
             # print('Warning: CCBlade.__loads: Wind Velocities, Vx=0, Vy=0. If unexpected, check assigned load cases, connections, and/or workflow order.')
             return 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, np.zeros(9), np.zeros(9), np.zeros(9)
 
+    # ------------------
+    #  Batched versions: arrays of shape (m, n), m conditions by n blade sections
+    # ------------------
+
+    def __evaluateAirfoils(self, alpha, Re):
+        """lift and drag coefficients where column j uses the airfoil of section j"""
+
+        # sections sharing the same airfoil instance are evaluated in one call
+        groups = {}
+        for j in range(alpha.shape[1]):
+            groups.setdefault(id(self.af[j]), []).append(j)
+
+        cl = np.zeros_like(alpha)
+        cd = np.zeros_like(alpha)
+        for cols in groups.values():
+            cl_j, cd_j = self.af[cols[0]].evaluate(alpha[:, cols], Re[:, cols])
+            cl[:, cols] = cl_j
+            cd[:, cols] = cd_j
+
+        return cl, cd
+
+    def __runBEMBatch(self, phi, Vx, Vy, pitch):
+        """residual of BEM method and other corresponding variables at all sections"""
+
+        shape = phi.shape
+        r = np.broadcast_to(self.r, shape).ravel()
+        chord = np.broadcast_to(self.chord, shape).ravel()
+        theta = np.broadcast_to(self.theta, shape).ravel()
+        pitch = np.broadcast_to(pitch, shape).ravel()
+        phi = phi.ravel()
+        Vx = Vx.ravel()
+        Vy = Vy.ravel()
+
+        a = np.zeros(phi.size)
+        ap = np.zeros(phi.size)
+
+        for i in range(self.iterRe):
+            alpha, W, Re = _bem.relativewind_vec(phi, a, ap, Vx, Vy, pitch, chord, theta, self.rho, self.mu)
+            cl, cd = self.__evaluateAirfoils(alpha.reshape(shape), Re.reshape(shape))
+
+            fzero, a, ap = _bem.inductionfactors_vec(
+                r, chord, self.Rhub, self.Rtip, phi, cl.ravel(), cd.ravel(), self.B, Vx, Vy, **self.bemoptions
+            )
+
+        return fzero.reshape(shape), a.reshape(shape), ap.reshape(shape), cl, cd
+
+    def __solvePhiBatch(self, Vx, Vy, pitch, phi_guess=None, residual=None):
+        """inflow angle at all sections, same bracketing logic as the scalar solution
+        (residual replaces the BEM residual of the current geometry if given)"""
+
+        def errf(phi):
+            return self.__runBEMBatch(phi, Vx, Vy, pitch)[0]
+
+        if residual is not None:
+            errf = residual
+
+        shape = Vx.shape
+        epsilon = 1e-6
+
+        if phi_guess is not None:
+            # narrow bracket about a previous solution.  It is kept inside the standard limits,
+            # where the root is unique, so a sign change means it holds the same root.
+            phi_lower = np.clip(phi_guess - 1e-3, epsilon, np.pi / 2)
+            phi_upper = np.clip(phi_guess + 1e-3, epsilon, np.pi / 2)
+            f_lower = errf(phi_lower)
+            f_upper = errf(phi_upper)
+            warm = (phi_lower < phi_upper) & (np.signbit(f_lower) != np.signbit(f_upper))
+
+            if np.all(warm):
+                return brentq_vec(errf, phi_lower, phi_upper, f_lower, f_upper)[0]
+
+            # cold start only for the sections that need it
+            phi_star = np.zeros(shape)
+            phi_star[warm] = brentq_vec(errf, phi_lower, phi_upper, f_lower, f_upper)[0][warm]
+            if np.any(~warm):
+                rows = np.any(~warm, axis=1)
+                phi_star[rows] = np.where(
+                    warm[rows], phi_star[rows], self.__solvePhiBatch(Vx[rows], Vy[rows], pitch[rows])
+                )
+            return phi_star
+
+        # set standard limits
+        phi_lower = np.full(shape, epsilon)
+        phi_upper = np.full(shape, np.pi / 2)
+        f_lower = errf(phi_lower)
+        f_upper = errf(phi_upper)
+
+        swap = f_lower * f_upper > 0  # an uncommon but possible case
+        if np.any(swap):
+            f_brake_lower = errf(np.full(shape, -np.pi / 4))
+            f_brake_upper = errf(np.full(shape, -epsilon))
+            f_high_upper = errf(np.full(shape, np.pi - epsilon))
+            brake = swap & (f_brake_lower < 0) & (f_brake_upper > 0)
+            high = swap & ~brake
+
+            phi_lower = np.where(brake, -np.pi / 4, np.where(high, np.pi / 2, phi_lower))
+            phi_upper = np.where(brake, -epsilon, np.where(high, np.pi - epsilon, phi_upper))
+            f_lower, f_upper = (
+                np.where(brake, f_brake_lower, np.where(high, f_upper, f_lower)),
+                np.where(brake, f_brake_upper, np.where(high, f_high_upper, f_upper)),
+            )
+
+        phi_star, bracketed = brentq_vec(errf, phi_lower, phi_upper, f_lower, f_upper)
+
+        if not np.all(bracketed):
+            warnings.warn("error.  check input values.")
+            phi_star[~bracketed] = 0.0
+
+        return phi_star
+
+    def __solvePhiWarm(self, Vx, Vy, pitch):
+        """inflow angles, bracketed about a recent solution at nearly the same conditions if there is one"""
+
+        signature = np.array([Vx.sum(), Vy.sum(), pitch.sum()])
+        phi_guess = None
+        for sig, Vx_i, Vy_i, pitch_i, phi_i in reversed(self.phi_warm):
+            if (
+                Vx_i.shape == Vx.shape
+                and np.all(np.abs(sig - signature) <= 1e-4 * np.abs(signature) + 1e-6)
+                and np.allclose(Vx_i, Vx, rtol=1e-4, atol=1e-6)
+                and np.allclose(Vy_i, Vy, rtol=1e-4, atol=1e-6)
+                and np.allclose(pitch_i, pitch, rtol=0.0, atol=1e-4)
+            ):
+                phi_guess = phi_i
+                break
+
+        phi = self.__solvePhiBatch(Vx, Vy, pitch, phi_guess)
+        self.phi_warm.append((signature, Vx.copy(), Vy.copy(), pitch.copy(), phi.copy()))
+
+        return phi
+
+    def __distributedAeroLoadsBatch(self, Vx, Vy, Omega, pitch):
+        """distributed loads (no derivatives) for several conditions at once
+
+        Vx, Vy are (m, n) arrays of velocity components, Omega (RPM) and pitch (rad) have length m.
+        Returns a dictionary with the same keys as distributedAeroLoads, each an (m, n) array.
+        """
+
+        m, n = Vx.shape
+        pitch = np.broadcast_to(np.asarray(pitch, dtype=float).reshape(m, 1), (m, n))
+        rotating = np.asarray(Omega).reshape(m) != 0.0
+
+        phi = np.full((m, n), np.pi / 2.0)  # non-rotating
+        a = np.zeros((m, n))
+        ap = np.zeros((m, n))
+        cl = np.zeros((m, n))
+        cd = np.zeros((m, n))
+
+        if np.any(rotating):
+            if self.warm_start:
+                phi[rotating] = self.__solvePhiWarm(Vx[rotating], Vy[rotating], pitch[rotating])
+            else:
+                phi[rotating] = self.__solvePhiBatch(Vx[rotating], Vy[rotating], pitch[rotating])
+            _, a[rotating], ap[rotating], cl[rotating], cd[rotating] = self.__runBEMBatch(
+                phi[rotating], Vx[rotating], Vy[rotating], pitch[rotating]
+            )
+
+        alpha_rad, W, Re = _bem.relativewind_vec(
+            phi.ravel(),
+            a.ravel(),
+            ap.ravel(),
+            Vx.ravel(),
+            Vy.ravel(),
+            pitch.ravel(),
+            np.broadcast_to(self.chord, (m, n)).ravel(),
+            np.broadcast_to(self.theta, (m, n)).ravel(),
+            self.rho,
+            self.mu,
+        )
+        alpha_rad = alpha_rad.reshape(m, n)
+        W = W.reshape(m, n)
+        Re = Re.reshape(m, n)
+
+        if not np.all(rotating):
+            cl[~rotating], cd[~rotating] = self.__evaluateAirfoils(alpha_rad[~rotating], Re[~rotating])
+
+        cphi = np.cos(phi)
+        sphi = np.sin(phi)
+        cn = cl * cphi + cd * sphi  # these expressions should always contain drag
+        ct = cl * sphi - cd * cphi
+
+        q = 0.5 * self.rho * W**2
+        Np = cn * q * self.chord
+        Tp = ct * q * self.chord
+        alpha = np.rad2deg(alpha_rad)
+
+        # sections without inflow carry no load
+        still = (Vx == 0.0) | (Vy == 0.0)
+        for val in (a, ap, Np, Tp, alpha, cl, cd, cn, ct, W, Re):
+            val[still] = 0.0
+
+        bad = np.isnan(Np)
+        if np.any(bad):
+            print(f"NaNs at {np.count_nonzero(bad)}/{Np.size} sections: {phi[bad]}")
+            for val in (a, ap, Np, Tp, alpha):
+                val[bad] = 0.0
+
+        loads = {
+            "Np": Np,
+            "Tp": Tp,
+            "a": a,
+            "ap": ap,
+            "alpha": alpha,
+            "Cl": cl,
+            "Cd": cd,
+            "Cn": cn,
+            "Ct": ct,
+            "W": W,
+            "Re": Re,
+        }
+
+        return loads
+
     def __windComponents(self, Uinf, Omega, azimuth):
         """x, y components of wind in blade-aligned coordinate system"""
 
@@ -904,6 +1410,107 @@ class CCBlade(object):
         # component of velocity at each radial station
         Vx, Vy, dVx_dw, dVy_dw, dVx_dcurve, dVy_dcurve = self.__windComponents(Uinf, Omega, azimuth)
 
+        # solve all sections at once
+        phi_batch = None
+        if self.vectorized and not self.inverse_analysis:
+            if not self.derivatives:
+                loads = self.__distributedAeroLoadsBatch(Vx[np.newaxis, :], Vy[np.newaxis, :], [Omega], [self.pitch])
+                return {key: val[0] for key, val in loads.items()}, {}
+            elif Omega != 0.0:
+                phi_batch = self.__solvePhiBatch(Vx[np.newaxis, :], Vy[np.newaxis, :], self.pitch)[0]
+
+        return self.__sectionLoads(Omega, Vx, Vy, dVx_dw, dVy_dw, dVx_dcurve, dVy_dcurve, phi_batch)
+
+    def inverseTwist(self, Uinf, Omega, pitch, alpha, cl, cd, azimuth=0.0):
+        """Twist that gives the target angles of attack along the blade, solved for all sections
+        and design conditions at once.  This is the batched equivalent of running
+        distributedAeroLoads with inverse_analysis set.
+
+        Parameters
+        ----------
+        Uinf : float or array_like (m/s)
+            hub height wind speed, one entry per design condition
+        Omega : float or array_like (RPM)
+            rotor rotation speed
+        pitch : float or array_like (deg)
+            blade pitch setting
+        alpha : array_like (rad)
+            target angle of attack at each section, either shared by all conditions or one row per condition
+        cl : array_like
+            lift coefficient at the target angles of attack, same shape as alpha
+        cd : array_like
+            drag coefficient at the target angles of attack, same shape as alpha
+        azimuth : float (deg)
+            azimuth angle at which the inflow is computed
+
+        Returns
+        -------
+        theta : ndarray (rad)
+            twist at each section, (m, n) for m design conditions or (n,) if the conditions are scalars
+        """
+
+        scalar = np.ndim(Uinf) == 0 and np.ndim(Omega) == 0 and np.ndim(pitch) == 0
+        Uinf, Omega, pitch = np.broadcast_arrays(
+            np.atleast_1d(np.asarray(Uinf, dtype=float)),
+            np.atleast_1d(np.asarray(Omega, dtype=float)),
+            np.atleast_1d(np.asarray(pitch, dtype=float)),
+        )
+        m = Uinf.size
+        n = len(self.r)
+        alpha = np.broadcast_to(alpha, (m, n))
+        cl = np.broadcast_to(cl, (m, n))
+        cd = np.broadcast_to(cd, (m, n))
+
+        Vx, Vy = _bem.windcomponents_vec(
+            self.r,
+            self.precurve,
+            self.presweep,
+            self.precone,
+            self.yaw,
+            self.tilt,
+            np.full(m, np.deg2rad(azimuth)),
+            Uinf,
+            Omega,
+            self.hubHt,
+            self.shearExp,
+        )
+
+        phi = np.full((m, n), np.pi / 2.0)  # non-rotating
+        rotating = Omega != 0.0
+        if np.any(rotating):
+            # the residual only depends on the target cl and cd, not on the twist
+            r = np.broadcast_to(self.r, (m, n))[rotating].ravel()
+            chord = np.broadcast_to(self.chord, (m, n))[rotating].ravel()
+            cl_rot = cl[rotating].ravel()
+            cd_rot = cd[rotating].ravel()
+            Vx_rot = Vx[rotating]
+            Vy_rot = Vy[rotating]
+
+            def errf(phi):
+                fzero, _, _ = _bem.inductionfactors_vec(
+                    r,
+                    chord,
+                    self.Rhub,
+                    self.Rtip,
+                    phi.ravel(),
+                    cl_rot,
+                    cd_rot,
+                    self.B,
+                    Vx_rot.ravel(),
+                    Vy_rot.ravel(),
+                    **self.bemoptions
+                )
+                return fzero.reshape(phi.shape)
+
+            phi[rotating] = self.__solvePhiBatch(Vx_rot, Vy_rot, None, residual=errf)
+
+        theta = phi - alpha - np.deg2rad(pitch)[:, np.newaxis]
+
+        return theta[0] if scalar else theta
+
+    def __sectionLoads(self, Omega, Vx, Vy, dVx_dw, dVy_dw, dVx_dcurve, dVy_dcurve, phi_batch=None):
+        """section by section loads and derivatives for one condition (phi_batch skips the root solve)"""
+
         # initialize
         n = len(self.r)
         a = np.zeros(n)
@@ -944,6 +1551,10 @@ class CCBlade(object):
             if not rotating:  # non-rotating
                 phi_star = np.pi / 2.0
 
+            elif phi_batch is not None:
+                phi_lower = phi_upper = None
+                phi_star = phi_batch[i]
+
             else:
                 # ------ BEM solution method see (Ning, doi:10.1002/we.1636) ------
 
@@ -1236,60 +1847,114 @@ class CCBlade(object):
             dMb_dv = np.zeros((npts, 5, nr))
 
         azimuth_angles = np.linspace(0.0, 2 * np.pi, nsec + 1)[:-1]
-        for i in range(npts):  # iterate across conditions
-            for azimuth in azimuth_angles:  # integrate across azimuth
-                ca = np.cos(azimuth)
-                sa = np.sin(azimuth)
 
-                # contribution from this azimuthal location
-                loads, derivs = self.distributedAeroLoads(Uinf[i], Omega[i], pitch[i], np.rad2deg(azimuth))
-                Np, Tp, W = (loads["Np"], loads["Tp"], loads["W"])
-
-                Tsub, Ysub, Zsub, Qsub, Msub = _bem.thrusttorque(Np, Tp, *args)
+        batch = self.vectorized and not self.inverse_analysis
+        if batch:
+            # solve the full npts x nsec grid of conditions together
+            Omega_grid = np.repeat(Omega, nsec)
+            pitch_grid = np.deg2rad(np.repeat(pitch, nsec))
+            Vx, Vy = _bem.windcomponents_vec(
+                self.r,
+                self.precurve,
+                self.presweep,
+                self.precone,
+                self.yaw,
+                self.tilt,
+                np.tile(azimuth_angles, npts),
+                np.repeat(Uinf, nsec),
+                Omega_grid,
+                self.hubHt,
+                self.shearExp,
+            )
 
-                # Scale rotor quantities (thrust & torque) by num blades.  Keep blade root moment as is
-                T[i] += self.B * Tsub / nsec
-                Y[i] += self.B * (Ysub * ca - Zsub * sa) / nsec
-                Z[i] += self.B * (Zsub * ca + Ysub * sa) / nsec
-                Q[i] += self.B * Qsub / nsec
-                My[i] += self.B * Msub * ca / nsec
-                Mz[i] += self.B * Msub * sa / nsec
-                Mb[i] += Msub / nsec
-
-                if self.derivatives:
-                    # dNp = derivs["dNp"]
-                    # dTp = derivs["dTp"]
-
-                    (
-                        dT_ds_sub,
-                        dY_ds_sub,
-                        dZ_ds_sub,
-                        dQ_ds_sub,
-                        dM_ds_sub,
-                        dT_dv_sub,
-                        dY_dv_sub,
-                        dZ_dv_sub,
-                        dQ_dv_sub,
-                        dM_dv_sub,
-                    ) = self.__thrustTorqueDeriv(
-                        Np, Tp, self._dNp_dX, self._dTp_dX, self._dNp_dprecurve, self._dTp_dprecurve, *args
+            if self.derivatives:
+                # only the inflow angles are batched, the Jacobians are still assembled condition by condition
+                rotating = Omega_grid != 0.0
+                phi_grid = np.full(Vx.shape, np.pi / 2.0)
+                if np.any(rotating):
+                    phi_grid[rotating] = self.__solvePhiBatch(
+                        Vx[rotating], Vy[rotating], pitch_grid[rotating, np.newaxis]
                     )
 
-                    dT_ds[i, :] += self.B * dT_ds_sub / nsec
-                    dY_ds[i, :] += self.B * (dY_ds_sub * ca - dZ_ds_sub * sa) / nsec
-                    dZ_ds[i, :] += self.B * (dZ_ds_sub * ca + dY_ds_sub * sa) / nsec
-                    dQ_ds[i, :] += self.B * dQ_ds_sub / nsec
-                    dMy_ds[i, :] += self.B * dM_ds_sub * ca / nsec
-                    dMz_ds[i, :] += self.B * dM_ds_sub * sa / nsec
-                    dMb_ds[i, :] += dM_ds_sub / nsec
-
-                    dT_dv[i, :, :] += self.B * dT_dv_sub / nsec
-                    dY_dv[i, :, :] += self.B * (dY_dv_sub * ca - dZ_dv_sub * sa) / nsec
-                    dZ_dv[i, :, :] += self.B * (dZ_dv_sub * ca + dY_dv_sub * sa) / nsec
-                    dQ_dv[i, :, :] += self.B * dQ_dv_sub / nsec
-                    dMy_dv[i, :, :] += self.B * dM_dv_sub * ca / nsec
-                    dMz_dv[i, :, :] += self.B * dM_dv_sub * sa / nsec
-                    dMb_dv[i, :, :] += dM_dv_sub / nsec
+            else:
+                loads = self.__distributedAeroLoadsBatch(Vx, Vy, Omega_grid, pitch_grid)
+                W = loads["W"][-1]
+
+                Tsub, Ysub, Zsub, Qsub, Msub = [
+                    val.reshape(npts, nsec) for val in _bem.thrusttorque_vec(loads["Np"], loads["Tp"], *args)
+                ]
+                ca = np.cos(azimuth_angles)
+                sa = np.sin(azimuth_angles)
+
+                # Scale rotor quantities (thrust & torque) by num blades.  Keep blade root moment as is
+                T = np.sum(self.B * Tsub / nsec, axis=1)
+                Y = np.sum(self.B * (Ysub * ca - Zsub * sa) / nsec, axis=1)
+                Z = np.sum(self.B * (Zsub * ca + Ysub * sa) / nsec, axis=1)
+                Q = np.sum(self.B * Qsub / nsec, axis=1)
+                My = np.sum(self.B * Msub * ca / nsec, axis=1)
+                Mz = np.sum(self.B * Msub * sa / nsec, axis=1)
+                Mb = np.sum(Msub / nsec, axis=1)
+
+        if not batch or self.derivatives:
+            for i in range(npts):  # iterate across conditions
+                for k, azimuth in enumerate(azimuth_angles):  # integrate across azimuth
+                    ca = np.cos(azimuth)
+                    sa = np.sin(azimuth)
+
+                    # contribution from this azimuthal location
+                    if batch:
+                        self.pitch = np.deg2rad(pitch[i])
+                        wind = self.__windComponents(Uinf[i], Omega[i], azimuth)
+                        loads, derivs = self.__sectionLoads(Omega[i], *wind, phi_grid[i * nsec + k])
+                    else:
+                        loads, derivs = self.distributedAeroLoads(Uinf[i], Omega[i], pitch[i], np.rad2deg(azimuth))
+                    Np, Tp, W = (loads["Np"], loads["Tp"], loads["W"])
+
+                    Tsub, Ysub, Zsub, Qsub, Msub = _bem.thrusttorque(Np, Tp, *args)
+
+                    # Scale rotor quantities (thrust & torque) by num blades.  Keep blade root moment as is
+                    T[i] += self.B * Tsub / nsec
+                    Y[i] += self.B * (Ysub * ca - Zsub * sa) / nsec
+                    Z[i] += self.B * (Zsub * ca + Ysub * sa) / nsec
+                    Q[i] += self.B * Qsub / nsec
+                    My[i] += self.B * Msub * ca / nsec
+                    Mz[i] += self.B * Msub * sa / nsec
+                    Mb[i] += Msub / nsec
+
+                    if self.derivatives:
+                        # dNp = derivs["dNp"]
+                        # dTp = derivs["dTp"]
+
+                        (
+                            dT_ds_sub,
+                            dY_ds_sub,
+                            dZ_ds_sub,
+                            dQ_ds_sub,
+                            dM_ds_sub,
+                            dT_dv_sub,
+                            dY_dv_sub,
+                            dZ_dv_sub,
+                            dQ_dv_sub,
+                            dM_dv_sub,
+                        ) = self.__thrustTorqueDeriv(
+                            Np, Tp, self._dNp_dX, self._dTp_dX, self._dNp_dprecurve, self._dTp_dprecurve, *args
+                        )
+
+                        dT_ds[i, :] += self.B * dT_ds_sub / nsec
+                        dY_ds[i, :] += self.B * (dY_ds_sub * ca - dZ_ds_sub * sa) / nsec
+                        dZ_ds[i, :] += self.B * (dZ_ds_sub * ca + dY_ds_sub * sa) / nsec
+                        dQ_ds[i, :] += self.B * dQ_ds_sub / nsec
+                        dMy_ds[i, :] += self.B * dM_ds_sub * ca / nsec
+                        dMz_ds[i, :] += self.B * dM_ds_sub * sa / nsec
+                        dMb_ds[i, :] += dM_ds_sub / nsec
+
+                        dT_dv[i, :, :] += self.B * dT_dv_sub / nsec
+                        dY_dv[i, :, :] += self.B * (dY_dv_sub * ca - dZ_dv_sub * sa) / nsec
+                        dZ_dv[i, :, :] += self.B * (dZ_dv_sub * ca + dY_dv_sub * sa) / nsec
+                        dQ_dv[i, :, :] += self.B * dQ_dv_sub / nsec
+                        dMy_dv[i, :, :] += self.B * dM_dv_sub * ca / nsec
+                        dMz_dv[i, :, :] += self.B * dM_dv_sub * sa / nsec
+                        dMb_dv[i, :, :] += dM_dv_sub / nsec
 
         # Power
         P = Q * Omega * np.pi / 30.0  # RPM to rad/s
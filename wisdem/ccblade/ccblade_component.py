@@ -2,7 +2,7 @@ import numpy as np
 from openmdao.api import ExplicitComponent
 from scipy.interpolate import PchipInterpolator
 
-from wisdem.ccblade.ccblade import CCBlade, CCAirfoil
+from wisdem.ccblade.ccblade import CCBlade, airfoil_cache
 from wisdem.commonse.csystem import DirectionVector
 
 class CCBladeLoads(ExplicitComponent):
@@ -215,12 +215,13 @@ class CCBladeLoads(ExplicitComponent):
         # airfoil files
         af = [None] * self.n_span
         for i in range(self.n_span):
-            af[i] = CCAirfoil(
+            af[i] = airfoil_cache.get(
                 inputs["airfoils_aoa"],
                 inputs["airfoils_Re"],
                 inputs["airfoils_cl"][i, :, :],
                 inputs["airfoils_cd"][i, :, :],
                 inputs["airfoils_cm"][i, :, :],
+                tabulated=True,
             )
 
         ccblade = CCBlade(
@@ -449,12 +450,13 @@ class CCBladeTwist(ExplicitComponent):
         # Create Airfoil class instances
         af = [None] * self.n_span
         for i in range(self.n_span):
-            af[i] = CCAirfoil(
+            af[i] = airfoil_cache.get(
                 inputs["airfoils_aoa"],
                 inputs["airfoils_Re"],
                 inputs["airfoils_cl"][i, :, :],
                 inputs["airfoils_cd"][i, :, :],
                 inputs["airfoils_cm"][i, :, :],
+                tabulated=True,
             )
 
         # Create the CCBlade class instance
@@ -529,12 +531,12 @@ class CCBladeTwist(ExplicitComponent):
             idx_min = [i for i, thk in enumerate(inputs["rthick"]) if thk < 95.0][0]
             alpha[0:idx_min] = alpha[idx_min]
 
-            # Call ccblade in inverse mode for desired alpha, cl, and cd along blade span
-            ccblade.inverse_analysis = True
-            ccblade.alpha = alpha
-            ccblade.cl = cl
-            ccblade.cd = cd
-            _, _ = ccblade.evaluate([inputs["Uhub"]], [Omega_rpm], [inputs["pitch"]], coefficients=False)
+            # Invert the BEM equations for desired alpha, cl, and cd along blade span. The inflow is taken
+            # at the last azimuth sector, as in the sector by sector inverse analysis in ccblade.evaluate
+            azimuth = np.rad2deg(np.linspace(0.0, 2 * np.pi, ccblade.nSector + 1)[-2])
+            ccblade.theta = ccblade.inverseTwist(
+                inputs["Uhub"][0], Omega_rpm, inputs["pitch"][0], alpha, cl, cd, azimuth=azimuth
+            )
 
             # Cap twist root region to 20 degrees
             for i in range(len(ccblade.theta)):
@@ -557,9 +559,6 @@ class CCBladeTwist(ExplicitComponent):
             theta_full = twist_spline(s)
             ccblade.theta = theta_full
 
-        # Turn off the inverse analysis
-        ccblade.inverse_analysis = False
-
         # Call ccblade at azimuth 0 deg
         loads, _ = ccblade.distributedAeroLoads(inputs["Uhub"][0], Omega_rpm, inputs["pitch"][0], 0.0)
 
@@ -708,12 +707,13 @@ class CCBladeEvaluate(ExplicitComponent):
         # airfoil files
         af = [None] * self.n_span
         for i in range(self.n_span):
-            af[i] = CCAirfoil(
+            af[i] = airfoil_cache.get(
                 inputs["airfoils_aoa"],
                 inputs["airfoils_Re"],
                 inputs["airfoils_cl"][i, :, :],
                 inputs["airfoils_cd"][i, :, :],
                 inputs["airfoils_cm"][i, :, :],
+                tabulated=True,
             )
 
         ccblade = CCBlade(
@@ -786,12 +786,13 @@ class CCBladeEvaluate(ExplicitComponent):
         # airfoil files
         af = [None] * self.n_span
         for i in range(self.n_span):
-            af[i] = CCAirfoil(
+            af[i] = airfoil_cache.get(
                 inputs["airfoils_aoa"],
                 inputs["airfoils_Re"],
                 inputs["airfoils_cl"][i, :, :],
                 inputs["airfoils_cd"][i, :, :],
                 inputs["airfoils_cm"][i, :, :],
+                tabulated=True,
             )
 
         ccblade = CCBlade(
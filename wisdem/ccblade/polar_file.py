@@ -7,7 +7,6 @@ This module contains:
 
 import os
 import numpy as np
-import pandas as pd
 
 # --- Welib polar readers
 CSVFile=None
@@ -70,6 +69,7 @@ class BasePolarFile(dict):
     def formatName(): raise NotImplementedError()
 
     def toDataFrame(self):
+        import pandas as pd
         if self['nPolars']==1:
             return pd.DataFrame(data=self['data'], columns=self['columns'])
         else:
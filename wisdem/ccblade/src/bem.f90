@@ -362,6 +362,251 @@ end subroutine thrustTorque
 
 
 
+! array versions of the section routines so that the Python side can evaluate
+! the BEM residual at many sections (and operating conditions) in a single call
+
+subroutine inductionFactors_vec(n, r, chord, Rhub, Rtip, phi, cl, cd, B, &
+    Vx, Vy, useCd, hubLoss, tipLoss, wakerotation, &
+    fzero, a, ap)
+
+    implicit none
+
+    integer, parameter :: dp = kind(0.d0)
+
+    ! in
+    integer, intent(in) :: n
+    real(dp), dimension(n), intent(in) :: r, chord, phi, cl, cd, Vx, Vy
+    real(dp), intent(in) :: Rhub, Rtip
+    integer, intent(in) :: B
+    logical, intent(in) :: useCd, hubLoss, tipLoss, wakerotation
+    !f2py logical, optional, intent(in) :: useCd = 1, hubLoss = 1, tipLoss = 1, wakerotation = 1
+
+    ! out
+    real(dp), dimension(n), intent(out) :: fzero, a, ap
+
+    ! local
+    integer :: i
+
+    do i = 1, n
+        call inductionFactors(r(i), chord(i), Rhub, Rtip, phi(i), cl(i), cd(i), B, &
+            Vx(i), Vy(i), useCd, hubLoss, tipLoss, wakerotation, &
+            fzero(i), a(i), ap(i))
+    end do
+
+end subroutine inductionFactors_vec
+
+
+
+
+subroutine relativeWind_vec(n, phi, a, ap, Vx, Vy, pitch, &
+    chord, theta, rho, mu, alpha, W, Re)
+
+    implicit none
+
+    integer, parameter :: dp = kind(0.d0)
+
+    ! in
+    integer, intent(in) :: n
+    real(dp), dimension(n), intent(in) :: phi, a, ap, Vx, Vy, pitch
+    real(dp), dimension(n), intent(in) :: chord, theta
+    real(dp), intent(in) :: rho, mu
+
+    ! out
+    real(dp), dimension(n), intent(out) :: alpha, W, Re
+
+    ! local
+    integer :: i
+
+    do i = 1, n
+        call relativeWind(phi(i), a(i), ap(i), Vx(i), Vy(i), pitch(i), &
+            chord(i), theta(i), rho, mu, alpha(i), W(i), Re(i))
+    end do
+
+end subroutine relativeWind_vec
+
+
+
+
+subroutine windComponents_vec(m, n, r, precurve, presweep, precone, yaw, tilt, azimuth, &
+    Uinf, OmegaRPM, hubHt, shearExp, Vx, Vy)
+
+    implicit none
+
+    integer, parameter :: dp = kind(0.d0)
+
+    ! in
+    integer, intent(in) :: m, n
+    real(dp), dimension(n), intent(in) :: r, precurve, presweep
+    real(dp), intent(in) :: precone, yaw, tilt, hubHt, shearExp
+    real(dp), dimension(m), intent(in) :: azimuth, Uinf, OmegaRPM
+
+    ! out
+    real(dp), dimension(m, n), intent(out) :: Vx, Vy
+
+    ! local
+    integer :: i
+    real(dp), dimension(n) :: Vx_i, Vy_i
+
+    do i = 1, m
+        call windComponents(n, r, precurve, presweep, precone, yaw, tilt, azimuth(i), &
+            Uinf(i), OmegaRPM(i), hubHt, shearExp, Vx_i, Vy_i)
+        Vx(i, :) = Vx_i
+        Vy(i, :) = Vy_i
+    end do
+
+end subroutine windComponents_vec
+
+
+
+
+subroutine thrustTorque_vec(m, n, Np, Tp, r, precurve, presweep, precone, &
+    Rhub, Rtip, precurveTip, presweepTip, T, Y, Z, Q, M_out)
+
+    implicit none
+
+    integer, parameter :: dp = kind(0.d0)
+
+    ! in
+    integer, intent(in) :: m, n
+    real(dp), dimension(m, n), intent(in) :: Np, Tp
+    real(dp), dimension(n), intent(in) :: r, precurve, presweep
+    real(dp), intent(in) :: precone, Rhub, Rtip, precurveTip, presweepTip
+
+    ! out
+    real(dp), dimension(m), intent(out) :: T, Y, Z, Q, M_out
+
+    ! local
+    integer :: i
+    real(dp), dimension(n) :: Np_i, Tp_i
+
+    do i = 1, m
+        Np_i = Np(i, :)
+        Tp_i = Tp(i, :)
+        call thrustTorque(n, Np_i, Tp_i, r, precurve, presweep, precone, &
+            Rhub, Rtip, precurveTip, presweepTip, T(i), Y(i), Z(i), Q(i), M_out(i))
+    end do
+
+end subroutine thrustTorque_vec
+
+
+
+
+! evaluate airfoil coefficients (and their derivatives) from the piecewise polynomial
+! form of the tensor product splines in CCAirfoil.  coef(p, q, k, i, j) multiplies
+! (x - xb(i))**(p-1) * (y - yb(j))**(q-1) for coefficient k.  Points outside the
+! tabulated range are clamped to the boundary, as in FITPACK.
+
+subroutine evalAirfoilTable(m, nx, ny, kx, ky, nf, xb, yb, coef, x, y, f, dfdx, dfdy)
+
+    implicit none
+
+    integer, parameter :: dp = kind(0.d0)
+
+    ! in
+    integer, intent(in) :: m, nx, ny, kx, ky, nf
+    real(dp), dimension(nx), intent(in) :: xb
+    real(dp), dimension(ny), intent(in) :: yb
+    real(dp), dimension(kx+1, ky+1, nf, nx-1, ny-1), intent(in) :: coef
+    real(dp), dimension(m), intent(in) :: x, y
+
+    ! out
+    real(dp), dimension(nf, m), intent(out) :: f, dfdx, dfdy
+
+    ! local
+    integer :: i, ix, iy, k, p, q
+    real(dp) :: xi, yi, dx, dy, g, dg
+    real(dp), dimension(kx+1) :: px, dpx
+    real(dp), dimension(ky+1) :: py, dpy
+
+    do i = 1, m
+
+        xi = min(max(x(i), xb(1)), xb(nx))
+        yi = min(max(y(i), yb(1)), yb(ny))
+
+        call findInterval(nx, xb, xi, ix)
+        call findInterval(ny, yb, yi, iy)
+
+        dx = xi - xb(ix)
+        dy = yi - yb(iy)
+
+        ! powers of the local coordinates and their derivatives
+        px(1) = 1.0_dp
+        dpx(1) = 0.0_dp
+        do p = 2, kx+1
+            px(p) = px(p-1)*dx
+            dpx(p) = (p-1)*px(p-1)
+        end do
+
+        py(1) = 1.0_dp
+        dpy(1) = 0.0_dp
+        do q = 2, ky+1
+            py(q) = py(q-1)*dy
+            dpy(q) = (q-1)*py(q-1)
+        end do
+
+        ! the clamped function is constant outside of the table
+        if (x(i) < xb(1) .or. x(i) > xb(nx)) dpx = 0.0_dp
+        if (y(i) < yb(1) .or. y(i) > yb(ny)) dpy = 0.0_dp
+
+        do k = 1, nf
+            f(k, i) = 0.0_dp
+            dfdx(k, i) = 0.0_dp
+            dfdy(k, i) = 0.0_dp
+            do q = 1, ky+1
+                g = 0.0_dp
+                dg = 0.0_dp
+                do p = 1, kx+1
+                    g = g + coef(p, q, k, ix, iy)*px(p)
+                    dg = dg + coef(p, q, k, ix, iy)*dpx(p)
+                end do
+                f(k, i) = f(k, i) + g*py(q)
+                dfdx(k, i) = dfdx(k, i) + dg*py(q)
+                dfdy(k, i) = dfdy(k, i) + g*dpy(q)
+            end do
+        end do
+
+    end do
+
+end subroutine evalAirfoilTable
+
+
+
+
+subroutine findInterval(n, xb, x, idx)
+
+    implicit none
+
+    integer, parameter :: dp = kind(0.d0)
+
+    ! in
+    integer, intent(in) :: n
+    real(dp), dimension(n), intent(in) :: xb
+    real(dp), intent(in) :: x
+
+    ! out
+    integer, intent(out) :: idx
+
+    ! local
+    integer :: lo, hi, mid
+
+    ! largest idx in [1, n-1] with xb(idx) <= x (bisection)
+    lo = 1
+    hi = n
+    do while (hi - lo > 1)
+        mid = (lo + hi)/2
+        if (xb(mid) <= x) then
+            lo = mid
+        else
+            hi = mid
+        end if
+    end do
+    idx = lo
+
+end subroutine findInterval
+
+
+
+
 !        Generated by TAPENADE     (INRIA, Ecuador team)
 !  Tapenade 3.16 (develop) -  9 Apr 2021 17:40
 !
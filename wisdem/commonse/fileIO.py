@@ -1,22 +1,34 @@
 import os
+import re
+import ast
+import json
 import pickle
+import fnmatch
+import zipfile
 import openmdao
 import numpy as np
 import pandas as pd
 import scipy.io as sio
 from openmdao.utils.mpi import MPI
 
-def get_variable_list(prob, rank_0=False):
+def get_variable_list(prob, rank_0=False, includes=None, excludes=None):
+
+    # Only list the variables with promoted or absolute names matching the includes and excludes glob patterns
+    filters = {"includes": includes, "excludes": excludes}
 
     # Get all OpenMDAO inputs and outputs into a dictionary
-    input_dict = prob.model.list_inputs(prom_name=True, units=True, desc=True, out_stream=None) # is_indep_var=True
+    input_dict = prob.model.list_inputs(
+        prom_name=True, units=True, desc=True, out_stream=None, **filters
+    ) # is_indep_var=True
     # If MPI, share input dictionary from rank 0 to all other ranks, which would otherwise be empty
     if MPI and rank_0 == False:
         input_dict = MPI.COMM_WORLD.bcast(input_dict, root=0) 
     for k in range(len(input_dict)):
         input_dict[k][1]["type"] = "input"
 
-    inter_dict = prob.model.list_inputs(prom_name=True, units=True, desc=True, out_stream=None) # is_indep_var=False
+    inter_dict = prob.model.list_inputs(
+        prom_name=True, units=True, desc=True, out_stream=None, **filters
+    ) # is_indep_var=False
     # If MPI, share intermediate dictionary from rank 0 to all other ranks, which would otherwise be empty
     if MPI and rank_0 == False:
         inter_dict = MPI.COMM_WORLD.bcast(inter_dict, root=0)
@@ -27,7 +39,7 @@ def get_variable_list(prob, rank_0=False):
     #for k in range(len(var_dict)):
     #    var_dict[k][1]["type"] = "output"
 
-    out_dict = prob.model.list_outputs(prom_name=True, units=True, desc=True, out_stream=None)
+    out_dict = prob.model.list_outputs(prom_name=True, units=True, desc=True, out_stream=None, **filters)
     # If MPI, share output dictionary from rank 0 to all other ranks, which would otherwise be empty
     if MPI and rank_0 == False:
         out_dict = MPI.COMM_WORLD.bcast(out_dict, root=0)
@@ -79,14 +91,130 @@ def variable_dict2df(var_dict):
     return pd.DataFrame(data)
 
 
-def save_data(fname, prob, npz_file=True, mat_file=False, xls_file=True):
-    # Get the variables
-    _, _, var_dict = get_variable_list(prob, rank_0 = True)
-    df = variable_dict2df(var_dict)
-    
+def column_value(value):
+    """Value of a variable as a numpy array for the columnar archive, without any list conversion"""
+    if isinstance(value, np.ndarray):
+        return value
+    elif isinstance(value, (list, tuple)):
+        try:
+            value_array = np.array(value)
+        except ValueError:
+            value_array = np.empty(0, dtype=object)
+        if value_array.dtype == object or value_array.shape[:1] != (len(value),):
+            # Ragged or mixed type lists are kept as an array of their elements
+            value_array = np.empty(len(value), dtype=object)
+            value_array[:] = value[:]
+        return value_array
+    elif isinstance(value, (bool, int, float, str, np.generic)):
+        return np.array(value)
+    # Dictionaries and other python objects
+    value_array = np.empty((), dtype=object)
+    value_array[()] = value
+    return value_array
+
+
+def save_columns(fname, prob, includes=None, excludes=None):
+    """
+    Write the variables of an OpenMDAO problem to an uncompressed numpy archive with one array per
+    promoted variable name, stored as-is.  All values are listed from the model first, then each array
+    is written straight into the archive, without the conversions of the other formats.  The names, types
+    (input or output), units and descriptions of the variables are stored in the __variables__, __types__,
+    __units__ and __descriptions__ arrays.
+
+    Parameters
+    ----------
+    fname : str
+        File name of the archive, with or without the .npz extension
+    prob : openmdao.api.Problem
+        Problem to save, after it has been run
+    includes : list of str, optional
+        Glob patterns of the promoted or absolute names of the variables to save, all by default
+    excludes : list of str, optional
+        Glob patterns of the promoted or absolute names of the variables not to save
+    """
+    # Outputs first, so that promoted names shared by an input and an output are listed as outputs
+    filters = {"includes": includes, "excludes": excludes}
+    var_list = [
+        (var_type, meta)
+        for var_type, list_vars in [("output", prob.model.list_outputs), ("input", prob.model.list_inputs)]
+        for _, meta in list_vars(prom_name=True, units=True, desc=True, out_stream=None, **filters)
+    ]
+
+    if not fname.endswith(".npz"):
+        fname += ".npz"
+
+    names, types, units, descriptions = [], [], [], []
+    saved = set()
+    with zipfile.ZipFile(fname, mode="w", compression=zipfile.ZIP_STORED, allowZip64=True) as fzip:
+        for var_type, meta in var_list:
+            iname = meta["prom_name"]
+            if iname in saved:
+                continue
+            saved.add(iname)
+            names.append(iname)
+            types.append(var_type)
+            units.append("" if meta["units"] is None else meta["units"])
+            descriptions.append(meta["desc"])
+
+            with fzip.open(iname + ".npy", mode="w", force_zip64=True) as f:
+                np.lib.format.write_array(f, column_value(meta["val"]), allow_pickle=True)
+
+        for key, value in zip(
+            ["__variables__", "__types__", "__units__", "__descriptions__"], [names, types, units, descriptions]
+        ):
+            with fzip.open(key + ".npy", mode="w", force_zip64=True) as f:
+                np.lib.format.write_array(f, np.array(value, dtype=str))
+
+
+def save_data(
+    fname,
+    prob,
+    npz_file=False,
+    mat_file=False,
+    xls_file=False,
+    pkl_file=False,
+    col_file=True,
+    includes=None,
+    excludes=None,
+):
+    """
+    Save the variables of an OpenMDAO problem to file, writing one file per selected format.  By default only
+    the columnar archive, which load_wisdem reads back, is written.  The model is only listed again for the
+    other formats, and the pandas DataFrame behind the pkl, xlsx and csv files only for those files.
+
+    Parameters
+    ----------
+    fname : str
+        Root of the output file names, any extension is removed
+    prob : openmdao.api.Problem
+        Problem to save, after it has been run
+    npz_file : bool
+        Compressed numpy archive, fname.npz, with the units appended to the variable names
+    mat_file : bool
+        Matlab archive, fname.mat
+    xls_file : bool
+        Tables of all variables in fname.xlsx and fname.csv.  This is slow for large models
+    pkl_file : bool
+        Pickled pandas DataFrame of all variables, fname.pkl.  This is slow for large models
+    col_file : bool
+        Uncompressed columnar numpy archive, fname-columns.npz, see save_columns
+    includes : list of str, optional
+        Glob patterns of the promoted or absolute names of the variables to save, all by default
+    excludes : list of str, optional
+        Glob patterns of the promoted or absolute names of the variables not to save
+    """
     # Remove file extension
     froot = os.path.splitext(fname)[0]
 
+    if col_file:
+        save_columns(froot + "-columns", prob, includes=includes, excludes=excludes)
+
+    if not (npz_file or mat_file or xls_file or pkl_file):
+        return
+
+    # Get the variables
+    _, _, var_dict = get_variable_list(prob, rank_0=True, includes=includes, excludes=excludes)
+
     # Reduce to variables we can save for matlab or python
     array_dict = {}
     for k in range(len(var_dict)):
@@ -116,8 +244,11 @@ def save_data(fname, prob, npz_file=True, mat_file=False, xls_file=True):
         #    print(var_dict[k])
 
     # Pickle the full archive so that we can load it back in if we need
-    df.to_pickle(froot + ".pkl")
-        
+    if pkl_file or xls_file:
+        df = variable_dict2df(var_dict)
+    if pkl_file:
+        df.to_pickle(froot + ".pkl")
+
     # Save to numpy compatible
     if npz_file:
         kwargs = {key: array_dict[key] for key in array_dict.keys()}
@@ -132,100 +263,298 @@ def save_data(fname, prob, npz_file=True, mat_file=False, xls_file=True):
         df.to_csv(froot + ".csv", index=False)
 
 
-    
-        
-def transfer_data(prob_from, prob_to, prefix_append=None, prefix_remove=None):
+def problem_values(prob, includes=None, excludes=None):
+    """Dictionary of the units and value of every promoted variable in an OpenMDAO problem"""
+    filters = {"includes": includes, "excludes": excludes}
+    values = {}
+    for list_vars in [prob.model.list_outputs, prob.model.list_inputs]:
+        var_list = list_vars(prom_name=True, units=True, out_stream=None, **filters)
+        # If MPI, share the variables from rank 0 to all other ranks, which would otherwise be empty
+        if MPI:
+            var_list = MPI.COMM_WORLD.bcast(var_list, root=0)
+        for _, meta in var_list:
+            values.setdefault(meta["prom_name"], ("" if meta["units"] is None else meta["units"], meta["val"]))
+    return values
+
+
+def problem_names(prob):
+    """Promoted names of all variables in an OpenMDAO problem, mapped to True for the discrete variables"""
+    names = {}
+    for list_vars in [prob.model.list_outputs, prob.model.list_inputs]:
+        var_list = list_vars(val=False, prom_name=True, units=True, out_stream=None)
+        if MPI:
+            var_list = MPI.COMM_WORLD.bcast(var_list, root=0)
+        for _, meta in var_list:
+            # OpenMDAO lists the units of discrete variables as n/a
+            names[meta["prom_name"]] = meta["units"] == "n/a"
+    return names
+
+
+# Header of the arrays written by numpy.lib.format, parsed directly as numpy's own parser is slow
+npy_header = re.compile(
+    r"\{'descr': '([^']+)', 'fortran_order': (True|False), 'shape': \(([0-9, ]*)\), \}"
+)
+
+
+class NpzArchive(object):
+    """
+    Arrays of a numpy archive, like numpy.load, but reading the arrays stored uncompressed, as in the columnar
+    archives of save_columns, straight from the file, and memory mapping the larger ones instead of reading
+    them into memory.  numpy.load ignores mmap_mode for npz archives.  Arrays are only read when accessed.
+
+    Parameters
+    ----------
+    fname : str
+        File name of the archive
+    mmap_mode : str or None
+        Memory map mode, see numpy.memmap, or None to read all arrays into memory
+    mmap_bytes : int
+        Size from which arrays are memory mapped rather than read
+    """
+
+    def __init__(self, fname, mmap_mode="r", mmap_bytes=2**20):
+        self.fname = fname
+        self.mmap_mode = mmap_mode
+        self.mmap_bytes = mmap_bytes
+        self.npz = np.load(fname, allow_pickle=True)
+        self.files = self.npz.files
+        self.info = {info.filename[:-4]: info for info in self.npz.zip.infolist() if info.filename.endswith(".npy")}
+        self.fid = open(fname, "rb")
+
+    def read_stored(self, info):
+        """Read, or memory map, an uncompressed array, or return None if it has to be read by numpy.load"""
+        f = self.fid
+        # The data follows the local file header, whose name and extra field lengths are bytes 26-30
+        f.seek(info.header_offset + 26)
+        name_len, extra_len = np.frombuffer(f.read(4), dtype="<u2")
+        f.seek(info.header_offset + 30 + int(name_len) + int(extra_len))
+        if f.read(8) != b"\x93NUMPY\x01\x00":
+            return None
+        header_len = int(np.frombuffer(f.read(2), dtype="<u2")[0])
+        header = npy_header.match(f.read(header_len).decode("latin1"))
+        if header is None:
+            return None
+        dtype = np.dtype(header.group(1))
+        shape = tuple(int(k) for k in header.group(3).split(",") if k.strip())
+        order = "F" if header.group(2) == "True" else "C"
+        if dtype.hasobject:
+            return None
+
+        count = int(np.prod(shape))
+        if self.mmap_mode is not None and count * dtype.itemsize >= self.mmap_bytes:
+            return np.memmap(self.fname, dtype=dtype, mode=self.mmap_mode, offset=f.tell(), shape=shape, order=order)
+        return np.fromfile(f, dtype=dtype, count=count).reshape(shape, order=order)
+
+    def __getitem__(self, key):
+        info = self.info.get(key)
+        if info is not None and info.compress_type == zipfile.ZIP_STORED:
+            value = self.read_stored(info)
+            if value is not None:
+                return value
+        return self.npz[key]
+
+    def __contains__(self, key):
+        return key in self.info
+
+    def keys(self):
+        return self.files
+
+    def close(self):
+        self.fid.close()
+        self.npz.close()
+
+
+def columns2df(fname):
+    """Variables of a columnar archive from save_columns as a DataFrame, in the layout of variable_dict2df"""
+    archive = NpzArchive(fname, mmap_mode=None)
+    try:
+        names = archive["__variables__"].tolist()
+        data = {
+            "variables": names,
+            "type": archive["__types__"].tolist(),
+            "units": archive["__units__"].tolist(),
+            "values": [restore_value(archive[iname]) for iname in names],
+            "description": archive["__descriptions__"].tolist(),
+        }
+    finally:
+        archive.close()
+    for k, value in enumerate(data["values"]):
+        if isinstance(value, np.ndarray):
+            data["values"][k] = value.item() if value.size == 1 else value.tolist()
+    return pd.DataFrame(data)
 
+
+def archive_values(obj):
+    """
+    Units of every variable in a numpy archive, for lazy, selective loading.  Columnar archives written by
+    save_columns carry the units alongside, other archives are expected to have the units appended to the
+    variable names, as save_data does for npz files.
+    """
+    if "__variables__" in obj:
+        return dict(zip(obj["__variables__"].tolist(), obj["__units__"].tolist()))
+    return {iname: iname.split("_")[-1] for iname in obj.keys()}
+
+
+def table_values(df):
+    """Units and values of every variable in a DataFrame from variable_dict2df or a csv/xlsx file of one"""
+    units = df["units"].fillna("").astype(str) if len(df) else df["units"]
+    values = {}
+    for iname, iunits, ival in zip(df["variables"], units, df["values"]):
+        values.setdefault(iname, (iunits, ival))
+    return values
+
+
+def restore_value(ival):
+    """Value read from file in the form an OpenMDAO problem accepts"""
+    if isinstance(ival, np.ndarray):
+        if ival.ndim == 0:
+            # Scalars and discrete objects saved as 0-d arrays
+            return ival.item()
+        elif ival.dtype.kind in "OUS":
+            # Discrete lists saved as arrays of objects or strings
+            return ival.tolist()
+        return ival
+    elif isinstance(ival, (float, int, list, dict)):
+        return ival
+    elif isinstance(ival, str):
+        # Tables written to csv/xlsx hold the repr of lists and dictionaries
+        if ival.startswith("[") or ival.startswith("{"):
+            try:
+                # Lists of numbers parse much faster as json
+                return json.loads(ival)
+            except ValueError:
+                pass
+            try:
+                return ast.literal_eval(re.sub(r"np\.\w+\((.*?)\)", r"\1", ival))
+            except (ValueError, SyntaxError):
+                return ival
+    try:
+        return float(ival)
+    except Exception:
+        return ival
+
+
+def transfer_data(prob_from, prob_to, prefix_append=None, prefix_remove=None, includes=None, excludes=None):
+    """
+    Copy the variable values from one problem, or from saved data, into an OpenMDAO problem, matching the
+    promoted names.  Only the values of the matching variables are read.
+
+    Parameters
+    ----------
+    prob_from : openmdao.api.Problem, pandas.DataFrame, dict or numpy archive
+        Source of the values.  A dictionary maps variable names to (units, value) tuples
+    prob_to : openmdao.api.Problem
+        Problem to set the values in
+    prefix_append : str, optional
+        Prefix to add to the source variable names
+    prefix_remove : str, optional
+        Prefix to remove from the source variable names
+    includes : list of str, optional
+        Glob patterns of the source variable names to transfer, all by default
+    excludes : list of str, optional
+        Glob patterns of the source variable names not to transfer
+
+    Returns
+    -------
+    openmdao.api.Problem
+        prob_to, with the values set
+    """
     if prefix_append is None:
         prefix_append = ''
         
     if prefix_remove is None:
         prefix_remove = ''
 
-    # Get FROM data as DF
-    if isinstance(prob_from, pd.DataFrame):
-        var_df_from = prob_from
-    elif isinstance(prob_from, openmdao.core.problem.Problem):
-        _, _, var_dict_from = get_variable_list(prob_from)
-        var_df_from = variable_dict2df(var_dict_from)
-    
-    # Get TO data as DF
+    # Units of every source variable, with the values of archives only read once matched to a target variable
+    if isinstance(prob_from, (np.lib.npyio.NpzFile, NpzArchive)):
+        units = archive_values(prob_from)
+        values = prob_from
+    else:
+        if isinstance(prob_from, openmdao.core.problem.Problem):
+            values = problem_values(prob_from, includes=includes, excludes=excludes)
+        elif isinstance(prob_from, pd.DataFrame):
+            values = table_values(prob_from)
+        else:
+            values = prob_from
+        units = {k: v[0] for k, v in values.items()}
+        values = {k: v[1] for k, v in values.items()}
+
+    # Target variable names
     if isinstance(prob_to, pd.DataFrame):
-        var_df_to = prob_to
+        valid_vars_to = dict.fromkeys(prob_to["variables"], True)
     else:
-        _, _, var_dict_to = get_variable_list(prob_to)
-        var_df_to = variable_dict2df(var_dict_to)
-    valid_vars_to = list(var_df_to["variables"])
+        valid_vars_to = problem_names(prob_to)
 
     # Set the variables
-    for k in range(len(var_df_from)):
+    for invar_name, invar_units in units.items():
+        if invar_name.startswith("__"):
+            continue
+        if (includes and not any(fnmatch.fnmatchcase(invar_name, k) for k in includes)) or (
+            excludes and any(fnmatch.fnmatchcase(invar_name, k) for k in excludes)
+        ):
+            continue
+
         # Guess at the proper variable name
-        invar_name = var_df_from["variables"].iloc[k]
-        invar_units = var_df_from["units"].iloc[k]
-        local_name = prefix_append + invar_name.replace(prefix_remove,"")
+        local_name = prefix_append + invar_name.replace(prefix_remove, "")
         local_name2 = local_name.replace(f"_{invar_units}", "")
-
-        # Restore the type of the input data
-        ival = var_df_from["values"].iloc[k]
-        if isinstance(ival, (np.ndarray, float, int, list, dict)):
-            pass
-        elif isinstance(ival, str) and (ival.startswith('[') or ival.startswith('{')):
-            ival = eval(ival)
-        else:
-            try:
-                ival = float(ival)
-            except Exception:
-                pass
-
-        # Store the value
-        if local_name in valid_vars_to:
-            prob_to[local_name] = ival
-        elif local_name2 in valid_vars_to:
-            prob_to[local_name2] = ival
+        if local_name not in valid_vars_to:
+            local_name = local_name2
+            if local_name not in valid_vars_to:
+                continue
+
+        # Store the value, restoring the type of the input data
+        ival = restore_value(values[invar_name])
+        if isinstance(ival, np.memmap) and valid_vars_to[local_name]:
+            # Discrete variables hold the value itself, which must not stay tied to the file
+            ival = np.array(ival)
+        prob_to[local_name] = ival
 
     return prob_to
 
 
-def load_data(fname, prob, prefix_append=None, prefix_remove=None):
-
-    # Extracting from npz
-    def npz2df(obj):
-        data = {}
-        data["variables"] = []
-        data["units"] = []
-        data["values"] = []
-        for k in range(len(wt_obj.files)):
-            iname = obj.files[k]
-            iunit = iname.split('_')[-1]
-            ival = obj[iname]
-            data["variables"].append(iname)
-            data["units"].append(iunit)
-            data["values"].append(ival)
-            
-        mydf = pd.DataFrame(data)
-        return mydf
-
+def load_data(fname, prob, prefix_append=None, prefix_remove=None, includes=None, excludes=None, mmap_mode="r"):
+    """
+    Load the variable values saved by save_data into an OpenMDAO problem, see transfer_data.
+
+    Parameters
+    ----------
+    fname : str, numpy archive, pandas.DataFrame or openmdao.api.Problem
+        File name of an xlsx, csv, npz or pkl file written by save_data, or the data itself
+    prob : openmdao.api.Problem
+        Problem to set the values in
+    prefix_append, prefix_remove, includes, excludes
+        See transfer_data
+    mmap_mode : str or None
+        Memory map mode of the arrays in uncompressed npz files, see NpzArchive
+
+    Returns
+    -------
+    openmdao.api.Problem
+        prob, with the values set
+    """
     # Load in the difference filetypes
     if isinstance(fname, str) and fname.endswith(".xlsx"):
-        mydf = pd.read_excel(fname)
+        mydata = pd.read_excel(fname)
         
     elif isinstance(fname, str) and fname.endswith(".csv"):
-        mydf = pd.read_csv(fname)
+        mydata = pd.read_csv(fname)
         
     elif isinstance(fname, str) and fname.endswith(".npz"):
-        wt_obj = np.load(fname, allow_pickle=True)
-        mydf = npz2df(wt_obj)
+        mydata = NpzArchive(fname, mmap_mode=mmap_mode)
         
     elif isinstance(fname, str) and fname.endswith(".pkl"):
-        mydf = pd.read_pickle(fname)
-
-    elif isinstance(fname, np.lib.npyio.NpzFile):
-        mydf = npz2df(fname)
+        mydata = pd.read_pickle(fname)
 
-    elif isinstance(fname, pd.DataFrame) or isinstance(fname, openmdao.core.problem.Problem):
-        mydf = fname
+    elif isinstance(fname, (np.lib.npyio.NpzFile, pd.DataFrame, openmdao.core.problem.Problem)):
+        mydata = fname
 
     else:
         raise Exception(f"Unknown file type, {fname}.  Expected xlsx or csv or npz or pkl")
     
-    return transfer_data(mydf, prob, prefix_append=prefix_append, prefix_remove=prefix_remove)
+    try:
+        return transfer_data(
+            mydata, prob, prefix_append=prefix_append, prefix_remove=prefix_remove, includes=includes, excludes=excludes
+        )
+    finally:
+        if isinstance(mydata, NpzArchive):
+            mydata.close()
@@ -139,6 +139,7 @@ class ComputeFrame3DD(om.ExplicitComponent):
 
     def initialize(self):
         self.options.declare("modeling_options")
+        self.frame_cache = pyframe3dd.FrameCache()
 
     def setup(self):
         mod_opt = self.options["modeling_options"]
@@ -424,11 +425,12 @@ class ComputeFrame3DD(om.ExplicitComponent):
             mod_opt["WISDEM"]["FixedBottomSE"]["frame3dd"]["shear"],
             mod_opt["WISDEM"]["FixedBottomSE"]["frame3dd"]["geom"],
             dx,
+            mod_opt["WISDEM"]["FixedBottomSE"]["frame3dd"]["sparse"],
         )
         # -----------------------------------
 
         # initialize frame3dd object
-        self.frame = pyframe3dd.Frame(nodes, reactions, elements, options)
+        self.frame = pyframe3dd.Frame(nodes, reactions, elements, options, cache=self.frame_cache)
 
         if mod_opt["WISDEM"]["FixedBottomSE"]["save_truss_figures"]:
             if not self.under_approx:
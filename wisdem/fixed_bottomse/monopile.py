@@ -260,6 +260,7 @@ class MonopileFrame(om.ExplicitComponent):
         self.options.declare("frame3dd_opt")
         self.options.declare("soil_springs", default=False)
         self.options.declare("gravity_foundation", default=False)
+        self.frame_cache = pyframe3dd.FrameCache()
 
     def setup(self):
         n_full = self.options["n_full"]
@@ -516,7 +517,7 @@ class MonopileFrame(om.ExplicitComponent):
         # -----------------------------------
 
         # initialize frame3dd object
-        self.frame = pyframe3dd.Frame(nodes, reactions, elements, options)
+        self.frame = pyframe3dd.Frame(nodes, reactions, elements, options, cache=self.frame_cache)
 
         # ------- enable dynamic analysis ----------
         lump = 0
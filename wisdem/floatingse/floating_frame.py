@@ -217,7 +217,9 @@ class FrameAnalysis(om.ExplicitComponent):
         react_obj = pyframe3dd.ReactionData(rid + 1, Rx, Ry, Rz, Rxx, Ryy, Rzz, rigid=RIGID)
 
         frame3dd_opt = opt["WISDEM"]["FloatingSE"]["frame3dd"]
-        opt_obj = pyframe3dd.Options(frame3dd_opt["shear"], frame3dd_opt["geom"], -1.0)
+        opt_obj = pyframe3dd.Options(
+            frame3dd_opt["shear"], frame3dd_opt["geom"], -1.0, frame3dd_opt["sparse"]
+        )
 
         myframe = pyframe3dd.Frame(node_obj, react_obj, elem_obj, opt_obj)
 
@@ -122,6 +122,10 @@ class WindTurbineOntologyPython(object):
         if flags["floating"] and (flags["monopile"] or flags["jacket"]):
             raise ValueError("Cannot have both floating and fixed-bottom components")
 
+        # The tower loads on the substructure come from the tower load cases
+        if flags["offshore"] and self.modeling_options["WISDEM"]["TowerSE"]["frame3dd"]["frequency_only"]:
+            raise ValueError("TowerSE frame3dd frequency_only skips the tower loads that the substructure needs")
+
         # Water depth check
         if self.modeling_options["WISDEM"]["Environment"]["water_depth"] <= 0.0 and flags["offshore"]:
             raise ValueError("Water depth must be > 0 to do fixed-bottom or floating analysis")
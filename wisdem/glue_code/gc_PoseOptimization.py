@@ -2,8 +2,9 @@ import os
 
 import numpy as np
 import openmdao.api as om
+from openmdao.utils.mpi import MPI
 from scipy.interpolate import PchipInterpolator
-from wisdem.optimization_drivers.nsga2_driver import NSGA2Driver
+from wisdem.optimization_drivers.parallel_fd import approx_totals_parallel
 
 class PoseOptimization(object):
     def __init__(self, wt_init, modeling_options, analysis_options):
@@ -105,7 +106,12 @@ class PoseOptimization(object):
                 step_calc = None
             else:
                 step_calc = opt_options["step_calc"]
-            wt_opt.model.approx_totals(method="fd", step=step_size, form=opt_options["form"], step_calc=step_calc)
+            if opt_options["fd_workers"] != 1 and not MPI:
+                approx_totals_parallel(
+                    wt_opt.model, opt_options["fd_workers"], step=step_size, form=opt_options["form"], step_calc=step_calc
+                )
+            else:
+                wt_opt.model.approx_totals(method="fd", step=step_size, form=opt_options["form"], step_calc=step_calc)
 
             # Set optimization solver and options. First, Scipy's SLSQP and COBYLA
             if opt_options["solver"] in self.scipy_methods:
@@ -178,6 +184,8 @@ class PoseOptimization(object):
                     wt_opt.driver.options["hotstart_file"] = opt_options["hotstart_file"] # File location of a pyopt_sparse optimization history to use to hot start the optimization. Default is None.
 
             elif opt_options["solver"] == "NSGA2":
+                from wisdem.optimization_drivers.nsga2_driver import NSGA2Driver
+
                 wt_opt.driver = NSGA2Driver()
                 options_keys = [
                     "max_gen",
@@ -1057,6 +1065,16 @@ class PoseOptimization(object):
         tower_constr = self.opt["constraints"]["tower"]
         monopile_constr = self.opt["constraints"]["monopile"]
 
+        # With frequency_only, the tower load cases are not solved and their outputs are NaN
+        if self.modeling["flags"]["tower"] and self.modeling["WISDEM"]["TowerSE"]["frame3dd"]["frequency_only"]:
+            load_constr = [k for k in ["stress", "global_buckling", "shell_buckling"] if tower_constr[k]["flag"]]
+            if load_constr:
+                raise ValueError(
+                    "The tower constraints "
+                    + ", ".join(load_constr)
+                    + " need the tower load cases, which frame3dd frequency_only skips."
+                )
+
         if tower_constr["height_constraint"]["flag"]:
             wt_opt.model.add_constraint(
                 "towerse.height_constraint",
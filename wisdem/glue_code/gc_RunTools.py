@@ -1,7 +1,6 @@
 import os
 
 import openmdao.api as om
-import matplotlib.pyplot as plt
 import numpy as np
 
 
@@ -18,6 +17,8 @@ class Convergence_Trends_Opt(om.ExplicitComponent):
         optimization_log = os.path.join(folder_output, self.options["opt_options"]["recorder"]["file_name"])
 
         if os.path.exists(optimization_log):
+            import matplotlib.pyplot as plt
+
             cr = om.CaseReader(optimization_log)
             cases = cr.get_cases()
             rec_data = {}
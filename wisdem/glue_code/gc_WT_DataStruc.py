@@ -3,7 +3,6 @@ import logging
 
 import numpy as np
 import openmdao.api as om
-from moorpy.helpers import getLineProps
 from scipy.interpolate import PchipInterpolator
 
 from wisdem.ccblade.Polar import Polar
@@ -2468,6 +2467,8 @@ class MooringProperties(om.ExplicitComponent):
         self.add_output("line_tangential_drag", val=np.zeros(n_lines))
 
     def compute(self, inputs, outputs):
+        from moorpy.helpers import getLineProps
+
         n_lines = self.options["mooring_init_options"]["n_lines"]
         line_mat = self.options["mooring_init_options"]["line_material"]
         outputs["line_diameter"] = d = inputs["line_diameter_in"] * np.ones(n_lines)
@@ -1,20 +1,10 @@
 import numpy as np
 import openmdao.api as om
 
-from wisdem.rotorse.rotor import RotorSE, RotorSEPerf, RotorSEProp
-from wisdem.towerse.tower import TowerSE, TowerSEPerf, TowerSEProp
-from wisdem.orbit.orbit_api import Orbit
-from wisdem.wombat.wombat_api import Wombat
-from wisdem.floatingse.floating import FloatingSE, FloatingSEPerf, FloatingSEProp
-from wisdem.fixed_bottomse.jacket import JacketSE, JacketSEPerf, JacketSEProp
-from wisdem.glue_code.gc_RunTools import Outputs_2_Screen
-from wisdem.drivetrainse.drivetrain import DrivetrainSE
-from wisdem.fixed_bottomse.monopile import MonopileSE, MonopileSEPerf, MonopileSEProp
 from wisdem.glue_code.gc_WT_DataStruc import WindTurbineOntologyOpenMDAO
-from wisdem.nrelcsm.nrel_csm_cost_2015 import Turbine_CostsSE_2015
-from wisdem.commonse.turbine_constraints import TurbineConstraints
-from wisdem.plant_financese.plant_finance import PlantFinance
-from wisdem.landbosse.landbosse_omdao.landbosse import LandBOSSE
+
+# The subsystems are only imported in the setup of the groups whose flags are set,
+# so a tower-only or cost-only run does not pay for importing all of WISDEM
 
 
 class WT_RNTA_Prop(om.Group):
@@ -36,15 +26,23 @@ class WT_RNTA_Prop(om.Group):
         )
 
         if modeling_options["flags"]["blade"]:
+            from wisdem.rotorse.rotor import RotorSEProp
+
             self.add_subsystem("rotorse", RotorSEProp(modeling_options=modeling_options, opt_options=opt_options))
 
         if modeling_options["flags"]["tower"]:
+            from wisdem.towerse.tower import TowerSEProp
+
             self.add_subsystem("towerse", TowerSEProp(modeling_options=modeling_options))
 
         if modeling_options["flags"]["monopile"]:
+            from wisdem.fixed_bottomse.monopile import MonopileSEProp
+
             self.add_subsystem("fixedse", MonopileSEProp(modeling_options=modeling_options))
 
         elif modeling_options["flags"]["jacket"]:
+            from wisdem.fixed_bottomse.jacket import JacketSEProp
+
             self.add_subsystem("fixedse", JacketSEProp(modeling_options=modeling_options))
 
 
@@ -68,9 +66,13 @@ class WT_RNA(om.Group):
             nlbgs.options["iprint"] = 2
 
         if modeling_options["flags"]["blade"]:
+            from wisdem.rotorse.rotor import RotorSEPerf
+
             self.add_subsystem("rotorse", RotorSEPerf(modeling_options=modeling_options, opt_options=opt_options))
 
         if modeling_options["flags"]["drivetrain"]:
+            from wisdem.drivetrainse.drivetrain import DrivetrainSE
+
             self.add_subsystem("drivese", DrivetrainSE(modeling_options=modeling_options))
 
 
@@ -97,21 +99,33 @@ class WT_RNTA(om.Group):
             )
 
         if modeling_options["flags"]["tower"]:
+            from wisdem.towerse.tower import TowerSEPerf
+
             self.add_subsystem("towerse", TowerSEPerf(modeling_options=modeling_options))
 
         if modeling_options["flags"]["blade"] and modeling_options["flags"]["tower"]:
+            from wisdem.commonse.turbine_constraints import TurbineConstraints
+
             self.add_subsystem("tcons", TurbineConstraints(modeling_options=modeling_options))
 
         if modeling_options["flags"]["monopile"]:
+            from wisdem.fixed_bottomse.monopile import MonopileSEPerf
+
             self.add_subsystem("fixedse", MonopileSEPerf(modeling_options=modeling_options))
 
         elif modeling_options["flags"]["jacket"]:
+            from wisdem.fixed_bottomse.jacket import JacketSEPerf
+
             self.add_subsystem("fixedse", JacketSEPerf(modeling_options=modeling_options))
 
         elif modeling_options["flags"]["floating"]:
+            from wisdem.floatingse.floating import FloatingSE
+
             self.add_subsystem("floatingse", FloatingSE(modeling_options=modeling_options))
 
         if modeling_options["flags"]["costs"]:
+            from wisdem.nrelcsm.nrel_csm_cost_2015 import Turbine_CostsSE_2015
+
             self.add_subsystem("tcc", Turbine_CostsSE_2015(verbosity=modeling_options["General"]["verbosity"]))
 
         if modeling_options["flags"]["blade"]:
@@ -964,6 +978,8 @@ class WindPark(om.Group):
         is_offshore = modeling_options["flags"]["offshore"]
         if model_bos:
             if is_offshore:
+                from wisdem.orbit.orbit_api import Orbit
+
                 self.add_subsystem(
                     "orbit",
                     Orbit(
@@ -974,10 +990,14 @@ class WindPark(om.Group):
                     ),
                 )
             else:
+                from wisdem.landbosse.landbosse_omdao.landbosse import LandBOSSE
+
                 self.add_subsystem("landbosse", LandBOSSE())
 
         if modeling_options["flags"]["opex"]:
             if model_bos:
+                from wisdem.wombat.wombat_api import Wombat
+
                 if is_offshore:
                     scenario = "osw-floating" if modeling_options["flags"]["floating"] else "osw-fixed"
                     self.add_subsystem("wombat", Wombat(scenario=scenario))
@@ -985,6 +1005,9 @@ class WindPark(om.Group):
                     self.add_subsystem("wombat", Wombat(scenario="lbw"))
 
         if modeling_options["flags"]["blade"]:
+            from wisdem.glue_code.gc_RunTools import Outputs_2_Screen
+            from wisdem.plant_financese.plant_finance import PlantFinance
+
             self.add_subsystem("financese", PlantFinance(verbosity=modeling_options["General"]["verbosity"]))
             self.add_subsystem("outputs_2_screen", Outputs_2_Screen(verbosity=modeling_options["General"]["verbosity"]))
 
@@ -3,6 +3,7 @@ import sys
 import logging
 import warnings
 import time
+import multiprocessing as mp
 
 import numpy as np
 import openmdao.api as om
@@ -10,7 +11,6 @@ from openmdao.utils.mpi import MPI
 if MPI:
     max_cores = MPI.COMM_WORLD.Get_size()
     
-from wisdem.commonse import fileIO
 from wisdem.glue_code.glue_code import WindPark
 from wisdem.glue_code.gc_LoadInputs import WindTurbineOntologyPython
 from wisdem.glue_code.gc_WT_InitModel import yaml2openmdao
@@ -154,7 +154,17 @@ def run_wisdem(fname_wt_input, fname_modeling_options, fname_opt_options, overri
     wt_initial.write_outputs(froot_out)
 
     # Save data to numpy and matlab arrays
-    fileIO.save_data(froot_out, wt_opt)
+    from wisdem.commonse import fileIO
+
+    fileIO.save_data(
+        froot_out,
+        wt_opt,
+        npz_file=opt_options["general"]["output_npz"],
+        xls_file=opt_options["general"]["output_excel"],
+        pkl_file=opt_options["general"]["output_pickle"],
+        includes=opt_options["general"]["output_includes"] or None,
+        excludes=opt_options["general"]["output_excludes"] or None,
+    )
 
     t1 = time.time()
     if MPI:
@@ -175,6 +185,8 @@ def load_wisdem(frootin):
     fmodel = froot + "-modeling.yaml"
     fopt = froot + "-analysis.yaml"
     fpkl = froot + ".pkl"
+    # The columnar archive is always written, the pickle only with output_pickle or by older versions
+    fcol = froot + "-columns.npz"
 
     # Load all yaml inputs and validate (also fills in defaults)
     wt_initial = WindTurbineOntologyPython(fgeom, fmodel, fopt)
@@ -183,6 +195,117 @@ def load_wisdem(frootin):
     wt_opt = om.Problem(model=WindPark(modeling_options=modeling_options, opt_options=opt_options), reports=False)
     wt_opt.setup()
 
-    wt_opt = fileIO.load_data(fpkl, wt_opt)
+    from wisdem.commonse import fileIO
+
+    wt_opt = fileIO.load_data(fcol if os.path.exists(fcol) else fpkl, wt_opt)
 
     return wt_opt, modeling_options, opt_options
+
+
+class WisdemSession(object):
+    """
+    A WISDEM problem that is loaded and set up once, then run for any number of overridden values.
+
+    Unlike run_wisdem with overridden_values, the input files are only read and validated once,
+    the problem is only set up once, and no output files are written: evaluate returns the
+    requested outputs in memory.  Values overridden for one case are set back to their initial
+    values before the next case, so the cases are independent of their order.  run evaluates a
+    list of cases, optionally across a pool of worker processes that each hold their own session.
+
+    Parameters
+    ----------
+    fname_wt_input : str
+        Geometry yaml file
+    fname_modeling_options : str
+        Modeling options yaml file
+    fname_opt_options : str
+        Analysis options yaml file
+    outputs : list of str
+        Promoted names of the values to return for each case
+    """
+
+    def __init__(self, fname_wt_input, fname_modeling_options, fname_opt_options, outputs=()):
+        self.args = (fname_wt_input, fname_modeling_options, fname_opt_options, list(outputs))
+        self.outputs = list(outputs)
+        self.pool = None
+        self.pool_size = 0
+
+        # Load all yaml inputs and validate (also fills in defaults)
+        wt_initial = WindTurbineOntologyPython(fname_wt_input, fname_modeling_options, fname_opt_options)
+        wt_init, modeling_options, opt_options = wt_initial.get_input_data()
+        self.modeling_options = modeling_options
+        self.opt_options = opt_options
+
+        myopt = PoseOptimization(wt_init, modeling_options, opt_options)
+        folder_output = opt_options["general"]["folder_output"]
+        os.makedirs(folder_output, exist_ok=True)
+
+        wt_opt = om.Problem(model=WindPark(modeling_options=modeling_options, opt_options=opt_options), reports=False)
+        if modeling_options["General"]["verbosity"] == False:
+            wt_opt.set_solver_print(level=-1)
+        wt_opt.options["work_dir"] = folder_output
+        wt_opt.setup()
+
+        # Load initial wind turbine data from wt_initial to the openmdao problem
+        wt_opt = yaml2openmdao(wt_opt, modeling_options, wt_init, opt_options)
+        wt_opt = myopt.set_initial(wt_opt, wt_init)
+        wt_opt = myopt.set_restart(wt_opt)
+        self.problem = wt_opt
+
+        # initial values of everything overridden so far
+        self.initial_values = {}
+
+    def evaluate(self, overridden_values=None, outputs=None):
+        """Run the model with the overridden values and return a dict of the outputs"""
+        wt_opt = self.problem
+        overridden_values = {} if overridden_values is None else overridden_values
+        for key in self.initial_values:
+            if key not in overridden_values:
+                wt_opt[key] = self.initial_values[key]
+        for key in overridden_values:
+            if key not in self.initial_values:
+                self.initial_values[key] = np.copy(wt_opt[key])
+            wt_opt[key] = overridden_values[key]
+
+        wt_opt.run_model()
+
+        outputs = self.outputs if outputs is None else outputs
+        return {key: np.copy(wt_opt[key]) for key in outputs}
+
+    def run(self, cases, n_workers=0):
+        """Evaluate a list of dicts of overridden values, in order, in this process or across
+        n_workers worker processes, returning the list of dicts of outputs"""
+        if n_workers < 1:
+            return [self.evaluate(case) for case in cases]
+
+        if self.pool is None or self.pool_size != n_workers:
+            self.close()
+            self.pool = mp.Pool(processes=n_workers, initializer=_init_session_worker, initargs=(self.args,))
+            self.pool_size = n_workers
+        return self.pool.map(_evaluate_session_worker, cases)
+
+    def close(self):
+        """Shut down the worker processes, if any"""
+        if self.pool is not None:
+            self.pool.close()
+            self.pool.join()
+            self.pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+# the session of each worker process of WisdemSession.run
+_worker_session = None
+
+
+def _init_session_worker(args):
+    global _worker_session
+    _worker_session = WisdemSession(*args)
+
+
+def _evaluate_session_worker(overridden_values):
+    return _worker_session.evaluate(overridden_values)
@@ -12,6 +12,7 @@ except ImportError:
 
 import wisdem.inputs.validation as val
 from wisdem.glue_code.runWISDEM import run_wisdem
+from wisdem.commonse.fileIO import columns2df
 
 
 def _hsv_to_rgb(h, s, v):
@@ -335,7 +336,9 @@ class GUI_Master(object):
             fname = [temp_dict[m] for m in temp_dict][0]
 
             # Read in the file
-            if fname.lower().endswith('.pkl'):
+            if fname.lower().endswith('-columns.npz'):
+                temp_data = columns2df(fname)
+            elif fname.lower().endswith('.pkl'):
                 temp_data = pd.read_pickle(fname)
             elif fname.lower().endswith('.csv'):
                 temp_data = pd.read_csv(fname)
@@ -400,6 +403,7 @@ class GUI_Master(object):
             dpg.add_file_extension(".*")
             dpg.add_file_extension(".xlsx", color=(0, 255, 0, 255), custom_text="[Excel]")
             dpg.add_file_extension(".csv", color=(0, 255, 0, 255), custom_text="[CSV]")
+            dpg.add_file_extension(".npz", color=(0, 255, 0, 255), custom_text="[NumPy]")
             dpg.add_file_extension(".pkl", color=(0, 255, 0, 255), custom_text="[Pickle]")
 
     def _set_workdir(self, sender, app_data):
@@ -1,25 +1,42 @@
 import os
 import copy
+import pickle
+import hashlib
+import tempfile
+import importlib.util
 import numpy as np
-import jsonschema as json
-import jsonmerge
-from functools import reduce
+from functools import reduce, lru_cache
 import operator
 from openmdao.utils.mpi import MPI
-import windIO.schemas as windio
-from windIO.yaml import load_yaml, write_yaml
-from windIO.validator import _enforce_no_additional_properties, _jsonschema_validate_modified
 from pathlib import Path
 from referencing import Registry, Resource
 from referencing.exceptions import NoSuchResource
 
-fschema_windio = os.path.join(os.path.dirname(os.path.realpath(windio.__file__)), "turbine", "turbine_schema.yaml")
+from wisdem import __version__
+
+# windIO imports jsonschema, which takes seconds, so it is only imported when a yaml file is read or validated
+windio_dir = importlib.util.find_spec("windIO").submodule_search_locations[0]
+fschema_windio = os.path.join(os.path.realpath(windio_dir), "schemas", "turbine", "turbine_schema.yaml")
 fschema_geom = os.path.join(os.path.dirname(os.path.realpath(__file__)), "geometry_schema.yaml")
 fschema_model = os.path.join(os.path.dirname(os.path.realpath(__file__)), "modeling_schema.yaml")
 fschema_opt = os.path.join(os.path.dirname(os.path.realpath(__file__)), "analysis_schema.yaml")
 
 schemaPath = Path(__file__).parent
 
+
+
+def load_yaml(*args, **kwargs):
+    from windIO.yaml import load_yaml
+
+    return load_yaml(*args, **kwargs)
+
+
+def write_yaml(*args, **kwargs):
+    from windIO.yaml import write_yaml
+
+    return write_yaml(*args, **kwargs)
+
+
 def retrieve_yaml(uri: str):
     if not uri.endswith(".yaml"):
         raise NoSuchResource(ref=uri)
@@ -57,6 +74,8 @@ def integrate_defaults(instance : dict, defaults : dict, yaml_schema : dict) ->
     Returns:
         dict: Updated dictionary with default values integrated.
     """
+    import jsonschema as json
+
     # Prep iterative validator
     # json.validate(self.wt_init, yaml_schema)
     validator = json.Draft7Validator(yaml_schema)
@@ -109,6 +128,8 @@ def simple_types(indict : dict) -> dict:
 
 # ---------------------
 def extend_with_default(validator_class):
+    import jsonschema as json
+
     # https://python-jsonschema.readthedocs.io/en/stable/faq/#why-doesn-t-my-schema-s-default-property-set-the-default-on-my-instance
     validate_properties = validator_class.VALIDATORS["properties"]
 
@@ -123,6 +144,8 @@ def extend_with_default(validator_class):
     return json.validators.extend(validator_class, {"properties": set_defaults})
 
 def extend_remove_additional(validator_class):
+    import jsonschema as json
+
     # https://stackoverflow.com/questions/44694835/remove-properties-from-json-object-not-present-in-schema
     validate_properties = validator_class.VALIDATORS["properties"]
 
@@ -136,8 +159,20 @@ def extend_remove_additional(validator_class):
 
     return json.validators.extend(validator_class, {"properties" : remove_additional_properties})
 
-DefaultValidatingDraft7Validator = extend_with_default(json.Draft7Validator)
-RemovalValidatingDraft7Validator = extend_remove_additional(json.Draft7Validator)
+@lru_cache(maxsize=None)
+def validator_classes():
+    import jsonschema as json
+
+    return extend_with_default(json.Draft7Validator), extend_remove_additional(json.Draft7Validator)
+
+
+def __getattr__(name):
+    if name == "DefaultValidatingDraft7Validator":
+        return validator_classes()[0]
+    elif name == "RemovalValidatingDraft7Validator":
+        return validator_classes()[1]
+    raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
+
 
 def MPI_load_yaml(fname):
     """
@@ -172,6 +207,10 @@ def _validate(finput, fschema, defaults=True, removal=False, restrictive=False,
     Returns:
         dict: Validated dictionary.
     """
+    from windIO.validator import _enforce_no_additional_properties, _jsonschema_validate_modified
+
+    DefaultValidatingDraft7Validator, RemovalValidatingDraft7Validator = validator_classes()
+
     # Read schema as dictionary
     if isinstance(fschema, dict):
         schema_dict = fschema
@@ -219,24 +258,113 @@ def deep_copy_without_shared_refs(obj):
     else:
         return obj  # Return the value directly if not a container
 
+def get_yaml_cache_dir():
+    """
+    Returns the directory of the validated input file cache, or None when the cache is off.
+
+    The cache is opt-in with WISDEM_YAML_CACHE=1 and lives in WISDEM_CACHE_DIR (default ~/.cache/wisdem),
+    in a subdirectory per WISDEM version.
+    """
+    if os.environ.get("WISDEM_YAML_CACHE", "0") != "1":
+        return None
+    cache_dir = os.environ.get("WISDEM_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "wisdem"))
+    return os.path.join(cache_dir, "yaml", __version__)
+
+
+def _is_private(fname):
+    # Only pickles that no other user could have written are loaded
+    if os.name != "posix":
+        return True
+    st = os.stat(fname)
+    return st.st_uid == os.getuid() and not st.st_mode & 0o022
+
+
+def _validate_cached(finput, fschemas, get_schema, **kwargs):
+    """
+    Validates an input file as _validate does, keeping the validated dictionary in an on-disk cache.
+
+    The cache is keyed on the contents of the input file, the schema files and this module, and on
+    the validation flags, so any change to them validates the file again.  Dictionaries, and files
+    that include other files, are always validated.  See get_yaml_cache_dir for turning it on.
+
+    Args:
+        finput (dict or str): Dictionary or path to the YAML file to be validated.
+        fschemas (list): Paths to the schema files that get_schema depends on.
+        get_schema (callable): Returns the schema (dictionary or path) to validate against.
+        kwargs: Flags passed on to _validate.
+
+    Returns:
+        dict: Validated dictionary.
+    """
+    cache_dir = get_yaml_cache_dir()
+    if isinstance(finput, dict) or cache_dir is None:
+        return _validate(finput, get_schema(), **kwargs)
+
+    with open(finput, "rb") as f:
+        content = f.read()
+    if b"!include" in content:
+        return _validate(finput, get_schema(), **kwargs)
+
+    h = hashlib.sha1(content)
+    for fname in list(fschemas) + [__file__]:
+        with open(fname, "rb") as f:
+            h.update(f.read())
+    h.update(repr(sorted(kwargs.items())).encode())
+    fcache = os.path.join(cache_dir, h.hexdigest() + ".pkl")
+
+    # All ranks have to agree, a miss validates with a broadcast from rank 0
+    hit = os.path.exists(fcache) and _is_private(cache_dir) and _is_private(fcache)
+    if MPI:
+        hit = MPI.COMM_WORLD.bcast(hit, root=0)
+    if hit:
+        try:
+            with open(fcache, "rb") as f:
+                return pickle.load(f)
+        except Exception:
+            if MPI:
+                raise
+            # an unreadable file, validate again
+
+    input_dict = _validate(finput, get_schema(), **kwargs)
+
+    # Write to a temporary file first so that other processes never read a partial cache file
+    if not MPI or MPI.COMM_WORLD.Get_rank() == 0:
+        ftemp = None
+        try:
+            os.makedirs(cache_dir, mode=0o700, exist_ok=True)
+            fd, ftemp = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(input_dict, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(ftemp, fcache)
+            ftemp = None
+        except Exception:
+            pass  # the input file is validated, it is only left out of the cache
+        finally:
+            if ftemp is not None:
+                os.unlink(ftemp)
+
+    return input_dict
+
+
 # ---------------------
 def get_geometry_schema():
+    import jsonmerge
+
     windio_schema = load_yaml(fschema_windio)
     wisdem_schema = load_yaml(fschema_geom)
     merged_schema = jsonmerge.merge(windio_schema, wisdem_schema)
     return merged_schema
 
 def load_geometry_yaml(finput):
-    merged_schema = get_geometry_schema()
-    return _validate(finput, merged_schema, restrictive=False) #True)
+    return _validate_cached(finput, [fschema_windio, fschema_geom], get_geometry_schema, restrictive=False) #True)
 
 
 def load_modeling_yaml(finput):
-    return _validate(finput, fschema_model, restrictive=True)
+    return _validate_cached(finput, [fschema_model], lambda: fschema_model, restrictive=True)
 
 
 def load_analysis_yaml(finput):
-    return _validate(finput, fschema_opt, restrictive=True)
+    return _validate_cached(finput, [fschema_opt], lambda: fschema_opt, restrictive=True)
 
 
 def write_geometry_yaml(instance, foutput):
@@ -341,6 +469,7 @@ def remove_numpy(fst_vt : dict) -> dict:
 
 
 if __name__ == "__main__":
+    DefaultValidatingDraft7Validator = validator_classes()[0]
     yaml_schema = load_yaml(fschema_opt)
     myobj = load_yaml("sample_analysis.yaml")
     DefaultValidatingDraft7Validator(yaml_schema).validate(myobj)
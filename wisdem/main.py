@@ -7,8 +7,6 @@ import warnings
 import numpy as np
 
 from wisdem.inputs import load_yaml
-from wisdem.inputs.gui import run as guirun
-from wisdem.glue_code.runWISDEM import run_wisdem
 
 warnings.filterwarnings("ignore", category=np.exceptions.VisibleDeprecationWarning)
 warnings.simplefilter("ignore", RuntimeWarning, lineno=175)
@@ -44,6 +42,8 @@ def wisdem_cmd():
 
     elif len(sys.argv) == 1:
         # Launch GUI
+        from wisdem.inputs.gui import run as guirun
+
         guirun()
 
     elif len(sys.argv) == 2:
@@ -61,6 +61,8 @@ def wisdem_cmd():
                 raise FileNotFoundError("The " + f + " entry, " + yaml_dict[f] + ", cannot be found.")
 
         # Run WISDEM (also saves output)
+        from wisdem.glue_code.runWISDEM import run_wisdem
+
         wt_opt, modeling_options, opt_options = run_wisdem(
             yaml_dict["geometry_file"], yaml_dict["modeling_file"], yaml_dict["analysis_file"]
         )
@@ -72,6 +74,8 @@ def wisdem_cmd():
                 raise FileNotFoundError("The " + check_list[k] + " file, " + f + ", cannot be found.")
 
         # Run WISDEM (also saves output)
+        from wisdem.glue_code.runWISDEM import run_wisdem
+
         wt_opt, modeling_options, opt_options = run_wisdem(sys.argv[1], sys.argv[2], sys.argv[3])
 
     else:
@@ -0,0 +1,150 @@
+import os
+import re
+import copy
+import weakref
+import warnings
+import multiprocessing
+
+import openmdao
+from openmdao.core.system import _supported_methods
+from openmdao.approximation_schemes.finite_difference import FiniteDifference
+
+# OpenMDAO releases [first, last) whose finite difference internals ParallelFiniteDifference builds on,
+# the openmdao requirement in pyproject.toml and the environment files is pinned to the same range
+OPENMDAO_VERSIONS = ((3, 45), (3, 46))
+
+# Scheme and system being differenced, inherited by the forked worker processes
+_fd_context = None
+
+# Number of worker processes for each group set up through approx_totals_parallel
+_n_workers = weakref.WeakKeyDictionary()
+
+
+def _run_fd_point(point):
+    """
+    Run one perturbed copy of the model in a worker process and return its outputs.
+    """
+    scheme, system = _fd_context
+    perturbations, delta, seeds = point
+
+    for vec_name, idxs in perturbations:
+        vec = system._outputs if vec_name == "output" else system._inputs
+        vec.iadd(delta, idxs)
+
+    with system._relevance.seeds_active(fwd_seeds=seeds):
+        system.run_solve_nonlinear()
+    results = system._outputs.asarray(copy=True)
+
+    system._residuals.set_val(scheme._starting_resids)
+    system._inputs.set_val(scheme._starting_ins)
+    system._outputs.set_val(scheme._starting_outs)
+
+    return results
+
+
+class ParallelFiniteDifference(FiniteDifference):
+    """
+    Finite difference total derivatives with the perturbed model runs spread over a pool of
+    worker processes on a single node, for use when MPI (and so num_par_fd) is not available.
+
+    The steps are gathered by a first pass through the regular OpenMDAO finite difference
+    iteration that does not run the model. The workers are then forked from the current
+    process, so each one starts from an exact copy of the model in its current state, and
+    the results are replayed through a second pass in the original order.
+
+    Set up through approx_totals_parallel, which also sets the number of workers for the group.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._fd_points = None
+        self._fd_results = None
+
+    def _compute_approx_col_iter(self, system, under_cs):
+        n_workers = _n_workers.get(system, 1) or os.cpu_count()
+        if n_workers < 2 or under_cs or system.pathname != "" or "fork" not in multiprocessing.get_all_start_methods():
+            yield from super()._compute_approx_col_iter(system, under_cs)
+            return
+
+        # Collect the perturbations without running the model
+        self._fd_points = []
+        try:
+            for _ in super()._compute_approx_col_iter(system, under_cs):
+                pass
+            points = self._fd_points
+        finally:
+            self._fd_points = None
+
+        if None in points:
+            warnings.warn("Unsupported finite difference perturbation, running the steps serially")
+            yield from super()._compute_approx_col_iter(system, under_cs)
+            return
+
+        global _fd_context
+        _fd_context = (self, system)
+        try:
+            with multiprocessing.get_context("fork").Pool(min(n_workers, len(points))) as pool:
+                results = pool.map(_run_fd_point, points, chunksize=1)
+        finally:
+            _fd_context = None
+
+        # Replay the iteration with the results from the workers
+        self._fd_results = iter(results)
+        try:
+            yield from super()._compute_approx_col_iter(system, under_cs)
+        finally:
+            self._fd_results = None
+
+    def _run_sub_point(self, system, idx_info, delta, total):
+        if self._fd_points is not None:
+            perturbations = []
+            for vec, idxs in idx_info:
+                if vec is None or idxs is None:
+                    continue
+                elif vec is system._outputs:
+                    perturbations.append(("output", copy.copy(idxs)))
+                elif vec is system._inputs:
+                    perturbations.append(("input", copy.copy(idxs)))
+                else:
+                    self._fd_points.append(None)
+                    return self._results_tmp
+            self._fd_points.append((perturbations, delta, system._relevance._seed_vars["fwd"]))
+            return self._results_tmp
+
+        if self._fd_results is not None:
+            self._results_tmp[:] = next(self._fd_results)
+            return self._results_tmp
+
+        return super()._run_sub_point(system, idx_info, delta, total)
+
+
+_supported_methods["fd_parallel"] = ParallelFiniteDifference
+
+
+def openmdao_supported():
+    """
+    Whether the installed OpenMDAO is a release that ParallelFiniteDifference is known to work with.
+    """
+    version = tuple(int(v) for v in re.findall(r"\d+", openmdao.__version__)[:2])
+    return OPENMDAO_VERSIONS[0] <= version < OPENMDAO_VERSIONS[1] and all(
+        hasattr(FiniteDifference, name) for name in ["_compute_approx_col_iter", "_run_sub_point"]
+    )
+
+
+def approx_totals_parallel(group, n_workers=0, step=None, form=None, step_calc=None):
+    """
+    Approximate the total derivatives of the top level group by finite differences, as in
+    group.approx_totals(method="fd"), with the steps evaluated by n_workers processes
+    (0 uses all available cores). Falls back to serial finite differences, with a warning,
+    on OpenMDAO releases outside of OPENMDAO_VERSIONS.
+    """
+    if not openmdao_supported():
+        warnings.warn(
+            f"Parallel finite differences are not supported with OpenMDAO {openmdao.__version__}, "
+            "running the steps serially"
+        )
+        group.approx_totals(method="fd", step=step, form=form, step_calc=step_calc)
+        return
+
+    _n_workers[group] = n_workers
+    group.approx_totals(method="fd_parallel", step=step, form=form, step_calc=step_calc)
@@ -820,8 +820,10 @@ def main():
         froot = os.path.splitext(input_filename)[0]
 
         print()
-        if os.path.exists(froot + ".yaml") and os.path.exists(froot + ".pkl"):
-            # Load in saved pickle dictionary if already ran WISDEM
+        if os.path.exists(froot + ".yaml") and (
+            os.path.exists(froot + "-columns.npz") or os.path.exists(froot + ".pkl")
+        ):
+            # Load in saved data if already ran WISDEM
             print(f"Loading WISDEM data for {input_filename}.")
             wt_opt, modeling_options, analysis_options = load_wisdem(froot)
 
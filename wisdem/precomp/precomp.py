@@ -8,9 +8,10 @@ Copyright (c)  NREL. All rights reserved.
 """
 
 import os
+
 import numpy as np
 
-#from wisdem.precomp._precomp import precomp as _precomp
+# from wisdem.precomp._precomp import precomp as _precomp
 import wisdem.precomp.properties as properties
 
 
@@ -50,6 +51,7 @@ class PreComp:
         sector_idx_strain_spar_ss,
         sector_idx_strain_te_ps,
         sector_idx_strain_te_ss,
+        th_prime=None,
     ):
         """Constructor
 
@@ -75,6 +77,9 @@ class PreComp:
         upperCS, lowerCS, websCS : list(:class:`CompositeSection`)
             list of CompositeSection objections defining the properties for upper surface, lower surface,
             and shear webs (if any) for each section
+        th_prime : ndarray (deg/m), optional
+            twist rate at each section.  computed from r and theta if not given, which is only
+            possible if the sections span the whole blade
 
         """
 
@@ -97,8 +102,11 @@ class PreComp:
         self.sector_idx_strain_te_ss = sector_idx_strain_te_ss
 
         # twist rate
-        #self.th_prime = _precomp.tw_rate(self.r, self.theta)
-        self.th_prime = properties.tw_rate(self.r, self.theta)
+        # self.th_prime = _precomp.tw_rate(self.r, self.theta)
+        if th_prime is None:
+            self.th_prime = properties.tw_rate(self.r, self.theta)
+        else:
+            self.th_prime = np.array(th_prime)
 
     def sectionProperties(self):
         """see meth:`SectionStrucInterface.sectionProperties`"""
@@ -106,38 +114,6 @@ class PreComp:
         # radial discretization
         nsec = len(self.r)
 
-        # initialize variables
-        beam_z = self.r
-        beam_EA = np.zeros(nsec)
-        beam_EIxx = np.zeros(nsec)
-        beam_EIyy = np.zeros(nsec)
-        beam_EIxy = np.zeros(nsec)
-        beam_GJ = np.zeros(nsec)
-        beam_EA_EIxx = np.zeros(nsec)
-        beam_EA_EIyy = np.zeros(nsec)
-        beam_EIxx_GJ = np.zeros(nsec)
-        beam_EIyy_GJ = np.zeros(nsec)
-        beam_EA_GJ = np.zeros(nsec)
-        beam_rhoA = np.zeros(nsec)
-        beam_A = np.zeros(nsec)
-        beam_rhoJ = np.zeros(nsec)
-        beam_Tw_iner = np.zeros(nsec)
-
-        beam_flap_iner = np.zeros(nsec)
-        beam_edge_iner = np.zeros(nsec)
-
-        beam_x_sc = np.zeros(nsec)
-        beam_y_sc = np.zeros(nsec)
-        beam_x_tc = np.zeros(nsec)
-        beam_y_tc = np.zeros(nsec)
-        beam_x_cg = np.zeros(nsec)
-        beam_y_cg = np.zeros(nsec)
-
-        # distance to elastic center from airfoil nose
-        # using profile coordinate system
-        self.x_ec_nose = np.zeros(nsec)
-        self.y_ec_nose = np.zeros(nsec)
-
         profile = self.profile
         mat = self.materials
         csU = self.upperCS
@@ -159,90 +135,110 @@ class PreComp:
             nu12[i] = mat[i].nu12
             rho[i] = mat[i].rho
 
+        # gather the inputs of all sections, which are evaluated together in one batch
+        xnode, ynode = [], []
+        locU, n_laminaU, n_pliesU, tU, thetaU, mat_idxU = [], [], [], [], [], []
+        locL, n_laminaL, n_pliesL, tL, thetaL, mat_idxL = [], [], [], [], [], []
+        nwebs, locW, n_laminaW, n_pliesW, tW, thetaW, mat_idxW = [], [], [], [], [], [], []
         for i in range(nsec):
-            # print(i)
-
-            xnode, ynode = profile[i]._preCompFormat()
-            locU, n_laminaU, n_pliesU, tU, thetaU, mat_idxU = csU[i]._preCompFormat()
-            locL, n_laminaL, n_pliesL, tL, thetaL, mat_idxL = csL[i]._preCompFormat()
-            locW, n_laminaW, n_pliesW, tW, thetaW, mat_idxW = csW[i]._preCompFormat()
-
-            nwebs = len(locW)
+            for x, xi in zip([xnode, ynode], profile[i]._preCompFormat()):
+                x.append(xi)
+            for x, xi in zip([locU, n_laminaU, n_pliesU, tU, thetaU, mat_idxU], csU[i]._preCompFormat()):
+                x.append(xi)
+            for x, xi in zip([locL, n_laminaL, n_pliesL, tL, thetaL, mat_idxL], csL[i]._preCompFormat()):
+                x.append(xi)
+            webs = csW[i]._preCompFormat()
+            nwebs.append(len(webs[0]))
 
             # address a bug in f2py (need to pass in length 1 arrays even though they are not used)
-            if nwebs == 0:
-                locW = [0]
-                n_laminaW = [0]
-                n_pliesW = [0]
-                tW = [0]
-                thetaW = [0]
-                mat_idxW = [0]
-
-            (eifbar,eilbar,gjbar,eabar,eiflbar,
-             sfbar,slbar,sftbar,sltbar,satbar,
-             z_sc,y_sc,ztc_ref,ytc_ref,
-             mass,area,iflap_eta,ilag_zeta,tw_iner,
-             zcm_ref,ycm_ref) = properties.properties(
-                self.chord[i],
-                self.theta[i],
-                self.th_prime[i],
-                self.leLoc[i],
-                xnode,
-                ynode,
-                E1,
-                E2,
-                G12,
-                nu12,
-                rho,
-                locU,
-                n_laminaU,
-                n_pliesU,
-                tU,
-                thetaU,
-                mat_idxU,
-                locL,
-                n_laminaL,
-                n_pliesL,
-                tL,
-                thetaL,
-                mat_idxL,
-                nwebs,
-                locW,
-                n_laminaW,
-                n_pliesW,
-                tW,
-                thetaW,
-                mat_idxW,
-            )
-            
-            beam_EIxx[i] = eilbar  # EI_lag, Section lag (edgewise) bending stiffness about the XE axis (Nm2)
-            beam_EIyy[i] = eifbar  # EI_flap, Section flap bending stiffness about the YE axis (Nm2)
-            beam_GJ[i] = gjbar #  Section torsion stiffness (Nm2)
-            beam_EA[i] = eabar # Section axial stiffness (N)
-            beam_EIxy[i] = eiflbar # Coupled flap-lag stiffness with respect to the XE-YE frame (Nm2)
-            beam_EA_EIxx[i] = slbar # Coupled axial-lag stiffness with respect to the XE-YE frame (Nm.)
-            beam_EA_EIyy[i] = sfbar # Coupled axial-flap stiffness with respect to the XE-YE frame (Nm)
-            beam_EIxx_GJ[i] = sltbar # Coupled lag-torsion stiffness with respect to the XE-YE frame (Nm2)
-            beam_EIyy_GJ[i] = sftbar # Coupled flap-torsion stiffness with respect to the XE-YE frame (Nm2)
-            beam_EA_GJ[i] = satbar # Coupled axial-torsion stiffness (Nm)
-            beam_x_sc[i] = z_sc # X-coordinate of the shear-center offset with respect to the ref axes (m)
-            beam_y_sc[i] = y_sc # Chordwise offset of the section shear-center with respect to the reference frame, XR-YR (m)
-            beam_x_tc[i] = ztc_ref # X-coordinate of the tension-center offset with respect to the XR-YR axes (m)
-            beam_y_tc[i] = ytc_ref # Chordwise offset of the section tension-center with respect to the XR-YR axes (m)
-            beam_rhoA[i] = mass # Section mass per unit length (kg/m)
-            beam_A[i] = area # Cross-Sectional area (m)
-            beam_flap_iner[i] = iflap_eta # Section flap inertia about the YG axis per unit length (kg-m)
-            beam_edge_iner[i] = ilag_zeta # Section lag inertia about the XG axis per unit length (kg-m)
-            beam_Tw_iner[i] = tw_iner # Orientation of the section principal inertia axes with respect the blade reference plane, theta (deg)
-            beam_x_cg[i] = zcm_ref # X-coordinate of the center-of-mass offset with respect to the XR-YR axes (m)
-            beam_y_cg[i] = ycm_ref # Chordwise offset of the section center of mass with respect to the XR-YR axes (m)
+            if nwebs[i] == 0:
+                webs = [[0]] * 6
+            for x, xi in zip([locW, n_laminaW, n_pliesW, tW, thetaW, mat_idxW], webs):
+                x.append(xi)
+
+        (
+            eifbar,
+            eilbar,
+            gjbar,
+            eabar,
+            eiflbar,
+            sfbar,
+            slbar,
+            sftbar,
+            sltbar,
+            satbar,
+            z_sc,
+            y_sc,
+            ztc_ref,
+            ytc_ref,
+            mass,
+            area,
+            iflap_eta,
+            ilag_zeta,
+            tw_iner,
+            zcm_ref,
+            ycm_ref,
+        ) = properties.properties_batch(
+            self.chord,
+            self.theta,
+            self.th_prime,
+            self.leLoc,
+            xnode,
+            ynode,
+            E1,
+            E2,
+            G12,
+            nu12,
+            rho,
+            locU,
+            n_laminaU,
+            n_pliesU,
+            tU,
+            thetaU,
+            mat_idxU,
+            locL,
+            n_laminaL,
+            n_pliesL,
+            tL,
+            thetaL,
+            mat_idxL,
+            nwebs,
+            locW,
+            n_laminaW,
+            n_pliesW,
+            tW,
+            thetaW,
+            mat_idxW,
+        )
 
+        beam_EIxx = eilbar  # EI_lag, Section lag (edgewise) bending stiffness about the XE axis (Nm2)
+        beam_EIyy = eifbar  # EI_flap, Section flap bending stiffness about the YE axis (Nm2)
+        beam_GJ = gjbar  #  Section torsion stiffness (Nm2)
+        beam_EA = eabar  # Section axial stiffness (N)
+        beam_EIxy = eiflbar  # Coupled flap-lag stiffness with respect to the XE-YE frame (Nm2)
+        beam_EA_EIxx = slbar  # Coupled axial-lag stiffness with respect to the XE-YE frame (Nm.)
+        beam_EA_EIyy = sfbar  # Coupled axial-flap stiffness with respect to the XE-YE frame (Nm)
+        beam_EIxx_GJ = sltbar  # Coupled lag-torsion stiffness with respect to the XE-YE frame (Nm2)
+        beam_EIyy_GJ = sftbar  # Coupled flap-torsion stiffness with respect to the XE-YE frame (Nm2)
+        beam_EA_GJ = satbar  # Coupled axial-torsion stiffness (Nm)
+        beam_x_sc = z_sc  # X-coordinate of the shear-center offset with respect to the ref axes (m)
+        beam_y_sc = y_sc  # Chordwise offset of the section shear-center with respect to the reference frame, XR-YR (m)
+        beam_x_tc = ztc_ref  # X-coordinate of the tension-center offset with respect to the XR-YR axes (m)
+        beam_y_tc = ytc_ref  # Chordwise offset of the section tension-center with respect to the XR-YR axes (m)
+        beam_rhoA = mass  # Section mass per unit length (kg/m)
+        beam_A = area  # Cross-Sectional area (m)
+        beam_flap_iner = iflap_eta  # Section flap inertia about the YG axis per unit length (kg-m)
+        beam_edge_iner = ilag_zeta  # Section lag inertia about the XG axis per unit length (kg-m)
+        # Orientation of the section principal inertia axes with respect the blade reference plane, theta (deg)
+        beam_Tw_iner = tw_iner
+        beam_x_cg = zcm_ref  # X-coordinate of the center-of-mass offset with respect to the XR-YR axes (m)
+        beam_y_cg = ycm_ref  # Chordwise offset of the section center of mass with respect to the XR-YR axes (m)
 
         beam_rhoJ = beam_flap_iner + beam_edge_iner  # perpendicular axis theorem
 
         self.x_ec_nose = beam_y_tc + self.leLoc * self.chord
         self.y_ec_nose = beam_x_tc  # switch b.c of coordinate system used
-            
+
         return (
             beam_EIxx,
             beam_EIyy,
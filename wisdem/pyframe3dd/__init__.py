@@ -1,3 +1,3 @@
-from .pyframe3dd import Frame, Options, NodeData, ElementData, ReactionData, StaticLoadCase
+from .pyframe3dd import Frame, Options, NodeData, FrameCache, ElementData, FrameResults, ReactionData, StaticLoadCase
 
 # import frame3dd
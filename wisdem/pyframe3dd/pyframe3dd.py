@@ -10,9 +10,9 @@ Copyright (c) NREL. All rights reserved.
 from __future__ import print_function
 
 import os
-import math
+import hashlib
 from sys import platform
-from ctypes import POINTER, Structure, c_int, pointer, c_double
+from ctypes import POINTER, Structure, c_int, c_double, c_void_p
 from collections import namedtuple
 
 import numpy as np
@@ -47,6 +47,38 @@ def dp(x):
     return x.ctypes.data_as(c_double_p)
 
 
+def row_addresses(x):
+    """Addresses of the rows x[..., :] of a C-contiguous array, in an array of shape x.shape[:-1]"""
+    n = int(np.prod(x.shape[:-1]))
+    return np.uint64(x.ctypes.data) + np.uint64(x.shape[-1] * x.itemsize) * np.arange(n, dtype=np.uint64).reshape(
+        x.shape[:-1]
+    )
+
+
+def pointer_structs(ctype, addresses):
+    """ctypes array of structures of pointers, one structure per row of addresses"""
+    addresses = np.asarray(addresses, dtype=np.uint64)
+    structs = (ctype * len(addresses))()
+    if len(addresses) > 0:
+        np.frombuffer(structs, dtype=np.uint64)[:] = addresses.ravel()
+    return structs
+
+
+def load_library():
+    mydir = os.path.dirname(os.path.realpath(__file__))  # get path to this file
+    try:
+        lib = np.ctypeslib.load_library(libname, mydir)
+    except:
+        mydir = os.path.abspath(os.path.dirname(mydir))
+        lib = np.ctypeslib.load_library(libname, mydir)
+
+    lib.new_cache.restype = c_void_p
+    lib.new_cache.argtypes = []
+    lib.clear_cache.argtypes = [c_void_p]
+    lib.free_cache.argtypes = [c_void_p]
+    return lib
+
+
 # --------------
 # General Inputs
 # --------------
@@ -97,7 +129,7 @@ class C_Elements(Structure):
 
 
 class C_OtherElementData(Structure):
-    _fields_ = [("shear", c_int), ("geom", c_int), ("exagg_static", c_double), ("dx", c_double)]
+    _fields_ = [("shear", c_int), ("geom", c_int), ("exagg_static", c_double), ("dx", c_double), ("sparse", c_int)]
 
 
 # --------------
@@ -350,7 +382,7 @@ ReactionData = namedtuple("ReactionData", ["node", "Kx", "Ky", "Kz", "Ktx", "Kty
 ElementData = namedtuple(
     "ElementData", ["element", "N1", "N2", "Ax", "Asy", "Asz", "Jx", "Iy", "Iz", "E", "G", "roll", "density"]
 )
-Options = namedtuple("Options", ["shear", "geom", "dx"])
+Options = namedtuple("Options", ["shear", "geom", "dx", "sparse"], defaults=[False])
 
 
 # outputs
@@ -365,8 +397,150 @@ NodeMasses = namedtuple(
 Modes = namedtuple("Modes", ["freq", "xmpf", "ympf", "zmpf", "node", "xdsp", "ydsp", "zdsp", "xrot", "yrot", "zrot"])
 
 
+class FrameResults(object):
+    """Results of a Frame run, in a few contiguous arrays that Frame3DD writes into directly.
+
+    displacements[iCase, :, iN] are the dx, dy, dz, dxrot, dyrot, dzrot of each node,
+    forces[iCase, :, 2*iE + end] the Nx, Vy, Vz, Txx, Myy, Mzz at each end of each element and
+    reactions[iCase, :, iR] the Fx, Fy, Fz, Mxx, Myy, Mzz of each reaction.  The internal forces
+    x, Nx, Vy, Vz, Tx, My, Mz, Dx, Dy, Dz, Rx along element iE are
+    internalForces[iCase, :, offsets[iE]:offsets[iE+1]], or None if the Options dx is -1.
+    nodeMasses[:, iN] are the xmass, ymass, zmass, xinrta, yinrta, zinrta of each node,
+    modalFactors[:, iM] the freq, xmpf, ympf, zmpf of each mode and modes[iM, :, iN]
+    its xdsp, ydsp, zdsp, xrot, yrot, zrot.
+    """
+
+    def __init__(self, nCases, nN, nE, nR, nM, nIF=None):
+        self.displacementNodes = np.zeros((nCases, nN), dtype=np.int32)
+        self.displacements = np.zeros((nCases, 6, nN))
+        self.forceElements = np.zeros((nCases, 2 * nE), dtype=np.int32)
+        self.forceNodes = np.zeros((nCases, 2 * nE), dtype=np.int32)
+        self.forces = np.zeros((nCases, 6, 2 * nE))
+        self.reactionNodes = np.zeros((nCases, nR), dtype=np.int32)
+        self.reactions = np.zeros((nCases, 6, nR))
+
+        if nIF is None:
+            self.offsets = None
+            self.internalForces = None
+        else:
+            self.offsets = np.r_[0, np.cumsum(nIF)]
+            self.internalForces = np.zeros((nCases, 11, self.offsets[-1]))
+
+        self.mass = np.zeros(2)  # total and structural mass
+        self.massNodes = np.zeros(nN, dtype=np.int32)
+        self.nodeMasses = np.zeros((6, nN))
+        self.modalFactors = np.zeros((4, nM))
+        self.modeNodes = np.zeros((nM, nN), dtype=np.int32)
+        self.modes = np.zeros((nM, 6, nN))
+
+    @property
+    def total_mass(self):
+        return self.mass[0]
+
+    @property
+    def struct_mass(self):
+        return self.mass[1]
+
+    def c_structs(self):
+        """The ctypes output structures of Frame3DD, pointing into the result arrays"""
+        nCases = self.displacements.shape[0]
+        nM = self.modes.shape[0]
+
+        c_disp = pointer_structs(
+            C_Displacements, np.c_[row_addresses(self.displacementNodes)[:, None], row_addresses(self.displacements)]
+        )
+        c_forces = pointer_structs(
+            C_Forces,
+            np.c_[
+                row_addresses(self.forceElements)[:, None],
+                row_addresses(self.forceNodes)[:, None],
+                row_addresses(self.forces),
+            ],
+        )
+        c_reactions = pointer_structs(
+            C_ReactionForces, np.c_[row_addresses(self.reactionNodes)[:, None], row_addresses(self.reactions)]
+        )
+
+        # one block of element structures, with a pointer to the first one of each load case
+        if self.internalForces is None:
+            c_internalForces = None
+        else:
+            rows = row_addresses(self.internalForces)[:, None, :]
+            offsets = np.uint64(self.internalForces.itemsize) * self.offsets[:-1].astype(np.uint64)
+            self._c_elements = pointer_structs(C_InternalForces, (rows + offsets[None, :, None]).reshape(-1, 11))
+            c_internalForces = pointer_structs(
+                POINTER(C_InternalForces),
+                row_addresses(np.frombuffer(self._c_elements, dtype=np.uint64).reshape(nCases, -1))[:, None],
+            )
+
+        c_massResults = pointer_structs(
+            C_MassResults,
+            np.r_[
+                row_addresses(self.mass[:, None]),
+                row_addresses(self.massNodes[None, :]),
+                row_addresses(self.nodeMasses),
+            ][None, :],
+        )
+        c_modalResults = pointer_structs(
+            C_ModalResults,
+            np.c_[
+                row_addresses(self.modalFactors[:, :, None]).T,
+                row_addresses(self.modeNodes)[:, None],
+                row_addresses(self.modes),
+            ].reshape(nM, 11),
+        )
+        return c_disp, c_forces, c_reactions, c_internalForces, c_massResults, c_modalResults
+
+    def unpack(self):
+        """The results as the named tuples returned by Frame.run, viewing the result arrays"""
+        dout = NodeDisplacements(self.displacementNodes, *self.displacements.transpose(1, 0, 2))
+        fout = ElementEndForces(self.forceElements, self.forceNodes, *self.forces.transpose(1, 0, 2))
+        rout = NodeReactions(self.reactionNodes, *self.reactions.transpose(1, 0, 2))
+        if self.internalForces is None:
+            ifout = []
+        else:
+            ifout = [
+                InternalForces(*self.internalForces[:, :, i0:i1].transpose(1, 0, 2))
+                for i0, i1 in zip(self.offsets[:-1], self.offsets[1:])
+            ]
+        mout = NodeMasses(self.total_mass, self.struct_mass, self.massNodes, *self.nodeMasses)
+        modalout = Modes(*self.modalFactors, self.modeNodes, *self.modes.transpose(1, 0, 2))
+        return dout, fout, rout, ifout, mout, modalout
+
+
+class FrameCache(object):
+    """The factored elastic stiffness matrix of a frame, and its modes if there is no
+    geometric stiffness, kept between runs.
+
+    A Frame that is run again, or a new Frame given the same FrameCache, only re-solves
+    for its loads while the nodes, reactions, elements, extra masses and options are unchanged.
+    Any change to those empties the cache on the next run.
+    """
+
+    def __init__(self):
+        self._lib = load_library()
+        self._cache = self._lib.new_cache()
+        self.key = None
+
+    def clear(self):
+        self._lib.clear_cache(self._cache)
+        self.key = None
+
+    def __del__(self):
+        if getattr(self, "_cache", None):
+            self._lib.free_cache(self._cache)
+            self._cache = None
+
+    # the C memory is not copied, a copy starts empty
+    def __getstate__(self):
+        return {}
+
+    def __setstate__(self, state):
+        self.__init__()
+
+
 class Frame(object):
-    def __init__(self, nodes, reactions, elements, options):
+    def __init__(self, nodes, reactions, elements, options, cache=None):
         """docstring"""
 
         self.nodes = nodes
@@ -428,11 +602,13 @@ class Frame(object):
 
         # options
         exagg_static = 1.0  # not used
-        self.c_other = C_OtherElementData(options.shear, options.geom, exagg_static, options.dx)
+        self.c_other = C_OtherElementData(
+            options.shear, options.geom, exagg_static, options.dx, int(getattr(options, "sparse", False))
+        )
 
         # leave off dynamics by default
         self.nM = 0  # number of desired dynamic modes of vibration (below only necessary if nM > 0)
-        self.Mmethod = 1  # 1: subspace Jacobi     2: Stodola
+        self.Mmethod = 1  # 1: subspace Jacobi     2: Stodola     3: Lanczos
         self.lump = 0  # 0: consistent mass ... 1: lumped mass matrix
         self.tol = 1e-9  # mode shape tolerance
         self.shift = 0.0  # shift value ... for unrestrained structures
@@ -447,13 +623,11 @@ class Frame(object):
         self.changeExtraElementMass(i, d, False)
         self.changeCondensationData(0, i, d, d, d, d, d, d, i)
 
+        # factored stiffness matrix and modes, reused while the structure is unchanged
+        self.cache = FrameCache() if cache is None else cache
+
         # load c module
-        mydir = os.path.dirname(os.path.realpath(__file__))  # get path to this file
-        try:
-            self._pyframe3dd = np.ctypeslib.load_library(libname, mydir)
-        except:
-            mydir = os.path.abspath(os.path.dirname(mydir))
-            self._pyframe3dd = np.ctypeslib.load_library(libname, mydir)
+        self._pyframe3dd = load_library()
 
         self._pyframe3dd.run.argtypes = [
             POINTER(C_Nodes),
@@ -472,6 +646,7 @@ class Frame(object):
             POINTER(POINTER(C_InternalForces)),
             POINTER(C_MassResults),
             POINTER(C_ModalResults),
+            c_void_p,
         ]
 
         self._pyframe3dd.run.restype = c_int
@@ -544,6 +719,24 @@ class Frame(object):
             dp(self.ENMrhoz),
         )
 
+    def structureKey(self):
+        """Hash of everything the stiffness matrix and the modes depend on, but not the loads"""
+        h = hashlib.sha1()
+        nodes = [self.nnode, self.nx, self.ny, self.nz, self.nr]
+        reactions = [self.rnode, self.rKx, self.rKy, self.rKz, self.rKtx, self.rKty, self.rKtz]
+        elements = [self.eelement, self.eN1, self.eN2, self.eAx, self.eAsy, self.eAsz, self.eJx, self.eIy, self.eIz]
+        materials = [self.eE, self.eG, self.eroll, self.edensity]
+        node_mass = [self.ENMnode, self.ENMmass, self.ENMIxx, self.ENMIyy, self.ENMIzz, self.ENMIxy, self.ENMIxz]
+        node_mass += [self.ENMIyz, self.ENMrhox, self.ENMrhoy, self.ENMrhoz]
+        element_mass = [self.EEMelement, self.EEMmass]
+        for x in nodes + reactions + elements + materials + node_mass + element_mass:
+            h.update(str(x.shape).encode())
+            h.update(np.ascontiguousarray(x).tobytes())
+        c = self.c_other
+        h.update(repr((self.c_reactions.rigid, c.shear, c.geom, c.sparse)).encode())
+        h.update(repr((self.nM, self.Mmethod, self.lump, self.tol, self.shift)).encode())
+        return h.hexdigest()
+
     def changeExtraElementMass(self, element, mass, addGravityLoad):
         self.EEMelement = np.array(element).astype(np.int32)
         nelem = len(self.EEMelement)
@@ -714,7 +907,10 @@ class Frame(object):
                     dp(self.IPLxE[icase]),
                 )
 
-    def run(self, nanokay=False):
+    def run(self, nanokay=False, compact=False):
+        """Run the analysis, returning the NodeDisplacements, ElementEndForces, NodeReactions,
+        list of InternalForces of each element (empty if the Options dx is -1), NodeMasses and
+        Modes, or the FrameResults behind them all if compact is True."""
         nCases = len(self.loadCases)  # number of load cases
         nN = len(self.nodes.node)  # number of nodes
         nE = len(self.elements.element)  # number of elements
@@ -727,186 +923,30 @@ class Frame(object):
 
         self.__addGravityToExtraMass()
 
-        # initialize output arrays
-
-        dout = NodeDisplacements(
-            np.zeros((nCases, nN), dtype=np.int32),
-            np.zeros((nCases, nN)),
-            np.zeros((nCases, nN)),
-            np.zeros((nCases, nN)),
-            np.zeros((nCases, nN)),
-            np.zeros((nCases, nN)),
-            np.zeros((nCases, nN)),
-        )
-        fout = ElementEndForces(
-            np.zeros((nCases, 2 * nE), dtype=np.int32),
-            np.zeros((nCases, 2 * nE), dtype=np.int32),
-            np.zeros((nCases, 2 * nE)),
-            np.zeros((nCases, 2 * nE)),
-            np.zeros((nCases, 2 * nE)),
-            np.zeros((nCases, 2 * nE)),
-            np.zeros((nCases, 2 * nE)),
-            np.zeros((nCases, 2 * nE)),
-        )
-        rout = NodeReactions(
-            np.zeros((nCases, nR), dtype=np.int32),
-            np.zeros((nCases, nR)),
-            np.zeros((nCases, nR)),
-            np.zeros((nCases, nR)),
-            np.zeros((nCases, nR)),
-            np.zeros((nCases, nR)),
-            np.zeros((nCases, nR)),
-        )
-
+        # initialize output arrays, internal forces are only calculated if dx != -1
         dx = self.options.dx
-
-        ifout = [0] * nE
-        for i in range(nE):
-            L = self.eL[i]
-
-            nIF = int(max(math.floor(L / dx), 1)) + 1
-
-            ifout[i] = InternalForces(
-                np.zeros((nCases, nIF)),
-                np.zeros((nCases, nIF)),
-                np.zeros((nCases, nIF)),
-                np.zeros((nCases, nIF)),
-                np.zeros((nCases, nIF)),
-                np.zeros((nCases, nIF)),
-                np.zeros((nCases, nIF)),
-                np.zeros((nCases, nIF)),
-                np.zeros((nCases, nIF)),
-                np.zeros((nCases, nIF)),
-                np.zeros((nCases, nIF)),
-            )
-
-        mout = NodeMasses(
-            0.0,
-            0.0,
-            np.zeros(nN, dtype=np.int32),
-            np.zeros(nN),
-            np.zeros(nN),
-            np.zeros(nN),
-            np.zeros(nN),
-            np.zeros(nN),
-            np.zeros(nN),
-        )
-        modalout = Modes(
-            np.zeros(nM),
-            np.zeros(nM),
-            np.zeros(nM),
-            np.zeros(nM),
-            np.zeros((nM, nN), dtype=np.int32),
-            np.zeros((nM, nN)),
-            np.zeros((nM, nN)),
-            np.zeros((nM, nN)),
-            np.zeros((nM, nN)),
-            np.zeros((nM, nN)),
-            np.zeros((nM, nN)),
-        )
+        nIF = None if dx == -1 else np.maximum(np.floor(self.eL / dx), 1).astype(np.int64) + 1
+        results = FrameResults(nCases, nN, nE, nR, nM, nIF)
 
         # create c structs
 
         c_loadcases = (C_LoadCase * nCases)()
-        c_disp = (C_Displacements * nCases)()
-        c_forces = (C_Forces * nCases)()
-        c_reactions = (C_ReactionForces * nCases)()
-        c_internalForces = (POINTER(C_InternalForces) * nCases)()
-
         for i in range(nCases):
             lci = self.loadCases[i]
             c_loadcases[i] = C_LoadCase(lci.gx, lci.gy, lci.gz, lci.pL, lci.uL, lci.tL, lci.eL, lci.tempL, lci.pD)
-            c_disp[i] = C_Displacements(
-                ip(dout.node[i, :]),
-                dp(dout.dx[i, :]),
-                dp(dout.dy[i, :]),
-                dp(dout.dz[i, :]),
-                dp(dout.dxrot[i, :]),
-                dp(dout.dyrot[i, :]),
-                dp(dout.dzrot[i, :]),
-            )
-            c_forces[i] = C_Forces(
-                ip(fout.element[i, :]),
-                ip(fout.node[i, :]),
-                dp(fout.Nx[i, :]),
-                dp(fout.Vy[i, :]),
-                dp(fout.Vz[i, :]),
-                dp(fout.Txx[i, :]),
-                dp(fout.Myy[i, :]),
-                dp(fout.Mzz[i, :]),
-            )
-            c_reactions[i] = C_ReactionForces(
-                ip(rout.node[i, :]),
-                dp(rout.Fx[i, :]),
-                dp(rout.Fy[i, :]),
-                dp(rout.Fz[i, :]),
-                dp(rout.Mxx[i, :]),
-                dp(rout.Myy[i, :]),
-                dp(rout.Mzz[i, :]),
-            )
-
-            c_internalForces[i] = (C_InternalForces * nE)()
-            for j in range(nE):
-                (c_internalForces[i])[j] = C_InternalForces(
-                    dp(ifout[j].x[i, :]),
-                    dp(ifout[j].Nx[i, :]),
-                    dp(ifout[j].Vy[i, :]),
-                    dp(ifout[j].Vz[i, :]),
-                    dp(ifout[j].Tx[i, :]),
-                    dp(ifout[j].My[i, :]),
-                    dp(ifout[j].Mz[i, :]),
-                    dp(ifout[j].Dx[i, :]),
-                    dp(ifout[j].Dy[i, :]),
-                    dp(ifout[j].Dz[i, :]),
-                    dp(ifout[j].Rx[i, :]),
-                )
-
-        total_mass = c_double()
-        struct_mass = c_double()
-
-        c_massResults = C_MassResults(
-            pointer(total_mass),
-            pointer(struct_mass),
-            ip(mout.node),
-            dp(mout.xmass),
-            dp(mout.ymass),
-            dp(mout.zmass),
-            dp(mout.xinrta),
-            dp(mout.yinrta),
-            dp(mout.zinrta),
-        )
 
-        c_modalResults = (C_ModalResults * nM)()
-
-        freq = [0] * nM
-        xmpf = [0] * nM
-        ympf = [0] * nM
-        zmpf = [0] * nM
-
-        for i in range(nM):
-            freq[i] = c_double()
-            xmpf[i] = c_double()
-            ympf[i] = c_double()
-            zmpf[i] = c_double()
-
-            c_modalResults[i] = C_ModalResults(
-                pointer(freq[i]),
-                pointer(xmpf[i]),
-                pointer(ympf[i]),
-                pointer(zmpf[i]),
-                ip(modalout.node[i, :]),
-                dp(modalout.xdsp[i, :]),
-                dp(modalout.ydsp[i, :]),
-                dp(modalout.zdsp[i, :]),
-                dp(modalout.xrot[i, :]),
-                dp(modalout.yrot[i, :]),
-                dp(modalout.zrot[i, :]),
-            )
+        c_disp, c_forces, c_reactions, c_internalForces, c_massResults, c_modalResults = results.c_structs()
 
         # set dynamics data
         exagg_modal = 1.0  # not used
         c_dynamicData = C_DynamicData(self.nM, self.Mmethod, self.lump, self.tol, self.shift, exagg_modal)
 
+        # reuse the factored stiffness and modes unless the structure has changed
+        key = self.structureKey()
+        if self.cache.key != key:
+            self.cache.clear()
+            self.cache.key = key
+
         exitCode = self._pyframe3dd.run(
             self.c_nodes,
             self.c_reactions,
@@ -924,30 +964,11 @@ class Frame(object):
             c_internalForces,
             c_massResults,
             c_modalResults,
+            self.cache._cache,
         )
 
-        # put mass values back in since tuple is read only
-        mout = NodeMasses(
-            total_mass.value,
-            struct_mass.value,
-            mout.node,
-            mout.xmass,
-            mout.ymass,
-            mout.zmass,
-            mout.xinrta,
-            mout.yinrta,
-            mout.zinrta,
-        )
-
-        # put modal results back in
-        for i in range(nM):
-            modalout.freq[i] = freq[i].value
-            modalout.xmpf[i] = xmpf[i].value
-            modalout.ympf[i] = ympf[i].value
-            modalout.zmpf[i] = zmpf[i].value
-
-        nantest1 = np.isnan(np.c_[fout.Nx, fout.Vy, fout.Vz, fout.Txx, fout.Myy, fout.Mzz])
-        nantest2 = np.isnan(modalout.freq)
+        nantest1 = np.isnan(results.forces)
+        nantest2 = np.isnan(results.modalFactors[0])
         if not nanokay and (np.any(nantest1) or np.any(nantest2)):
             raise RuntimeError("Frame3DD did not exit gracefully")
         elif exitCode == 182 or exitCode == 183:
@@ -955,7 +976,7 @@ class Frame(object):
         elif exitCode != 0:
             raise RuntimeError("Frame3DD did not exit gracefully")
 
-        return dout, fout, rout, ifout, mout, modalout
+        return results if compact else results.unpack()
 
     def write(self, fname):
         f = open(fname, "w")
@@ -1167,7 +1188,7 @@ class Frame(object):
         f.write("\n")
         f.write("\n")
         f.write(str(self.nM) + "    # number of desired dynamic modes of vibration\n")
-        f.write(str(self.Mmethod) + "    # 1: subspace Jacobi     2: Stodola\n")
+        f.write(str(self.Mmethod) + "    # 1: subspace Jacobi     2: Stodola     3: Lanczos\n")
         f.write(str(self.lump) + "    # 0: consistent mass ... 1: lumped mass matrix\n")
         f.write(str(self.tol) + " # mode shape tolerance\n")
         f.write(str(self.shift) + "  # shift value ... for unrestrained structures\n")
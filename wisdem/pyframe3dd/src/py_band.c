@@ -0,0 +1,451 @@
+/*
+ This file is part of FRAME3DD:
+ Static and dynamic structural analysis of 2D and 3D frames and trusses with
+ elastic and geometric stiffness.
+ ---------------------------------------------------------------------------
+ http://frame3dd.sourceforge.net/
+ ---------------------------------------------------------------------------
+ Copyright (C) 1992-2014  Henri P. Gavin
+
+    FRAME3DD is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    FRAME3DD is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with FRAME3DD.  If not, see <http://www.gnu.org/licenses/>.
+*//**
+	@file
+	Banded storage of the symmetric stiffness and mass matrices, with a
+	bandwidth-reducing node renumbering.  See py_band.h.
+*/
+
+#include <math.h>
+#include <stdio.h>
+#include <stdlib.h>
+
+#include "py_band.h"
+#include "NRutil.h"
+
+/* forward declarations */
+
+static int node_bandwidth( int nE, int *N1, int *N2, int *perm );
+
+static int bfs_levels( int start, int *xadj, int *adj, int *level, int *order );
+
+
+/*
+ * BAND_RENUMBER - renumber the nodes with the reverse Cuthill-McKee ordering
+ * if it reduces the bandwidth of the structural matrices.         2026-10-16
+ */
+int band_renumber( int nN, int nE, int *N1, int *N2, int *perm, int *idx )
+{
+	int	*deg,		/* number of neighbors of each node	*/
+		*xadj, *adj,	/* adjacency lists, compressed by node	*/
+		*level,		/* BFS level of each node, 0: unvisited	*/
+		*order,		/* the Cuthill-McKee node order		*/
+		*rcm,		/* the reverse Cuthill-McKee numbering	*/
+		nb_id, nb_rcm,	/* node bandwidth, original and RCM	*/
+		i, j, k, n, m, s, head, tail, start, ecc, ecc_new, nO = 0;
+
+	for (n=1; n<=nN; n++)	perm[n] = n;
+
+	deg   = ivector(1,nN+1);
+	xadj  = ivector(1,nN+1);
+	adj   = ivector(1,2*nE+1);
+	level = ivector(1,nN);
+	order = ivector(1,nN);
+	rcm   = ivector(1,nN);
+
+	for (n=1; n<=nN+1; n++)	deg[n] = 0;
+	for (i=1; i<=nE; i++) {
+		if ( N1[i] == N2[i] ) continue;
+		++deg[N1[i]];
+		++deg[N2[i]];
+	}
+	xadj[1] = 1;
+	for (n=1; n<=nN; n++)	xadj[n+1] = xadj[n] + deg[n];
+	for (n=1; n<=nN; n++)	deg[n] = 0;
+	for (i=1; i<=nE; i++) {
+		if ( N1[i] == N2[i] ) continue;
+		adj[xadj[N1[i]] + deg[N1[i]]++] = N2[i];
+		adj[xadj[N2[i]] + deg[N2[i]]++] = N1[i];
+	}
+
+	for (n=1; n<=nN; n++)	level[n] = 0;
+
+	for (s=1; s<=nN; s++) {		/* each connected component */
+		if ( level[s] ) continue;
+
+		/* the unvisited node of least degree in this component */
+		start = s;
+		ecc = bfs_levels( s, xadj, adj, level, order + nO );
+		for (k=1; k<=ecc; k++)	/* ecc is the component size here */
+			if ( deg[order[nO+k]] < deg[start] ) start = order[nO+k];
+		for (k=1; k<=ecc; k++)	level[order[nO+k]] = 0;
+
+		/* pseudo-peripheral node, George and Liu, 1979 */
+		ecc = -1;
+		for (j=0; j<8; j++) {
+			m = bfs_levels( start, xadj, adj, level, order + nO );
+			ecc_new = level[order[nO+m]];
+			i = order[nO+m];	/* least degree in the last level */
+			for (k=m; k>=1 && level[order[nO+k]] == ecc_new; k--)
+				if ( deg[order[nO+k]] < deg[i] ) i = order[nO+k];
+			for (k=1; k<=m; k++)	level[order[nO+k]] = 0;
+			if ( ecc_new <= ecc ) break;
+			ecc = ecc_new;
+			start = i;
+		}
+
+		/* Cuthill-McKee: breadth first, neighbors by increasing degree */
+		level[start] = 1;
+		order[nO+1] = start;
+		head = tail = nO+1;
+		while ( head <= tail ) {
+			n = order[head++];
+			m = tail;
+			for (k=xadj[n]; k<xadj[n+1]; k++) {
+				if ( level[adj[k]] ) continue;
+				level[adj[k]] = level[n] + 1;
+				order[++tail] = adj[k];
+			}
+			for (i=m+2; i<=tail; i++) {	/* insertion sort */
+				k = order[i];
+				for (j=i-1; j>m && deg[order[j]] > deg[k]; j--)
+					order[j+1] = order[j];
+				order[j+1] = k;
+			}
+		}
+		nO = tail;
+	}
+
+	for (k=1; k<=nN; k++)	rcm[order[k]] = nN + 1 - k;
+
+	nb_id  = node_bandwidth( nE, N1, N2, perm );
+	nb_rcm = node_bandwidth( nE, N1, N2, rcm );
+	if ( nb_rcm < nb_id ) {
+		for (n=1; n<=nN; n++)	perm[n] = rcm[n];
+		nb_id = nb_rcm;
+	}
+
+	for (n=1; n<=nN; n++)
+		for (k=1; k<=6; k++)	idx[6*(n-1)+k] = 6*(perm[n]-1)+k;
+
+	free_ivector(deg,1,nN+1);
+	free_ivector(xadj,1,nN+1);
+	free_ivector(adj,1,2*nE+1);
+	free_ivector(level,1,nN);
+	free_ivector(order,1,nN);
+	free_ivector(rcm,1,nN);
+
+	k = 6*nb_id + 5;	/* half-bandwidth of the coordinates */
+	return ( k < 6*nN-1 ? k : 6*nN-1 );
+}
+
+
+/*
+ * NODE_BANDWIDTH - largest difference in node numbers over all elements
+ */
+static int node_bandwidth( int nE, int *N1, int *N2, int *perm )
+{
+	int	i, b = 0;
+
+	for (i=1; i<=nE; i++)
+		if ( abs(perm[N1[i]] - perm[N2[i]]) > b )
+			b = abs(perm[N1[i]] - perm[N2[i]]);
+	return b;
+}
+
+
+/*
+ * BFS_LEVELS - breadth first search from node start, labeling the level of
+ * each visited node.  The visited nodes are listed in order[1..m].  Returns m.
+ */
+static int bfs_levels( int start, int *xadj, int *adj, int *level, int *order )
+{
+	int	head = 1, tail = 1, n, k;
+
+	level[start] = 1;
+	order[1] = start;
+	while ( head <= tail ) {
+		n = order[head++];
+		for (k=xadj[n]; k<xadj[n+1]; k++) {
+			if ( level[adj[k]] ) continue;
+			level[adj[k]] = level[n] + 1;
+			order[++tail] = adj[k];
+		}
+	}
+	return tail;
+}
+
+
+/*
+ * BAND_GET - element A(i,j) of a symmetric band matrix, |i-j| <= bw
+ */
+double band_get( double **A, int i, int j )
+{
+	return ( i <= j ? A[i][j-i] : A[j][i-j] );
+}
+
+
+/*
+ * BAND_ZERO - set a band matrix to zero
+ */
+void band_zero( double **A, int n, int bw )
+{
+	int	i, k;
+
+	for (i=1; i<=n; i++)	for (k=0; k<=bw; k++)	A[i][k] = 0.0;
+}
+
+
+/*
+ * BAND_PROD - matrix-vector product {y} = [A]{x} of a symmetric band matrix
+ */
+void band_prod( double **A, int n, int bw, double *x, double *y )
+{
+	int	i, k;
+
+	for (i=1; i<=n; i++)	y[i] = A[i][0] * x[i];
+
+	for (i=1; i<=n; i++) {
+		for (k=1; k<=bw && i+k<=n; k++) {
+			y[i]   += A[i][k] * x[i+k];
+			y[i+k] += A[i][k] * x[i];
+		}
+	}
+}
+
+
+/*
+ * BAND_PERMUTE - gather {xb} = {x} into band order, or scatter {x} = {xb}
+ * back into the structural order if reverse is non-zero
+ */
+void band_permute( double *x, double *xb, int *idx, int n, int reverse )
+{
+	int	i;
+
+	if ( reverse )	for (i=1; i<=n; i++)	x[i] = xb[idx[i]];
+	else		for (i=1; i<=n; i++)	xb[idx[i]] = x[i];
+}
+
+
+/*
+ * BAND_UNPACK - copy a band matrix into the full matrix Af, in the
+ * structural order, for the routines that need the full matrix
+ */
+void band_unpack( double **A, int n, int bw, int *idx, double **Af )
+{
+	int	i, j;
+
+	for (i=1; i<=n; i++) {
+		for (j=1; j<=n; j++) {
+			if ( abs(idx[i] - idx[j]) <= bw )
+				Af[i][j] = band_get( A, idx[i], idx[j] );
+			else	Af[i][j] = 0.0;
+		}
+	}
+}
+
+
+/*
+ * LDL_DCMP_BAND_PM  -  Solves partitioned matrix equations
+ *
+ *           [A_qq]{x_q} + [A_qr]{x_r} = {b_q}
+ *           [A_rq]{x_q} + [A_rr]{x_r} = {b_r}+{c_r}
+ *           where {b_q}, {b_r}, and {x_r} are known and
+ *           where {x_q} and {c_r} are unknown
+ *
+ * via L D L' - decomposition of [A_qq], as ldl_dcmp_pm(), with [A] stored by
+ * its upper band.  [A] is preserved, L is returned in the lower band matrix
+ * [L] and the diagonal of D in the vector {d}.  The work of the reduction is
+ * n*bw^2 and the work of a back substitution is n*bw.
+ */
+void ldl_dcmp_band_pm (
+	double **A, double **L, int n, int bw,
+	double *d, double *b, double *x, double *c,
+	int *q, int *r, int reduce, int solve, int *pd
+){
+	int	i, j, k, m, lo, hi;
+	*pd = 0;	/* number of negative elements on the diagonal of D */
+
+	if ( reduce ) {		/* forward column-wise reduction of [A]	*/
+
+	    for (j=1; j<=n; j++) {
+
+	      d[j] = 0.0;
+	      for (k=1; k<=bw; k++)	L[j][k] = 0.0;
+
+	      if ( q[j] ) { /* reduce column j, except where q[i]==0	*/
+
+		for (m = j-bw > 1 ? j-bw : 1; m < j; m++) /* scan the sky-line */
+			if ( A[m][j-m] != 0.0 )	break;
+
+		for (i=m; i < j; i++) {
+		    if ( q[i] ) {
+			L[j][j-i] = A[i][j-i];
+			for (k=m; k < i; k++)
+				if ( q[k] )
+					L[j][j-i] -= L[j][j-k]*L[i][i-k];
+		    }
+		}
+
+		d[j] = A[j][0];
+		for (i=m; i < j; i++) if ( q[i] ) d[j] -= L[j][j-i]*L[j][j-i]/d[i];
+		for (i=m; i < j; i++) if ( q[i] ) L[j][j-i] /= d[i];
+
+		if ( d[j] == 0.0 ) {
+		 fprintf(stderr," ldl_dcmp_band_pm(): zero found on diagonal ...\n");
+		 fprintf(stderr," d[%d] = %11.4e\n", j, d[j] );
+		 return;
+		}
+		if ( d[j] < 0.0 ) (*pd)--;
+	      }
+	    }
+
+	}		/* the forward reduction of [A] is now complete	*/
+
+	if ( solve ) {		/* back substitution to solve for {x}   */
+
+	    for (i=1; i <= n; i++) {
+		if ( q[i] ) {
+			x[i] = b[i];
+			lo = i-bw > 1 ? i-bw : 1;
+			hi = i+bw < n ? i+bw : n;
+			for (j=lo; j<=hi; j++)
+				if ( r[j] ) x[i] -= band_get(A,i,j)*x[j];
+		}
+	    }
+
+		/* {x} is run through the same forward reduction as was [A] */
+	    for (i=1; i <= n; i++) {
+		if ( q[i] ) {
+			lo = i-bw > 1 ? i-bw : 1;
+			for (j=lo; j<i; j++) if ( q[j] ) x[i] -= L[i][i-j]*x[j];
+		}
+	    }
+
+	    for (i=1; i <= n; i++)	if ( q[i] )	x[i] /= d[i];
+
+	    /* now back substitution is conducted on {x};  [A] is preserved */
+
+	    for (i=n; i > 1; i--) {
+		if ( q[i] ) {
+			lo = i-bw > 1 ? i-bw : 1;
+			for (j=lo; j < i; j++)
+				if ( q[j] )
+					x[j] -= L[i][i-j]*x[i];
+		}
+	    }
+
+	    /* finally, evaluate c_r	*/
+
+	    for (i=1; i<=n; i++) {
+		c[i] = 0.0;
+		if ( r[i] ) {
+			c[i] = -b[i];
+			lo = i-bw > 1 ? i-bw : 1;
+			hi = i+bw < n ? i+bw : n;
+			for (j=lo; j<=hi; j++)	c[i] += band_get(A,i,j)*x[j];
+		}
+	    }
+
+	}
+	return;
+}
+
+
+/*
+ * LDL_MPROVE_BAND_PM
+ * Improves a solution vector x[1..n] of the partitioned set of linear equations
+ * as ldl_mprove_pm(), with [A] stored by its upper band and [L] as returned
+ * by ldl_dcmp_band_pm().
+ */
+void ldl_mprove_band_pm (
+	double **A, double **L, int n, int bw,
+	double *d, double *b, double *x, double *c,
+	int *q, int *r, double *rms_resid, int *ok
+){
+	double  sdp;		// accumulate the r.h.s. in double precision
+	double  *dx,		// the residual error
+		*dc,		// update to partial r.h.s. vector, c
+		rms_resid_new=0.0; // the RMS error of the mprvd solution
+	int	j, i, lo, hi, pd;
+
+	dx  = dvector(1,n);
+	dc  = dvector(1,n);
+
+	for (i=1;i<=n;i++)	dx[i] = 0.0;
+
+	// calculate the r.h.s. of ...
+	//  [A_qq]{dx_q} = {b_q} - [A_qq]*{x_q} - [A_qr]*{x_r}
+	//  {dx_r} is left unchanged at 0.0;
+	for (i=1;i<=n;i++) {
+	    if ( q[i] ) {
+		sdp = b[i];
+		lo = i-bw > 1 ? i-bw : 1;
+		hi = i+bw < n ? i+bw : n;
+		for (j=lo;j<=hi;j++) if ( q[j] ) sdp -= band_get(A,i,j) * x[j];
+		for (j=lo;j<=hi;j++) if ( r[j] ) sdp -= band_get(A,i,j) * x[j];
+		dx[i] = sdp;
+	    }
+	}
+
+	// solve for the residual error term, A is already factored
+	ldl_dcmp_band_pm ( A, L, n, bw, d, dx, dx, dc, q,r, 0, 1, &pd );
+
+	for (i=1;i<=n;i++) if ( q[i] )	rms_resid_new += dx[i]*dx[i];
+
+	rms_resid_new = sqrt ( rms_resid_new / (double) n );
+
+	*ok = 0;
+	if ( rms_resid_new / *rms_resid < 0.90 ) { /*  enough improvement    */
+		for (i=1;i<=n;i++) {	/*  update the solution   */
+		    	if ( q[i] )	x[i] += dx[i];
+			if ( r[i] )	c[i] += dc[i];
+		}
+		*rms_resid = rms_resid_new;	/* return the new residual   */
+		*ok = 1;			/* the solution has improved */
+	}
+
+	free_dvector(dx,1,n);
+	free_dvector(dc,1,n);
+	return;
+}
+
+
+/*
+ * XTAX_BAND - carry out matrix-matrix-matrix multiplication for a symmetric
+ * band matrix A, C = X' A X, where X is N by J
+ */
+void xtAx_band( double **A, int bw, double **X, double **C, int N, int J )
+{
+	double	*x, *ax;
+	int	i, j, k;
+
+	x  = dvector(1,N);
+	ax = dvector(1,N);
+
+	for (j=1; j<=J; j++) {
+		for (k=1; k<=N; k++)	x[k] = X[k][j];
+		band_prod( A, N, bw, x, ax );
+		for (i=1; i<=J; i++) {
+			C[i][j] = 0.0;
+			for (k=1; k<=N; k++)	C[i][j] += X[k][i] * ax[k];
+		}
+	}
+
+	for (i=1; i<=J; i++)	    /*  make  C  symmetric */
+		for (j=i; j<=J; j++)
+			C[i][j] = C[j][i] = 0.5 * ( C[i][j] + C[j][i] );
+
+	free_dvector(x,1,N);
+	free_dvector(ax,1,N);
+	return;
+}
@@ -0,0 +1,132 @@
+/*
+ This file is part of FRAME3DD:
+ Static and dynamic structural analysis of 2D and 3D frames and trusses with
+ elastic and geometric stiffness.
+ ---------------------------------------------------------------------------
+ http://frame3dd.sourceforge.net/
+ ---------------------------------------------------------------------------
+ Copyright (C) 1992-2014  Henri P. Gavin
+
+    FRAME3DD is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    FRAME3DD is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with FRAME3DD.  If not, see <http://www.gnu.org/licenses/>.
+*//**
+	@file
+	Banded storage of the symmetric stiffness and mass matrices, with a
+	bandwidth-reducing node renumbering.
+
+	A symmetric matrix [A] of half-bandwidth bw is stored by its upper band,
+	A[i][k] = A(i,i+k) for k = 0..bw, allocated as dmatrix(1,n,0,bw).
+	The L of its L D L' decomposition is stored separately by its lower band,
+	L[j][k] = L(j,j-k) for k = 1..bw, so [A] is preserved for the iterative
+	improvement of the solution.  Rows of the band matrices are ordered by the
+	renumbered nodes; idx[i] is the band row of structural coordinate i.
+*/
+#ifndef PYFRAME_BAND_H
+#define PYFRAME_BAND_H
+
+/*
+ * BAND_RENUMBER - renumber the nodes with the reverse Cuthill-McKee ordering
+ * if it reduces the bandwidth of the structural matrices.  perm[n] is the new
+ * number of node n, idx[i] is the band row of coordinate i, 1 <= i <= 6*nN.
+ * Returns the half-bandwidth of the structural matrices.
+ */
+int band_renumber(
+	int nN,		/**< number of nodes				*/
+	int nE,		/**< number of frame elements			*/
+	int *N1, int *N2, /**< node connectivity			*/
+	int *perm,	/**< new number of each node, [1..nN]		*/
+	int *idx	/**< band row of each coordinate, [1..6*nN]	*/
+);
+
+
+/*
+ * BAND_GET - element A(i,j) of a symmetric band matrix, |i-j| <= bw
+ */
+double band_get( double **A, int i, int j );
+
+
+/*
+ * BAND_ZERO - set a band matrix to zero
+ */
+void band_zero( double **A, int n, int bw );
+
+
+/*
+ * BAND_PROD - matrix-vector product {y} = [A]{x} of a symmetric band matrix
+ */
+void band_prod( double **A, int n, int bw, double *x, double *y );
+
+
+/*
+ * BAND_PERMUTE - gather {xb} = {x} into band order, or scatter {x} = {xb}
+ * back into the structural order if reverse is non-zero
+ */
+void band_permute( double *x, double *xb, int *idx, int n, int reverse );
+
+
+/*
+ * BAND_UNPACK - copy a band matrix into the full matrix Af, in the
+ * structural order, for the routines that need the full matrix
+ */
+void band_unpack( double **A, int n, int bw, int *idx, double **Af );
+
+
+/*
+ * LDL_DCMP_BAND_PM - the banded counterpart of ldl_dcmp_pm(), solving
+ *           [A_qq]{x_q} + [A_qr]{x_r} = {b_q}
+ *           [A_rq]{x_q} + [A_rr]{x_r} = {b_r}+{c_r}
+ * via L D L' - decomposition of [A_qq] into the band matrix [L].
+ */
+void ldl_dcmp_band_pm (
+	double **A,	/**< the system matrix, upper band, preserved	*/
+	double **L,	/**< L of the L D L' decomp., lower band	*/
+	int n,		/**< the dimension of the matrix		*/
+	int bw,		/**< the half-bandwidth of the matrix		*/
+	double *d,	/**< diagonal of D in the  L D L' - decomp'n    */
+	double *b,	/**< the right hand side vector			*/
+	double *x,	/**< part of the solution vector		*/
+	double *c,	/**< the part of the solution vector in the rhs */
+	int *q,		/**< q[j]=1 if  b[j] is known; q[j]=0 otherwise	*/
+	int *r,		/**< r[j]=1 if  x[j] is known; r[j]=0 otherwise	*/
+	int reduce,	/**< 1: do a forward reduction of A; 0: don't   */
+	int solve,	/**< 1: do a back substitution for {x}; 0: don't */
+	int *pd		/**< 1: definite matrix and successful L D L' decomp'n*/
+);
+
+
+/*
+ * LDL_MPROVE_BAND_PM - the banded counterpart of ldl_mprove_pm()
+ */
+void ldl_mprove_band_pm (
+	double **A,	/**< the system matrix, upper band		*/
+	double **L,	/**< L of the L D L' decomp., lower band	*/
+	int n,		/**< the dimension of the matrix		*/
+	int bw,		/**< the half-bandwidth of the matrix		*/
+	double *d,	/**< diagonal of D in the  L D L' - decomp'n    */
+	double *b,	/**< the right hand side vector			*/
+	double *x,	/**< part of the solution vector		*/
+	double *c,	/**< the part of the solution vector in the rhs */
+	int *q,		/**< q[j]=1 if  b[j] is known; q[j]=0 otherwise	*/
+	int *r,		/**< r[j]=1 if  x[j] is known; r[j]=0 otherwise	*/
+	double *rms_resid, /**< root-mean-square of residual error	*/
+	int *ok		/**< 1: >10% reduction in rms_resid; 0: not	*/
+);
+
+
+/*
+ * XTAX_BAND - carry out matrix-matrix-matrix multiplication for a symmetric
+ * band matrix A, C = X' A X, where X is N by J
+ */
+void xtAx_band( double **A, int bw, double **X, double **C, int N, int J );
+
+#endif /* PYFRAME_BAND_H */
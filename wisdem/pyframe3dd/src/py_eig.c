@@ -36,6 +36,7 @@
 #include "py_eig.h"
 #include "common.h"
 #include "py_HPGmatrix.h"
+#include "py_band.h"
 #include "HPGutil.h"
 #include "NRutil.h"
 
@@ -51,6 +52,10 @@ void eigsort ( double *e, double **v, int n, int m);
 
 int sturm ( double **K, double **M, int n, int m, double shift, double ws, int verbose );
 
+static int sturm_band ( double **K, double **M, int n, int bw, int m, double shift, double ws, int verbose );
+
+static void lanczos_ritz ( double *alpha, double *beta, double **T, double **Id, double *theta, double **S, int j );
+
 /*-----------------------------------------------------------------------------
 SUBSPACE - Find the lowest m eigen-values, w, and eigen-vectors, V, of the
 general eigen-problem  ...       K V = w M V using sub-space / Jacobi iteration
@@ -236,6 +241,446 @@ int subspace(
 }
 
 
+/*-----------------------------------------------------------------------------
+SUBSPACE_BAND - Find the lowest m eigen-values, w, and eigen-vectors, V, of the
+general eigen-problem  ...       K V = w M V using sub-space / Jacobi iteration
+where K and M are stored by their upper bands, with rows in the renumbered
+order of the coordinates, idx.  The trial vectors are chosen in the structural
+order, as in subspace(), so both find the same modes.  V is returned in the
+structural order.
+
+ Bathe, Finite Element Procecures in Engineering Analysis, Prentice Hall, 1982
+-----------------------------------------------------------------------------*/
+int subspace_band(
+	double **K, double **M,
+	int n, int bw,	/**< DoF and half-bandwidth		*/
+	int *idx,	/**< band row of each coordinate	*/
+	int m,		/**< number of required modes		*/
+	double *w, double **V,
+	double tol, double shift,
+	int *iter,	/**< sub-space iterations		*/
+	int *ok,	/**< Sturm check result			*/
+	int verbose
+){
+	double	**L, **Kb, **Mb, **Xb, **Qb, **Vb, *d, *u, *v, *x, *c, km, km_old,
+		error=1.0, w_old = 0.0;
+
+	int	i=0, j=0, k=0,
+		modes,
+		disp = 0,	/* display convergence info.	*/
+		*idm, *q, *r;
+	char	errMsg[MAXL];
+
+	if ( m > n ) {
+		sprintf(errMsg,"subspace_band: Number of eigen-values must be less than the problem dimension.\n Desired number of eigen-values=%d \n Dimension of the problem= %d \n", m, n);
+		errorMsg(errMsg);
+		return 32;
+	}
+
+	L  = dmatrix(1,n,0,bw);
+	d  = dvector(1,n);
+	u  = dvector(1,n);
+	v  = dvector(1,n);
+	x  = dvector(1,n);
+	c  = dvector(1,n);
+	Kb = dmatrix(1,m,1,m);
+	Mb = dmatrix(1,m,1,m);
+	Xb = dmatrix(1,n,1,m);
+	Qb = dmatrix(1,m,1,m);
+	Vb = dmatrix(1,n,1,m);
+	idm = ivector(1,m);
+	q  = ivector(1,n);
+	r  = ivector(1,n);
+
+	for (i=1; i<=n; i++) { q[i] = 1; r[i] = 0; }
+
+	for (i=1; i<=m; i++) {
+	 idm[i] = 0;
+	 for (j=i; j<=m; j++)
+	  Kb[i][j]=Kb[j][i] = Mb[i][j]=Mb[j][i] = Qb[i][j]=Qb[j][i] = 0.0;
+	}
+
+	for (i=1; i<=n; i++) for (j=1; j<=m; j++) Xb[i][j] = Vb[i][j] = 0.0;
+
+	modes = (int) ( (double)(0.5*m) > (double)(m-8.0) ? (int)(m/2.0) : m-8 );
+
+					/* shift eigen-values by this much */
+	for (i=1;i<=n;i++) for (k=0;k<=bw;k++) K[i][k] += shift*M[i][k];
+
+
+	ldl_dcmp_band_pm ( K, L, n, bw, u, v, v, c, q, r, 1, 0, ok ); /* L D L' */
+
+	for (i=1; i<=n; i++) {		/* in the structural order */
+		if ( M[idx[i]][0] <= 0.0 )  {
+		 sprintf(errMsg," subspace_band: M[%d][%d] = %e \n", i,i, M[idx[i]][0] );
+		 errorMsg(errMsg);
+		 return 32;
+		}
+		d[i] = K[idx[i]][0] / M[idx[i]][0];
+	}
+
+	km_old = 0.0;
+	for (k=1; k<=m; k++) {
+	    km = d[1];
+	    for (i=1; i<=n; i++) {
+		if ( km_old <= d[i] && d[i] <= km ) {
+			*ok = 1;
+			for (j=1; j<=k-1; j++) if ( i == idm[j] ) *ok = 0;
+			if (*ok) {
+				km = d[i];
+				idm[k] = i;
+			}
+		}
+	    }
+	    if ( idm[k] == 0 ) {
+			i = idm[1];
+			for ( j=1; j<k; j++ ) if ( i < idm[j] ) i = idm[j];
+			idm[k] = i+1;
+			km = d[i+1];
+	    }
+	    km_old = km;
+	}
+
+	for (k=1; k<=m; k++) {
+		Vb[idx[idm[k]]][k] = 1.0;
+		*ok = idm[k] % 6;
+		switch ( *ok ) {
+			case 1:	i =  1;	j =  2;	break;
+			case 2:	i = -1;	j =  1;	break;
+			case 3:	i = -1;	j = -2;	break;
+			case 4:	i =  1;	j =  2;	break;
+			case 5:	i = -1;	j =  1;	break;
+			case 0:	i = -1;	j = -2;	break;
+		}
+		Vb[idx[idm[k]+i]][k] = 0.2; Vb[idx[idm[k]+j]][k] = 0.2;
+	}
+
+	*iter = 0;
+	do { 					/* Begin sub-space iterations */
+
+		for (k=1; k<=m; k++) {		/* K Xb = M V	(12.10) */
+			for (i=1; i<=n; i++)	x[i] = Vb[i][k];
+			band_prod ( M, n, bw, x, v );
+			ldl_dcmp_band_pm ( K, L, n, bw, u, v, d, c, q, r, 0, 1, ok );
+
+                                        /* improve the solution iteratively */
+			if (disp) fprintf(stdout,"  RMS matrix error:");
+			error = *ok = 1;
+			do {
+				ldl_mprove_band_pm ( K, L, n, bw, u, v, d, c, q, r, &error, ok );
+				if (disp) fprintf(stdout,"%9.2e", error );
+			} while ( *ok );
+			if (disp) fprintf(stdout,"\n");
+
+			for (i=1; i<=n; i++)	Xb[i][k] = d[i];
+		}
+
+		xtAx_band ( K, bw, Xb, Kb, n,m );	/* Kb = Xb' K Xb (12.11) */
+		xtAx_band ( M, bw, Xb, Mb, n,m );	/* Mb = Xb' M Xb (12.12) */
+
+		jacobi ( Kb, Mb, w, Qb, m );		/* (12.13) */
+
+		prodAB ( Xb, Qb, Vb, n,m,m );		/* V = Xb Qb (12.14) */
+
+		eigsort ( w, Vb, n, m );
+
+		if (w[modes] == 0.0) {
+		 sprintf(errMsg," subspace_band: Zero frequency found! \n w[%d] = %e \n", modes, w[modes] );
+		 errorMsg(errMsg);
+		 return 32;
+		}
+		error = fabs( w[modes] - w_old ) / w[modes];
+
+		(*iter)++;
+		if (disp) fprintf(stdout," iter = %d  w[%d] = %f error = %e\n",
+						*iter, modes, w[modes], error );
+		w_old = w[modes];
+
+		if ( *iter > 2000 ) {
+		    sprintf(errMsg,"  subspace_band: Iteration limit exceeded\n rel. error = %e > %e\n", error, tol );
+		    errorMsg(errMsg);
+		    return 32;
+		}
+
+	} while	( error > tol );		/* End   sub-space iterations */
+
+
+	for (k=1; k<=m; k++) {			/* shift eigen-values */
+	    if ( w[k] > shift )	w[k] = w[k] - shift;
+	    else		w[k] = shift - w[k];
+	}
+
+	if ( verbose ) {
+		fprintf(stdout," %4d sub-space iterations,   error: %.4e \n", *iter, error );
+		for ( k=1; k<=m; k++ )
+			fprintf(stdout,"  mode: %2d\tDoF: %5d\t %9.4lf Hz\n",
+				k, idm[k], sqrt(w[k])/(2.0*PI) );
+	}
+
+	*ok = sturm_band ( K, M, n, bw, m, shift, w[modes]+tol, verbose );
+
+	for (i=1;i<=n;i++) for (k=0;k<=bw;k++) K[i][k] -= shift*M[i][k];
+
+	for (i=1; i<=n; i++)	/* mode shapes in the structural order */
+		for (k=1; k<=m; k++)	V[i][k] = Vb[idx[i]][k];
+
+	free_dmatrix(L,1,n,0,bw);
+	free_dvector(d,1,n);
+	free_dvector(u,1,n);
+	free_dvector(v,1,n);
+	free_dvector(x,1,n);
+	free_dvector(c,1,n);
+	free_dmatrix(Kb,1,m,1,m);
+	free_dmatrix(Mb,1,m,1,m);
+	free_dmatrix(Xb,1,n,1,m);
+	free_dmatrix(Qb,1,m,1,m);
+	free_dmatrix(Vb,1,n,1,m);
+	free_ivector(idm,1,m);
+	free_ivector(q,1,n);
+	free_ivector(r,1,n);
+
+	return 0;
+}
+
+
+/*-----------------------------------------------------------------------------
+LANCZOS_BAND - Find the lowest m eigen-values, w, and eigen-vectors, V, of the
+general eigen-problem  K V = w M V  using shift-invert Lanczos iteration,
+with K and M stored by their upper bands, as in py_band.h.
+
+The Lanczos vectors of the operator inv(K) M are kept M-orthogonal by full
+re-orthogonalization.  Converged Ritz vectors are locked, and the Lanczos
+iteration restarts from a new starting vector, M-orthogonal to the locked
+vectors, until m modes are locked and a Sturm check finds no missing modes
+below them, e.g. the second of a pair of repeated frequencies.
+-----------------------------------------------------------------------------*/
+int lanczos_band(
+	double **K, double **M,
+	int n, int bw,	/**< DoF and half-bandwidth		*/
+	int *idx,	/**< band row of each coordinate	*/
+	int m,		/**< number of required modes		*/
+	double *w, double **V,
+	double tol, double shift,
+	int *iter,	/**< Lanczos steps			*/
+	int *ok,	/**< Sturm check result			*/
+	int verbose
+){
+	double	**L, **Q, **MQ, **Y, **MY, **T, **Id, **S, *alpha, *beta,
+		*theta, *wl, *wl_sort, *dd, *b, *x, *c, *u,
+		error, s, ws, tol_r;
+
+	int	i=0, j=0, k=0, l=0, pass,
+		p,		/* maximum Lanczos steps per restart	*/
+		nY = 0,		/* number of locked Ritz vectors	*/
+		nL,		/* number of Lanczos steps this restart	*/
+		want = m,	/* number of modes still wanted		*/
+		found, restart = 0, converged, status = 0,
+		*q, *r;
+	unsigned int seed = 1;
+	char	errMsg[MAXL];
+
+	if ( m > n ) {
+		sprintf(errMsg,"lanczos_band: Number of eigen-values must be less than the problem dimension.\n Desired number of eigen-values=%d \n Dimension of the problem= %d \n", m, n);
+		errorMsg(errMsg);
+		return 32;
+	}
+
+	p = m + ( m > 20 ? m : 20 );
+	if ( p > n ) p = n;
+	tol_r = tol > 1e-10 ? tol : 1e-10;	/* attainable residual	*/
+
+	L  = dmatrix(1,n,0,bw);
+	Q  = dmatrix(1,n,1,p);
+	MQ = dmatrix(1,n,1,p);
+	Y  = dmatrix(1,n,1,m+p);
+	MY = dmatrix(1,n,1,m+p);
+	T  = dmatrix(1,p,1,p);
+	Id = dmatrix(1,p,1,p);
+	S  = dmatrix(1,p,1,p);
+	alpha = dvector(1,p);
+	beta  = dvector(0,p);
+	theta = dvector(1,p);
+	wl = dvector(1,m+p);
+	wl_sort = dvector(1,m+p);
+	dd = dvector(1,n);
+	b  = dvector(1,n);
+	x  = dvector(1,n);
+	c  = dvector(1,n);
+	u  = dvector(1,n);
+	q  = ivector(1,n);
+	r  = ivector(1,n);
+
+	for (i=1; i<=n; i++) { q[i] = 1; r[i] = 0; }
+
+					/* shift eigen-values by this much */
+	for (i=1;i<=n;i++) for (k=0;k<=bw;k++) K[i][k] += shift*M[i][k];
+
+	ldl_dcmp_band_pm ( K, L, n, bw, dd, b, x, c, q, r, 1, 0, ok ); /* L D L' */
+
+	*iter = 0;
+	while ( want > 0 ) {
+
+		if ( ++restart > 2*m+10 || nY + want > m+p ) {
+			sprintf(errMsg,"  lanczos_band: Restart limit exceeded\n %d of %d modes converged\n", nY, m );
+			errorMsg(errMsg);
+			status = 32;
+			goto cleanup;
+		}
+
+		/* a pseudo-random starting vector, M-orthogonal to the locked vectors */
+		for (i=1; i<=n; i++) {
+			seed = seed*1103515245u + 12345u;
+			x[i] = ((seed >> 16) & 0x7fff) / 16384.0 - 1.0;
+		}
+		for (pass=0; pass<2; pass++)
+			for (l=1; l<=nY; l++) {
+				for (s=0.0, i=1; i<=n; i++)	s += x[i]*MY[i][l];
+				for (i=1; i<=n; i++)	x[i] -= s*Y[i][l];
+			}
+		band_prod ( M, n, bw, x, u );
+		for (s=0.0, i=1; i<=n; i++)	s += x[i]*u[i];
+		beta[0] = sqrt(s);
+
+		nL = 0;
+		converged = 0;
+		for (j=1; j<=p && nY+j<=n; j++) {	/* Lanczos steps */
+
+			for (i=1; i<=n; i++)	Q[i][j] = x[i] / beta[j-1];
+			for (i=1; i<=n; i++)	x[i] = Q[i][j];
+			band_prod ( M, n, bw, x, b );
+			for (i=1; i<=n; i++)	MQ[i][j] = b[i];
+
+			/* (K + shift M) x = M q_j */
+			ldl_dcmp_band_pm ( K, L, n, bw, dd, b, x, c, q, r, 0, 1, ok );
+			error = *ok = 1;
+			do {
+				ldl_mprove_band_pm ( K, L, n, bw, dd, b, x, c, q, r, &error, ok );
+			} while ( *ok );
+			(*iter)++;
+
+			for (alpha[j]=0.0, i=1; i<=n; i++)	alpha[j] += x[i]*MQ[i][j];
+
+			/* full M-re-orthogonalization, twice is enough */
+			for (pass=0; pass<2; pass++) {
+				for (l=1; l<=j; l++) {
+					for (s=0.0, i=1; i<=n; i++)	s += x[i]*MQ[i][l];
+					for (i=1; i<=n; i++)	x[i] -= s*Q[i][l];
+				}
+				for (l=1; l<=nY; l++) {
+					for (s=0.0, i=1; i<=n; i++)	s += x[i]*MY[i][l];
+					for (i=1; i<=n; i++)	x[i] -= s*Y[i][l];
+				}
+			}
+			band_prod ( M, n, bw, x, u );
+			for (s=0.0, i=1; i<=n; i++)	s += x[i]*u[i];
+			beta[j] = sqrt(s);
+			nL = j;
+
+			if ( beta[j] <= 1e-14 * fabs(alpha[j]) ) break; /* invariant subspace */
+
+			if ( j >= want && ( j % 4 == 0 || j == p ) ) {
+				lanczos_ritz ( alpha, beta, T, Id, theta, S, j );
+				for (converged=0, k=j; k>j-want; k--)
+					if ( fabs(beta[j]*S[j][k]) <= tol_r*theta[k] )	converged++;
+				if ( converged == want ) break;
+			}
+		}
+
+		/* lock the converged Ritz vectors, y = Q s */
+		lanczos_ritz ( alpha, beta, T, Id, theta, S, nL );
+		for (found=0, k=nL; k>=1 && nY<m+p; k--) {
+			if ( theta[k] <= 0.0 ) continue;
+			if ( fabs(beta[nL]*S[nL][k]) > tol_r*theta[k] &&
+			     beta[nL] > 1e-14 * fabs(alpha[nL]) )	continue;
+			nY++;
+			found++;
+			for (i=1; i<=n; i++)
+				for (Y[i][nY]=MY[i][nY]=0.0, l=1; l<=nL; l++) {
+					Y[i][nY]  += Q[i][l] * S[l][k];
+					MY[i][nY] += MQ[i][l] * S[l][k];
+				}
+			wl[nY] = 1.0/theta[k] - shift;
+		}
+
+		if ( nY < m ) {
+			want = m - nY;
+			continue;
+		}
+
+		/* Sturm check for modes missed below the m-th locked mode */
+		for (k=1; k<=nY; k++)	wl_sort[k] = wl[k];
+		eigsort ( wl_sort, Y, 0, nY );	/* sorts the values only */
+		ws = wl_sort[m] + 1e-6*fabs(wl_sort[m]) + tol;
+		*ok = sturm_band ( K, M, n, bw, m, shift, ws, 0 );
+		for (found=0, k=1; k<=nY; k++)	if ( wl[k] <= ws )	found++;
+		want = -(*ok) - found;
+		if (want > 0 && verbose)
+			fprintf(stdout," lanczos_band: %d modes below %f Hz missed, restarting\n", want, sqrt(fabs(ws))/(2.0*PI) );
+	}
+
+	for (k=1; k<=nY; k++)	wl_sort[k] = fabs(wl[k]);	/* as in subspace */
+	for (k=1; k<=nY; k++)	wl[k] = wl_sort[k];
+	eigsort ( wl, Y, n, nY );
+
+	if ( verbose ) {
+		fprintf(stdout," %4d Lanczos steps, %d restarts \n", *iter, restart );
+		for ( k=1; k<=m; k++ )
+			fprintf(stdout,"  mode: %2d\t %9.4lf Hz\n", k, sqrt(wl[k])/(2.0*PI) );
+	}
+
+	for (k=1; k<=m; k++)	w[k] = wl[k];
+	for (i=1; i<=n; i++)	/* mode shapes in the structural order */
+		for (k=1; k<=m; k++)	V[i][k] = Y[idx[i]][k];
+
+cleanup:		/* K is left unshifted on every exit path */
+	for (i=1;i<=n;i++) for (k=0;k<=bw;k++) K[i][k] -= shift*M[i][k];
+
+	free_dmatrix(L,1,n,0,bw);
+	free_dmatrix(Q,1,n,1,p);
+	free_dmatrix(MQ,1,n,1,p);
+	free_dmatrix(Y,1,n,1,m+p);
+	free_dmatrix(MY,1,n,1,m+p);
+	free_dmatrix(T,1,p,1,p);
+	free_dmatrix(Id,1,p,1,p);
+	free_dmatrix(S,1,p,1,p);
+	free_dvector(alpha,1,p);
+	free_dvector(beta,0,p);
+	free_dvector(theta,1,p);
+	free_dvector(wl,1,m+p);
+	free_dvector(wl_sort,1,m+p);
+	free_dvector(dd,1,n);
+	free_dvector(b,1,n);
+	free_dvector(x,1,n);
+	free_dvector(c,1,n);
+	free_dvector(u,1,n);
+	free_ivector(q,1,n);
+	free_ivector(r,1,n);
+
+	return status;
+}
+
+
+/*
+ * LANCZOS_RITZ - eigen-values theta[1..j], in ascending order, and
+ * eigen-vectors S of the j by j Lanczos tri-diagonal matrix
+ */
+static void lanczos_ritz(
+	double *alpha, double *beta, double **T, double **Id,
+	double *theta, double **S, int j
+){
+	int	i, k;
+
+	for (i=1; i<=j; i++) for (k=1; k<=j; k++)	T[i][k] = Id[i][k] = 0.0;
+	for (i=1; i<=j; i++) {
+		T[i][i] = alpha[i];
+		Id[i][i] = 1.0;
+		if ( i < j )	T[i][i+1] = T[i+1][i] = beta[i];
+	}
+	jacobi ( T, Id, theta, S, j );
+	eigsort ( theta, S, j, j );
+}
+
+
 /*-----------------------------------------------------------------------------
  JACOBI - Find all eigen-values, E, and eigen-vectors, V,
  of the general eigen-problem  K V = E M V
@@ -598,6 +1043,54 @@ int sturm(
 }
 
 
+/*-----------------------------------------------------------------------------
+STURM_BAND  -  Determine the number of eigenvalues, w, of the general
+  eigen-problem K V = w M V which are below the value ws, as sturm(), with K
+  and M stored by their upper bands.
+-----------------------------------------------------------------------------*/
+static int sturm_band(
+	double **K, double **M, int n, int bw, int m,
+	double shift, double ws, int verbose
+){
+	double	ws_shift, **T, **L, *d;
+	int	ok=0, i, k, modes, *q, *r;
+
+	T  = dmatrix(1,n,0,bw);
+	L  = dmatrix(1,n,0,bw);
+	d  = dvector(1,n);
+	q  = ivector(1,n);
+	r  = ivector(1,n);
+
+	for (i=1; i<=n; i++) { q[i] = 1; r[i] = 0; }
+
+	modes = (int) ( (float)(0.5*m) > (float)(m-8.0) ? (int)(m/2.0) : m-8 );
+
+	ws_shift = ws + shift;			/* shift [K]	*/
+	for (i=1; i<=n; i++) for (k=0; k<=bw; k++) T[i][k] = K[i][k] - ws_shift*M[i][k];
+
+	ldl_dcmp_band_pm ( T, L, n, bw, d, d, d, d, q, r, 1, 0, &ok );
+
+	if ( verbose )
+	 fprintf(stdout,"  There are %d modes below %f Hz.", -ok, sqrt(ws)/(2.0*PI) );
+
+	if (( -ok > modes ) && (verbose)){
+		fprintf(stderr," ... %d modes were not found.\n", -ok-modes );
+		fprintf(stderr," Try increasing the number of modes in \n");
+		fprintf(stderr," order to get the missing modes below %f Hz.\n",
+							sqrt(ws)/(2.0*PI) );
+	} else if ( verbose )
+		fprintf(stdout,"  All %d modes were found.\n",modes);
+
+	free_dmatrix(T,1,n,0,bw);
+	free_dmatrix(L,1,n,0,bw);
+	free_dvector(d,1,n);
+	free_ivector(q,1,n);
+	free_ivector(r,1,n);
+
+	return ok;
+}
+
+
 /*----------------------------------------------------------------------------
 CHECK_NON_NEGATIVE -  checks that a value is non-negative
 -----------------------------------------------------------------------------*/
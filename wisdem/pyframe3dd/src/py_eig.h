@@ -49,6 +49,55 @@ int subspace(
 );
 
 
+/**
+	Find the lowest m eigenvalues, w, and eigenvectors, V, of the
+	general eigenproblem, K V = w M V, using sub-space / Jacobi iteration,
+	with K and M stored by their upper bands, as in py_band.h.
+
+	@param K is the band of an n by n symmetric real (stiffness) matrix
+	@param M is the band of an n by n symmetric positive definate real (mass) matrix
+	@param idx is the band row of each structural coordinate
+	@param V is a rectangular matrix of eigen-vectors, in structural order
+*/
+int subspace_band(
+	double **K, double **M,	/**< stiffness and mass band matrices	*/
+	int n, int bw,		/**< DoF and half-bandwidth		*/
+	int *idx,		/**< band row of each coordinate	*/
+	int m,			/**< number of required modes		*/
+	double *w, double **V,	/**< modal frequencies and mode shapes	*/
+	double tol,		/**< covergence tolerence		*/
+	double shift,		/**< frequency shift for unrestrained frames */
+	int *iter,		/**< number of sub-space iterations	*/
+	int *ok,		/**< Sturm check result			*/
+	int verbose		/**< 1: copious screen output, 0: none	*/
+);
+
+
+/**
+	Find the lowest m eigenvalues, w, and eigenvectors, V, of the
+	general eigenproblem, K V = w M V, using shift-invert Lanczos iteration
+	with full re-orthogonalization, locking and restarts,
+	with K and M stored by their upper bands, as in py_band.h.
+
+	@param K is the band of an n by n symmetric real (stiffness) matrix
+	@param M is the band of an n by n symmetric positive definate real (mass) matrix
+	@param idx is the band row of each structural coordinate
+	@param V is a rectangular matrix of eigen-vectors, in structural order
+*/
+int lanczos_band(
+	double **K, double **M,	/**< stiffness and mass band matrices	*/
+	int n, int bw,		/**< DoF and half-bandwidth		*/
+	int *idx,		/**< band row of each coordinate	*/
+	int m,			/**< number of required modes		*/
+	double *w, double **V,	/**< modal frequencies and mode shapes	*/
+	double tol,		/**< covergence tolerence		*/
+	double shift,		/**< frequency shift for unrestrained frames */
+	int *iter,		/**< number of Lanczos steps		*/
+	int *ok,		/**< Sturm check result			*/
+	int verbose		/**< 1: copious screen output, 0: none	*/
+);
+
+
 /**
 	carry out matrix-matrix-matrix multiplication for symmetric A
 	C = X' A X     C is J by J	X is N by J	A is N by N
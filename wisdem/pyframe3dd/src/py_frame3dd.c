@@ -31,6 +31,7 @@
 #include "coordtrans.h"
 #include "py_eig.h"
 #include "py_HPGmatrix.h"
+#include "py_band.h"
 #include "NRutil.h"
 
 
@@ -98,7 +99,6 @@ void assemble_K(
 		){
 	double	**k;		/* element stiffness matrix in global coord */
 	int	**ind,		/* member-structure DoF index table	*/
-		res=0,
 		i, j, ii, jj, l, ll;
 	char	stiffness_fn[FILENMAX];
 
@@ -129,7 +129,7 @@ void assemble_K(
                            E[i],G[i], p[i], -Q[i][1], shear);
 
 		if (debug) {
-			res = sprintf(stiffness_fn,"k_%03d",i);
+			sprintf(stiffness_fn,"k_%03d",i);
 			save_dmatrix(stiffness_fn,k,1,12,1,12,0, "w");
 		}
 
@@ -158,6 +158,70 @@ void assemble_K(
 }
 
 
+/*
+ * ASSEMBLE_K_BAND  -  assemble the upper band of the global stiffness matrix,
+ * with rows in the renumbered order idx, see py_band.h
+ */
+void assemble_K_band(
+	double **K,
+	int DoF, int bw, int *idx, int nE, int nN,
+	vec3 *xyz, float *r, double *L, double *Le,
+	int *N1, int *N2,
+	float *Ax, float *Asy, float *Asz,
+	float *Jx, float *Iy, float *Iz,
+	float *E, float *G, float *p,
+	int shear, int geom, double **Q, int debug,
+	float *EKx, float *EKy, float *EKz,
+	float *EKtx, float *EKty, float *EKtz
+		){
+	double	**k;		/* element stiffness matrix in global coord */
+	int	ind[13],	/* member-structure DoF index table	*/
+		i, j, ii, jj, l, ll;
+
+	band_zero ( K, DoF, bw );
+
+	k   =  dmatrix(1,12,1,12);
+
+	for ( i = 1; i <= nE; i++ ) {
+
+		for ( l=1; l <= 6; l++ ) {
+			ind[l]   = idx[6*N1[i] - 6 + l];
+			ind[l+6] = idx[6*N2[i] - 6 + l];
+		}
+
+		elastic_K ( k, xyz, r, L[i], Le[i], N1[i], N2[i],
+		Ax[i],Asy[i],Asz[i], Jx[i],Iy[i],Iz[i], E[i],G[i], p[i], shear);
+
+		if (geom)
+		 geometric_K( k, xyz, r, L[i], Le[i], N1[i], N2[i],
+		           Ax[i], Asy[i],Asz[i],
+                           Jx[i], Iy[i], Iz[i],
+                           E[i],G[i], p[i], -Q[i][1], shear);
+
+		for ( l=1; l <= 12; l++ ) {
+			ii = ind[l];
+			for ( ll=1; ll <= 12; ll++ ) {
+				jj = ind[ll];
+				if ( ii <= jj )	K[ii][jj-ii] += k[l][ll];
+			}
+		}
+	}
+
+	for ( j = 1; j <= nN; j++ ) {		// add extra stiffness
+	  i = 6*(j-1);
+	  K[idx[i+1]][0] += EKx[j];
+	  K[idx[i+2]][0] += EKy[j];
+	  K[idx[i+3]][0] += EKz[j];
+	  K[idx[i+4]][0] += EKtx[j];
+	  K[idx[i+5]][0] += EKty[j];
+	  K[idx[i+6]][0] += EKtz[j];
+	}
+
+	free_dmatrix ( k,1,12,1,12);
+	return;
+}
+
+
 /*
  * ELASTIC_K - space frame elastic stiffness matrix in global coordnates	22oct02
  */
@@ -361,20 +425,20 @@ int	r;
 /*
  * SOLVE_SYSTEM  -  solve {F} =   [K]{D} via L D L' decomposition        27dec01
  * Prescribed displacements are "mechanical loads" not "temperature loads"
+ * If reduce is 0, K and diag hold the decomposition from an earlier call,
+ * and only the back-substitution and improvement are carried out.
  */
 void solve_system(
-	double **K, double *D, double *F, double *R, int DoF, int *q, int *r,
+	double **K, double *diag, int reduce,
+	double *D, double *F, double *R, int DoF, int *q, int *r,
 	int *ok, int verbose, double *rms_resid
 ){
-	double	*diag;		/* diagonal vector of the L D L' decomp. */
-
 	verbose = 0;		/* suppress verbose output		*/
 
-	diag = dvector ( 1, DoF );
-
 	/*  L D L' decomposition of K[q,q] into lower triangle of K[q,q] and diag[q] */
 	/*  vectors F and D are unchanged */
-	ldl_dcmp_pm ( K, DoF, diag, F, D, R, q,r, 1, 0, ok );
+	if ( reduce )
+		ldl_dcmp_pm ( K, DoF, diag, F, D, R, q,r, 1, 0, ok );
 	if ( *ok < 0 ) {
 	  //fprintf(stderr," Make sure that all six");
 	  //fprintf(stderr," rigid body translations are restrained!\n");
@@ -389,8 +453,54 @@ void solve_system(
 		} while ( *ok );
 	        if ( verbose ) fprintf(stdout,"\n");
 	}
+}
+
+
+/*
+ * SOLVE_SYSTEM_BAND  -  solve {F} =   [K]{D} via L D L' decomposition, as
+ * solve_system(), with [K] stored by its upper band in the renumbered order
+ * idx.  The lower band matrix [L] is the work space of the decomposition.
+ */
+void solve_system_band(
+	double **K, double **L, double *diag, int reduce, int bw, int *idx,
+	double *D, double *F, double *R, int DoF, int *q, int *r,
+	int *ok, int verbose, double *rms_resid
+){
+	double	*Db, *Fb, *Rb;	/* D, F, and R in the renumbered order	*/
+	int	*qb, *rb, i;	/* q and r in the renumbered order	*/
+
+	verbose = 0;		/* suppress verbose output		*/
+
+	Db = dvector ( 1, DoF );
+	Fb = dvector ( 1, DoF );
+	Rb = dvector ( 1, DoF );
+	qb = ivector ( 1, DoF );
+	rb = ivector ( 1, DoF );
+
+	band_permute ( D, Db, idx, DoF, 0 );
+	band_permute ( F, Fb, idx, DoF, 0 );
+	band_permute ( R, Rb, idx, DoF, 0 );
+	for (i=1; i<=DoF; i++) { qb[idx[i]] = q[i]; rb[idx[i]] = r[i]; }
+
+	/*  L D L' decomposition of K[q,q] into L[q,q] and diag[q] */
+	if ( reduce )
+		ldl_dcmp_band_pm ( K, L, DoF, bw, diag, Fb, Db, Rb, qb,rb, 1, 0, ok );
+	if ( *ok >= 0 ) {	/* LDL'  back-substitution for D[q] and R[r] */
+		ldl_dcmp_band_pm ( K, L, DoF, bw, diag, Fb,Db,Rb, qb,rb, 0, 1, ok );
+		*rms_resid = *ok = 1;
+		do {	/* improve solution for D[q] and R[r] */
+			ldl_mprove_band_pm ( K, L, DoF, bw, diag, Fb,Db,Rb, qb,rb, rms_resid,ok);
+		} while ( *ok );
+
+		band_permute ( D, Db, idx, DoF, 1 );
+		band_permute ( R, Rb, idx, DoF, 1 );
+	}
 
-	free_dvector( diag, 1, DoF );
+	free_dvector( Db, 1, DoF );
+	free_dvector( Fb, 1, DoF );
+	free_dvector( Rb, 1, DoF );
+	free_ivector( qb, 1, DoF );
+	free_ivector( rb, 1, DoF );
 }
 
 
@@ -431,6 +541,40 @@ double equilibrium_error( double *dF, double *F, double **K, double *D, int DoF,
 }
 
 
+/*
+ * EQUILIBRIUM_ERROR_BAND - compute {dF_q} = {F_q} - [K_qq]{D_q} - [K_qr]{D_r}
+ * as equilibrium_error(), with [K] stored by its upper band in the
+ * renumbered order idx, and return ||dF||/||F||
+ */
+double equilibrium_error_band( double *dF, double *F, double **K, int bw, int *idx, double *D, int DoF, int *q, int *r )
+{
+	double	ss_dF = 0.0,	//  sum of squares of dF
+		ss_F  = 0.0,	//  sum of squares of F
+		*Db, *KD;
+	int	i;
+
+	Db = dvector(1,DoF);
+	KD = dvector(1,DoF);
+
+	band_permute ( D, Db, idx, DoF, 0 );
+	band_prod ( K, DoF, bw, Db, KD );
+
+	// compute equilibrium error at free coord's (q)
+	for (i=1; i<=DoF; i++) {
+		dF[i] = 0.0;
+		if (q[i])	dF[i] = F[i] - KD[idx[i]];
+	}
+
+	for (i=1; i<=DoF; i++) if (q[i]) ss_dF += ( dF[i] * dF[i] );
+	for (i=1; i<=DoF; i++) if (q[i]) ss_F  += (  F[i] *  F[i] );
+
+	free_dvector(Db,1,DoF);
+	free_dvector(KD,1,DoF);
+
+	return ( sqrt(ss_dF) / sqrt(ss_F) );	// convergence criterion
+}
+
+
 /*
  * ELEMENT_END_FORCES  -  evaluate the end forces for all elements
  * 23feb94
@@ -684,6 +828,33 @@ void compute_reaction_forces(
 }
 
 
+/*
+ * COMPUTE_REACTION_FORCES_BAND : R(r) = [K(r,q)]*{D(q)} + [K(r,r)]*{D(r)} - F(r)
+ * as compute_reaction_forces(), with [K] stored by its upper band in the
+ * renumbered order idx
+ */
+void compute_reaction_forces_band(
+	 double *R, double *F, double **K, int bw, int *idx, double *D, int DoF, int *r
+){
+	double	*Db, *KD;
+	int	i;
+
+	Db = dvector(1,DoF);
+	KD = dvector(1,DoF);
+
+	band_permute ( D, Db, idx, DoF, 0 );
+	band_prod ( K, DoF, bw, Db, KD );
+
+	for (i=1; i<=DoF; i++) {
+		R[i] = 0;
+		if (r[i])	R[i] = KD[idx[i]] - F[i];
+	}
+
+	free_dvector(Db,1,DoF);
+	free_dvector(KD,1,DoF);
+}
+
+
 /*
  * ASSEMBLE_M  -  assemble global mass matrix from element mass & inertia  24nov98
  */
@@ -700,7 +871,6 @@ void assemble_M(
 		**dmatrix();
 	int     **ind,	  /* member-structure DoF index table     */
 		**imatrix(),
-		res=0,
 		i, j, ii, jj, l, ll;
 	char	mass_fn[FILENMAX];
 
@@ -727,7 +897,7 @@ void assemble_M(
 				Ax[i], Jx[i], Iy[i], Iz[i], p[i], d[i], EMs[i]);
 
 		if (debug) {
-			res = sprintf(mass_fn,"m_%03d",i);
+			sprintf(mass_fn,"m_%03d",i);
 			save_dmatrix(mass_fn, m, 1,12, 1,12, 0, "w");
 		}
 
@@ -761,6 +931,68 @@ void assemble_M(
 }
 
 
+/*
+ * ASSEMBLE_M_BAND  -  assemble the upper band of the global mass matrix,
+ * with rows in the renumbered order idx, see py_band.h
+ */
+void assemble_M_band(
+	double **M, int DoF, int bw, int *idx, int nN, int nE,
+	vec3 *xyz, float *r, double *L,
+	int *N1, int *N2,
+	float *Ax, float *Jx, float *Iy, float *Iz, float *p,
+	float *d, float *EMs,
+	float *NMs, float *NMx, float *NMy, float *NMz,
+	int lump, int debug
+){
+	double  **m;	    /* element mass matrix in global coord */
+	int     ind[13],  /* member-structure DoF index table     */
+		i, j, ii, jj, l, ll;
+
+	band_zero ( M, DoF, bw );
+
+	m      = dmatrix(1,12,1,12);
+
+	for ( i = 1; i <= nE; i++ ) {
+
+		for ( l=1; l <= 6; l++ ) {
+			ind[l]   = idx[6*N1[i] - 6 + l];
+			ind[l+6] = idx[6*N2[i] - 6 + l];
+		}
+
+		if ( lump )	lumped_M ( m, xyz, L[i], N1[i], N2[i],
+				Ax[i], Jx[i], Iy[i], Iz[i], p[i], d[i], EMs[i]);
+		else		consistent_M ( m, xyz,r,L[i], N1[i], N2[i],
+				Ax[i], Jx[i], Iy[i], Iz[i], p[i], d[i], EMs[i]);
+
+		for ( l=1; l <= 12; l++ ) {
+			ii = ind[l];
+			for ( ll=1; ll <= 12; ll++ ) {
+				jj = ind[ll];
+				if ( ii <= jj )	M[ii][jj-ii] += m[l][ll];
+			}
+		}
+	}
+
+	for ( j = 1; j <= nN; j++ ) {		// add extra node mass
+		i = 6*(j-1);
+		M[idx[i+1]][0] += NMs[j];
+		M[idx[i+2]][0] += NMs[j];
+		M[idx[i+3]][0] += NMs[j];
+		M[idx[i+4]][0] += NMx[j];
+		M[idx[i+5]][0] += NMy[j];
+		M[idx[i+6]][0] += NMz[j];
+	}
+
+	for (i=1; i<= DoF; i++) {
+		if ( M[idx[i]][0] <= 0.0 ) {
+			fprintf(stderr,"  error: Non pos-def mass matrix\n");
+			fprintf(stderr,"  M[%d][%d] = %lf\n", i,i, M[idx[i]][0] );
+		}
+	}
+	free_dmatrix ( m, 1,12,1,12);
+}
+
+
 /*
  * LUMPED_M  -  space frame element lumped mass matrix in global coordnates 7apr94
  */
@@ -1154,7 +1386,7 @@ void deallocate(
 	free_dvector(dF,1,DoF);
 
 // printf("..H.. K & Q\n"); /* debug */
-	free_dmatrix(K,1,DoF,1,DoF);
+	if ( K )	free_dmatrix(K,1,DoF,1,DoF);	/* NULL if banded */
 	free_dmatrix(Q,1,nE,1,12);
 
 // printf("..I.. D  dD R dR \n"); /* debug */
@@ -1198,7 +1430,7 @@ void deallocate(
 
 // printf("..L.. M f V\n"); /* debug */
 	if ( nM > 0 ) {
-		free_dmatrix(M,1,DoF,1,DoF);
+		if ( M )	free_dmatrix(M,1,DoF,1,DoF);
 		free_dvector(f,1,nM);
 		free_dmatrix(V,1,DoF,1,DoF);
 	}
@@ -57,9 +57,56 @@ void assemble_K(
 		);
 
 
+/** form the upper band of the global stiffness matrix, see py_band.h */
+void assemble_K_band(
+	double **K,		/**< stiffness matrix, upper band	*/
+	int DoF,		/**< number of degrees of freedom	*/
+	int bw,			/**< half-bandwidth of the matrix	*/
+	int *idx,		/**< band row of each coordinate	*/
+	int nE,			/**< number of frame elements		*/
+	int nN,			/**< number of frame nodes		*/
+	vec3 *xyz,		/**< XYZ locations of every node	*/
+	float *r,		/**< rigid radius of every node	*/
+	double *L, double *Le,	/**< length of each frame element, effective */
+	int *N1, int *N2,	/**< node connectivity			*/
+	float *Ax, float *Asy, float *Asz,	/**< section areas	*/
+	float *Jx, float *Iy, float *Iz,	/**< section inertias	*/
+	float *E, float *G,	/**< elastic and shear moduli		*/
+	float *p,		/**< roll angle, radians		*/
+	int shear,		/**< 1: include shear deformation, 0: don't */
+	int geom,		/**< 1: include goemetric stiffness, 0: don't */
+	double **Q,		/**< frame element end forces		*/
+	int debug,		/**< 1: write element stiffness matrices*/
+	float *EKx, float *EKy, float *EKz,  // extra nodal stiffness
+	float *EKtx, float *EKty, float *EKtz
+		);
+
+
 /** solve {F} =   [K]{D} via L D L' decomposition */
 void solve_system(
 	double **K,	/**< stiffness matrix for the restrained frame	*/
+	double *diag,	/**< diagonal of D in the L D L' decomposition	*/
+	int reduce,	/**< 1: decompose K; 0: K and diag are decomposed */
+	double *D,	/**< displacement vector to be solved		*/
+	double *F,	/**< external load vector			*/
+	double *R,	/**< reaction vector				*/
+	int DoF,	/**< number of degrees of freedom		*/
+	int *q,		/**< 1: not a reaction; 0: a reaction coordinate */
+	int *r,		/**< 0: not a reaction; 1: a reaction coordinate */
+	int *ok,	/**< indicates positive definite stiffness matrix */
+	int verbose,	/**< 1: copious screen output; 0: none		*/
+	double *rms_resid /**< the RMS error of the solution residual */
+);
+
+
+/** solve {F} =   [K]{D} via L D L' decomposition of the band of [K] */
+void solve_system_band(
+	double **K,	/**< stiffness matrix, upper band		*/
+	double **L,	/**< work space for the L D L' decomposition	*/
+	double *diag,	/**< diagonal of D in the L D L' decomposition	*/
+	int reduce,	/**< 1: decompose K; 0: K, L and diag are decomposed */
+	int bw,		/**< half-bandwidth of the matrix		*/
+	int *idx,	/**< band row of each coordinate		*/
 	double *D,	/**< displacement vector to be solved		*/
 	double *F,	/**< external load vector			*/
 	double *R,	/**< reaction vector				*/
@@ -87,6 +134,19 @@ void compute_reaction_forces(
 );
 
 
+/** reaction forces, as compute_reaction_forces(), for the band of [K] */
+void compute_reaction_forces_band(
+	double *R, 	/**< computed reaction forces			*/
+	double *F,	/**< vector of equivalent external loads	*/
+	double **K,	/**< stiffness matrix, upper band		*/
+	int bw,		/**< half-bandwidth of the matrix		*/
+	int *idx,	/**< band row of each coordinate		*/
+	double *D,	/**< displacement vector for the solved system	*/
+	int DoF,	/**< number of structural coordinates		*/
+	int *r		/**< 0: not a reaction; 1: a reaction coordinate */
+);
+
+
 /* add_feF :  add fixed end forces to internal element forces
  * removed reaction calculations on 2014-05-14
  *
@@ -121,6 +181,20 @@ double equilibrium_error(
 );
 
 
+/** equilibrium error, as equilibrium_error(), for the band of [K] */
+double equilibrium_error_band(
+	double *dF,	/**< equilibrium error  {dF} = {F} - [K]{D}	*/
+	double *F,	/**< load vector                                */
+	double **K,	/**< stiffness matrix, upper band		*/
+	int bw,		/**< half-bandwidth of the matrix		*/
+	int *idx,	/**< band row of each coordinate		*/
+	double *D,	/**< displacement vector to be solved           */
+	int DoF,	/**< number of degrees of freedom               */
+	int *q,		/**< 1: not a reaction; 0: a reaction coordinate */
+	int *r		/**< 0: not a reaction; 1: a reaction coordinate */
+);
+
+
 /** evaluate the member end forces for every member */
 void element_end_forces(
 	double **Q,	/**< frame element end forces			*/
@@ -163,6 +237,29 @@ void assemble_M(
 );
 
 
+/** assemble the upper band of the global mass matrix, see py_band.h */
+void assemble_M_band(
+	double **M,	/**< mass matrix, upper band			*/
+	int DoF,	/**< number of degrees of freedom		*/
+	int bw,		/**< half-bandwidth of the matrix		*/
+	int *idx,	/**< band row of each coordinate		*/
+	int nN, int nE,	/**< number of nodes, number of frame elements	*/
+	vec3 *xyz,	/** XYZ locations of each node			*/
+	float *r,	/**< rigid radius of every node		*/
+	double *L,	/**< length of each frame element, effective	*/
+	int *N1, int *N2, /**< node connectivity			*/
+	float *Ax,	/**< node connectivity				*/
+	float *Jx, float *Iy, float *Iz,	/**< section area inertias*/
+	float *p,	/**< roll angle, radians			*/
+	float *d,	/**< frame element density			*/
+	float *EMs,	/**< extra frame element mass			*/
+	float *NMs,	/**< node mass					*/
+	float *NMx, float *NMy, float *NMz,	/**< node inertias	*/
+	int lump,	/**< 1: lumped mass matrix, 0: consistent mass	*/
+	int debug	/**< 1: write element mass matrices	 	*/
+);
+
+
 /** static condensation of stiffness matrix from NxN to nxn */
 void static_condensation(
 	double **A,	/**< a square matrix				*/
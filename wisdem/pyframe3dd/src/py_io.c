@@ -14,6 +14,7 @@
 // #include "frame3dd_io.h"
 #include "coordtrans.h"
 #include "py_HPGmatrix.h"
+#include "py_band.h"
 #include "HPGutil.h"
 #include "NRutil.h"
 #include "py_io.h"
@@ -184,12 +185,13 @@ int read_frame_element_data (Elements *elements,
   Oct 31, 2013
   ------------------------------------------------------------------------------*/
 
-int read_run_data (OtherElementData *other, int *shear, int *geom, double *exagg_static, float *dx){
+int read_run_data (OtherElementData *other, int *shear, int *geom, double *exagg_static, float *dx, int *sparse){
 
   *shear = other->shear;
   *geom = other->geom;
   *exagg_static = other->exagg_static;
   *dx = other->dx;
+  *sparse = other->sparse;
 
   if (*shear != 0 && *shear != 1) {
     errorMsg(" Rember to specify shear deformations with a 0 or a 1 \n after the frame element property info.\n");
@@ -211,6 +213,11 @@ int read_run_data (OtherElementData *other, int *shear, int *geom, double *exagg
     return 74;
   }
 
+  if (*sparse != 0 && *sparse != 1) {
+    errorMsg(" Rember to specify banded matrix storage with a 0 or a 1.\n");
+    return 75;
+  }
+
   return 0;
 }
 
@@ -955,6 +962,7 @@ int read_mass_data (
     dots(stdout,30);    fprintf(stdout," %3d ",*Mmethod);
     if ( *Mmethod == 1 ) fprintf(stdout," (Subspace-Jacobi)\n");
     if ( *Mmethod == 2 ) fprintf(stdout," (Stodola)\n");
+    if ( *Mmethod == 3 ) fprintf(stdout," (Lanczos)\n");
   }
 
   *lump = dynamic->lump;
@@ -1603,13 +1611,13 @@ void write_internal_forces (
 void write_modal_results(
 			 MassResults* massR, ModalResults* modalR,
 			 int nN, int nE, int nI, int DoF,
-			 double **M, double *f, double **V,
+			 double **M, int bw, int *idx, double *f, double **V,
 			 double total_mass, double struct_mass,
 			 int iter, int sumR, int nM,
 			 double shift, int lump, double tol, int ok
 			 ){
 
-  int i, j, k, m, num_modes;
+  int i, j, k, m, lo, hi, num_modes;
   double  mpfX, mpfY, mpfZ,   /* mode participation factors   */
     *msX, *msY, *msZ;
   // double  fs;
@@ -1620,6 +1628,17 @@ void write_modal_results(
 
   for (i=1; i<=DoF; i++) {
     msX[i] = msY[i] = msZ[i] = 0.0;
+    if ( idx ) {	/* renumbering keeps the order of coordinates in a node */
+      k = idx[i];
+      lo = k-bw > 1 ? k-bw : 1;
+      hi = k+bw < DoF ? k+bw : DoF;
+      for (j=lo; j<=hi; j++) {
+	if ( j%6 == 1 ) msX[i] += band_get(M,k,j);
+	if ( j%6 == 2 ) msY[i] += band_get(M,k,j);
+	if ( j%6 == 3 ) msZ[i] += band_get(M,k,j);
+      }
+      continue;
+    }
     for (j=1; j<=DoF; j+=6) msX[i] += M[i][j];
     for (j=2; j<=DoF; j+=6) msY[i] += M[i][j];
     for (j=3; j<=DoF; j+=6) msZ[i] += M[i][j];
@@ -1634,6 +1653,15 @@ void write_modal_results(
   for (j=1; j <= nN; j++) {
     k = 6*(j-1);
     massR->N[j-1] = j;
+    if ( idx ) {
+      massR->xmass[j-1] = M[idx[k+1]][0];
+      massR->ymass[j-1] = M[idx[k+2]][0];
+      massR->zmass[j-1] = M[idx[k+3]][0];
+      massR->xinrta[j-1] = M[idx[k+4]][0];
+      massR->yinrta[j-1] = M[idx[k+5]][0];
+      massR->zinrta[j-1] = M[idx[k+6]][0];
+      continue;
+    }
     massR->xmass[j-1] = M[k+1][k+1];
     massR->ymass[j-1] = M[k+2][k+2];
     massR->zmass[j-1] = M[k+3][k+3];
@@ -51,7 +51,8 @@ int read_run_data (
     int *shear, /**< 1: include shear deformations, 0: don't    */
     int *geom,  /**< 1: include geometric stiffness, 0: don't   */
     double *exagg_static,/**< factor for static displ. exaggeration */
-    float *dx  /**< frame element increment for internal forces*/
+    float *dx,  /**< frame element increment for internal forces*/
+    int *sparse /**< 1: banded matrices with renumbered nodes, 0: full */
 );
 
 
@@ -210,11 +211,12 @@ void write_internal_forces(
 
 /**
     save modal frequencies and mode shapes          16aug01
+    if idx is not NULL, M is stored by its upper band, see py_band.h
 */
 void write_modal_results(
     MassResults* massR, ModalResults* modalR, //structs
     int nN, int nE, int nI, int DoF,
-    double **M, double *f, double **V,
+    double **M, int bw, int *idx, double *f, double **V,
     double total_mass, double struct_mass,
     int iter, int sumR, int nM,
     double shift, int lump, double tol, int ok
@@ -57,6 +57,7 @@
 #include "py_io.h"
 #include "py_eig.h"
 #include "py_HPGmatrix.h"
+#include "py_band.h"
 #include "HPGutil.h"
 #include "NRutil.h"
 
@@ -73,12 +74,61 @@
 void init_pyframe3dd() { }
 void PyInit__pyframe3dd() { }
 
+
+/*
+ * NEW_CACHE - an empty cache of the factored stiffness matrix and the modes
+ * of a frame, to be passed to run() for each analysis of the same structure
+ */
+ALLOW_DLL_CALL FrameCache* new_cache( void )
+{
+  return (FrameCache *) calloc( 1, sizeof(FrameCache) );
+}
+
+
+/*
+ * CLEAR_CACHE - empty the cache, when the structure has changed
+ */
+ALLOW_DLL_CALL void clear_cache( FrameCache *cache )
+{
+  int	DoF = cache->DoF, bw = cache->bw;
+
+  if ( cache->K ) {
+    if ( bw ) {
+      free_dmatrix(cache->K,1,DoF,0,bw);
+      free_dmatrix(cache->L,1,DoF,0,bw);
+    } else
+      free_dmatrix(cache->K,1,DoF,1,DoF);
+    free_dvector(cache->d,1,DoF);
+  }
+  if ( cache->nM ) {
+    if ( bw )	free_dmatrix(cache->M,1,DoF,0,bw);
+    else	free_dmatrix(cache->M,1,DoF,1,DoF);
+    free_dvector(cache->f,1,cache->nM);
+    free_dmatrix(cache->V,1,DoF,1,cache->nM);
+  }
+  memset( cache, 0, sizeof(FrameCache) );
+}
+
+
+/*
+ * FREE_CACHE - release the cache and everything in it
+ */
+ALLOW_DLL_CALL void free_cache( FrameCache *cache )
+{
+  if ( cache ) {
+    clear_cache ( cache );
+    free ( cache );
+  }
+}
+
+
 ALLOW_DLL_CALL int run(Nodes* nodes, Reactions* reactions, Elements* elements,
 		       OtherElementData* other, int nL, LoadCase* loadcases,
 		       DynamicData *dynamic, ExtraInertia *extraInertia, ExtraMass *extraMass,
 		       Condensation *condensation, // end of inputs, rest are outputs
 		       Displacements* displacements, Forces* forces, ReactionForces* reactionForces,
-		       InternalForces** internalForces, MassResults *massResults, ModalResults *modalResults){
+		       InternalForces** internalForces, MassResults *massResults, ModalResults *modalResults,
+		       FrameCache *cache){ // factored stiffness and modes of an earlier run, or NULL
 
 
   char	errMsg[MAXL];		// the text of an error message
@@ -104,7 +154,6 @@ ALLOW_DLL_CALL int run(Nodes* nodes, Reactions* reactions, Elements* elements,
     gY[_NL_],	// gravitational acceleration in global Y
     gZ[_NL_],	// gravitational acceleration in global Z
     pan=1.0,	// >0: pan during animation; 0: don't
-    scale=1.0,	// zoom scale for 3D plotting in Gnuplot
     dx=1.0;		// x-increment for internal force data
 
   double	**K=NULL,	// equilibrium stiffness matrix
@@ -136,6 +185,13 @@ ALLOW_DLL_CALL int run(Nodes* nodes, Reactions* reactions, Elements* elements,
     error = 1.0,	// rms equilibrium error and reactions
     Cfreq = 0.0,	// frequency used for Guyan condensation
     **Kc, **Mc,	// condensed stiffness and mass matrices
+    **Kb=NULL,	// upper band of the stiffness matrix
+    **Lb=NULL,	// lower band of its L D L' decomposition
+    **Mb=NULL,	// upper band of the mass matrix
+    **Kf=NULL,	// stiffness matrix of the linear load solutions
+    **Lf=NULL,	// lower band of its L D L' decomposition
+    *df=NULL,	// diagonal of D of its L D L' decomposition
+    *diag=NULL,	// diagonal of D of the L D L' decomposition of K
     exagg_static=10,// exaggerate static displ. in mesh data
     exagg_modal=10;	// exaggerate modal displ. in mesh data
 
@@ -147,7 +203,7 @@ ALLOW_DLL_CALL int run(Nodes* nodes, Reactions* reactions, Elements* elements,
   int	nN=0,		// number of Nodes
     nE=0,		// number of frame Elements
     lc=0,	// number of Load cases
-    DoF=0, i, j,	// number of Degrees of Freedom
+    DoF=0, i, j, k,	// number of Degrees of Freedom
     nR=0,		// number of restrained nodes
     nD[_NL_],	// number of prescribed nodal displ'nts
     nF[_NL_],	// number of loaded nodes
@@ -164,7 +220,7 @@ ALLOW_DLL_CALL int run(Nodes* nodes, Reactions* reactions, Elements* elements,
     anlyz=1,	// 1: stiffness analysis, 0: data check
     *q=NULL,*r=NULL,sumR,	// reaction data, total no. of reactions
     nM=0,		// number of desired modes
-    Mmethod,	// 1: Subspace Jacobi, 2: Stodola
+    Mmethod,	// 1: Subspace Jacobi, 2: Stodola, 3: Lanczos
     nM_calc,	// number of modes to calculate
     lump=1,		// 1: lumped, 0: consistent mass matrix
     iter=0,		// number of iterations
@@ -175,9 +231,16 @@ ALLOW_DLL_CALL int run(Nodes* nodes, Reactions* reactions, Elements* elements,
     *c=NULL,	// vector of DoF's to condense
     *m=NULL,	// vector of modes to condense
     write_matrix=0,  //   write stiffness and mass matrix
+    sparse=0,	// 1: banded K and M with renumbered nodes, 0: full
+    bw=0,		// half-bandwidth of the banded matrices
+    *perm=NULL,	// renumbered node numbers
+    *idx=NULL,	// band row of each degree of freedom
+    *jdx=NULL,	// degree of freedom of each band row
+    reduce=1,	// 1: decompose the stiffness matrix, 0: decomposed
     debug=0,	// 1: debugging screen output, 0: none
     verbose=0,	// 1: copious screen output, 0: none
     axial_strain_warning = 0, // 0: "ok", 1: strain > 0.001
+    eigCode = 0,	// error code of the eigen-problem solution
     ExitCode = 0;	// error code returned by Frame3DD
 
   if ( verbose ) { /*  display program name, version and license type */
@@ -208,7 +271,7 @@ ALLOW_DLL_CALL int run(Nodes* nodes, Reactions* reactions, Elements* elements,
   DoF = 6*nN;		/* total number of degrees of freedom	*/
 
   // andrewng: read this first because want geom for check in read_reaction_data
-  ExitCode += read_run_data ( other, &shear, &geom, &exagg_static, &dx);
+  ExitCode += read_run_data ( other, &shear, &geom, &exagg_static, &dx, &sparse);
 
   q   = ivector(1,DoF);	/* allocate memory for reaction data ... */
   r   = ivector(1,DoF);	/* allocate memory for reaction data ... */
@@ -284,7 +347,6 @@ ALLOW_DLL_CALL int run(Nodes* nodes, Reactions* reactions, Elements* elements,
   eqF_mech =  D3dmatrix(1,nL,1,nE,1,12); /* eqF due to mech loads */
   eqF_temp =  D3dmatrix(1,nL,1,nE,1,12); /* eqF due to temp loads */
 
-  K   = dmatrix(1,DoF,1,DoF);	/* global stiffness matrix	*/
   Q   = dmatrix(1,nE,1,12);	/* end forces for each member	*/
 
   D   = dvector(1,DoF);	/* displacments of each node		*/
@@ -349,6 +411,48 @@ ALLOW_DLL_CALL int run(Nodes* nodes, Reactions* reactions, Elements* elements,
     fprintf(stdout," matrix condensation data ... complete\n");
   }
 
+  if ( nM > 0 && Mmethod == 3 )	/* Lanczos works on the band matrices */
+    sparse = 1;
+
+  if ( nC > 0 ) {	/* condensation needs the full K and M of this run */
+    sparse = 0;
+    cache = NULL;
+    if ( Mmethod == 3 )	Mmethod = 1;
+  }
+
+  if ( sparse ) {	/* banded matrices with bandwidth-reducing node numbers */
+    perm = ivector(1,nN);
+    idx  = ivector(1,DoF);
+    jdx  = ivector(1,DoF);
+    bw   = band_renumber ( nN, nE, N1, N2, perm, idx );
+    for (i=1; i<=DoF; i++)	jdx[idx[i]] = i;
+    if ( verbose )
+      fprintf(stdout," banded matrices, half-bandwidth %d of %d\n", bw, DoF );
+  }
+
+  if ( cache && cache->K && ( cache->DoF != DoF || cache->bw != bw ) )
+    clear_cache ( cache );	/* left by a different structure	*/
+
+  if ( cache && !cache->K ) {	/* elastic stiffness kept between runs	*/
+    cache->DoF = DoF;
+    cache->bw  = bw;
+    if ( sparse ) {
+      cache->K = dmatrix(1,DoF,0,bw);
+      cache->L = dmatrix(1,DoF,0,bw);
+    } else
+      cache->K = dmatrix(1,DoF,1,DoF);
+    cache->d = dvector(1,DoF);
+  }
+
+  if ( !cache || geom ) {	/* the cache only holds the elastic stiffness */
+    if ( sparse ) {
+      Kb = dmatrix(1,DoF,0,bw);	/* global stiffness matrix, band	*/
+      Lb = dmatrix(1,DoF,0,bw);	/* its L D L' decomposition, band	*/
+    } else
+      K  = dmatrix(1,DoF,1,DoF);	/* global stiffness matrix	*/
+  }
+  diag = dvector(1,DoF);	/* diagonal of its L D L' decomposition	*/
+
 
   //if ( anlyz ) {			/* solve the problem	*/
   srand(time(NULL));
@@ -373,13 +477,27 @@ ALLOW_DLL_CALL int run(Nodes* nodes, Reactions* reactions, Elements* elements,
     for (i=1; i<=nE; i++)	for (j=1;j<=12;j++)	Q[i][j] = 0.0;
 
     /*  elastic stiffness matrix  [K({D}^(i))], {D}^(0)={0} (i=0) */
-    assemble_K ( K, DoF, nE, nN, xyz, rj, L, Le, N1, N2,
+    if ( cache ) {	/* decomposed once for all load cases and runs */
+      Kf = cache->K;  Lf = cache->L;  df = cache->d;
+      reduce = !cache->factored;
+    } else {
+      Kf = sparse ? Kb : K;  Lf = Lb;  df = diag;
+      reduce = 1;
+    }
+    if ( reduce && sparse )
+      assemble_K_band ( Kf, DoF, bw, idx, nE, nN, xyz, rj, L, Le, N1, N2,
+		 Ax, Asy, Asz, Jx,Iy,Iz, E, G, p,
+		 shear, geom, Q, debug,
+		 EKx, EKy, EKz, EKtx, EKty, EKtz);
+    else if ( reduce )
+      assemble_K ( Kf, DoF, nE, nN, xyz, rj, L, Le, N1, N2,
 		 Ax, Asy, Asz, Jx,Iy,Iz, E, G, p,
 		 shear, geom, Q, debug,
 		 EKx, EKy, EKz, EKtx, EKty, EKtz);
 
 #ifdef MATRIX_DEBUG
-    save_dmatrix ( "Ku", K, 1,DoF, 1,DoF, 0, "w" ); // unloaded stiffness matrix
+    if ( !sparse && reduce )
+    save_dmatrix ( "Ku", Kf, 1,DoF, 1,DoF, 0, "w" ); // unloaded stiffness matrix
 #endif
 
     /* first apply temperature loads only, if there are any ... */
@@ -388,7 +506,12 @@ ALLOW_DLL_CALL int run(Nodes* nodes, Reactions* reactions, Elements* elements,
 	fprintf(stdout," Linear Elastic Analysis ... Temperature Loads\n");
 
       /*  solve {F_t} = [K({D=0})] * {D_t} */
-      solve_system(K,dD,F_temp[lc],dR,DoF,q,r,&ok,verbose,&rms_resid);
+      if ( sparse )
+	solve_system_band(Kf,Lf,df,reduce,bw,idx,dD,F_temp[lc],dR,DoF,q,r,&ok,verbose,&rms_resid);
+      else
+	solve_system(Kf,df,reduce,dD,F_temp[lc],dR,DoF,q,r,&ok,verbose,&rms_resid);
+      if ( reduce && cache && Kf == cache->K )	cache->factored = ( ok >= 0 );
+      reduce = 0;
 
       /* increment {D_t} = {0} + {D_t} temp.-induced displ */
       for (i=1; i<=DoF; i++)	if (q[i]) D[i] += dD[i];
@@ -403,7 +526,15 @@ ALLOW_DLL_CALL int run(Nodes* nodes, Reactions* reactions, Elements* elements,
 			     &axial_strain_warning );
 
 	/* assemble temp.-stressed stiffness [K({D_t})]     */
-	assemble_K ( K, DoF, nE, nN, xyz, rj, L, Le, N1, N2,
+	Kf = sparse ? Kb : K;  Lf = Lb;  df = diag;
+	reduce = 1;
+	if ( sparse )
+	  assemble_K_band ( Kf, DoF, bw, idx, nE, nN, xyz, rj, L, Le, N1, N2,
+		     Ax,Asy,Asz, Jx,Iy,Iz, E, G, p,
+		     shear,geom, Q, debug,
+		     EKx, EKy, EKz, EKtx, EKty, EKtz);
+	else
+	  assemble_K ( Kf, DoF, nE, nN, xyz, rj, L, Le, N1, N2,
 		     Ax,Asy,Asz, Jx,Iy,Iz, E, G, p,
 		     shear,geom, Q, debug,
 		     EKx, EKy, EKz, EKtx, EKty, EKtz);
@@ -419,7 +550,12 @@ ALLOW_DLL_CALL int run(Nodes* nodes, Reactions* reactions, Elements* elements,
       for (i=1; i<=DoF; i++)	if (r[i]) dD[i] = Dp[lc][i];
 
       /*  solve {F_m} = [K({D_t})] * {D_m}	*/
-      solve_system(K,dD,F_mech[lc],dR,DoF,q,r,&ok,verbose,&rms_resid);
+      if ( sparse )
+	solve_system_band(Kf,Lf,df,reduce,bw,idx,dD,F_mech[lc],dR,DoF,q,r,&ok,verbose,&rms_resid);
+      else
+	solve_system(Kf,df,reduce,dD,F_mech[lc],dR,DoF,q,r,&ok,verbose,&rms_resid);
+      if ( reduce && cache && Kf == cache->K )	cache->factored = ( ok >= 0 );
+      reduce = 0;
 
       /* combine {D} = {D_t} + {D_m}	*/
       for (i=1; i<=DoF; i++) {
@@ -441,7 +577,10 @@ ALLOW_DLL_CALL int run(Nodes* nodes, Reactions* reactions, Elements* elements,
 			 &axial_strain_warning );
 
     /*  check the equilibrium error	*/
-    error = equilibrium_error ( dF, F, K, D, DoF, q,r );
+    if ( sparse )
+      error = equilibrium_error_band ( dF, F, Kf, bw, idx, D, DoF, q,r );
+    else
+      error = equilibrium_error ( dF, F, Kf, D, DoF, q,r );
 
     if ( geom && verbose )
       fprintf(stdout,"\n Non-Linear Elastic Analysis ...\n");
@@ -464,7 +603,13 @@ ALLOW_DLL_CALL int run(Nodes* nodes, Reactions* reactions, Elements* elements,
       ++iter;
 
       /*  assemble stiffness matrix [K({D}^(i))]	      */
-      assemble_K ( K, DoF, nE, nN, xyz, rj, L, Le, N1, N2,
+      if ( sparse )
+	assemble_K_band ( Kb, DoF, bw, idx, nE, nN, xyz, rj, L, Le, N1, N2,
+		   Ax,Asy,Asz, Jx,Iy,Iz, E, G, p,
+		   shear,geom, Q, debug,
+		   EKx, EKy, EKz, EKtx, EKty, EKtz);
+      else
+	assemble_K ( K, DoF, nE, nN, xyz, rj, L, Le, N1, N2,
 		   Ax,Asy,Asz, Jx,Iy,Iz, E, G, p,
 		   shear,geom, Q, debug,
 		   EKx, EKy, EKz, EKtx, EKty, EKtz);
@@ -473,13 +618,19 @@ ALLOW_DLL_CALL int run(Nodes* nodes, Reactions* reactions, Elements* elements,
       /*  compute equilibrium error, {dF}, at iteration i   */
       /*  {dF}^(i) = {F} - [K({D}^(i))]*{D}^(i)	      */
       /*  convergence criteria = || {dF}^(i) ||  /  || F || */
-      error = equilibrium_error ( dF, F, K, D, DoF, q,r );
+      if ( sparse )
+	error = equilibrium_error_band ( dF, F, Kb, bw, idx, D, DoF, q,r );
+      else
+	error = equilibrium_error ( dF, F, K, D, DoF, q,r );
 
       /*  Powell-Symmetric-Broyden secant stiffness update  */
       // PSB_update ( Ks, dF, dD, DoF );  /* not helpful?   */
 
       /*  solve {dF}^(i) = [K({D}^(i))] * {dD}^(i)	      */
-      solve_system(K,dD,dF,dR,DoF,q,r,&ok,verbose,&rms_resid);
+      if ( sparse )
+	solve_system_band(Kb,Lb,diag,1,bw,idx,dD,dF,dR,DoF,q,r,&ok,verbose,&rms_resid);
+      else
+	solve_system(K,diag,1,dD,dF,dR,DoF,q,r,&ok,verbose,&rms_resid);
 
       if ( ok < 0 ) {	/*  K is not positive definite	      */
 	fprintf(stderr,"   The stiffness matrix is not pos-def. \n");
@@ -509,12 +660,13 @@ ALLOW_DLL_CALL int run(Nodes* nodes, Reactions* reactions, Elements* elements,
     /*   strain limit _and_ buckling failure ... */
     if (axial_strain_warning > 0 && ExitCode == 181) ExitCode = 183;
 
-    if ( geom )	compute_reaction_forces( R,F,K, D, DoF, r );
+    if ( geom && sparse )	compute_reaction_forces_band( R,F,Kb,bw,idx, D, DoF, r );
+    else if ( geom )	compute_reaction_forces( R,F,K, D, DoF, r );
 
     /*  dealocate Broyden secant stiffness matrix, Ks */
     // if ( geom )	free_dmatrix(Ks, 1, DoF, 1, DoF );
 
-    if ( write_matrix )	/* write static stiffness matrix */
+    if ( write_matrix && K )	/* write static stiffness matrix */
       save_ut_dmatrix ( "Ks", K, DoF, "w" );
 
     /*  display RMS equilibrium error */
@@ -583,62 +735,156 @@ ALLOW_DLL_CALL int run(Nodes* nodes, Reactions* reactions, Elements* elements,
      }
   */
 
-  if ( nM > 0 ) { /* carry out modal analysis */
+  nM_calc = (nM+8)<(2*nM) ? nM+8 : 2*nM;		/* Bathe */
+
+  if ( nM > 0 && cache && !geom && cache->nM == nM_calc ) {
+    /* the modes do not depend on the loads without geometric stiffness */
+
+    f   = dvector(1,nM_calc);
+    V   = dmatrix(1,2*DoF,1,nM_calc);
+    for (j=1; j<=nM_calc; j++) {
+      f[j] = cache->f[j];
+      for (i=1; i<=DoF; i++)	V[i][j] = cache->V[i][j];
+    }
+    iter = cache->iter;
+    ok   = cache->ok;
+
+    write_modal_results ( massResults, modalResults,
+			  nN, nE, nI, DoF, cache->M, bw, sparse ? idx : NULL, f, V,
+			  total_mass, struct_mass,
+			  iter, sumR, nM, shift, lump, tol, ok );
+
+  } else if ( nM > 0 ) { /* carry out modal analysis */
 
     if(verbose & anlyz) fprintf(stdout,"\n\n Modal Analysis ...\n");
 
-    nM_calc = (nM+8)<(2*nM) ? nM+8 : 2*nM;		/* Bathe */
+    if ( cache && !geom ) {	/* K was only assembled into the cache */
+      if ( sparse ) {
+	Kb = dmatrix(1,DoF,0,bw);
+	assemble_K_band ( Kb, DoF, bw, idx, nE, nN, xyz, rj, L, Le, N1, N2,
+		   Ax,Asy,Asz, Jx,Iy,Iz, E, G, p,
+		   shear,geom, Q, debug,
+		   EKx, EKy, EKz, EKtx, EKty, EKtz);
+      } else {
+	K  = dmatrix(1,DoF,1,DoF);
+	assemble_K ( K, DoF, nE, nN, xyz, rj, L, Le, N1, N2,
+		   Ax,Asy,Asz, Jx,Iy,Iz, E, G, p,
+		   shear,geom, Q, debug,
+		   EKx, EKy, EKz, EKtx, EKty, EKtz);
+      }
+    }
 
-    M   = dmatrix(1,DoF,1,DoF);
+    if ( sparse )
+      Mb  = dmatrix(1,DoF,0,bw);
+    else
+      M   = dmatrix(1,DoF,1,DoF);
     f   = dvector(1,nM_calc);
     V   = dmatrix(1,2*DoF,1,nM_calc);
 
-    assemble_M ( M, DoF, nN, nE, xyz, rj, L, N1,N2,
+    if ( sparse )
+      assemble_M_band ( Mb, DoF, bw, idx, nN, nE, xyz, rj, L, N1,N2,
+		 Ax, Jx,Iy,Iz, p, d, EMs, NMs, NMx, NMy, NMz,
+		 lump, debug );
+    else
+      assemble_M ( M, DoF, nN, nE, xyz, rj, L, N1,N2,
 		 Ax, Jx,Iy,Iz, p, d, EMs, NMs, NMx, NMy, NMz,
 		 lump, debug );
 
 #ifdef MATRIX_DEBUG
+    if ( !sparse )
     save_dmatrix ( "Mf", M, 1,DoF, 1,DoF, 0, "w" ); /* free mass matrix */
 #endif
 
-    for (j=1; j<=DoF; j++) { /*  compute traceK and traceM */
-      if ( !r[j] ) {
-	traceK += K[j][j];
-	traceM += M[j][j];
+    if ( sparse ) {
+      for (j=1; j<=DoF; j++) { /*  compute traceK and traceM */
+	if ( !r[j] ) {
+	  traceK += Kb[idx[j]][0];
+	  traceM += Mb[idx[j]][0];
+	}
       }
-    }
-    for (i=1; i<=DoF; i++) { /*  modify K and M for reactions    */
-      if ( r[i] ) {	/* apply full reactions to upper triangle */
-	K[i][i] = traceK * 1e4;
-	for (j=i+1; j<=DoF; j++) K[j][i] = K[i][j] = 0.0;
-
-	M[i][i] = traceM;
-	for (j=i+1; j<=DoF; j++) M[j][i] = M[i][j] = 0.0;
+      for (i=1; i<=DoF; i++) { /*  modify K and M for reactions    */
+	if ( r[i] ) {	/* as below, in the structural order */
+	  Kb[idx[i]][0] = traceK * 1e4;
+	  Mb[idx[i]][0] = traceM;
+	}
+      }
+      for (i=1; i<=DoF; i++) {
+	for (k=1; k<=bw && i+k<=DoF; k++) {
+	  j = jdx[i] < jdx[i+k] ? jdx[i] : jdx[i+k];
+	  if ( r[j] )	Kb[i][k] = Mb[i][k] = 0.0;
+	}
+      }
+      if ( anlyz && Mmethod == 2 ) {	/* stodola needs the full matrices */
+	K = dmatrix(1,DoF,1,DoF);
+	M = dmatrix(1,DoF,1,DoF);
+	band_unpack ( Kb, DoF, bw, idx, K );
+	band_unpack ( Mb, DoF, bw, idx, M );
+      }
+    } else {
+      for (j=1; j<=DoF; j++) { /*  compute traceK and traceM */
+	if ( !r[j] ) {
+	  traceK += K[j][j];
+	  traceM += M[j][j];
+	}
+      }
+      for (i=1; i<=DoF; i++) { /*  modify K and M for reactions    */
+	if ( r[i] ) {	/* apply full reactions to upper triangle */
+	  K[i][i] = traceK * 1e4;
+	  for (j=i+1; j<=DoF; j++) K[j][i] = K[i][j] = 0.0;
+
+	  M[i][i] = traceM;
+	  for (j=i+1; j<=DoF; j++) M[j][i] = M[i][j] = 0.0;
+	}
       }
     }
 
-    if ( write_matrix ) {	/* write Kd and Md matrices */
+    if ( write_matrix && !sparse ) {	/* write Kd and Md matrices */
       save_ut_dmatrix ( "Kd", K, DoF, "w" );/* dynamic stff matx */
       save_ut_dmatrix ( "Md", M, DoF, "w" );/* dynamic mass matx */
     }
 
     if ( anlyz ) {	/* subspace or stodola methods */
-      if( Mmethod == 1 )
-	ExitCode += subspace( K, M, DoF, nM_calc, f, V, tol,shift,&iter,&ok, verbose );
+      if( Mmethod == 1 && sparse )
+	eigCode = subspace_band( Kb, Mb, DoF, bw, idx, nM_calc, f, V, tol,shift,&iter,&ok, verbose );
+      else if( Mmethod == 1 )
+	eigCode = subspace( K, M, DoF, nM_calc, f, V, tol,shift,&iter,&ok, verbose );
       if( Mmethod == 2 )
-	ExitCode += stodola ( K, M, DoF, nM_calc, f, V, tol,shift,&iter,&ok, verbose );
+	eigCode = stodola ( K, M, DoF, nM_calc, f, V, tol,shift,&iter,&ok, verbose );
+      if( Mmethod == 3 )
+	eigCode = lanczos_band( Kb, Mb, DoF, bw, idx, nM_calc, f, V, tol,shift,&iter,&ok, verbose );
+      ExitCode += eigCode;
 
       for (j=1; j<=nM_calc; j++) f[j] = sqrt(f[j])/(2.0*PI);
 
-      write_modal_results ( massResults, modalResults,
-			    nN, nE, nI, DoF, M, f, V,
-			    total_mass, struct_mass,
-			    iter, sumR, nM, shift, lump, tol, ok );
+      if ( M )
+	write_modal_results ( massResults, modalResults,
+			      nN, nE, nI, DoF, M, 0, NULL, f, V,
+			      total_mass, struct_mass,
+			      iter, sumR, nM, shift, lump, tol, ok );
+      else
+	write_modal_results ( massResults, modalResults,
+			      nN, nE, nI, DoF, Mb, bw, idx, f, V,
+			      total_mass, struct_mass,
+			      iter, sumR, nM, shift, lump, tol, ok );
       /*
 	write_modal_results ( fp, nN,nE,nI, DoF, M,f,V,
 	total_mass, struct_mass,
 	iter, sumR, nM, shift, lump, tol, ok );
       */
+
+      if ( cache && !geom && !cache->nM && !eigCode ) {	/* keep the modes for the next run */
+	cache->nM   = nM_calc;
+	cache->iter = iter;
+	cache->ok   = ok;
+	cache->f = dvector(1,nM_calc);
+	cache->V = dmatrix(1,DoF,1,nM_calc);
+	for (j=1; j<=nM_calc; j++) {
+	  cache->f[j] = f[j];
+	  for (i=1; i<=DoF; i++)	cache->V[i][j] = V[i][j];
+	}
+	if ( sparse ) {	cache->M = Mb;	Mb = NULL; }
+	else {		cache->M = M;	M  = NULL; }
+      }
     }
   }
 
@@ -710,6 +956,17 @@ ALLOW_DLL_CALL int run(Nodes* nodes, Reactions* reactions, Elements* elements,
 	       pkDx, pkDy, pkDz, pkRx, pkSy, pkSz,
 	       EKx, EKy, EKz, EKtx, EKty, EKtz);
 
+  free_dvector(diag,1,DoF);
+
+  if ( sparse ) {	/* deallocate the band matrices */
+    if ( Kb )	free_dmatrix(Kb,1,DoF,0,bw);
+    if ( Lb )	free_dmatrix(Lb,1,DoF,0,bw);
+    if ( Mb )	free_dmatrix(Mb,1,DoF,0,bw);
+    free_ivector(perm,1,nN);
+    free_ivector(idx,1,DoF);
+    free_ivector(jdx,1,DoF);
+  }
+
   if ( verbose ) fprintf(stdout,"\n");
 
   color(0);
@@ -41,6 +41,7 @@ typedef struct {
 
     int shear, geom;
     double exagg_static, dx;
+    int sparse;
 
 } OtherElementData;
 
@@ -216,3 +217,23 @@ typedef struct {
     double *xdsp, *ydsp, *zdsp, *xrot, *yrot, *zrot;
 
 } ModalResults;
+
+
+
+// --------------
+// Reused Results
+// --------------
+
+
+// The factored elastic stiffness matrix and the modes of a frame, kept by the
+// caller between runs of the same structure.  Opaque to Python, which only
+// holds a pointer from new_cache().
+typedef struct {
+    int DoF, bw;		// size and half-bandwidth (0: full) of K and M
+    int factored;		// 1: K holds its L D L' decomposition
+    double **K, **L, *d;	// elastic stiffness and its L D L' decomposition
+    int nM;			// number of stored modes, 0: none
+    int iter, ok;		// eigen-solver iterations and Sturm check
+    double **M, *f, **V;	// mass matrix, frequencies, and mode shapes
+
+} FrameCache;
@@ -6,10 +6,8 @@ import openmdao.api as om
 from scipy.optimize import brentq
 
 from wisdem.commonse.utilities import arc_length
-from wisdem.glue_code.gc_LoadInputs import WindTurbineOntologyPython
 from wisdem.glue_code.gc_WT_DataStruc import Blade, Materials, ComputeHighLevelBladeProperties
 from wisdem.glue_code.gc_WT_InitModel import assign_blade_values, assign_airfoil_values, assign_material_values
-from wisdem.glue_code.gc_PoseOptimization import PoseOptimization
 
 logger = logging.getLogger("wisdem/weis")
 
@@ -4085,6 +4083,9 @@ def initialize_omdao_prob(wt_opt, modeling_options, wt_init, opt_options):
 
 
 if __name__ == "__main__":
+    from wisdem.glue_code.gc_LoadInputs import WindTurbineOntologyPython
+    from wisdem.glue_code.gc_PoseOptimization import PoseOptimization
+
     wisdem_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
     example_dir = os.path.join(wisdem_dir, "examples", "02_reference_turbines")  # get path example 03_blade
     fname_wt_input = os.path.join(example_dir, "IEA-3p4-130-RWT.yaml")
@@ -1,21 +1,506 @@
+import os
 import copy
+import hashlib
+import weakref
+import multiprocessing
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 
 import numpy as np
 from openmdao.api import Group, ExplicitComponent
 from scipy.interpolate import PchipInterpolator
 
 from wisdem.precomp import PreComp, Profile, CompositeSection, Orthotropic2DMaterial
+from wisdem.precomp.properties import tw_rate
 from wisdem.commonse.utilities import arc_length
 from wisdem.precomp.precomp_to_beamdyn import pc2bd_K, pc2bd_I, TransformCrossSectionMatrix
 import logging
 logger = logging.getLogger("wisdem/weis")
 
 
+def region_stacking(
+    idx,
+    start_nd_arc,
+    end_nd_arc,
+    layer_name,
+    layer_thickness,
+    fiber_orientation,
+    layer_mat,
+    material_dict,
+    materials,
+    region_loc,
+):
+    # Receive start and end of composite sections chordwise, find which composites layers are in each
+    # chordwise regions, generate the precomp composite class instance
+
+    # error handling to makes sure there were no numeric errors causing values very close too, but not exactly, 0 or 1
+    start_nd_arc = [
+        0.0 if start_nd_arci != 0.0 and np.isclose(start_nd_arci, 0.0) else start_nd_arci
+        for start_nd_arci in start_nd_arc
+    ]
+    end_nd_arc = [
+        0.0 if end_nd_arci != 0.0 and np.isclose(end_nd_arci, 0.0) else end_nd_arci
+        for end_nd_arci in end_nd_arc
+    ]
+    start_nd_arc = [
+        1.0 if start_nd_arci != 1.0 and np.isclose(start_nd_arci, 1.0) else start_nd_arci
+        for start_nd_arci in start_nd_arc
+    ]
+    end_nd_arc = [
+        1.0 if end_nd_arci != 1.0 and np.isclose(end_nd_arci, 1.0) else end_nd_arci
+        for end_nd_arci in end_nd_arc
+    ]
+
+    # region end points
+    dp = sorted(list(set(start_nd_arc + end_nd_arc)))
+
+    # initialize
+    n_plies = []
+    thk = []
+    theta = []
+    mat_idx = []
+
+    # loop through division points, find what layers make up the stack between those bounds
+    for i_reg, (dp0, dp1) in enumerate(zip(dp[0:-1], dp[1:])):
+        n_pliesi = []
+        thki = []
+        thetai = []
+        mati = []
+        for i_sec, start_nd_arci, end_nd_arci in zip(idx, start_nd_arc, end_nd_arc):
+            name = layer_name[i_sec]
+            if start_nd_arci <= dp0 and end_nd_arci >= dp1:
+                if name in region_loc.keys():
+                    if region_loc[name] == None:
+                        region_loc[name] = [i_reg]
+                    else:
+                        region_loc[name].append(i_reg)
+
+                n_pliesi.append(1.0)
+                thki.append(layer_thickness[i_sec])
+                if fiber_orientation[i_sec] == None:
+                    thetai.append(0.0)
+                else:
+                    thetai.append(fiber_orientation[i_sec])
+                mati.append(material_dict[layer_mat[i_sec]])
+
+        n_plies.append(np.array(n_pliesi))
+        thk.append(np.array(thki))
+        theta.append(np.array(thetai))
+        mat_idx.append(np.array(mati))
+
+    # print('----------------------')
+    # print('dp', dp)
+    # print('n_plies', n_plies)
+    # print('thk', thk)
+    # print('theta', theta)
+    # print('mat_idx', mat_idx)
+    # print('materials', materials)
+
+    sec = CompositeSection(dp, n_plies, thk, theta, mat_idx, materials)
+    return sec, region_loc
+
+
+def web_stacking(
+    i,
+    web_idx,
+    web_start_nd_arc,
+    web_end_nd_arc,
+    layer_thickness,
+    fiber_orientation,
+    layer_mat,
+    material_dict,
+    materials,
+    flatback,
+    upperCSi,
+):
+    dp = []
+    n_plies = []
+    thk = []
+    theta = []
+    mat_idx = []
+
+    if len(web_idx) > 0:
+        dp = np.mean((np.abs(web_start_nd_arc), np.abs(web_start_nd_arc)), axis=0).tolist()
+
+        dp_all = [
+            [start_nd_arci, end_nd_arci]
+            for start_nd_arci, end_nd_arci in zip(web_start_nd_arc, web_end_nd_arc)
+        ]
+        _, web_ids = np.unique(dp_all, axis=0, return_inverse=True)
+        for webi in np.unique(web_ids):
+            # store variable values (thickness, orientation, material) for layers that make up each web, based on the mapping array web_ids
+            n_pliesi = [1.0 for i_reg, web_idi in zip(web_idx, web_ids) if web_idi == webi]
+            thki = [layer_thickness[i_reg] for i_reg, web_idi in zip(web_idx, web_ids) if web_idi == webi]
+            thetai = [fiber_orientation[i_reg] for i_reg, web_idi in zip(web_idx, web_ids) if web_idi == webi]
+            thetai = [0.0 if theta_ij == None else theta_ij for theta_ij in thetai]
+            mati = [
+                material_dict[layer_mat[i_reg]] for i_reg, web_idi in zip(web_idx, web_ids) if web_idi == webi
+            ]
+
+            n_plies.append(np.array(n_pliesi))
+            thk.append(np.array(thki))
+            theta.append(np.array(thetai))
+            mat_idx.append(np.array(mati))
+
+    if flatback:
+        dp.append(1.0)
+        n_plies.append(upperCSi.n_plies[-1])
+        thk.append(upperCSi.t[-1])
+        theta.append(upperCSi.theta[-1])
+        mat_idx.append(upperCSi.mat_idx[-1])
+
+    dp_out = sorted(list(set(dp)))
+
+    sec = CompositeSection(dp_out, n_plies, thk, theta, mat_idx, materials)
+    return sec
+
+
+def precomp_section(
+    i,
+    coord_xy,
+    chord,
+    span,
+    layer_thickness,
+    layer_start_nd,
+    layer_end_nd,
+    fiber_orientation,
+    web_start_nd,
+    web_end_nd,
+    build_layer,
+    layer_name,
+    layer_mat,
+    material_dict,
+    materials,
+    region_loc_vars,
+):
+    # Generate the precomp profile and composite stacks of span station i from the inputs at that station,
+    # which is independent of the other stations. Also returns the station area and the precomp regions
+    # of the user selected composite layers on the suction and pressure sides.
+    area = 0.0
+    region_loc_ss = {var: None for var in region_loc_vars}
+    region_loc_ps = {var: None for var in region_loc_vars}
+
+    # time0 = time.time()
+
+    ## Profiles
+    # rotate, on a copy as the profile is normalized in place
+    profile_i = coord_xy.copy()
+    profile_i_rot = profile_i
+
+    # normalize
+    profile_i_rot[:, 0] -= min(profile_i_rot[:, 0])
+    profile_i_rot = profile_i_rot / max(profile_i_rot[:, 0])
+
+    profile_i_rot_precomp = copy.copy(profile_i_rot)
+    idx_s = 0
+    idx_le_precomp = np.argmax(profile_i_rot_precomp[:, 0])
+    if idx_le_precomp != 0:
+        if profile_i_rot_precomp[0, 0] == profile_i_rot_precomp[-1, 0]:
+            idx_s = 1
+        profile_i_rot_precomp = np.vstack(
+            (profile_i_rot_precomp[idx_le_precomp:], profile_i_rot_precomp[idx_s:idx_le_precomp, :])
+        )
+    profile_i_rot_precomp[:, 1] -= profile_i_rot_precomp[np.argmin(profile_i_rot_precomp[:, 0]), 1]
+
+    # # renormalize
+    profile_i_rot_precomp[:, 0] -= min(profile_i_rot_precomp[:, 0])
+    profile_i_rot_precomp = profile_i_rot_precomp / max(profile_i_rot_precomp[:, 0])
+
+    if profile_i_rot_precomp[-1, 0] != 1.0:
+        profile_i_rot_precomp = np.vstack((profile_i_rot_precomp, profile_i_rot_precomp[0, :]))
+
+    # 'web' at trailing edge needed for flatback airfoils
+    if (
+        profile_i_rot_precomp[0, 1] != profile_i_rot_precomp[-1, 1]
+        and profile_i_rot_precomp[0, 0] == profile_i_rot_precomp[-1, 0]
+    ):
+        flatback = True
+    else:
+        flatback = False
+
+    profile = Profile.initWithTEtoTEdata(profile_i_rot_precomp[:, 0], profile_i_rot_precomp[:, 1])
+
+    # import matplotlib.pyplot as plt
+    # plt.plot(profile_i_rot_precomp[:,0], profile_i_rot_precomp[:,1])
+    # plt.axis('equal')
+    # plt.title(i)
+    # plt.show()
+
+    idx_le = np.argmin(profile_i_rot[:, 0])
+
+    profile_i_arc = arc_length(profile_i_rot)
+    arc_L = profile_i_arc[-1]
+    profile_i_arc /= arc_L
+    arc_L_m = arc_L * chord
+
+    loc_LE = profile_i_arc[idx_le]
+    len_PS = 1.0 - loc_LE
+
+    ## Composites
+    ss_idx = []
+    ss_start_nd_arc = []
+    ss_end_nd_arc = []
+    ps_idx = []
+    ps_start_nd_arc = []
+    ps_end_nd_arc = []
+    web_start_nd_arc = []
+    web_end_nd_arc = []
+    web_idx = []
+
+    # Determine spanwise composite layer elements that are non-zero at this spanwise location,
+    # determine their chord-wise start and end location on the pressure and suctions side
+
+    spline_arc2xnd = PchipInterpolator(profile_i_arc, profile_i_rot[:, 0])
+
+    # time1 = time.time()
+    for idx_sec in range(len(layer_thickness)):
+        if build_layer[idx_sec] >= 0:
+            if layer_thickness[idx_sec] > 1.0e-6:
+                area += arc_L_m * (layer_end_nd[idx_sec] - 
+                                      layer_start_nd[idx_sec]) * (
+                                      layer_thickness[idx_sec])
+                if layer_start_nd[idx_sec] < loc_LE or layer_end_nd[idx_sec] < loc_LE:
+                    ss_idx.append(idx_sec)
+                    if layer_start_nd[idx_sec] < loc_LE:
+                        # ss_start_nd_arc.append(sec['start_nd_arc']['values'][i])
+                        ss_end_nd_arc_temp = float(spline_arc2xnd(layer_start_nd[idx_sec]))
+                        if ss_end_nd_arc_temp > 1:
+                            logger.debug(
+                                "Error in the definition of material "
+                                + layer_name[idx_sec]
+                                + ". It cannot fit in the section number "
+                                + str(i)
+                                + " at span location "
+                                + str(span * 100.0)
+                                + " %. Variable ss_end_nd_arc_temp was equal "
+                                + " to "
+                                + str(ss_end_nd_arc_temp)
+                                + " and is not set to 1"
+                            )
+                            ss_end_nd_arc_temp = 1.
+                        if ss_end_nd_arc_temp < 0:
+                            logger.debug(
+                                "Error in the definition of material "
+                                + layer_name[idx_sec]
+                                + ". It cannot fit in the section number "
+                                + str(i)
+                                + " at span location "
+                                + str(span * 100.0)
+                                + " %. Variable ss_end_nd_arc_temp was equal "
+                                + " to "
+                                + str(ss_end_nd_arc_temp)
+                                + " and is not set to 0"
+                            )
+                            ss_end_nd_arc_temp = 0.
+                        if ss_end_nd_arc_temp == profile_i_rot[0, 0] and profile_i_rot[0, 0] != 1.0:
+                            ss_end_nd_arc_temp = 1.0
+                        ss_end_nd_arc.append(ss_end_nd_arc_temp)
+                    else:
+                        ss_end_nd_arc.append(1.0)
+                    # ss_end_nd_arc.append(min(sec['end_nd_arc']['values'][i], loc_LE)/loc_LE)
+                    if layer_end_nd[idx_sec] < loc_LE:
+                        ss_start_nd_arc.append(float(spline_arc2xnd(layer_end_nd[idx_sec])))
+                    else:
+                        ss_start_nd_arc.append(0.0)
+
+                if layer_start_nd[idx_sec] > loc_LE or layer_end_nd[idx_sec] > loc_LE:
+                    ps_idx.append(idx_sec)
+                    # ps_start_nd_arc.append((max(sec['start_nd_arc']['values'][i], loc_LE)-loc_LE)/len_PS)
+                    # ps_end_nd_arc.append((min(sec['end_nd_arc']['values'][i], 1.)-loc_LE)/len_PS)
+
+                    if (
+                        layer_start_nd[idx_sec] > loc_LE
+                        and layer_end_nd[idx_sec] < loc_LE
+                    ):
+                        # ps_start_nd_arc.append(float(remap2grid(profile_i_arc, profile_i_rot[:,0], sec['start_nd_arc']['values'][i])))
+                        ps_end_nd_arc.append(1.0)
+                    else:
+                        ps_end_nd_arc_temp = float(spline_arc2xnd(layer_end_nd[idx_sec]))
+                        if (
+                            np.isclose(ps_end_nd_arc_temp, profile_i_rot[-1, 0], atol=1.0e-2)
+                            and profile_i_rot[-1, 0] != 1.0
+                        ):
+                            ps_end_nd_arc_temp = 1.0
+                        if ps_end_nd_arc_temp > 1.0:
+                            ps_end_nd_arc_temp = 1.0
+                        ps_end_nd_arc.append(ps_end_nd_arc_temp)
+                    if layer_start_nd[idx_sec] < loc_LE:
+                        ps_start_nd_arc.append(0.0)
+                    else:
+                        ps_start_nd_arc.append(float(spline_arc2xnd(layer_start_nd[idx_sec])))
+        else:
+            target_idx = - build_layer[idx_sec] - 1
+
+            if layer_thickness[idx_sec] > 1.0e-6:
+                web_idx.append(idx_sec)
+
+                web_start_ndi = web_start_nd[int(target_idx)]
+                web_end_ndi = web_end_nd[int(target_idx)]
+
+                start_nd_arc = float(spline_arc2xnd(web_start_ndi))
+                end_nd_arc = float(spline_arc2xnd(web_end_ndi))
+
+                web_start_nd_arc.append(start_nd_arc)
+                web_end_nd_arc.append(end_nd_arc)
+
+                # Compute height the webs along span
+                id_start = np.argmin(abs(profile_i_arc - web_start_ndi))
+                id_end = np.argmin(abs(profile_i_arc - web_end_ndi))
+                web_height = np.sqrt((profile_i[id_start, 0] - profile_i[id_end, 0])**2 +
+                                     (profile_i[id_start, 1] - profile_i[id_end, 1])**2) * (
+                                     chord)
+
+                area += web_height * layer_thickness[idx_sec]
+
+    # time1 = time.time() - time1
+    # print(time1)
+
+    # cap layer starts and ends within 0 and 1
+    ss_start_nd_arc = [max(0, min(1, value)) for value in ss_start_nd_arc]
+    ss_end_nd_arc = [max(0, min(1, value)) for value in ss_end_nd_arc]
+    # generate the Precomp composite stacks for chordwise regions
+    upperCS, region_loc_ss = region_stacking(
+        ss_idx,
+        ss_start_nd_arc,
+        ss_end_nd_arc,
+        layer_name,
+        layer_thickness,
+        fiber_orientation,
+        layer_mat,
+        material_dict,
+        materials,
+        region_loc_ss,
+    )
+    lowerCS, region_loc_ps = region_stacking(
+        ps_idx,
+        ps_start_nd_arc,
+        ps_end_nd_arc,
+        layer_name,
+        layer_thickness,
+        fiber_orientation,
+        layer_mat,
+        material_dict,
+        materials,
+        region_loc_ps,
+    )
+    if len(web_idx) > 0 or flatback:
+        websCS = web_stacking(
+            i,
+            web_idx,
+            web_start_nd_arc,
+            web_end_nd_arc,
+            layer_thickness,
+            fiber_orientation,
+            layer_mat,
+            material_dict,
+            materials,
+            flatback,
+            upperCS,
+        )
+    else:
+        websCS = CompositeSection([], [], [], [], [], [])
+
+    return profile, upperCS, lowerCS, websCS, area, region_loc_ss, region_loc_ps
+
+
+class StationPool(object):
+    """Pool of n_workers threads or forked processes (0 uses all available cores) that evaluates the span stations.
+
+    The workers are started on the first evaluation with more than one station and kept for the later ones,
+    so that a component only pays for them once.  Process pools fall back to threads on platforms without fork.
+    """
+
+    def __init__(self, n_workers=1, kind="thread"):
+        self.n_workers = n_workers if n_workers > 0 else os.cpu_count()
+        self.processes = kind == "process" and "fork" in multiprocessing.get_all_start_methods()
+        self.workers = None
+
+    def map(self, func, stations):
+        """Evaluate func(*args) for the args of each station and return the results in station order"""
+        if self.n_workers < 2 or len(stations) < 2:
+            return [func(*args) for args in stations]
+
+        if self.workers is None:
+            n_workers = min(self.n_workers, len(stations))
+            if self.processes:
+                self.workers = multiprocessing.get_context("fork").Pool(n_workers)
+                weakref.finalize(self, self.workers.terminate)
+            else:
+                self.workers = ThreadPoolExecutor(n_workers)
+                weakref.finalize(self, self.workers.shutdown, wait=False)
+
+        if self.processes:
+            return self.workers.starmap(func, stations)
+        return list(self.workers.map(func, *zip(*stations)))
+
+
+def joint_station(r, joint_position):
+    # Span station of a blade joint and the length of blade its mass is smeared over
+    s = (r - r[0]) / (r[-1] - r[0])
+    id_station = np.argmin(abs(joint_position - s))
+    span = np.average([r[id_station] - r[id_station - 1], r[id_station + 1] - r[id_station]])
+    return id_station, span
+
+
+class PreCompStationCache(object):
+    """Bounded cache of the PreComp results of single span stations keyed by a hash of the station inputs.
+
+    Thickness-only design variables and the finite difference steps of a single spar cap or trailing
+    edge control point change the layup of a few span stations at a time, so the other stations can be
+    served from the cache instead of rebuilding their profiles and composite stacks.  The least recently
+    used station is discarded once more than ``maxsize`` are stored.  Cached stations are shared, so they
+    must be treated as read-only.
+    """
+
+    def __init__(self, maxsize=256):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._stations = OrderedDict()
+
+    def __len__(self):
+        return len(self._stations)
+
+    def key(self, *values):
+        """Hash of the arrays, numbers and strings in values"""
+        h = hashlib.sha1()
+        for val in values:
+            val = np.asarray(val)
+            h.update(str(val.shape).encode())
+            if val.dtype.kind in "biuf":
+                h.update(np.ascontiguousarray(val, dtype=np.float64).tobytes())
+            else:
+                h.update(str(val.tolist()).encode())
+        return h.hexdigest()
+
+    def get(self, key):
+        """Return the cached results of a station, or None if it needs to be computed"""
+        if key in self._stations:
+            self.hits += 1
+            self._stations.move_to_end(key)
+            return self._stations[key]
+
+        self.misses += 1
+        return None
+
+    def put(self, key, station):
+        self._stations[key] = station
+        while len(self._stations) > self.maxsize:
+            self._stations.popitem(last=False)
+
+    def clear(self):
+        self.hits = 0
+        self.misses = 0
+        self._stations.clear()
+
+
 class RunPreComp(ExplicitComponent):
     # Openmdao component to run precomp and generate the elastic properties of a wind turbine blade
     def initialize(self):
         self.options.declare("modeling_options")
         self.options.declare("opt_options")
+        self.station_cache = PreCompStationCache()
+        self.station_pool = None
 
     def setup(self):
         rotorse_options = self.options["modeling_options"]["WISDEM"]["RotorSE"]
@@ -26,6 +511,9 @@ class RunPreComp(ExplicitComponent):
         mat_init_options = self.options["modeling_options"]["materials"]
         self.n_mat = n_mat = mat_init_options["n_mat"]
         self.verbosity = self.options["modeling_options"]["General"]["verbosity"]
+        self.precomp_workers = rotorse_options["precomp_workers"]
+        self.precomp_pool = rotorse_options["precomp_pool"]
+        self.station_pool = None
 
         self.te_ss_var = rotorse_options["te_ss"]
         self.te_ps_var = rotorse_options["te_ps"]
@@ -292,433 +780,80 @@ class RunPreComp(ExplicitComponent):
             desc="trailing edge reinforcement, pressure side, boolean of materials in each composite layer spanwise, passed as floats for differentiablity, used for Fatigue Analysis",
         )
 
-    def compute(self, inputs, outputs, discrete_inputs, discrete_outputs):
-        ##############################
-        def region_stacking(
-            i,
-            idx,
-            start_nd_arc,
-            end_nd_arc,
-            layer_name,
-            layer_thickness,
-            fiber_orientation,
-            layer_mat,
-            material_dict,
-            materials,
-            region_loc,
-        ):
-            # Receive start and end of composite sections chordwise, find which composites layers are in each
-            # chordwise regions, generate the precomp composite class instance
-
-            # error handling to makes sure there were no numeric errors causing values very close too, but not exactly, 0 or 1
-            start_nd_arc = [
-                0.0 if start_nd_arci != 0.0 and np.isclose(start_nd_arci, 0.0) else start_nd_arci
-                for start_nd_arci in start_nd_arc
-            ]
-            end_nd_arc = [
-                0.0 if end_nd_arci != 0.0 and np.isclose(end_nd_arci, 0.0) else end_nd_arci
-                for end_nd_arci in end_nd_arc
-            ]
-            start_nd_arc = [
-                1.0 if start_nd_arci != 1.0 and np.isclose(start_nd_arci, 1.0) else start_nd_arci
-                for start_nd_arci in start_nd_arc
-            ]
-            end_nd_arc = [
-                1.0 if end_nd_arci != 1.0 and np.isclose(end_nd_arci, 1.0) else end_nd_arci
-                for end_nd_arci in end_nd_arc
-            ]
-
-            # region end points
-            dp = sorted(list(set(start_nd_arc + end_nd_arc)))
-
-            # initialize
-            n_plies = []
-            thk = []
-            theta = []
-            mat_idx = []
-
-            # loop through division points, find what layers make up the stack between those bounds
-            for i_reg, (dp0, dp1) in enumerate(zip(dp[0:-1], dp[1:])):
-                n_pliesi = []
-                thki = []
-                thetai = []
-                mati = []
-                for i_sec, start_nd_arci, end_nd_arci in zip(idx, start_nd_arc, end_nd_arc):
-                    name = layer_name[i_sec]
-                    if start_nd_arci <= dp0 and end_nd_arci >= dp1:
-                        if name in region_loc.keys():
-                            if region_loc[name][i] == None:
-                                region_loc[name][i] = [i_reg]
-                            else:
-                                region_loc[name][i].append(i_reg)
-
-                        n_pliesi.append(1.0)
-                        thki.append(layer_thickness[i_sec])
-                        if fiber_orientation[i_sec] == None:
-                            thetai.append(0.0)
-                        else:
-                            thetai.append(fiber_orientation[i_sec])
-                        mati.append(material_dict[layer_mat[i_sec]])
-
-                n_plies.append(np.array(n_pliesi))
-                thk.append(np.array(thki))
-                theta.append(np.array(thetai))
-                mat_idx.append(np.array(mati))
-
-            # print('----------------------')
-            # print('dp', dp)
-            # print('n_plies', n_plies)
-            # print('thk', thk)
-            # print('theta', theta)
-            # print('mat_idx', mat_idx)
-            # print('materials', materials)
-
-            sec = CompositeSection(dp, n_plies, thk, theta, mat_idx, materials)
-            return sec, region_loc
-            ##############################
-
-        def web_stacking(
-            i,
-            web_idx,
-            web_start_nd_arc,
-            web_end_nd_arc,
-            layer_thickness,
-            fiber_orientation,
-            layer_mat,
-            material_dict,
-            materials,
-            flatback,
-            upperCSi,
-        ):
-            dp = []
-            n_plies = []
-            thk = []
-            theta = []
-            mat_idx = []
-
-            if len(web_idx) > 0:
-                dp = np.mean((np.abs(web_start_nd_arc), np.abs(web_start_nd_arc)), axis=0).tolist()
-
-                dp_all = [
-                    [start_nd_arci, end_nd_arci]
-                    for start_nd_arci, end_nd_arci in zip(web_start_nd_arc, web_end_nd_arc)
-                ]
-                _, web_ids = np.unique(dp_all, axis=0, return_inverse=True)
-                for webi in np.unique(web_ids):
-                    # store variable values (thickness, orientation, material) for layers that make up each web, based on the mapping array web_ids
-                    n_pliesi = [1.0 for i_reg, web_idi in zip(web_idx, web_ids) if web_idi == webi]
-                    thki = [layer_thickness[i_reg] for i_reg, web_idi in zip(web_idx, web_ids) if web_idi == webi]
-                    thetai = [fiber_orientation[i_reg] for i_reg, web_idi in zip(web_idx, web_ids) if web_idi == webi]
-                    thetai = [0.0 if theta_ij == None else theta_ij for theta_ij in thetai]
-                    mati = [
-                        material_dict[layer_mat[i_reg]] for i_reg, web_idi in zip(web_idx, web_ids) if web_idi == webi
-                    ]
-
-                    n_plies.append(np.array(n_pliesi))
-                    thk.append(np.array(thki))
-                    theta.append(np.array(thetai))
-                    mat_idx.append(np.array(mati))
-
-            if flatback:
-                dp.append(1.0)
-                n_plies.append(upperCSi.n_plies[-1])
-                thk.append(upperCSi.t[-1])
-                theta.append(upperCSi.theta[-1])
-                mat_idx.append(upperCSi.mat_idx[-1])
-
-            dp_out = sorted(list(set(dp)))
-
-            sec = CompositeSection(dp_out, n_plies, thk, theta, mat_idx, materials)
-            return sec
-            ##############################
-
-        layer_name = self.options["modeling_options"]["WISDEM"]["RotorSE"]["layer_name"]
-        layer_mat = self.options["modeling_options"]["WISDEM"]["RotorSE"]["layer_mat"]
-
-        upperCS = [None] * self.n_span
-        lowerCS = [None] * self.n_span
-        websCS = [None] * self.n_span
-        profile = [None] * self.n_span
-        chord = inputs["chord"]
-        area = np.zeros_like(chord)
-        region_loc_vars = [self.te_ss_var, self.te_ps_var, self.spar_cap_ss_var, self.spar_cap_ps_var]
-
-        region_loc_ss = {}  # track precomp regions for user selected composite layers
-        region_loc_ps = {}
-        for var in region_loc_vars:
-            region_loc_ss[var] = [None] * self.n_span
-            region_loc_ps[var] = [None] * self.n_span
+        # Section properties and strain locations in the order returned by PreComp
+        self.precomp_outputs = [
+            "EIxx",
+            "EIyy",
+            "GJ",
+            "EA",
+            "EIxy",
+            "EA_EIxx",
+            "EA_EIyy",
+            "EIxx_GJ",
+            "EIyy_GJ",
+            "EA_GJ",
+            "rhoA",
+            "A",
+            "rhoJ",
+            "Tw_iner",
+            "flap_iner",
+            "edge_iner",
+            "x_tc",
+            "y_tc",
+            "x_sc",
+            "y_sc",
+            "x_cg",
+            "y_cg",
+            "xu_spar",
+            "xl_spar",
+            "yu_spar",
+            "yl_spar",
+            "xu_te",
+            "xl_te",
+            "yu_te",
+            "yl_te",
+        ]
+        of = [name for name in self.precomp_outputs if name != "A"]
+        span = np.arange(n_span)
+
+        # Each station depends on its own chord, offset and layers, and on the twist and span of its neighbours
+        # through the twist rate
+        self.band_rows, self.band_cols = np.nonzero(np.abs(span[:, np.newaxis] - span[np.newaxis, :]) <= 1)
+        self.declare_partials(of, ["chord", "section_offset_y"], rows=span, cols=span)
+        self.declare_partials(of, ["theta", "r"], rows=self.band_rows, cols=self.band_cols)
+        self.declare_partials(
+            self.precomp_outputs, "layer_thickness", rows=np.tile(span, n_layers), cols=np.arange(n_layers * n_span)
+        )
+        self.declare_partials("A", "chord", rows=span, cols=span)
+        self.declare_partials("rhoA", "joint_mass")
+        self.declare_partials("rhoA", "joint_position", method="fd")
+        self.declare_partials("z", "r", rows=span, cols=span, val=1.0)
+
+        # Each station also depends on its own profile, which places the layer edges through the arc length.
+        # This is not complex safe, so it is finite differenced, and only when the profiles are relevant to
+        # the requested derivatives.  Each step only rebuilds the stepped station, the others come from the
+        # station cache.  The profiles are normalized by the chord, so a small absolute step is used.
+        self.declare_partials(
+            self.precomp_outputs,
+            "coord_xy_interp",
+            rows=np.repeat(span, 2 * n_xy),
+            cols=np.arange(2 * n_xy * n_span),
+            method="fd",
+            step=1e-8,
+        )
 
+    def compute(self, inputs, outputs, discrete_inputs, discrete_outputs):
         ## Materials
-        material_dict = {}
-        materials = []
-        for i_mat in range(self.n_mat):
-            materials.append(
-                Orthotropic2DMaterial(
-                    inputs["E"][i_mat, 0],
-                    inputs["E"][i_mat, 1],
-                    inputs["G"][i_mat, 0],
-                    inputs["nu"][i_mat, 0],
-                    inputs["rho"][i_mat],
-                    discrete_inputs["mat_name"][i_mat],
-                )
-            )
-            material_dict[discrete_inputs["mat_name"][i_mat]] = i_mat
+        materials, material_dict = self.precomp_materials(inputs, discrete_inputs)
 
         ## Spanwise
-        for i in range(self.n_span):
-            # time0 = time.time()
-
-            ## Profiles
-            # rotate
-            profile_i = inputs["coord_xy_interp"][i, :, :]
-            profile_i_rot = profile_i
-
-            # normalize
-            profile_i_rot[:, 0] -= min(profile_i_rot[:, 0])
-            profile_i_rot = profile_i_rot / max(profile_i_rot[:, 0])
-
-            profile_i_rot_precomp = copy.copy(profile_i_rot)
-            idx_s = 0
-            idx_le_precomp = np.argmax(profile_i_rot_precomp[:, 0])
-            if idx_le_precomp != 0:
-                if profile_i_rot_precomp[0, 0] == profile_i_rot_precomp[-1, 0]:
-                    idx_s = 1
-                profile_i_rot_precomp = np.vstack(
-                    (profile_i_rot_precomp[idx_le_precomp:], profile_i_rot_precomp[idx_s:idx_le_precomp, :])
-                )
-            profile_i_rot_precomp[:, 1] -= profile_i_rot_precomp[np.argmin(profile_i_rot_precomp[:, 0]), 1]
-
-            # # renormalize
-            profile_i_rot_precomp[:, 0] -= min(profile_i_rot_precomp[:, 0])
-            profile_i_rot_precomp = profile_i_rot_precomp / max(profile_i_rot_precomp[:, 0])
-
-            if profile_i_rot_precomp[-1, 0] != 1.0:
-                profile_i_rot_precomp = np.vstack((profile_i_rot_precomp, profile_i_rot_precomp[0, :]))
-
-            # 'web' at trailing edge needed for flatback airfoils
-            if (
-                profile_i_rot_precomp[0, 1] != profile_i_rot_precomp[-1, 1]
-                and profile_i_rot_precomp[0, 0] == profile_i_rot_precomp[-1, 0]
-            ):
-                flatback = True
-            else:
-                flatback = False
-
-            profile[i] = Profile.initWithTEtoTEdata(profile_i_rot_precomp[:, 0], profile_i_rot_precomp[:, 1])
-
-            # import matplotlib.pyplot as plt
-            # plt.plot(profile_i_rot_precomp[:,0], profile_i_rot_precomp[:,1])
-            # plt.axis('equal')
-            # plt.title(i)
-            # plt.show()
-
-            idx_le = np.argmin(profile_i_rot[:, 0])
-
-            profile_i_arc = arc_length(profile_i_rot)
-            arc_L = profile_i_arc[-1]
-            profile_i_arc /= arc_L
-            arc_L_m = arc_L * chord[i]
-
-            loc_LE = profile_i_arc[idx_le]
-            len_PS = 1.0 - loc_LE
-
-            ## Composites
-            ss_idx = []
-            ss_start_nd_arc = []
-            ss_end_nd_arc = []
-            ps_idx = []
-            ps_start_nd_arc = []
-            ps_end_nd_arc = []
-            web_start_nd_arc = []
-            web_end_nd_arc = []
-            web_idx = []
-
-            # Determine spanwise composite layer elements that are non-zero at this spanwise location,
-            # determine their chord-wise start and end location on the pressure and suctions side
-
-            spline_arc2xnd = PchipInterpolator(profile_i_arc, profile_i_rot[:, 0])
-
-            # time1 = time.time()
-            for idx_sec in range(self.n_layers):
-                if discrete_inputs["build_layer"][idx_sec] >= 0:
-                    if inputs["layer_thickness"][idx_sec, i] > 1.0e-6:
-                        area[i] += arc_L_m * (inputs["layer_end_nd"][idx_sec, i] - 
-                                              inputs["layer_start_nd"][idx_sec, i]) * (
-                                              inputs["layer_thickness"][idx_sec, i])
-                        if inputs["layer_start_nd"][idx_sec, i] < loc_LE or inputs["layer_end_nd"][idx_sec, i] < loc_LE:
-                            ss_idx.append(idx_sec)
-                            if inputs["layer_start_nd"][idx_sec, i] < loc_LE:
-                                # ss_start_nd_arc.append(sec['start_nd_arc']['values'][i])
-                                ss_end_nd_arc_temp = float(spline_arc2xnd(inputs["layer_start_nd"][idx_sec, i]))
-                                if ss_end_nd_arc_temp > 1:
-                                    logger.debug(
-                                        "Error in the definition of material "
-                                        + layer_name[idx_sec]
-                                        + ". It cannot fit in the section number "
-                                        + str(i)
-                                        + " at span location "
-                                        + str(inputs["r"][i] / inputs["r"][-1] * 100.0)
-                                        + " %. Variable ss_end_nd_arc_temp was equal "
-                                        + " to "
-                                        + str(ss_end_nd_arc_temp)
-                                        + " and is not set to 1"
-                                    )
-                                    ss_end_nd_arc_temp = 1.
-                                if ss_end_nd_arc_temp < 0:
-                                    logger.debug(
-                                        "Error in the definition of material "
-                                        + layer_name[idx_sec]
-                                        + ". It cannot fit in the section number "
-                                        + str(i)
-                                        + " at span location "
-                                        + str(inputs["r"][i] / inputs["r"][-1] * 100.0)
-                                        + " %. Variable ss_end_nd_arc_temp was equal "
-                                        + " to "
-                                        + str(ss_end_nd_arc_temp)
-                                        + " and is not set to 0"
-                                    )
-                                    ss_end_nd_arc_temp = 0.
-                                if ss_end_nd_arc_temp == profile_i_rot[0, 0] and profile_i_rot[0, 0] != 1.0:
-                                    ss_end_nd_arc_temp = 1.0
-                                ss_end_nd_arc.append(ss_end_nd_arc_temp)
-                            else:
-                                ss_end_nd_arc.append(1.0)
-                            # ss_end_nd_arc.append(min(sec['end_nd_arc']['values'][i], loc_LE)/loc_LE)
-                            if inputs["layer_end_nd"][idx_sec, i] < loc_LE:
-                                ss_start_nd_arc.append(float(spline_arc2xnd(inputs["layer_end_nd"][idx_sec, i])))
-                            else:
-                                ss_start_nd_arc.append(0.0)
-
-                        if inputs["layer_start_nd"][idx_sec, i] > loc_LE or inputs["layer_end_nd"][idx_sec, i] > loc_LE:
-                            ps_idx.append(idx_sec)
-                            # ps_start_nd_arc.append((max(sec['start_nd_arc']['values'][i], loc_LE)-loc_LE)/len_PS)
-                            # ps_end_nd_arc.append((min(sec['end_nd_arc']['values'][i], 1.)-loc_LE)/len_PS)
-
-                            if (
-                                inputs["layer_start_nd"][idx_sec, i] > loc_LE
-                                and inputs["layer_end_nd"][idx_sec, i] < loc_LE
-                            ):
-                                # ps_start_nd_arc.append(float(remap2grid(profile_i_arc, profile_i_rot[:,0], sec['start_nd_arc']['values'][i])))
-                                ps_end_nd_arc.append(1.0)
-                            else:
-                                ps_end_nd_arc_temp = float(spline_arc2xnd(inputs["layer_end_nd"][idx_sec, i]))
-                                if (
-                                    np.isclose(ps_end_nd_arc_temp, profile_i_rot[-1, 0], atol=1.0e-2)
-                                    and profile_i_rot[-1, 0] != 1.0
-                                ):
-                                    ps_end_nd_arc_temp = 1.0
-                                if ps_end_nd_arc_temp > 1.0:
-                                    ps_end_nd_arc_temp = 1.0
-                                ps_end_nd_arc.append(ps_end_nd_arc_temp)
-                            if inputs["layer_start_nd"][idx_sec, i] < loc_LE:
-                                ps_start_nd_arc.append(0.0)
-                            else:
-                                ps_start_nd_arc.append(float(spline_arc2xnd(inputs["layer_start_nd"][idx_sec, i])))
-                else:
-                    target_idx = - discrete_inputs["build_layer"][idx_sec] - 1
-
-                    if inputs["layer_thickness"][idx_sec, i] > 1.0e-6:
-                        web_idx.append(idx_sec)
-
-                        web_start_nd = inputs["web_start_nd"][int(target_idx), i]
-                        web_end_nd = inputs["web_end_nd"][int(target_idx), i]
-
-                        start_nd_arc = float(spline_arc2xnd(web_start_nd))
-                        end_nd_arc = float(spline_arc2xnd(web_end_nd))
-
-                        web_start_nd_arc.append(start_nd_arc)
-                        web_end_nd_arc.append(end_nd_arc)
-
-                        # Compute height the webs along span
-                        id_start = np.argmin(abs(profile_i_arc - web_start_nd))
-                        id_end = np.argmin(abs(profile_i_arc - web_end_nd))
-                        web_height = np.sqrt((profile_i[id_start, 0] - profile_i[id_end, 0])**2 +
-                                             (profile_i[id_start, 1] - profile_i[id_end, 1])**2) * (
-                                             chord[i])
-
-                        area[i] += web_height * inputs["layer_thickness"][idx_sec, i]
-
-            # time1 = time.time() - time1
-            # print(time1)
+        stations = self.precomp_stations(inputs, discrete_inputs, materials, material_dict)
 
-            # cap layer starts and ends within 0 and 1
-            ss_start_nd_arc = [max(0, min(1, value)) for value in ss_start_nd_arc]
-            ss_end_nd_arc = [max(0, min(1, value)) for value in ss_end_nd_arc]
-            # generate the Precomp composite stacks for chordwise regions
-            upperCS[i], region_loc_ss = region_stacking(
-                i,
-                ss_idx,
-                ss_start_nd_arc,
-                ss_end_nd_arc,
-                layer_name,
-                inputs["layer_thickness"][:, i],
-                inputs["fiber_orientation"][:, i],
-                layer_mat,
-                material_dict,
-                materials,
-                region_loc_ss,
-            )
-            lowerCS[i], region_loc_ps = region_stacking(
-                i,
-                ps_idx,
-                ps_start_nd_arc,
-                ps_end_nd_arc,
-                layer_name,
-                inputs["layer_thickness"][:, i],
-                inputs["fiber_orientation"][:, i],
-                layer_mat,
-                material_dict,
-                materials,
-                region_loc_ps,
-            )
-            if len(web_idx) > 0 or flatback:
-                websCS[i] = web_stacking(
-                    i,
-                    web_idx,
-                    web_start_nd_arc,
-                    web_end_nd_arc,
-                    inputs["layer_thickness"][:, i],
-                    inputs["fiber_orientation"][:, i],
-                    layer_mat,
-                    material_dict,
-                    materials,
-                    flatback,
-                    upperCS[i],
-                )
-            else:
-                websCS[i] = CompositeSection([], [], [], [], [], [])
-
-        sector_idx_spar_cap_ss = [
-            None if regs == None else regs[int(len(regs) / 2)] for regs in region_loc_ss[self.spar_cap_ss_var]
-        ]
-        sector_idx_spar_cap_ps = [
-            None if regs == None else regs[int(len(regs) / 2)] for regs in region_loc_ps[self.spar_cap_ps_var]
-        ]
-        sector_idx_te_ss = [
-            None if regs == None else regs[int(len(regs) / 2)] for regs in region_loc_ss[self.te_ss_var]
-        ]
-        sector_idx_te_ps = [
-            None if regs == None else regs[int(len(regs) / 2)] for regs in region_loc_ps[self.te_ps_var]
-        ]
-
-        # Get Beam Properties
-        beam = PreComp(
-            inputs["r"],
-            inputs["chord"],
-            inputs["theta"],
-            inputs["section_offset_y"]/inputs["chord"],
-            inputs["precurve"],
-            inputs["presweep"],
-            profile,
-            materials,
-            upperCS,
-            lowerCS,
-            websCS,
-            sector_idx_spar_cap_ps,
-            sector_idx_spar_cap_ss,
-            sector_idx_te_ps,
-            sector_idx_te_ss,
+        upperCS = [station[1] for station in stations]
+        lowerCS = [station[2] for station in stations]
+        area = np.array([station[4] for station in stations])
+        sector_idx_spar_cap_ss, sector_idx_spar_cap_ps, sector_idx_te_ss, sector_idx_te_ps = zip(
+            *[station[5] for station in stations]
         )
         (
             EIxx,
@@ -743,15 +878,10 @@ class RunPreComp(ExplicitComponent):
             y_sc,
             x_cg,
             y_cg,
-        ) = beam.sectionProperties()
-
-        # outputs['eps_crit_spar'] = beam.panelBucklingStrain(sector_idx_spar_cap_ss)
-        # outputs['eps_crit_te'] = beam.panelBucklingStrain(sector_idx_te_ss)
-
-        xu_spar, xl_spar, yu_spar, yl_spar = beam.criticalStrainLocations(
-            sector_idx_spar_cap_ss, sector_idx_spar_cap_ps
-        )
-        xu_te, xl_te, yu_te, yl_te = beam.criticalStrainLocations(sector_idx_te_ss, sector_idx_te_ps)
+        ) = np.array([station[6] for station in stations]).T
+        xu_spar, xl_spar, yu_spar, yl_spar, xu_te, xl_te, yu_te, yl_te = np.array(
+            [station[7] for station in stations]
+        ).T
 
         # Store what materials make up the composites for SC/TE
         for i in range(self.n_span):
@@ -770,14 +900,7 @@ class RunPreComp(ExplicitComponent):
                         outputs["te_ps_mats"][i, j] = 1.0
         rhoA_joint = copy.copy(rhoA)
         if inputs["joint_mass"] > 0.0:
-            s = (inputs["r"] - inputs["r"][0]) / (inputs["r"][-1] - inputs["r"][0])
-            id_station = np.argmin(abs(inputs["joint_position"] - s))
-            span = np.average(
-                [
-                    inputs["r"][id_station] - inputs["r"][id_station - 1],
-                    inputs["r"][id_station + 1] - inputs["r"][id_station],
-                ]
-            )
+            id_station, span = joint_station(inputs["r"], inputs["joint_position"])
             rhoA_joint[id_station] += inputs["joint_mass"][0] / span
 
         outputs["z"] = inputs["r"]
@@ -814,6 +937,249 @@ class RunPreComp(ExplicitComponent):
         outputs["yu_te"] = yu_te
         outputs["yl_te"] = yl_te
 
+    def compute_partials(self, inputs, J, discrete_inputs):
+        # Complex step through the PreComp evaluation of the stations, with one batch row per station and
+        # input.  The layer thicknesses are stepped through the composite stacks, while the rows of the
+        # chord, twist, twist rate and leading edge location reuse the stacks of the unperturbed stations.
+        n_span = self.n_span
+        span = np.arange(n_span)
+        h = 1e-30
+        chord = inputs["chord"]
+        theta = inputs["theta"]
+        layer_thickness = inputs["layer_thickness"]
+        th_prime = tw_rate(inputs["r"], theta)
+        materials, material_dict = self.precomp_materials(inputs, discrete_inputs)
+        stations = self.precomp_stations(inputs, discrete_inputs, materials, material_dict)
+
+        # Layers that are part of the composite stacks of each station
+        i_layer, k_layer = np.nonzero(layer_thickness.T > 1.0e-6)
+        n_lay = i_layer.size
+        thickness_cs = layer_thickness[:, i_layer].astype(np.complex128)
+        thickness_cs[k_layer, np.arange(n_lay)] += 1j * h
+        sections = self.precomp_sections(inputs, discrete_inputs, materials, material_dict, i_layer, thickness_cs)
+
+        # Then the chord, twist, twist rate and reference axis offset of every station
+        row_station = np.r_[i_layer, np.tile(span, 4)]
+        step = np.zeros((4, row_station.size), dtype=np.complex128)
+        for k in range(4):
+            step[k, n_lay + k * n_span : n_lay + (k + 1) * n_span] = 1j * h
+        chord_cs = chord[row_station] + step[0]
+        section_properties, strain_locations = self.precomp_beams(
+            inputs,
+            materials,
+            row_station,
+            sections + 4 * [station[:6] for station in stations],
+            chord_cs,
+            theta[row_station] + step[1],
+            th_prime[row_station] + step[2],
+            (inputs["section_offset_y"][row_station] + step[3]) / chord_cs,
+        )
+        dy = np.vstack((section_properties, strain_locations)).imag / h
+        dy_dthick = np.zeros((dy.shape[0], self.n_layers, n_span))
+        dy_dthick[:, k_layer, i_layer] = dy[:, :n_lay]
+        dy_dchord, dy_dtheta, dy_dthprime, dy_doffset = np.split(dy[:, n_lay:], 4, axis=1)
+
+        # Twist rate from the twist and span of the neighbouring stations
+        dthprime_dtheta = np.zeros((n_span, n_span))
+        dthprime_dr = np.zeros((n_span, n_span))
+        for i in range(n_span):
+            dthprime_dtheta[:, i] = tw_rate(inputs["r"], theta + 1j * h * (span == i)).imag / h
+            dthprime_dr[:, i] = tw_rate(inputs["r"] + 1j * h * (span == i), theta).imag / h
+        band = (self.band_rows, self.band_cols)
+
+        for k, name in enumerate(self.precomp_outputs):
+            if name == "A":
+                continue
+            J[name, "layer_thickness"] = dy_dthick[k].flatten()
+            J[name, "chord"] = dy_dchord[k]
+            J[name, "section_offset_y"] = dy_doffset[k]
+            J[name, "theta"] = (dy_dthprime[k][:, np.newaxis] * dthprime_dtheta + np.diag(dy_dtheta[k]))[band]
+            J[name, "r"] = (dy_dthprime[k][:, np.newaxis] * dthprime_dr)[band]
+
+        # The area is linear in the layer thicknesses and the chord
+        darea_dthick = np.zeros((self.n_layers, n_span))
+        darea_dthick[k_layer, i_layer] = np.array([section[4] for section in sections]).imag / h
+        J["A", "layer_thickness"] = darea_dthick.flatten()
+        J["A", "chord"] = np.array([station[4] for station in stations]) / chord
+
+        # Joint mass smeared over the span around its station
+        drhoA_djoint = np.zeros((n_span, 1))
+        drhoA_dr = np.zeros((n_span, n_span))
+        joint_mass = inputs["joint_mass"][0]
+        if joint_mass > 0.0:
+            id_station, span_joint = joint_station(inputs["r"], inputs["joint_position"])
+            drhoA_djoint[id_station] = 1.0 / span_joint
+            drhoA_dr[id_station, id_station - 1] = 0.5 * joint_mass / span_joint**2
+            drhoA_dr[id_station, id_station + 1] = -0.5 * joint_mass / span_joint**2
+        J["rhoA", "joint_mass"] = drhoA_djoint
+        J["rhoA", "r"] += drhoA_dr[band]
+
+    def precomp_stations(self, inputs, discrete_inputs, materials, material_dict):
+        # PreComp results of all span stations: the profile, composite sections, area and sectors of
+        # precomp_sections, then the section properties and strain locations of precomp_beams
+        layer_name = self.options["modeling_options"]["WISDEM"]["RotorSE"]["layer_name"]
+        layer_mat = self.options["modeling_options"]["WISDEM"]["RotorSE"]["layer_mat"]
+
+        chord = inputs["chord"]
+        leLoc = inputs["section_offset_y"] / inputs["chord"]
+        th_prime = tw_rate(inputs["r"], inputs["theta"])
+        region_loc_vars = [self.te_ss_var, self.te_ps_var, self.spar_cap_ss_var, self.spar_cap_ps_var]
+
+        # Serve the stations whose inputs have not changed from the cache
+        cache = self.station_cache
+        common = cache.key(
+            inputs["E"],
+            inputs["G"],
+            inputs["nu"],
+            inputs["rho"],
+            discrete_inputs["mat_name"],
+            discrete_inputs["build_layer"],
+            layer_name,
+            layer_mat,
+            region_loc_vars,
+        )
+        keys = [
+            cache.key(
+                common,
+                inputs["coord_xy_interp"][i, :, :],
+                chord[i],
+                inputs["r"][i] / inputs["r"][-1],
+                inputs["theta"][i],
+                th_prime[i],
+                leLoc[i],
+                inputs["precurve"][i],
+                inputs["presweep"][i],
+                inputs["layer_thickness"][:, i],
+                inputs["layer_start_nd"][:, i],
+                inputs["layer_end_nd"][:, i],
+                inputs["fiber_orientation"][:, i],
+                inputs["web_start_nd"][:, i],
+                inputs["web_end_nd"][:, i],
+            )
+            for i in range(self.n_span)
+        ]
+        stations = [cache.get(key) for key in keys]
+        idx = [i for i in range(self.n_span) if stations[i] is None]
+
+        if len(idx) > 0:
+            sections = self.precomp_sections(
+                inputs, discrete_inputs, materials, material_dict, idx, inputs["layer_thickness"][:, idx]
+            )
+            section_properties, strain_locations = self.precomp_beams(
+                inputs, materials, idx, sections, chord[idx], inputs["theta"][idx], th_prime[idx], leLoc[idx]
+            )
+            for j, i in enumerate(idx):
+                stations[i] = sections[j] + (section_properties[:, j], strain_locations[:, j])
+                cache.put(keys[i], stations[i])
+
+        return stations
+
+    def precomp_materials(self, inputs, discrete_inputs):
+        # PreComp materials and the index of each material name
+        material_dict = {}
+        materials = []
+        for i_mat in range(self.n_mat):
+            materials.append(
+                Orthotropic2DMaterial(
+                    inputs["E"][i_mat, 0],
+                    inputs["E"][i_mat, 1],
+                    inputs["G"][i_mat, 0],
+                    inputs["nu"][i_mat, 0],
+                    inputs["rho"][i_mat],
+                    discrete_inputs["mat_name"][i_mat],
+                )
+            )
+            material_dict[discrete_inputs["mat_name"][i_mat]] = i_mat
+        return materials, material_dict
+
+    def precomp_sections(self, inputs, discrete_inputs, materials, material_dict, idx, layer_thickness):
+        # Profiles and composite stacks of the span stations idx, with the layer thicknesses of each station
+        # in the columns of layer_thickness.  Returns the profile, upper, lower and web composite sections,
+        # area and the sectors of the spar caps and trailing edge reinforcements (ss, ps, ss, ps) of each station.
+        layer_name = self.options["modeling_options"]["WISDEM"]["RotorSE"]["layer_name"]
+        layer_mat = self.options["modeling_options"]["WISDEM"]["RotorSE"]["layer_mat"]
+        region_loc_vars = [self.te_ss_var, self.te_ps_var, self.spar_cap_ss_var, self.spar_cap_ps_var]
+
+        args = [
+            (
+                i,
+                inputs["coord_xy_interp"][i, :, :],
+                inputs["chord"][i],
+                inputs["r"][i] / inputs["r"][-1],
+                layer_thickness[:, j],
+                inputs["layer_start_nd"][:, i],
+                inputs["layer_end_nd"][:, i],
+                inputs["fiber_orientation"][:, i],
+                inputs["web_start_nd"][:, i],
+                inputs["web_end_nd"][:, i],
+                discrete_inputs["build_layer"],
+                layer_name,
+                layer_mat,
+                material_dict,
+                materials,
+                region_loc_vars,
+            )
+            for j, i in enumerate(idx)
+        ]
+        if self.station_pool is None:
+            self.station_pool = StationPool(self.precomp_workers, self.precomp_pool)
+        sections = self.station_pool.map(precomp_section, args)
+
+        def sector_idx(regs):
+            return None if regs == None else regs[int(len(regs) / 2)]
+
+        return [
+            (
+                profile,
+                upperCS,
+                lowerCS,
+                websCS,
+                area,
+                (
+                    sector_idx(region_loc_ss[self.spar_cap_ss_var]),
+                    sector_idx(region_loc_ps[self.spar_cap_ps_var]),
+                    sector_idx(region_loc_ss[self.te_ss_var]),
+                    sector_idx(region_loc_ps[self.te_ps_var]),
+                ),
+            )
+            for profile, upperCS, lowerCS, websCS, area, region_loc_ss, region_loc_ps in sections
+        ]
+
+    def precomp_beams(self, inputs, materials, idx, sections, chord, theta, th_prime, leLoc):
+        # Section properties and critical strain locations of the span stations idx from their profiles and
+        # composite stacks in sections, as arrays over the stations in the order of precomp_outputs
+        profile, upperCS, lowerCS, websCS, _, sector_idx = zip(*sections)
+        sector_idx_spar_cap_ss, sector_idx_spar_cap_ps, sector_idx_te_ss, sector_idx_te_ps = zip(*sector_idx)
+
+        # Get Beam Properties, with the twist rate of the full span
+        beam = PreComp(
+            inputs["r"][idx],
+            chord,
+            theta,
+            leLoc,
+            inputs["precurve"][idx],
+            inputs["presweep"][idx],
+            list(profile),
+            materials,
+            list(upperCS),
+            list(lowerCS),
+            list(websCS),
+            sector_idx_spar_cap_ps,
+            sector_idx_spar_cap_ss,
+            sector_idx_te_ps,
+            sector_idx_te_ss,
+            th_prime=th_prime,
+        )
+        section_properties = np.array(beam.sectionProperties())
+
+        # outputs['eps_crit_spar'] = beam.panelBucklingStrain(sector_idx_spar_cap_ss)
+        # outputs['eps_crit_te'] = beam.panelBucklingStrain(sector_idx_te_ss)
+
+        strain_locations = np.array(
+            beam.criticalStrainLocations(sector_idx_spar_cap_ss, sector_idx_spar_cap_ps)
+            + beam.criticalStrainLocations(sector_idx_te_ss, sector_idx_te_ps)
+        )
+        return section_properties, strain_locations
 
 
 class TotalBladeProperties(ExplicitComponent):
@@ -10,15 +10,19 @@ import logging
 import numpy as np
 from openmdao.api import Group, ExplicitComponent
 from scipy.optimize import brentq, minimize, minimize_scalar
-from scipy.interpolate import PchipInterpolator
+from scipy.interpolate import PchipInterpolator, RectBivariateSpline
 
 from wisdem.ccblade.Polar import Polar
-from wisdem.ccblade.ccblade import CCBlade, CCAirfoil
-from wisdem.commonse.utilities import smooth_abs, smooth_min, linspace_with_deriv
+from wisdem.ccblade.ccblade import CCBlade, airfoil_cache
+from wisdem.commonse.utilities import smooth_abs, smooth_min, trapz_deriv, linspace_with_deriv
 from wisdem.commonse.distribution import WeibullWithMeanCDF
 
 logger = logging.getLogger("wisdem/weis")
 TOL = 1e-3
+WARM_DU = 0.05  # half width of the warm started rated speed bracket (m/s)
+WARM_DPITCH = 0.25  # half width of the warm started pitch brackets (deg)
+WARM_TOL = 1e-9  # tolerance of the warm started searches, fine enough for a finite difference step to move them
+MAX_PITCH_PERF = 90.0  # largest pitch the surrogate tables are widened to (deg)
 
 
 class RotorPower(Group):
@@ -138,6 +142,15 @@ class RegulatedPowerCurve(Group):
 class ComputePowerCurve(ExplicitComponent):
     """
     Iteratively call CCBlade to compute the power curve.
+
+    Analytic derivatives of the power curve and rated conditions are provided with
+    respect to the blade geometry and the control inputs. The rated speed and pitch
+    solves are differentiated with the implicit function theorem, through the rated
+    power condition, the peak shaving thrust limit, or, where pitch maximizes power,
+    its optimality condition. Derivatives with respect to rho, mu, lss_rpm,
+    generator_efficiency and peak_thrust_shaving are finite differenced. Derivatives with
+    respect to the airfoil polar tables (airfoils*) are not provided. With the surrogate power
+    curve, which looks the rotor coefficients up from tables, all derivatives are finite differenced.
     """
 
     def initialize(self):
@@ -153,6 +166,21 @@ class ComputePowerCurve(ExplicitComponent):
         self.fix_pitch_regI12 = modeling_options["WISDEM"]["RotorSE"]["fix_pitch_regI12"]
         self.n_pc = modeling_options["WISDEM"]["RotorSE"]["n_pc"]
         self.n_pc_spline = modeling_options["WISDEM"]["RotorSE"]["n_pc_spline"]
+        self.warm_start = modeling_options["WISDEM"]["RotorSE"].get("warm_start_power_curve", False)
+        self.warm = None  # previous solution, used as a starting point when warm_start is set
+        self.surrogate = modeling_options["WISDEM"]["RotorSE"].get("surrogate_power_curve", False)
+        if self.surrogate:
+            self.n_tsr_perf = modeling_options["WISDEM"]["RotorSE"]["n_tsr_perf_surfaces"]
+            self.n_pitch_perf = modeling_options["WISDEM"]["RotorSE"]["n_pitch_perf_surfaces"]
+            self.n_U_perf = modeling_options["WISDEM"]["RotorSE"]["n_U_perf_surfaces"]
+            self.tsr_perf_bounds = [
+                modeling_options["WISDEM"]["RotorSE"]["min_tsr_perf_surfaces"],
+                modeling_options["WISDEM"]["RotorSE"]["max_tsr_perf_surfaces"],
+            ]
+            self.pitch_perf_bounds = [
+                modeling_options["WISDEM"]["RotorSE"]["min_pitch_perf_surfaces"],
+                modeling_options["WISDEM"]["RotorSE"]["max_pitch_perf_surfaces"],
+            ]
 
         # parameters
         self.add_input("v_min", val=0.0, units="m/s", desc="cut-in wind speed")
@@ -282,9 +310,101 @@ class ComputePowerCurve(ExplicitComponent):
         )
         self.add_output("rated_efficiency", val=1.0, desc="Efficiency at rated conditions")
 
-        # self.declare_partials('*', '*', method='fd', form='central', step=1e-6)
+        if self.surrogate:
+            n_tsr, n_pitch, n_U = self.n_tsr_perf, self.n_pitch_perf, self.n_U_perf
+            self.add_output("tsr_vector", val=np.zeros(n_tsr), desc="tip speed ratio grid of the performance tables")
+            self.add_output(
+                "pitch_vector", val=np.zeros(n_pitch), units="deg", desc="pitch grid of the performance tables"
+            )
+            self.add_output(
+                "U_vector", val=np.zeros(n_U), units="m/s", desc="wind speed grid of the performance tables"
+            )
+            self.add_output(
+                "Cp_aero_table",
+                val=np.zeros((n_tsr, n_pitch, n_U)),
+                desc="table of rotor aerodynamic power coefficient",
+            )
+            self.add_output(
+                "Ct_aero_table",
+                val=np.zeros((n_tsr, n_pitch, n_U)),
+                desc="table of rotor aerodynamic thrust coefficient",
+            )
+            self.add_output(
+                "Cq_aero_table",
+                val=np.zeros((n_tsr, n_pitch, n_U)),
+                desc="table of rotor aerodynamic torque coefficient",
+            )
 
-    def compute(self, inputs, outputs, discrete_inputs, discrete_outputs):
+        # Inputs with analytic derivatives, stacked into a single design vector in compute_partials
+        self.geom_derivs = [
+            ("r", "dr"),
+            ("chord", "dchord"),
+            ("theta", "dtheta"),
+            ("Rhub", "dRhub"),
+            ("Rtip", "dRtip"),
+            ("hub_height", "dhubHt"),
+            ("precone", "dprecone"),
+            ("tilt", "dtilt"),
+            ("yaw", "dyaw"),
+            ("shearExp", "dshear"),
+            ("precurve", "dprecurve"),
+            ("precurveTip", "dprecurveTip"),
+            ("presweep", "dpresweep"),
+            ("presweepTip", "dpresweepTip"),
+        ]
+        wrt = [k[0] for k in self.geom_derivs] + [
+            "v_min",
+            "v_max",
+            "rated_power",
+            "omega_min",
+            "omega_max",
+            "max_allowable_blade_tip_speed",
+            "tsr_operational",
+            "control_pitch",
+            "gearbox_efficiency",
+        ]
+        self.wrt_slices = {}
+        n_wrt = 0
+        for k in wrt:
+            size = n_span if k in ["r", "chord", "theta", "precurve", "presweep"] else 1
+            self.wrt_slices[k] = slice(n_wrt, n_wrt + size)
+            n_wrt += size
+        self.n_wrt = n_wrt
+
+        of = [
+            "V",
+            "Omega",
+            "pitch",
+            "P",
+            "P_aero",
+            "T",
+            "Q",
+            "M",
+            "Cp",
+            "Cp_aero",
+            "Ct_aero",
+            "Cq_aero",
+            "Cm_aero",
+            "rated_V",
+            "rated_Omega",
+            "rated_pitch",
+            "rated_T",
+            "rated_Q",
+            "rated_mech",
+            "rated_efficiency",
+        ]
+        wrt_fd = ["rho", "mu", "lss_rpm", "generator_efficiency", "peak_thrust_shaving"]
+        if self.surrogate:
+            # Table lookups are not differentiated, so the surrogate power curve is finite differenced throughout,
+            # with steps large enough for the searches through the tables to resolve
+            self.declare_partials(
+                of, wrt + wrt_fd, method="fd", form="central", step=1e-4, step_calc="rel_element", minimum_step=1e-4
+            )
+        else:
+            self.declare_partials(of, wrt)
+            self.declare_partials(of, wrt_fd, method="fd")
+
+    def compute(self, inputs, outputs, discrete_inputs, discrete_outputs, pitch_perf_max=None):
         # Saving out inputs for easy debugging of troublesome cases
         if self.options["debug"]:
             np.savez(
@@ -327,12 +447,13 @@ class ComputePowerCurve(ExplicitComponent):
         # Create Airfoil class instances
         af = [None] * self.n_span
         for i in range(self.n_span):
-            af[i] = CCAirfoil(
+            af[i] = airfoil_cache.get(
                 inputs["airfoils_aoa"],
                 inputs["airfoils_Re"],
                 inputs["airfoils_cl"][i, :, :],
                 inputs["airfoils_cd"][i, :, :],
                 inputs["airfoils_cm"][i, :, :],
+                tabulated=True,
             )
 
         self.ccblade = CCBlade(
@@ -359,7 +480,14 @@ class ComputePowerCurve(ExplicitComponent):
             discrete_inputs["hubloss"],
             discrete_inputs["wakerotation"],
             discrete_inputs["usecd"],
+            vectorized=True,
+            warm_start=self.warm_start,
         )
+        # Only the rated speed and pitch are carried over from the previous call.  The inflow angles the
+        # new CCBlade instance reuses are limited to this call, so its solutions don't depend on the
+        # order of earlier evaluations.
+        warm = self.warm
+        warm_tol = TOL if warm is None else WARM_TOL
 
         # JPJ: what is this grid for? Seems to be a special distribution of velocities
         # for the hub
@@ -403,11 +531,58 @@ class ComputePowerCurve(ExplicitComponent):
         else:
             Omega_max = np.inf
 
+        if np.isinf(Omega_max):
+            max_law = None
+        elif (
+            inputs["max_allowable_blade_tip_speed"][0] > 0.0
+            and Omega_max == inputs["max_allowable_blade_tip_speed"][0] / Rtip_cone
+        ):
+            max_law = "tip"
+        else:
+            max_law = "rpm"
+
         # Apply maximum and minimum rotor speed limits
         Omega_min = float(inputs["omega_min"][0]) * np.pi / 30.0
         Omega = np.maximum(np.minimum(Omega_tsr, Omega_max), Omega_min)
         Omega_rpm = Omega * 30.0 / np.pi
 
+        # Track which limit sets the rotor speed and how the pitch is found at each point, for compute_partials
+        omega_law = np.where(Omega == Omega_tsr, "tsr", np.where(Omega == Omega_min, "min", "max")).astype(object)
+        table_laws = (omega_law[0], omega_law[-1])
+        eval_tsr = np.ones(Uhub.shape, dtype=bool)
+        pitch_kind = np.full(Uhub.shape, "fixed", dtype=object)
+
+        # Tabulate the rotor coefficients once and look them up in the searches below instead of solving the BEM
+        if self.surrogate:
+            v_min = float(inputs["v_min"][0])
+            v_max = float(inputs["v_max"][0])
+            # Widen the grid to cover every tip speed ratio and pitch the searches can reach
+            tsr_bounds = [
+                min(self.tsr_perf_bounds[0], tsr, Omega[0] * Rtip_cone / v_max),
+                max(self.tsr_perf_bounds[1], tsr, Omega[0] * Rtip_cone / v_min),
+            ]
+            pitch_bounds = [
+                min(self.pitch_perf_bounds[0], min_pitch),
+                max(self.pitch_perf_bounds[1], min_pitch + 15.0, -np.inf if pitch_perf_max is None else pitch_perf_max),
+            ]
+            U_vector = np.linspace(v_min, v_max, self.n_U_perf) if self.n_U_perf > 1 else [0.5 * (v_min + v_max)]
+            perf = RotorPerformanceTable(
+                self.ccblade,
+                np.linspace(tsr_bounds[0], tsr_bounds[1], self.n_tsr_perf),
+                np.linspace(pitch_bounds[0], pitch_bounds[1], self.n_pitch_perf),
+                U_vector,
+            )
+            evaluate = perf.evaluate
+
+            outputs["tsr_vector"] = perf.tsr
+            outputs["pitch_vector"] = perf.pitch
+            outputs["U_vector"] = perf.U
+            outputs["Cp_aero_table"] = perf.tables["CP"]
+            outputs["Ct_aero_table"] = perf.tables["CT"]
+            outputs["Cq_aero_table"] = perf.tables["CQ"]
+        else:
+            evaluate = self.ccblade.evaluate
+
         # Create table lookup of total drivetrain efficiency, where rpm is first column and second column is gearbox*generator
         lss_rpm = inputs["lss_rpm"]
         gen_eff = inputs["generator_efficiency"]
@@ -425,7 +600,7 @@ class ComputePowerCurve(ExplicitComponent):
         driveEta = float(inputs["gearbox_efficiency"][0]) * gen_eff
 
         # Set baseline power production
-        myout, derivs = self.ccblade.evaluate(Uhub, Omega_tsr * 30.0 / np.pi, pitch, coefficients=True)
+        myout, derivs = evaluate(Uhub, Omega_tsr * 30.0 / np.pi, pitch, coefficients=True)
         P_aero, T, Q, M, Cp_aero, Ct_aero, Cq_aero, Cm_aero = [
             myout[key] for key in ["P", "T", "Q", "Mb", "CP", "CT", "CQ", "CMb"]
         ]
@@ -460,6 +635,7 @@ class ComputePowerCurve(ExplicitComponent):
         else:
             peak_thrust_shaving = False
         max_T = pts * T.max() if peak_thrust_shaving and found_rated else 1e16
+        rated0 = None  # rated point that sets the peak shaving thrust
 
         ## REGION II.5 and RATED ##
         # Solve for rated velocity
@@ -471,7 +647,7 @@ class ComputePowerCurve(ExplicitComponent):
                 Uhub_i = x[1]
                 Omega_i = min([Uhub_i * tsr / Rtip_cone, Omega_max])
                 Omega_i_rpm = Omega_i * 30.0 / np.pi
-                myout, _ = self.ccblade.evaluate([Uhub_i], [Omega_i_rpm], [pitch_i], coefficients=False)
+                myout, _ = evaluate([Uhub_i], [Omega_i_rpm], [pitch_i], coefficients=False)
                 P_aero_i = float(myout["P"][0])
                 # P_i,_  = compute_P_and_eff(P_aero_i.flatten(), P_rated, Omega_i_rpm, driveType, driveEta)
                 eff_i = np.interp(Omega_i_rpm, lss_rpm, driveEta)
@@ -485,11 +661,13 @@ class ComputePowerCurve(ExplicitComponent):
                 imin = max(i - 3, 0)
                 imax = min(i + 2, len(Uhub) - 1)
                 bnds = [[min_pitch, 15.0], [Uhub[imin] + TOL, Uhub[imax] - TOL]]
+                if warm is not None:
+                    x0 = np.clip([warm["pitch_rated"], warm["U_rated"]], [b[0] for b in bnds], [b[1] for b in bnds])
                 const = {}
                 const["type"] = "eq"
                 const["fun"] = const_Urated
                 params_rated = minimize(
-                    lambda x: x[1], x0, method="slsqp", bounds=bnds, constraints=const, tol=TOL, options={"maxiter": 20, "disp": False}
+                    lambda x: x[1], x0, method="slsqp", bounds=bnds, constraints=const, tol=warm_tol, options={"maxiter": 20, "disp": False}
                 )
 
                 if params_rated.success and not np.isnan(params_rated.x[1]):
@@ -498,17 +676,21 @@ class ComputePowerCurve(ExplicitComponent):
                 else:
                     U_rated = U_rated  # Use guessed value earlier
                     pitch_rated = min_pitch
+                rated_kind = "opt" if pitch_rated - min_pitch > TOL else "fixed"
             else:
                 # Just search over speed
                 pitch_rated = min_pitch
+                rated_kind = "fixed"
                 i_Uhub = np.max([0, i - 2])
                 try:
-                    U_rated = brentq(
+                    U_rated = brentq_warm(
                         lambda x: const_Urated([0.0, x]),
                         Uhub[i_Uhub],
                         Uhub[i + 2],
-                        xtol=1e-1 * TOL,
-                        rtol=1e-2 * TOL,
+                        None if warm is None else warm["U_rated"],
+                        WARM_DU,
+                        xtol=1e-1 * warm_tol,
+                        rtol=1e-2 * warm_tol,
                         maxiter=40,
                         disp=False,
                     )
@@ -523,7 +705,8 @@ class ComputePowerCurve(ExplicitComponent):
             Omega_tsr_rated = U_rated * tsr / Rtip_cone
             Omega_rated = np.minimum(Omega_tsr_rated, Omega_max)
             Omega_rpm_rated = Omega_rated * 30.0 / np.pi
-            myout, _ = self.ccblade.evaluate([U_rated], [Omega_rpm_rated], [pitch_rated], coefficients=True)
+            rated_law = "tsr" if Omega_tsr_rated <= Omega_max else "max"
+            myout, _ = evaluate([U_rated], [Omega_rpm_rated], [pitch_rated], coefficients=True)
             (
                 P_aero_rated,
                 T_rated,
@@ -541,13 +724,14 @@ class ComputePowerCurve(ExplicitComponent):
             ## REGION II.5 and RATED with peak shaving##
             if peak_thrust_shaving:
                 max_T = pts * T_rated
+                rated0 = (U_rated, pitch_rated, rated_kind, rated_law)
 
                 def const_Urated_Tpeak(x):
                     pitch_i = x[0]
                     Uhub_i = x[1]
                     Omega_i = min([Uhub_i * tsr / Rtip_cone, Omega_max])
                     Omega_i_rpm = Omega_i * 30.0 / np.pi
-                    myout, _ = self.ccblade.evaluate([Uhub_i], [Omega_i_rpm], [pitch_i], coefficients=False)
+                    myout, _ = evaluate([Uhub_i], [Omega_i_rpm], [pitch_i], coefficients=False)
                     P_aero_i = float(myout["P"][0])
                     # P_i,_  = compute_P_and_eff(P_aero_i.flatten(), P_rated, Omega_i_rpm, driveType, driveEta)
                     eff_i = np.interp(Omega_i_rpm, lss_rpm, driveEta)
@@ -560,11 +744,13 @@ class ComputePowerCurve(ExplicitComponent):
                 x0 = [0.0, U_rated]
                 i_Uhub = np.max([0, i - 2])
                 bnds = [[min_pitch, 15.0], [Uhub[i_Uhub] + TOL, Uhub[-1] - TOL]]
+                if warm is not None:
+                    x0 = np.clip([warm["pitch_rated"], warm["U_rated"]], [b[0] for b in bnds], [b[1] for b in bnds])
                 const = {}
                 const["type"] = "eq"
                 const["fun"] = const_Urated_Tpeak
                 params_rated = minimize(
-                    lambda x: x[1], x0, method="slsqp", bounds=bnds, constraints=const, tol=TOL, options={"maxiter": 20, "disp": False}
+                    lambda x: x[1], x0, method="slsqp", bounds=bnds, constraints=const, tol=warm_tol, options={"maxiter": 20, "disp": False}
                 )
 
                 if params_rated.success and not np.isnan(params_rated.x[1]):
@@ -573,11 +759,13 @@ class ComputePowerCurve(ExplicitComponent):
                 else:
                     U_rated = U_rated  # Use guessed value earlier
                     pitch_rated = min_pitch
+                rated_kind = "thrust" if pitch_rated - min_pitch > TOL else "fixed"
 
                 Omega_tsr_rated = U_rated * tsr / Rtip_cone
                 Omega_rated = np.minimum(Omega_tsr_rated, Omega_max)
                 Omega_rpm_rated = Omega_rated * 30.0 / np.pi
-                myout, _ = self.ccblade.evaluate([U_rated], [Omega_rpm_rated], [pitch_rated], coefficients=True)
+                rated_law = "tsr" if Omega_tsr_rated <= Omega_max else "max"
+                myout, _ = evaluate([U_rated], [Omega_rpm_rated], [pitch_rated], coefficients=True)
                 (
                     P_aero_rated,
                     T_rated,
@@ -610,6 +798,8 @@ class ComputePowerCurve(ExplicitComponent):
             Cq_aero_rated = Cq_aero[-1]
             Cm_aero_rated = Cm_aero[-1]
             eff_rated = eff[-1]
+            rated_law = omega_law[-1]
+            rated_kind = "fixed"
 
         # Store rated speed in array
         Uhub = np.r_[Uhub, U_rated]
@@ -631,6 +821,10 @@ class ComputePowerCurve(ExplicitComponent):
         Cq_aero = np.r_[Cq_aero, Cq_aero_rated][isort]
         Cm_aero = np.r_[Cm_aero, Cm_aero_rated][isort]
         eff = np.r_[eff, eff_rated][isort]
+        grid1 = np.r_[grid1, np.nan if found_rated else 1.0][isort]
+        omega_law = np.append(omega_law, "rated" if found_rated else rated_law)[isort]
+        eval_tsr = np.append(eval_tsr, not found_rated)[isort]
+        pitch_kind = np.append(pitch_kind, rated_kind)[isort]
 
         i_rated = np.where(Uhub == U_rated)[0][0]
         i_3 = np.minimum(i_rated + 1, self.n_pc)
@@ -638,15 +832,17 @@ class ComputePowerCurve(ExplicitComponent):
         # Set rated conditions for rest of powercurve
         Omega[i_rated:] = Omega_rated  # Stay at this speed if hit rated too early
         Omega_rpm = Omega * 30.0 / np.pi
+        if found_rated:
+            omega_law[i_rated:] = "rated"
 
         ## REGION II ##
         # Functions to be used inside of power maximization until Region 3
         def maximizePower(pitch_i, Uhub_i, Omega_rpm_i, scaling_power):
-            myout, _ = self.ccblade.evaluate([Uhub_i], [Omega_rpm_i], [pitch_i], coefficients=False)
+            myout, _ = evaluate([Uhub_i], [Omega_rpm_i], [pitch_i], coefficients=False)
             return -myout["P"] / scaling_power
 
         def constr_Tmax(pitch_i, Uhub_i, Omega_rpm_i, scaling_thrust):
-            myout, _ = self.ccblade.evaluate([Uhub_i], [Omega_rpm_i], [pitch_i], coefficients=False)
+            myout, _ = evaluate([Uhub_i], [Omega_rpm_i], [pitch_i], coefficients=False)
             return (max_T - float(myout["T"][0])) / scaling_thrust
 
         # Maximize power until rated
@@ -667,8 +863,11 @@ class ComputePowerCurve(ExplicitComponent):
             # Find pitch value that gives highest power rating
             pitch0 = pitch[i] if i == 0 else pitch[i - 1]
             bnds = [max([min_pitch, pitch0 - 10.0]), max([min_pitch, pitch0 + 10.0])]
+            if warm is not None:
+                pitch_warm = np.interp(Uhub[i], warm["Uhub"], warm["pitch"])
+                pitch0 = pitch_warm
             # For a successfull minimization, find the initial power value to nondimensionalize power and bring the figure of merit close to 1
-            myout, _ = self.ccblade.evaluate(Uhub[i], Omega_rpm[i], pitch0, coefficients=False)
+            myout, _ = evaluate(Uhub[i], Omega_rpm[i], pitch0, coefficients=False)
             # For better conditioning near cut-in, use rated values
             scaling_power = 0.1*P_rated #myout["P"]
             scaling_thrust = 0.1*T_rated #myout["T"]
@@ -683,21 +882,50 @@ class ComputePowerCurve(ExplicitComponent):
                     method="slsqp", #"cobyla",
                     bounds=[bnds],
                     constraints=const,
-                    tol=TOL,
+                    tol=warm_tol,
                     options={"maxiter": 20, "disp": False},  #'catol':0.01*max_T},
                 )
                 pitch[i] = params.x[0]
+                thrust_active = constr_Tmax(pitch[i], Uhub[i], Omega_rpm[i], max_T) < TOL
             else:
                 # Only adjust pitch- should be mostly region I.5 for peak shaving and also II.5 for non-peak shaving
-                pitch[i] = minimize_scalar(
-                    lambda x: maximizePower(x, Uhub[i], Omega_rpm[i], scaling_power),
-                    bounds=bnds,
-                    method="bounded",
-                    options={"disp": False, "xatol": TOL, "maxiter": 40},
-                )["x"][0]
-                
+                pitch[i] = np.nan
+                if warm is not None:
+                    # search a narrow interval about the previous solution, accepted if the optimum is interior
+                    bnds_warm = [max(bnds[0], pitch_warm - WARM_DPITCH), min(bnds[1], pitch_warm + WARM_DPITCH)]
+                    if bnds_warm[0] < bnds_warm[1]:
+                        pitch_i = minimize_scalar(
+                            lambda x: maximizePower(x, Uhub[i], Omega_rpm[i], scaling_power),
+                            bounds=bnds_warm,
+                            method="bounded",
+                            options={"disp": False, "xatol": warm_tol, "maxiter": 40},
+                        )["x"][0]
+                        if (bnds_warm[0] == bnds[0] or pitch_i - bnds_warm[0] > TOL) and (
+                            bnds_warm[1] == bnds[1] or bnds_warm[1] - pitch_i > TOL
+                        ):
+                            pitch[i] = pitch_i
+                if np.isnan(pitch[i]):
+                    pitch[i] = minimize_scalar(
+                        lambda x: maximizePower(x, Uhub[i], Omega_rpm[i], scaling_power),
+                        bounds=bnds,
+                        method="bounded",
+                        options={"disp": False, "xatol": TOL, "maxiter": 40},
+                    )["x"][0]
+                thrust_active = False
+
+            # Pitch at an interior optimum is differentiated through its optimality condition
+            if thrust_active:
+                pitch_kind[i] = "thrust"
+            elif pitch[i] - bnds[0] > TOL and bnds[1] - pitch[i] > TOL:
+                pitch_kind[i] = "opt"
+            elif pitch[i] - min_pitch <= TOL:
+                pitch_kind[i] = "fixed"
+            else:
+                pitch_kind[i] = "held"
+            eval_tsr[i] = False
+
             # Find associated power
-            myout, _ = self.ccblade.evaluate([Uhub[i]], [Omega_rpm[i]], [pitch[i]], coefficients=True)
+            myout, _ = evaluate([Uhub[i]], [Omega_rpm[i]], [pitch[i]], coefficients=True)
             P_aero[i], T[i], Q[i], M[i], Cp_aero[i], Ct_aero[i], Cq_aero[i], Cm_aero[i] = [
                 myout[key][0] for key in ["P", "T", "Q", "Mb", "CP", "CT", "CQ", "CMb"]
             ]
@@ -712,7 +940,7 @@ class ComputePowerCurve(ExplicitComponent):
         if region3:
             # Function to be used to stay at rated power in Region 3
             def rated_power_dist(pitch_i, Uhub_i, Omega_rpm_i):
-                myout, _ = self.ccblade.evaluate([Uhub_i], [Omega_rpm_i], [pitch_i], coefficients=False)
+                myout, _ = evaluate([Uhub_i], [Omega_rpm_i], [pitch_i], coefficients=False)
                 P_aero_i = myout["P"]
                 eff_i = np.interp(Omega_rpm_i, lss_rpm, driveEta)
                 P_i = P_aero_i * eff_i
@@ -723,25 +951,44 @@ class ComputePowerCurve(ExplicitComponent):
                 for i in range(i_3, self.n_pc):
                     pitch0 = pitch[i - 1]
                     bnds = ([pitch0, pitch0 + 15.0],)
+                    eval_tsr[i] = False
+                    pitch_kind[i] = "power"
                     try:
-                        pitch[i] = brentq(
+                        pitch[i] = brentq_warm(
                             lambda x: rated_power_dist(x, Uhub[i], Omega_rpm[i]),
                             bnds[0][0],
                             bnds[0][1],
-                            xtol=1e-1 * TOL,
-                            rtol=1e-2 * TOL,
+                            None if warm is None else np.interp(Uhub[i], warm["Uhub"], warm["pitch"]),
+                            WARM_DPITCH,
+                            xtol=1e-1 * warm_tol,
+                            rtol=1e-2 * warm_tol,
                             maxiter=40,
                             disp=False,
                         )
                     except ValueError:
+                        # The table holds pitch at its upper edge, so a Region 3 pitch beyond it can't be found.
+                        # Tabulate up to the top of the search interval and start over.
+                        if (
+                            self.surrogate
+                            and perf.pitch[-1] < min(bnds[0][1], MAX_PITCH_PERF)
+                            and rated_power_dist(perf.pitch[-1], Uhub[i], Omega_rpm[i]) > 0.0
+                        ):
+                            return self.compute(
+                                inputs,
+                                outputs,
+                                discrete_inputs,
+                                discrete_outputs,
+                                pitch_perf_max=min(bnds[0][1], MAX_PITCH_PERF),
+                            )
                         pitch[i] = minimize_scalar(
                             lambda x: np.abs(rated_power_dist(x, Uhub[i], Omega_rpm[i])),
                             bounds=bnds[0],
                             method="bounded",
                             options={"disp": False, "xatol": TOL, "maxiter": 40},
                         )["x"]
+                        pitch_kind[i] = "held"
 
-                    myout, _ = self.ccblade.evaluate([Uhub[i]], [Omega_rpm[i]], [pitch[i]], coefficients=True)
+                    myout, _ = evaluate([Uhub[i]], [Omega_rpm[i]], [pitch[i]], coefficients=True)
                     P_aero[i], T[i], Q[i], M[i], Cp_aero[i], Ct_aero[i], Cq_aero[i], Cm_aero[i] = [
                         myout[key][0] for key in ["P", "T", "Q", "Mb", "CP", "CT", "CQ", "CMb"]
                     ]
@@ -752,7 +999,7 @@ class ComputePowerCurve(ExplicitComponent):
 
                     # If we are thrust shaving, then check if this is a point that must be modified
                     if peak_thrust_shaving and T[i] >= max_T:
-                        myout, _ = self.ccblade.evaluate(Uhub[i], Omega_rpm[i], pitch0, coefficients=False)
+                        myout, _ = evaluate(Uhub[i], Omega_rpm[i], pitch0, coefficients=False)
                         scaling_thrust = 0.1*myout["T"]
                         const = {}
                         const["type"] = "ineq"
@@ -768,8 +1015,10 @@ class ComputePowerCurve(ExplicitComponent):
                         )
                         if params.success and not np.isnan(params.x[0]):
                             pitch[i] = params.x[0]
+                            if constr_Tmax(pitch[i], Uhub[i], Omega_rpm[i], max_T) < TOL:
+                                pitch_kind[i] = "thrust"
 
-                        myout, _ = self.ccblade.evaluate([Uhub[i]], [Omega_rpm[i]], [pitch[i]], coefficients=True)
+                        myout, _ = evaluate([Uhub[i]], [Omega_rpm[i]], [pitch[i]], coefficients=True)
                         P_aero[i], T[i], Q[i], M[i], Cp_aero[i], Ct_aero[i], Cq_aero[i], Cm_aero[i] = [
                             myout[key] for key in ["P", "T", "Q", "Mb", "CP", "CT", "CQ", "CMb"]
                         ]
@@ -790,6 +1039,7 @@ class ComputePowerCurve(ExplicitComponent):
                 Ct_aero[i_3:] = 0
                 Cq_aero[i_3:] = 0
                 Cm_aero[i_3:] = 0
+                pitch_kind[i_3:] = "flat"
 
         ## END POWERCURVE ##
 
@@ -840,6 +1090,292 @@ class ComputePowerCurve(ExplicitComponent):
                 outputs["Ct_regII"] = Ct_aero[i]
         outputs["ax_induct_rotor"] = ax_induct_rotor
 
+        # Finite difference steps must not replace the state at the point being linearized, nor the warm start
+        if self.under_approx:
+            return
+
+        self.lin_state = {
+            "Uhub": Uhub,
+            "Omega_rpm": Omega_rpm,
+            "pitch": pitch,
+            "grid1": grid1,
+            "omega_law": omega_law,
+            "eval_tsr": eval_tsr,
+            "pitch_kind": pitch_kind,
+            "i_rated": i_rated,
+            "i_3": i_3,
+            "found_rated": found_rated,
+            "rated_law": rated_law,
+            "max_law": max_law,
+            "table_laws": table_laws,
+            "lss_default": not np.any(inputs["lss_rpm"]),
+            "rated0": rated0,
+        }
+
+        if self.warm_start:
+            self.warm = {
+                "U_rated": float(U_rated),
+                "pitch_rated": float(pitch_rated),
+                "Uhub": Uhub.copy(),
+                "pitch": pitch.copy(),
+            }
+
+    def compute_partials(self, inputs, J, discrete_inputs):
+        if self.surrogate:
+            return
+
+        state = self.lin_state
+        n_wrt = self.n_wrt
+        cols = self.wrt_slices
+        Uhub = state["Uhub"]
+        Omega_rpm = state["Omega_rpm"]
+        pitch = state["pitch"]
+        omega_law = state["omega_law"]
+        pitch_kind = state["pitch_kind"]
+        i_rated = state["i_rated"]
+        i_3 = state["i_3"]
+        npts = len(Uhub)
+
+        def unit(name):
+            e = np.zeros(n_wrt)
+            e[cols[name]] = 1.0
+            return e
+
+        tsr = float(inputs["tsr_operational"][0])
+        Rtip = float(inputs["Rtip"][0])
+        cone = np.deg2rad(float(inputs["precone"][0]))
+        Rtip_cone = Rtip * np.cos(cone)
+        dRtip_cone = np.cos(cone) * unit("Rtip") - Rtip * np.sin(cone) * np.deg2rad(1.0) * unit("precone")
+
+        def omega_speed(law, U):
+            # Rotor speed (rpm) set by a control law, with derivatives wrt the inputs (at fixed U) and wrt U
+            if law == "tsr":
+                Omega_i = U * tsr / Rtip_cone
+                return Omega_i, (U * unit("tsr_operational") - Omega_i * dRtip_cone) / Rtip_cone, tsr / Rtip_cone
+            elif law == "min":
+                return float(inputs["omega_min"][0]) * np.pi / 30.0, np.pi / 30.0 * unit("omega_min"), 0.0
+            elif state["max_law"] == "tip":
+                Omega_i = float(inputs["max_allowable_blade_tip_speed"][0]) / Rtip_cone
+                return Omega_i, (unit("max_allowable_blade_tip_speed") - Omega_i * dRtip_cone) / Rtip_cone, 0.0
+            else:
+                return float(inputs["omega_max"][0]) * np.pi / 30.0, np.pi / 30.0 * unit("omega_max"), 0.0
+
+        def omega_speed_rpm(law, U):
+            Omega_i, dOmega_dx, dOmega_dU = omega_speed(law, U)
+            return Omega_i * 30.0 / np.pi, dOmega_dx * 30.0 / np.pi, dOmega_dU * 30.0 / np.pi
+
+        # Drivetrain efficiency, where the default table spans the rotor speeds of the first and last grid points
+        gbx = float(inputs["gearbox_efficiency"][0])
+        n_table = self.n_pc - 1
+        U_ends = (float(inputs["v_min"][0]), float(inputs["v_max"][0]))
+        table_ends = [omega_speed_rpm(law, U) for law, U in zip(state["table_laws"], U_ends)]
+
+        def efficiency(Omega_rpm_i, lss_start, lss_end):
+            if state["lss_default"]:
+                lss_rpm = np.linspace(np.maximum(0.1, lss_start), lss_end, n_table)
+                _, gen_eff = compute_P_and_eff(
+                    lss_rpm / lss_rpm[-1],
+                    1.0,
+                    np.zeros(n_table),
+                    discrete_inputs["drivetrainType"],
+                    np.zeros((n_table, 2)),
+                )
+            else:
+                lss_rpm = inputs["lss_rpm"]
+                gen_eff = inputs["generator_efficiency"]
+            return gbx * np.interp(Omega_rpm_i, lss_rpm, gen_eff)
+
+        def efficiency_deriv(Omega_rpm_i):
+            # Efficiency with derivatives wrt rotor speed (rpm) and wrt the inputs at fixed rotor speed
+            a, b = table_ends[0][0], table_ends[1][0]
+            eff_i = efficiency(Omega_rpm_i, a, b)
+            h = 1e-6 * np.maximum(1.0, np.abs(Omega_rpm_i))
+            deff_dOmega = (efficiency(Omega_rpm_i + h, a, b) - efficiency(Omega_rpm_i - h, a, b)) / (2 * h)
+            deff_dx = np.outer(eff_i, unit("gearbox_efficiency")) / gbx
+            if state["lss_default"]:
+                ha = 1e-6 * np.maximum(1.0, a)
+                hb = 1e-6 * np.maximum(1.0, b)
+                deff_da = (efficiency(Omega_rpm_i, a + ha, b) - efficiency(Omega_rpm_i, a - ha, b)) / (2 * ha)
+                deff_db = (efficiency(Omega_rpm_i, a, b + hb) - efficiency(Omega_rpm_i, a, b - hb)) / (2 * hb)
+                for deff_dend, (_, dend_dx, dend_dU), U_name in zip([deff_da, deff_db], table_ends, ["v_min", "v_max"]):
+                    deff_dx += np.outer(deff_dend, dend_dx + dend_dU * unit(U_name))
+            return eff_i, deff_dOmega, deff_dx
+
+        aero_keys = ["P", "T", "Q", "Mb", "CP", "CT", "CQ", "CMb"]
+
+        def aero_derivs(U, Omega_rpm_i, pitch_i, keys=aero_keys):
+            # CCBlade outputs with derivatives wrt the geometry (stacked), wind speed, rotor speed and pitch
+            self.ccblade.derivatives = True
+            try:
+                myout, derivs = self.ccblade.evaluate(U, Omega_rpm_i, pitch_i, coefficients=True)
+            finally:
+                self.ccblade.derivatives = False
+            dF = {}
+            for key in keys:
+                d = derivs["d" + key]
+                dF_dx = np.zeros((len(U), n_wrt))
+                for name, dname in self.geom_derivs:
+                    dF_dx[:, cols[name]] = d[dname]
+                dF[key] = (dF_dx, np.diag(d["dUinf"]), np.diag(d["dOmega"]), np.diag(d["dpitch"]))
+            return myout, dF
+
+        # Wind speed of the grid points
+        dU = np.zeros((npts, n_wrt))
+        igrid = np.nonzero(~np.isnan(state["grid1"]))[0]
+        grid1 = state["grid1"][igrid]
+        dU[igrid] = np.outer(1.0 - grid1, unit("v_min")) + np.outer(grid1, unit("v_max"))
+
+        # Rotor speed at which CCBlade was evaluated, the unlimited TSR speed for points that were not re-evaluated
+        Omega_eval = Omega_rpm.copy()
+        Omega_eval[state["eval_tsr"]] = (Uhub * tsr / Rtip_cone * 30.0 / np.pi)[state["eval_tsr"]]
+
+        # CCBlade is linearized at every point, and at the rated point that sets the peak shaving thrust
+        U_lin = Uhub
+        Omega_lin = Omega_eval
+        pitch_lin = pitch
+        kind_lin = pitch_kind
+        if state["rated0"] is not None:
+            U0, pitch0, kind0, law0 = state["rated0"]
+            U_lin = np.r_[U_lin, U0]
+            Omega_lin = np.r_[Omega_lin, omega_speed_rpm(law0, U0)[0]]
+            pitch_lin = np.r_[pitch_lin, pitch0]
+            kind_lin = np.append(kind_lin, kind0)
+        myout, dF = aero_derivs(U_lin, Omega_lin, pitch_lin)
+        P_aero = myout["P"]
+
+        # Second derivatives of power wrt pitch for the pitch optimality conditions
+        iopt = np.nonzero(kind_lin == "opt")[0]
+        dH = {}
+        if len(iopt) > 0:
+            # Central differences of the analytic first derivatives, with the step scaled for their truncation
+            # and round-off errors to balance
+            h = np.cbrt(np.finfo(float).eps) * np.maximum(1.0, np.abs(pitch_lin[iopt]))
+            _, dF_plus = aero_derivs(U_lin[iopt], Omega_lin[iopt], pitch_lin[iopt] + h, keys=["P"])
+            _, dF_minus = aero_derivs(U_lin[iopt], Omega_lin[iopt], pitch_lin[iopt] - h, keys=["P"])
+            for k, i in enumerate(iopt):
+                dH[i] = [(dplus[k] - dminus[k]) / (2 * h[k]) for dplus, dminus in zip(dF_plus["P"], dF_minus["P"])]
+
+        def rated_deriv(i, law, kind, dmax_T):
+            # Rated wind speed and pitch, found from the rated power condition and the pitch condition
+            _, dOmega_dx, dOmega_dU = omega_speed_rpm(law, U_lin[i])
+            eff_i, deff_dOmega, deff_dx = efficiency_deriv(Omega_lin[i])
+            dP_dx, dP_dU, dP_dOmega, dP_dpitch = [d[i] for d in dF["P"]]
+            G_x = (
+                eff_i * (dP_dx + dP_dOmega * dOmega_dx)
+                + P_aero[i] * (deff_dOmega * dOmega_dx + deff_dx[0])
+                - unit("rated_power")
+            )
+            G_U = eff_i * (dP_dU + dP_dOmega * dOmega_dU) + P_aero[i] * deff_dOmega * dOmega_dU
+            G_pitch = eff_i * dP_dpitch
+            if kind in ["opt", "thrust"]:
+                if kind == "opt":
+                    C_x, C_U, C_Omega, C_pitch = dH[i]
+                else:
+                    C_x, C_U, C_Omega, C_pitch = [d[i] for d in dF["T"]]
+                    C_x = C_x - dmax_T
+                A = np.array([[G_U, G_pitch], [C_U + C_Omega * dOmega_dU, C_pitch]])
+                dU_i, dpitch_i = np.linalg.solve(A, -np.vstack([G_x, C_x + C_Omega * dOmega_dx]))
+            else:
+                dpitch_i = unit("control_pitch") if kind == "fixed" else np.zeros(n_wrt)
+                dU_i = -(G_x + G_pitch * dpitch_i) / G_U
+            return dU_i, dpitch_i, dOmega_dx + dOmega_dU * dU_i
+
+        # Peak shaving thrust limit
+        dmax_T = np.zeros(n_wrt)
+        if state["rated0"] is not None:
+            dU0, dpitch0, dOmega0 = rated_deriv(npts, law0, kind0, None)
+            dT_dx, dT_dU, dT_dOmega, dT_dpitch = [d[npts] for d in dF["T"]]
+            pts = float(inputs["peak_thrust_shaving"][0])
+            dmax_T = pts * (dT_dx + dT_dU * dU0 + dT_dOmega * dOmega0 + dT_dpitch * dpitch0)
+
+        dOmega = np.zeros((npts, n_wrt))
+        dOmega_eval = np.zeros((npts, n_wrt))
+        dpitch = np.zeros((npts, n_wrt))
+
+        if state["found_rated"]:
+            i = i_rated
+            dU[i], dpitch[i], dOmega_rated = rated_deriv(i, state["rated_law"], pitch_kind[i], dmax_T)
+            dOmega[omega_law == "rated"] = dOmega_rated
+
+        for i in range(npts):
+            if omega_law[i] != "rated":
+                _, dOmega_dx, dOmega_dU = omega_speed_rpm(omega_law[i], Uhub[i])
+                dOmega[i] = dOmega_dx + dOmega_dU * dU[i]
+            if state["eval_tsr"][i]:
+                _, dOmega_dx, dOmega_dU = omega_speed_rpm("tsr", Uhub[i])
+                dOmega_eval[i] = dOmega_dx + dOmega_dU * dU[i]
+            else:
+                dOmega_eval[i] = dOmega[i]
+
+        # Pitch schedule away from rated
+        eff, deff_dOmega, deff_dx = efficiency_deriv(Omega_rpm)
+        for i in range(npts):
+            if state["found_rated"] and i == i_rated:
+                continue
+            if pitch_kind[i] == "fixed":
+                dpitch[i] = unit("control_pitch")
+            elif pitch_kind[i] == "opt":
+                H_x, H_U, H_Omega, H_pitch = dH[i]
+                dpitch[i] = -(H_x + H_U * dU[i] + H_Omega * dOmega_eval[i]) / H_pitch
+            elif pitch_kind[i] == "thrust":
+                dT_dx, dT_dU, dT_dOmega, dT_dpitch = [d[i] for d in dF["T"]]
+                dpitch[i] = -(dT_dx + dT_dU * dU[i] + dT_dOmega * dOmega_eval[i] - dmax_T) / dT_dpitch
+            elif pitch_kind[i] == "power":
+                dP_dx, dP_dU, dP_dOmega, dP_dpitch = [d[i] for d in dF["P"]]
+                G_x = (
+                    eff[i] * (dP_dx + dP_dU * dU[i] + dP_dOmega * dOmega_eval[i])
+                    + P_aero[i] * (deff_dOmega[i] * dOmega[i] + deff_dx[i])
+                    - unit("rated_power")
+                )
+                dpitch[i] = -G_x / (eff[i] * dP_dpitch)
+
+        # Chain rule through the CCBlade outputs
+        dout = {}
+        P_aero = P_aero[:npts]
+        for key, name in zip(aero_keys, ["P_aero", "T", "Q", "M", "Cp_aero", "Ct_aero", "Cq_aero", "Cm_aero"]):
+            dF_dx, dF_dU, dF_dOmega, dF_dpitch = [d[:npts] for d in dF[key]]
+            dout[name] = (
+                dF_dx
+                + dF_dU[:, np.newaxis] * dU
+                + dF_dOmega[:, np.newaxis] * dOmega_eval
+                + dF_dpitch[:, np.newaxis] * dpitch
+            )
+        deff = deff_dOmega[:, np.newaxis] * dOmega + deff_dx
+        dout["P"] = eff[:, np.newaxis] * dout["P_aero"] + P_aero[:, np.newaxis] * deff
+        dout["Cp"] = eff[:, np.newaxis] * dout["Cp_aero"] + myout["CP"][:npts, np.newaxis] * deff
+
+        # Region III without pitch regulation holds rated power
+        iflat = np.nonzero(pitch_kind == "flat")[0]
+        if len(iflat) > 0:
+            P_rated = float(inputs["rated_power"][0])
+            Omega_flat = Omega_rpm[iflat, np.newaxis] * np.pi / 30.0
+            q_flat = 0.5 * float(inputs["rho"][0]) * np.pi * Rtip_cone**2 * Uhub[iflat, np.newaxis] ** 3
+            dq_flat = q_flat * (2 * dRtip_cone / Rtip_cone + 3 * dU[iflat] / Uhub[iflat, np.newaxis])
+            dout["P"][iflat] = unit("rated_power")
+            dout["P_aero"][iflat] = dout["P_aero"][i_3 - 1]
+            dout["Q"][iflat] = (dout["P"][iflat] - P_rated * dOmega[iflat] * np.pi / 30.0 / Omega_flat) / Omega_flat
+            dout["Cp"][iflat] = (dout["P"][iflat] - P_rated * dq_flat / q_flat) / q_flat
+            dout["Cp_aero"][iflat] = (dout["P_aero"][iflat] - P_aero[i_3 - 1] * dq_flat / q_flat) / q_flat
+            for name in ["T", "M", "Ct_aero", "Cq_aero", "Cm_aero"]:
+                dout[name][iflat] = 0.0
+        dout["V"] = dU
+        dout["Omega"] = dOmega
+        dout["pitch"] = dpitch
+
+        i = i_rated
+        dout["rated_V"] = dU[[i]]
+        dout["rated_Omega"] = dOmega[[i]]
+        dout["rated_pitch"] = dpitch[[i]]
+        dout["rated_T"] = dout["T"][[i]]
+        dout["rated_Q"] = dout["Q"][[i]]
+        dout["rated_mech"] = dout["P_aero"][[i]]
+        dout["rated_efficiency"] = deff[[i]]
+
+        for of, dof in dout.items():
+            for wrt, sl in cols.items():
+                J[of, wrt] = dof[:, sl]
+
+
 class ComputeSplines(ExplicitComponent):
     """
     Compute splined quantities for V, P, and Omega.
@@ -984,7 +1520,7 @@ class AEP(ExplicitComponent):
         # outputs
         self.add_output("AEP", val=0.0, units="kW*h", desc="annual energy production")
 
-        # self.declare_partials('*', '*', method='fd', form='central', step=1e-6)
+        self.declare_partials("AEP", ["CDF_V", "P", "lossFactor"])
 
     def compute(self, inputs, outputs):
         lossFactor = inputs["lossFactor"][0]
@@ -997,20 +1533,23 @@ class AEP(ExplicitComponent):
             outputs["AEP"] = factor * np.trapezoid(P, CDF_V)  # in kWh
         except AttributeError:
             outputs["AEP"] = factor * np.trapz(P, CDF_V)  # in kWh
-        """
-        dAEP_dP, dAEP_dCDF = trapezoid_deriv(P, CDF_V)
-        dAEP_dP *= factor
-        dAEP_dCDF *= factor
-
-        dAEP_dlossFactor = np.array([outputs['AEP']/lossFactor])
-        self.J = {}
-        self.J['AEP', 'CDF_V'] = np.reshape(dAEP_dCDF, (1, len(dAEP_dCDF)))
-        self.J['AEP', 'P'] = np.reshape(dAEP_dP, (1, len(dAEP_dP)))
-        self.J['AEP', 'lossFactor'] = dAEP_dlossFactor
 
     def compute_partials(self, inputs, J):
-        J = self.J
-        """
+        lossFactor = inputs["lossFactor"][0]
+        P = inputs["P"]
+        CDF_V = inputs["CDF_V"]
+
+        factor = 1.0 / 1e3 * 365.0 * 24.0
+        dAEP_dP, dAEP_dCDF = trapz_deriv(P, CDF_V)
+        try:
+            # Numpy v1/2 clash
+            AEP_per_loss = factor * np.trapezoid(P, CDF_V)
+        except AttributeError:
+            AEP_per_loss = factor * np.trapz(P, CDF_V)
+
+        J["AEP", "CDF_V"] = lossFactor * factor * dAEP_dCDF
+        J["AEP", "P"] = lossFactor * factor * dAEP_dP
+        J["AEP", "lossFactor"] = AEP_per_loss
 
 
 def compute_P_and_eff(aeroPower, ratedPower, Omega_rpm, drivetrainType, drivetrainEff):
@@ -1061,6 +1600,121 @@ def compute_P_and_eff(aeroPower, ratedPower, Omega_rpm, drivetrainType, drivetra
     return aeroPower * eff, eff
 
 
+def brentq_warm(f, a, b, x_prev, dx, **kwargs):
+    """brentq on [a, b], first trying the narrower bracket [x_prev - dx, x_prev + dx] about a
+    previous root (skipped if x_prev is None)"""
+    if x_prev is not None:
+        lo = max(a, x_prev - dx)
+        hi = min(b, x_prev + dx)
+        if lo < hi:
+            try:
+                return brentq(f, lo, hi, **kwargs)
+            except ValueError:
+                pass
+    return brentq(f, a, b, **kwargs)
+
+
+class RotorPerformanceTable(object):
+    """
+    Rotor power, thrust, torque and blade root moment coefficients tabulated once from CCBlade
+    on a grid of tip speed ratio, pitch and wind speed, and splined in tip speed ratio and pitch
+    (linear in wind speed). The evaluate method mirrors CCBlade.evaluate for these quantities,
+    so that table lookups can stand in for BEM solves. Tip speed ratio and pitch are held at
+    the edges of the grid.
+    """
+
+    keys = ["CP", "CT", "CQ", "CMb"]
+
+    def __init__(self, ccblade, tsr, pitch, U):
+        """
+        Parameters
+        ----------
+        ccblade : CCBlade
+            rotor to tabulate
+        tsr : array_like
+            tip speed ratio grid, with respect to the coned rotor radius
+        pitch : array_like (deg)
+            pitch grid
+        U : array_like (m/s)
+            wind speed grid
+        """
+        self.tsr = np.array(tsr, dtype=float)
+        self.pitch = np.array(pitch, dtype=float)
+        self.U = np.array(U, dtype=float)
+        self.rho = ccblade.rho
+        self.R = ccblade.rotorR
+
+        # One batched CCBlade call over the whole grid
+        tsr_g, pitch_g, U_g = np.meshgrid(self.tsr, self.pitch, self.U, indexing="ij")
+        Omega_rpm = tsr_g * U_g / self.R * 30.0 / np.pi
+        myout, _ = ccblade.evaluate(U_g.flatten(), Omega_rpm.flatten(), pitch_g.flatten(), coefficients=True)
+        self.tables = {key: myout[key].reshape(tsr_g.shape) for key in self.keys}
+
+        kx = min(3, self.tsr.size - 1)
+        ky = min(3, self.pitch.size - 1)
+        self.splines = {
+            key: [
+                RectBivariateSpline(self.tsr, self.pitch, self.tables[key][:, :, k], kx=kx, ky=ky)
+                for k in range(self.U.size)
+            ]
+            for key in self.keys
+        }
+
+    def evaluate(self, Uinf, Omega, pitch, coefficients=False):
+        """Look up the rotor loads at the specified conditions, as in CCBlade.evaluate.
+
+        Parameters
+        ----------
+        Uinf : array_like (m/s)
+            hub height wind speed
+        Omega : array_like (RPM)
+            rotor rotation speed
+        pitch : array_like (deg)
+            blade pitch setting
+        coefficients : bool, optional
+            if True, the nondimensional coefficients are also returned
+
+        Returns
+        -------
+        outputs : dict
+            'P', 'T', 'Q' and 'Mb' and, with coefficients, 'CP', 'CT', 'CQ' and 'CMb'
+        derivs : dict
+            empty, derivatives are not provided
+        """
+        Uinf = np.array(Uinf, dtype=float).flatten()
+        Omega = np.array(Omega, dtype=float).flatten()
+        pitch = np.array(pitch, dtype=float).flatten()
+
+        tsr = np.clip(Omega * np.pi / 30.0 * self.R / Uinf, self.tsr[0], self.tsr[-1])
+        pitch = np.clip(pitch, self.pitch[0], self.pitch[-1])
+
+        # linear weights between the wind speed slices
+        if self.U.size > 1:
+            k = np.clip(np.searchsorted(self.U, Uinf) - 1, 0, self.U.size - 2)
+            w = np.clip((Uinf - self.U[k]) / (self.U[k + 1] - self.U[k]), 0.0, 1.0)
+        else:
+            k = np.zeros(Uinf.size, dtype=int)
+            w = np.zeros(Uinf.size)
+
+        outputs = {}
+        for key in self.keys:
+            vals = np.array([s(tsr, pitch, grid=False) for s in self.splines[key]])
+            vals = np.r_[vals, vals[-1:]]
+            outputs[key] = (1.0 - w) * vals[k, np.arange(Uinf.size)] + w * vals[k + 1, np.arange(Uinf.size)]
+
+        q = 0.5 * self.rho * Uinf**2
+        A = np.pi * self.R**2
+        outputs["P"] = outputs["CP"] * q * A * Uinf
+        outputs["T"] = outputs["CT"] * q * A
+        outputs["Q"] = outputs["CQ"] * q * A * self.R
+        outputs["Mb"] = outputs["CMb"] * q * A * self.R
+        if not coefficients:
+            for key in self.keys:
+                outputs.pop(key)
+
+        return outputs, {}
+
+
 def eval_unsteady(alpha, cl, cd, cm):
     # calculate unsteady coefficients from polars for OpenFAST's Aerodyn
 
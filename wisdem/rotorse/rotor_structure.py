@@ -161,11 +161,13 @@ class RunFrame3DD(ExplicitComponent):
     def initialize(self):
         self.options.declare("modeling_options")
         self.options.declare("pbeam", default=False)  # Recover old pbeam c.s. and accuracy
+        self.frame_cache = pyframe3dd.FrameCache()
 
     def setup(self):
         rotorse_options = self.options["modeling_options"]["WISDEM"]["RotorSE"]
         self.n_span = n_span = rotorse_options["n_span"]
         self.n_freq = n_freq = rotorse_options["n_freq"]
+        self.n_cases = n_cases = rotorse_options["n_extra_load_cases"]
 
         # Locations of airfoils in global c.s.
         self.add_input(
@@ -201,6 +203,26 @@ class RunFrame3DD(ExplicitComponent):
             units="N/m",
             desc="distributed load (force per unit length) in airfoil z-direction",
         )
+        if n_cases > 0:
+            # Extra load cases (e.g. other azimuths, gusts, parked), solved in the same Frame3DD run
+            self.add_input(
+                "Px_af_cases",
+                val=np.zeros((n_span, n_cases)),
+                units="N/m",
+                desc="distributed load (force per unit length) in airfoil x-direction of each extra load case",
+            )
+            self.add_input(
+                "Py_af_cases",
+                val=np.zeros((n_span, n_cases)),
+                units="N/m",
+                desc="distributed load (force per unit length) in airfoil y-direction of each extra load case",
+            )
+            self.add_input(
+                "Pz_af_cases",
+                val=np.zeros((n_span, n_cases)),
+                units="N/m",
+                desc="distributed load (force per unit length) in airfoil z-direction of each extra load case",
+            )
 
         self.add_input("r", val=np.zeros(n_span), units="m", desc="locations of properties along beam")
         self.add_input("A", val=np.zeros(n_span), units="m**2", desc="airfoil cross section material area")
@@ -331,8 +353,65 @@ class RunFrame3DD(ExplicitComponent):
             units="N",
             desc="axial resultant along blade span",
         )
+        if n_cases > 0:
+            self.add_output(
+                "root_F_cases",
+                np.zeros((3, n_cases)),
+                units="N",
+                desc="Blade root forces in blade c.s. of each extra load case",
+            )
+            self.add_output(
+                "root_M_cases",
+                np.zeros((3, n_cases)),
+                units="N*m",
+                desc="Blade root moment in blade c.s. of each extra load case",
+            )
+            self.add_output(
+                "dx_cases",
+                val=np.zeros((n_span, n_cases)),
+                units="m",
+                desc="deflection of blade section in airfoil x-direction of each extra load case",
+            )
+            self.add_output(
+                "dy_cases",
+                val=np.zeros((n_span, n_cases)),
+                units="m",
+                desc="deflection of blade section in airfoil y-direction of each extra load case",
+            )
+            self.add_output(
+                "dz_cases",
+                val=np.zeros((n_span, n_cases)),
+                units="m",
+                desc="deflection of blade section in airfoil z-direction of each extra load case",
+            )
+            self.add_output(
+                "M1_cases",
+                val=np.zeros((n_span, n_cases)),
+                units="N*m",
+                desc="distribution along blade span of bending moment w.r.t principal axis 1 of each extra load case",
+            )
+            self.add_output(
+                "M2_cases",
+                val=np.zeros((n_span, n_cases)),
+                units="N*m",
+                desc="distribution along blade span of bending moment w.r.t principal axis 2 of each extra load case",
+            )
+            self.add_output(
+                "F2_cases",
+                val=np.zeros((n_span, n_cases)),
+                units="N",
+                desc="distribution along blade span of force w.r.t principal axis 2 of each extra load case",
+            )
+            self.add_output(
+                "F3_cases",
+                val=np.zeros((n_span, n_cases)),
+                units="N",
+                desc="axial resultant along blade span of each extra load case",
+            )
 
     def compute(self, inputs, outputs):
+        n_cases = self.options["modeling_options"]["WISDEM"]["RotorSE"]["n_extra_load_cases"]
+
         # Unpack inputs
         r = inputs["r"]
         x_az = inputs["x_az"]
@@ -440,7 +519,7 @@ class RunFrame3DD(ExplicitComponent):
         # -----------------------------------
 
         # initialize frame3dd object
-        blade = pyframe3dd.Frame(nodes, reactions, elements, options)
+        blade = pyframe3dd.Frame(nodes, reactions, elements, options, cache=self.frame_cache)
 
         # ------- enable dynamic analysis ----------
         Mmethod = 1  # 1= Subspace-Jacobi iteration, 2= Stodola (matrix iteration) method
@@ -451,14 +530,16 @@ class RunFrame3DD(ExplicitComponent):
         blade.enableDynamics(2 * self.n_freq, Mmethod, lump, tol, shift)
         # ----------------------------
 
-        # ------ load case 1, blade 1 ------------
+        # ------ load cases, blade 1 ------------
         # trapezoidally distributed loads- already has gravity, centrifugal, aero, etc.
-        gx = gy = gz = 0.0
-        load = pyframe3dd.StaticLoadCase(gx, gy, gz)
+        # The extra load cases go first, so that the modes see the geometric stiffness of the last (design) case
+        Px_af = np.c_[inputs["Px_af_cases"], Px_af] if n_cases > 0 else Px_af[:, np.newaxis]
+        Py_af = np.c_[inputs["Py_af_cases"], Py_af] if n_cases > 0 else Py_af[:, np.newaxis]
+        Pz_af = np.c_[inputs["Pz_af_cases"], Pz_af] if n_cases > 0 else Pz_af[:, np.newaxis]
 
         if not self.options["pbeam"]:
             # Have to further move the loads into principle directions
-            P = DirectionVector(Px_af, Py_af, Pz_af).bladeToAirfoil(alpha)
+            P = DirectionVector(Px_af, Py_af, Pz_af).bladeToAirfoil(alpha[:, np.newaxis])
             Px_af = P.x
             Py_af = P.y
             Pz_af = P.z
@@ -466,14 +547,17 @@ class RunFrame3DD(ExplicitComponent):
         Px, Py, Pz = Pz_af, Py_af, Px_af  # switch to local c.s.
         xx1 = xy1 = xz1 = np.zeros(n - 1)
         xx2 = xy2 = xz2 = L - 1e-6  # subtract small number b.c. of precision
-        wx1 = Px[:-1]
-        wx2 = Px[1:]
-        wy1 = Py[:-1]
-        wy2 = Py[1:]
-        wz1 = Pz[:-1]
-        wz2 = Pz[1:]
-        load.changeTrapezoidalLoads(elem, xx1, xx2, wx1, wx2, xy1, xy2, wy1, wy2, xz1, xz2, wz1, wz2)
-        blade.addLoadCase(load)
+        gx = gy = gz = 0.0
+        for k in range(n_cases + 1):
+            load = pyframe3dd.StaticLoadCase(gx, gy, gz)
+            wx1 = Px[:-1, k]
+            wx2 = Px[1:, k]
+            wy1 = Py[:-1, k]
+            wy2 = Py[1:, k]
+            wz1 = Pz[:-1, k]
+            wz2 = Pz[1:, k]
+            load.changeTrapezoidalLoads(elem, xx1, xx2, wx1, wx2, xy1, xy2, wy1, wy2, xz1, xz2, wz1, wz2)
+            blade.addLoadCase(load)
 
         # Debugging
         # blade.write('blade.3dd')
@@ -481,8 +565,8 @@ class RunFrame3DD(ExplicitComponent):
         # run the analysis
         displacements, forces, reactions, internalForces, mass, modal = blade.run()
 
-        # For now, just 1 load case and blade
-        iCase = 0
+        # Design load case is the last one
+        iCase = n_cases
 
         # Mode shapes and frequencies
         n_freq2 = int(self.n_freq / 2)
@@ -496,15 +580,18 @@ class RunFrame3DD(ExplicitComponent):
         mshapes_y = mshapes_y[:n_freq2, :]
         mshapes_z = mshapes_z[:n_freq2, :]
 
-        # shear and bending w.r.t. principal axes
-        F2 = np.r_[-forces.Vz[iCase, 0], forces.Vz[iCase, 1::2]]  # TODO verify if this is correct
-        F3 = np.r_[-forces.Nx[iCase, 0], forces.Nx[iCase, 1::2]]
-        M1 = np.r_[-forces.Myy[iCase, 0], forces.Myy[iCase, 1::2]]
-        M2 = np.r_[-forces.Mzz[iCase, 0], forces.Mzz[iCase, 1::2]]
+        # shear and bending w.r.t. principal axes, (n_span, n_cases + 1).
+        # Principal axes 1 and 2 are the local y and z axes of the elements, so F2 is Vz as M2 is Mzz
+        F2 = np.r_[-forces.Vz[np.newaxis, :, 0], forces.Vz[:, 1::2].T]
+        F3 = np.r_[-forces.Nx[np.newaxis, :, 0], forces.Nx[:, 1::2].T]
+        M1 = np.r_[-forces.Myy[np.newaxis, :, 0], forces.Myy[:, 1::2].T]
+        M2 = np.r_[-forces.Mzz[np.newaxis, :, 0], forces.Mzz[:, 1::2].T]
+        root_F = -1.0 * np.array([reactions.Fx.sum(axis=1), reactions.Fy.sum(axis=1), reactions.Fz.sum(axis=1)])
+        root_M = -1.0 * np.array([reactions.Mxx.sum(axis=1), reactions.Myy.sum(axis=1), reactions.Mzz.sum(axis=1)])
 
         # Store outputs
-        outputs["root_F"] = -1.0 * np.array([reactions.Fx.sum(), reactions.Fy.sum(), reactions.Fz.sum()])
-        outputs["root_M"] = -1.0 * np.array([reactions.Mxx.sum(), reactions.Myy.sum(), reactions.Mzz.sum()])
+        outputs["root_F"] = root_F[:, iCase]
+        outputs["root_M"] = root_M[:, iCase]
         outputs["freqs"] = modal.freq[: self.n_freq]
         outputs["edge_mode_shapes"] = mshapes_y
         outputs["flap_mode_shapes"] = mshapes_x
@@ -521,11 +608,21 @@ class RunFrame3DD(ExplicitComponent):
         outputs["dz"] = -displacements.dz[iCase, :]
         outputs["EI11"] = EI11
         outputs["EI22"] = EI22
-        outputs["M1"] = M1
-        outputs["M2"] = M2
-        outputs["F2"] = F2
-        outputs["F3"] = F3
+        outputs["M1"] = M1[:, iCase]
+        outputs["M2"] = M2[:, iCase]
+        outputs["F2"] = F2[:, iCase]
+        outputs["F3"] = F3[:, iCase]
         outputs["alpha"] = alpha
+        if n_cases > 0:
+            outputs["root_F_cases"] = root_F[:, :iCase]
+            outputs["root_M_cases"] = root_M[:, :iCase]
+            outputs["dx_cases"] = -displacements.dx[:iCase, :].T
+            outputs["dy_cases"] = displacements.dy[:iCase, :].T
+            outputs["dz_cases"] = -displacements.dz[:iCase, :].T
+            outputs["M1_cases"] = M1[:, :iCase]
+            outputs["M2_cases"] = M2[:, :iCase]
+            outputs["F2_cases"] = F2[:, :iCase]
+            outputs["F3_cases"] = F3[:, :iCase]
 
 
 class ComputeStrains(ExplicitComponent):
@@ -536,6 +633,7 @@ class ComputeStrains(ExplicitComponent):
     def setup(self):
         rotorse_options = self.options["modeling_options"]["WISDEM"]["RotorSE"]
         self.n_span = n_span = rotorse_options["n_span"]
+        self.n_cases = n_cases = rotorse_options["n_extra_load_cases"]
 
         self.add_input("chord", val=np.zeros(n_span), units="m", desc="chord length at each section")
         self.add_input("EA", val=np.zeros(n_span), units="N", desc="axial stiffness")
@@ -577,6 +675,25 @@ class ComputeStrains(ExplicitComponent):
             units="N",
             desc="axial resultant along blade span",
         )
+        if n_cases > 0:
+            self.add_input(
+                "M1_cases",
+                val=np.zeros((n_span, n_cases)),
+                units="N*m",
+                desc="distribution along blade span of bending moment w.r.t principal axis 1 of each extra load case",
+            )
+            self.add_input(
+                "M2_cases",
+                val=np.zeros((n_span, n_cases)),
+                units="N*m",
+                desc="distribution along blade span of bending moment w.r.t principal axis 2 of each extra load case",
+            )
+            self.add_input(
+                "F3_cases",
+                val=np.zeros((n_span, n_cases)),
+                units="N",
+                desc="axial resultant along blade span of each extra load case",
+            )
         self.add_input(
             "xu_spar",
             val=np.zeros(n_span),
@@ -639,6 +756,27 @@ class ComputeStrains(ExplicitComponent):
             val=np.zeros(n_span),
             desc="strain in trailing-edge panels on lower surface at location xl,yl_te with loads P_te",
         )
+        if n_cases > 0:
+            self.add_output(
+                "strainU_spar_cases",
+                val=np.zeros((n_span, n_cases)),
+                desc="strain in spar cap on upper surface at location xu,yu_strain of each extra load case",
+            )
+            self.add_output(
+                "strainL_spar_cases",
+                val=np.zeros((n_span, n_cases)),
+                desc="strain in spar cap on lower surface at location xl,yl_strain of each extra load case",
+            )
+            self.add_output(
+                "strainU_te_cases",
+                val=np.zeros((n_span, n_cases)),
+                desc="strain in trailing-edge panels on upper surface at location xu,yu_te of each extra load case",
+            )
+            self.add_output(
+                "strainL_te_cases",
+                val=np.zeros((n_span, n_cases)),
+                desc="strain in trailing-edge panels on lower surface at location xl,yl_te of each extra load case",
+            )
         self.add_output(
             "axial_root_sparU_load2stress",
             val=np.zeros(6),
@@ -724,6 +862,25 @@ class ComputeStrains(ExplicitComponent):
         outputs["strainU_te"] = strainU_te
         outputs["strainL_te"] = strainL_te
 
+        # ----- same for each of the extra load cases -----
+        n_cases = self.options["modeling_options"]["WISDEM"]["RotorSE"]["n_extra_load_cases"]
+        if n_cases > 0:
+            strains = []
+            for k in range(n_cases):
+                loads = {
+                    "M1in": inputs["M1_cases"][:, k],
+                    "M2in": inputs["M2_cases"][:, k],
+                    "F3in": inputs["F3_cases"][:, k],
+                }
+                strains.append(
+                    strain(xu_spar, yu_spar, xl_spar, yl_spar, **loads) + strain(xu_te, yu_te, xl_te, yl_te, **loads)
+                )
+            strains = np.array(strains).transpose(1, 2, 0)  # (4, n_span, n_cases)
+            outputs["strainU_spar_cases"] = strains[0]
+            outputs["strainL_spar_cases"] = strains[1]
+            outputs["strainU_te_cases"] = strains[2]
+            outputs["strainL_te_cases"] = strains[3]
+
         # Sensitivities for fatigue calculation
         Espar = E  # Can update with rotor_elasticity later TODO
         Ete = E  # Can update with rotor_elasticity later TODO
@@ -1148,6 +1305,9 @@ class RotorStructure(Group):
             "rhoA",
             "rhoJ",
         ]
+        if modeling_options["WISDEM"]["RotorSE"]["n_extra_load_cases"] > 0:
+            # Stack of extra distributed load cases, solved along with the gust case
+            promoteListFrame3DD += ["Px_af_cases", "Py_af_cases", "Pz_af_cases"]
         self.add_subsystem("frame", RunFrame3DD(modeling_options=modeling_options), promotes=promoteListFrame3DD)
         promoteListStrains = [
             "chord",
@@ -1210,6 +1370,10 @@ class RotorStructure(Group):
         self.connect("frame.F3", "strains.F3")
         self.connect("frame.EI11", "strains.EI11")
         self.connect("frame.EI22", "strains.EI22")
+        if modeling_options["WISDEM"]["RotorSE"]["n_extra_load_cases"] > 0:
+            self.connect("frame.M1_cases", "strains.M1_cases")
+            self.connect("frame.M2_cases", "strains.M2_cases")
+            self.connect("frame.F3_cases", "strains.F3_cases")
 
         # Blade distributed deflections to tip deflection
         self.connect("frame.dx", "tip_pos.dx_tip", src_indices=[-1])
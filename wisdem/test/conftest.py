@@ -1,3 +1,4 @@
+import os
 from pathlib import Path
 
 import pytest
@@ -18,18 +19,25 @@ def pytest_addoption(parser):  # noqa: D103
         default=False,
         help="run all tests in 'test/test_examples/.",
     )
+    parser.addoption(
+        "--benchmark",
+        action="store_true",
+        default=False,
+        help="run the timing benchmarks in 'test/test_benchmarks/' against the stored baselines.",
+    )
 
 
 def pytest_configure(config):  # noqa: D103
     # Check for the options
     unit = config.getoption("--unit")
     integration = config.getoption("--integration")
+    benchmark = config.getoption("--benchmark")
 
     # Provide the appropriate directories
     unit_tests = [
         str(name)
         for el in sorted(TEST_ROOT.iterdir())
-        if "test_examples" not in el.parts and el.is_dir()
+        if "test_examples" not in el.parts and "test_benchmarks" not in el.parts and el.is_dir()
         for name in sorted(el.iterdir())
         if name.name.startswith("test_") and name.suffix == ".py"
     ]
@@ -39,6 +47,11 @@ def pytest_configure(config):  # noqa: D103
         if name.name.startswith("test_") and name.suffix == ".py"
     ]
 
+    if benchmark:
+        os.environ["WISDEM_BENCHMARK"] = "1"
+        config.args = [str(TEST_ROOT / "test_benchmarks")]
+        return
+
     # If both, run them all; if neither skip any modifications; otherwise run just the
     # appropriate subset
     if integration and unit:
@@ -0,0 +1,80 @@
+"""
+Startup time of WISDEM, measured as the time to import its entry points in a fresh interpreter.
+
+The timing cases follow test_rotorse_aero.py: they only run if WISDEM_BENCHMARK is set (or pytest
+is called with --benchmark) and are compared with, or saved to with WISDEM_BENCHMARK_SAVE, the
+stored relative times in baselines.json. The check that the heavy optional modules stay out of a plain
+import always runs.
+"""
+
+import sys
+import unittest
+import subprocess
+
+from wisdem.test.test_benchmarks.test_rotorse_aero import SAVE, BENCHMARK, check_baseline, save_baselines
+
+# Modules that are only needed by some analyses and must not be imported to start WISDEM
+# (matplotlib.pyplot is not listed as openmdao.api imports it)
+LAZY_MODULES = [
+    "wisdem.rotorse.rotor",
+    "wisdem.floatingse",
+    "wisdem.orbit",
+    "wisdem.landbosse",
+    "wisdem.wombat",
+    "wisdem.optimization_drivers.nsga2_driver",
+    "jsonschema",
+    "pandas",
+]
+
+results = {}
+
+
+def import_time(module, repeat=3):
+    """Best wall time (s) to import module in a fresh interpreter, less the interpreter startup"""
+
+    def run(statement):
+        code = f"import time; t = time.perf_counter(); {statement}; print(time.perf_counter() - t)"
+        out = subprocess.run(
+            [sys.executable, "-c", code],
+            capture_output=True,
+            check=True,
+            text=True,
+        )
+        return float(out.stdout.split()[-1])
+
+    run(f"import {module}")  # warm up the file system and byte code caches
+    return min(run(f"import {module}") for _ in range(repeat))
+
+
+class TestImportTime(unittest.TestCase):
+    def check(self, name, seconds):
+        check_baseline(self, results, "startup/" + name, seconds)
+
+    def test_lazy_modules(self):
+        code = (
+            "import sys; import wisdem.glue_code.runWISDEM; import wisdem.main; "
+            f"print(' '.join(m for m in {LAZY_MODULES!r} if m in sys.modules))"
+        )
+        out = subprocess.run([sys.executable, "-c", code], capture_output=True, check=True, text=True)
+        self.assertEqual(out.stdout.split(), [])
+
+    @unittest.skipUnless(BENCHMARK, "set WISDEM_BENCHMARK to run the benchmarks")
+    def test_import_wisdem(self):
+        self.check("import wisdem", import_time("wisdem"))
+
+    @unittest.skipUnless(BENCHMARK, "set WISDEM_BENCHMARK to run the benchmarks")
+    def test_import_run_wisdem(self):
+        self.check("import runWISDEM", import_time("wisdem.glue_code.runWISDEM"))
+
+    @unittest.skipUnless(BENCHMARK, "set WISDEM_BENCHMARK to run the benchmarks")
+    def test_import_main(self):
+        self.check("import main", import_time("wisdem.main"))
+
+
+def tearDownModule():
+    if BENCHMARK and SAVE and results:
+        save_baselines(results)
+
+
+if __name__ == "__main__":
+    unittest.main()
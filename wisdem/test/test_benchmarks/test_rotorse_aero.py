@@ -0,0 +1,325 @@
+"""
+Timing benchmarks of the RotorSE aerodynamic hot paths on the IEA reference blades.
+
+The benchmarks only run if the WISDEM_BENCHMARK environment variable is set (or pytest is
+called with --benchmark). Each case is timed as the best of several repeats, relative to the time of
+a fixed numpy reference workload on the same machine, and compared with the stored relative time in
+baselines.json, failing if it is more than WISDEM_BENCHMARK_TOLERANCE (default 1.0, i.e. twice the
+baseline) slower. Set WISDEM_BENCHMARK_SAVE to record new baselines instead, e.g. after a deliberate change.
+
+The relative times only take out the overall speed of the machine. The ratio of numpy to interpreter
+speed, the BLAS library and the number of cores still differ between machines, so baselines recorded
+on another machine (see "machine" in baselines.json) are a rough guide only.
+"""
+
+import os
+import json
+import time
+import platform
+import unittest
+
+import numpy as np
+import openmdao.api as om
+
+import wisdem.rotorse.rotor_power as rp
+from wisdem.ccblade.ccblade import CCBlade, CCAirfoil
+from wisdem.inputs.validation import load_geometry_yaml
+from wisdem.ccblade.ccblade_component import CCBladeLoads
+
+BENCHMARK = bool(os.environ.get("WISDEM_BENCHMARK"))
+SAVE = bool(os.environ.get("WISDEM_BENCHMARK_SAVE"))
+TOLERANCE = float(os.environ.get("WISDEM_BENCHMARK_TOLERANCE", 1.0))
+
+BASELINES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines.json")
+REFERENCE_TURBINES = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))),
+    "examples",
+    "02_reference_turbines",
+)
+
+N_SPAN = 30
+N_AOA = 200
+
+
+def reference_workload():
+    # Small numpy operations in a python loop, like the vectorized BEM solver
+    x = np.linspace(0.0, 1.0, 1000)
+    total = 0.0
+    for k in range(1000):
+        total += float(np.sum(np.sin(k * x) * x))
+    return total
+
+
+_reference_time = []
+
+
+def reference_time():
+    """Best time (s) of the reference workload, the unit of the stored baselines"""
+    if not _reference_time:
+        _reference_time.append(best_time(reference_workload, repeat=10))
+    return _reference_time[0]
+
+
+def check_baseline(test, results, key, seconds):
+    """Compare the time of a case, relative to the reference workload, with its baseline"""
+    relative = seconds / reference_time()
+    results[key] = relative
+    if SAVE:
+        return
+    with open(BASELINES) as f:
+        baseline = json.load(f)["cases"].get(key)
+    if baseline is None:
+        test.skipTest("no stored baseline for " + key)
+    test.assertLessEqual(
+        relative,
+        (1.0 + TOLERANCE) * baseline,
+        f"{key} took {seconds:.4g} s, {relative:.4g} reference times against a baseline of {baseline:.4g}",
+    )
+
+
+def save_baselines(results):
+    """Store the relative times of the cases in baselines.json"""
+    baseline = {"cases": {}}
+    if os.path.exists(BASELINES):
+        with open(BASELINES) as f:
+            baseline = json.load(f)
+    baseline["machine"] = f"{platform.machine()} {platform.processor()} {platform.python_version()}"
+    baseline["reference_seconds"] = float(f"{reference_time():.4g}")
+    baseline["cases"].update({k: float(f"{v:.4g}") for k, v in results.items()})
+    baseline["cases"] = dict(sorted(baseline["cases"].items()))
+    with open(BASELINES, "w") as f:
+        json.dump(baseline, f, indent=4)
+        f.write("\n")
+
+
+def best_time(func, number=1, repeat=5):
+    """Best time (s) per call of func over repeat rounds of number calls"""
+    func()  # warm up caches
+    times = []
+    for _ in range(repeat):
+        t = time.perf_counter()
+        for _ in range(number):
+            func()
+        times.append((time.perf_counter() - t) / number)
+    return min(times)
+
+
+def reference_rotor(fname):
+    """Spanwise geometry and airfoil polars of a reference blade, on a common grid of N_SPAN
+    stations and N_AOA angles of attack. Each station takes the polar of the nearest airfoil
+    inboard, which is good enough for timing."""
+    data = load_geometry_yaml(os.path.join(REFERENCE_TURBINES, fname))
+    blade = data["components"]["blade"]
+    shape = blade["outer_shape"]
+
+    Rhub = 0.5 * data["components"]["hub"]["diameter"]
+    blade_length = blade["reference_axis"]["z"]["values"][-1]
+    s = np.linspace(0.0, 1.0, N_SPAN)
+    s_r = np.r_[0.01, s[1:-1], 0.99]  # stations short of the hub and tip
+
+    rotor = {
+        "r": Rhub + s_r * blade_length,
+        "chord": np.interp(s_r, shape["chord"]["grid"], shape["chord"]["values"]),
+        "theta": np.interp(s_r, shape["twist"]["grid"], shape["twist"]["values"]),
+        "Rhub": Rhub,
+        "Rtip": Rhub + blade_length,
+        "precone": data["components"]["hub"]["cone_angle"],
+        "tilt": 6.0,
+        "hub_height": data["assembly"]["hub_height"],
+        "nBlades": data["assembly"]["number_of_blades"],
+        "rated_power": data["assembly"]["rated_power"],
+        "v_min": data["assembly"]["cut_in_wind_speed"],
+        "v_max": data["assembly"]["cut_out_wind_speed"],
+        "omega_max": data["control"]["max_rotor_speed"],
+        "max_allowable_blade_tip_speed": data["control"]["max_allowable_blade_tip_speed"],
+        "tsr": data["control"]["optimal_tsr"],
+    }
+
+    polars = {af["name"]: af["polars"][0]["re_sets"][0] for af in data["airfoils"]}
+    positions = [af["spanwise_position"] for af in shape["airfoils"]]
+    names = [af["name"] for af in shape["airfoils"]]
+    aoa = np.linspace(-180.0, 180.0, N_AOA)
+    cl = np.zeros((N_SPAN, N_AOA, 1))
+    cd = np.zeros((N_SPAN, N_AOA, 1))
+    cm = np.zeros((N_SPAN, N_AOA, 1))
+    for i in range(N_SPAN):
+        polar = polars[names[np.searchsorted(positions, s[i], side="right") - 1]]
+        cl[i, :, 0] = np.interp(aoa, polar["cl"]["grid"], polar["cl"]["values"])
+        cd[i, :, 0] = np.interp(aoa, polar["cd"]["grid"], polar["cd"]["values"])
+        cm[i, :, 0] = np.interp(aoa, polar["cm"]["grid"], polar["cm"]["values"])
+    rotor["airfoils_aoa"] = aoa
+    rotor["airfoils_Re"] = np.array([polars[names[-1]]["re"]])
+    rotor["airfoils_cl"] = cl
+    rotor["airfoils_cd"] = cd
+    rotor["airfoils_cm"] = cm
+
+    return rotor
+
+
+def ccblade_rotor(rotor, derivatives=False):
+    # Vectorized, as in ComputePowerCurve
+    af = [
+        CCAirfoil(
+            rotor["airfoils_aoa"],
+            rotor["airfoils_Re"],
+            rotor["airfoils_cl"][i],
+            rotor["airfoils_cd"][i],
+            rotor["airfoils_cm"][i],
+            tabulated=True,
+        )
+        for i in range(N_SPAN)
+    ]
+    return CCBlade(
+        rotor["r"],
+        rotor["chord"],
+        rotor["theta"],
+        af,
+        rotor["Rhub"],
+        rotor["Rtip"],
+        rotor["nBlades"],
+        1.225,
+        1.81206e-5,
+        rotor["precone"],
+        rotor["tilt"],
+        0.0,
+        shearExp=0.2,
+        hubHt=rotor["hub_height"],
+        nSector=4,
+        derivatives=derivatives,
+        vectorized=True,
+    )
+
+
+def modeling_options():
+    options = {}
+    options["WISDEM"] = {}
+    options["WISDEM"]["RotorSE"] = {}
+    options["WISDEM"]["RotorSE"]["n_span"] = N_SPAN
+    options["WISDEM"]["RotorSE"]["n_aoa"] = N_AOA
+    options["WISDEM"]["RotorSE"]["n_Re"] = 1
+    options["WISDEM"]["RotorSE"]["regulation_reg_III"] = True
+    options["WISDEM"]["RotorSE"]["fix_pitch_regI12"] = False
+    options["WISDEM"]["RotorSE"]["n_pc"] = 20
+    options["WISDEM"]["RotorSE"]["n_pc_spline"] = 200
+    return options
+
+
+def set_rotor(prob, rotor):
+    for k in ["r", "chord", "theta", "Rhub", "Rtip", "precone", "tilt", "hub_height", "nBlades"]:
+        prob[k] = rotor[k]
+    for k in ["airfoils_aoa", "airfoils_Re", "airfoils_cl", "airfoils_cd", "airfoils_cm"]:
+        prob[k] = rotor[k]
+    prob["rho"] = 1.225
+    prob["mu"] = 1.81206e-5
+    prob["shearExp"] = 0.2
+    prob["nSector"] = 4
+
+
+class AeroBenchmark(object):
+    """Benchmark cases for one reference blade, mixed into a TestCase per turbine"""
+
+    turbine = None
+    yaml = None
+    results = {}
+
+    @classmethod
+    def setUpClass(cls):
+        cls.rotor = reference_rotor(cls.yaml)
+
+    def check(self, name, seconds):
+        check_baseline(self, AeroBenchmark.results, self.turbine + "/" + name, seconds)
+
+    def test_airfoil_evaluate(self):
+        rotor = self.rotor
+        af = CCAirfoil(
+            rotor["airfoils_aoa"],
+            rotor["airfoils_Re"],
+            rotor["airfoils_cl"][-1],
+            rotor["airfoils_cd"][-1],
+            tabulated=True,
+        )
+        alpha = np.deg2rad(np.linspace(-20.0, 20.0, 10000))
+        Re = np.full_like(alpha, 1e7)
+        self.check("CCAirfoil.evaluate", best_time(lambda: af.evaluate(alpha, Re), number=20))
+
+    def test_distributed_aero_loads(self):
+        ccblade = ccblade_rotor(self.rotor)
+        self.check(
+            "CCBlade.distributedAeroLoads",
+            best_time(lambda: ccblade.distributedAeroLoads(10.0, 7.0, 0.0, 90.0), number=20),
+        )
+
+        ccblade.derivatives = True
+        self.check(
+            "CCBlade.distributedAeroLoads_derivatives",
+            best_time(lambda: ccblade.distributedAeroLoads(10.0, 7.0, 0.0, 90.0), number=5),
+        )
+
+    def test_evaluate(self):
+        ccblade = ccblade_rotor(self.rotor)
+        Uinf = np.linspace(3.0, 25.0, 20)
+        Omega = np.minimum(Uinf * self.rotor["tsr"] / self.rotor["Rtip"] * 30.0 / np.pi, self.rotor["omega_max"])
+        pitch = np.maximum(0.0, Uinf - 11.0)
+        self.check(
+            "CCBlade.evaluate", best_time(lambda: ccblade.evaluate(Uinf, Omega, pitch, coefficients=True), number=3)
+        )
+
+        ccblade.derivatives = True
+        self.check(
+            "CCBlade.evaluate_derivatives",
+            best_time(lambda: ccblade.evaluate(Uinf, Omega, pitch, coefficients=True), repeat=3),
+        )
+
+    def test_power_curve(self):
+        prob = om.Problem(reports=False)
+        prob.model.add_subsystem(
+            "powercurve", rp.ComputePowerCurve(modeling_options=modeling_options()), promotes=["*"]
+        )
+        prob.setup()
+        set_rotor(prob, self.rotor)
+        for k in ["v_min", "v_max", "rated_power", "omega_max", "max_allowable_blade_tip_speed"]:
+            prob[k] = self.rotor[k]
+        prob["tsr_operational"] = self.rotor["tsr"]
+        prob["gearbox_efficiency"] = 1.0
+        prob["generator_efficiency"] = 0.95
+        prob["lss_rpm"] = np.linspace(0.1, self.rotor["omega_max"], 20)
+        prob["drivetrainType"] = "DIRECT_DRIVE"
+
+        self.check("ComputePowerCurve.compute", best_time(prob.run_model, repeat=3))
+
+    def test_loads_partials(self):
+        prob = om.Problem(reports=False)
+        prob.model.add_subsystem("loads", CCBladeLoads(modeling_options=modeling_options()), promotes=["*"])
+        prob.setup()
+        set_rotor(prob, self.rotor)
+        prob["V_load"] = 10.0
+        prob["Omega_load"] = 7.0
+        prob["pitch_load"] = 0.0
+        prob["azimuth_load"] = 90.0
+
+        def linearize():
+            prob.run_model()
+            prob.model.run_linearize()
+
+        self.check("CCBladeLoads.compute_partials", best_time(linearize, number=5))
+
+
+@unittest.skipUnless(BENCHMARK, "set WISDEM_BENCHMARK to run the benchmarks")
+class TestIEA15MW(AeroBenchmark, unittest.TestCase):
+    turbine = "IEA-15MW"
+    yaml = "IEA-15-240-RWT.yaml"
+
+
+@unittest.skipUnless(BENCHMARK, "set WISDEM_BENCHMARK to run the benchmarks")
+class TestIEA3p4MW(AeroBenchmark, unittest.TestCase):
+    turbine = "IEA-3.4MW"
+    yaml = "IEA-3p4-130-RWT.yaml"
+
+
+def tearDownModule():
+    if BENCHMARK and SAVE and AeroBenchmark.results:
+        save_baselines(AeroBenchmark.results)
+
+
+if __name__ == "__main__":
+    unittest.main()
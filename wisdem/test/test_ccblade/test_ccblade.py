@@ -12,14 +12,14 @@ See the License for the specific language governing permissions and
 limitations under the License.
 """
 
+import os
 import math
 import unittest
-import os
-from wisdem.inputs.validation import load_geometry_yaml
 
 import numpy as np
 
-from wisdem.ccblade.ccblade import CCBlade, CCAirfoil
+from wisdem.ccblade.ccblade import CCBlade, CCAirfoil, CCAirfoilCache
+from wisdem.inputs.validation import load_geometry_yaml
 
 
 class TestNREL5MW(unittest.TestCase):
@@ -288,6 +288,124 @@ class TestNREL5MW(unittest.TestCase):
         np.testing.assert_allclose(P[idx] / 1e6, Pref[idx] / 1e3, atol=0.2)  # within 0.2 of 1MW
         np.testing.assert_allclose(T[idx] / 1e6, Tref[idx] / 1e3, atol=0.15)
 
+    def test_vectorized_loads(self):
+        for Uinf, Omega, pitch, azimuth in [(10.0, 11.4, 0.0, 0.0), (25.0, 12.1, 23.5, 90.0), (5.0, 0.0, 0.0, 0.0)]:
+            self.rotor.vectorized = False
+            loads, _ = self.rotor.distributedAeroLoads(Uinf, Omega, pitch, azimuth)
+            self.rotor.vectorized = True
+            loads_vec, _ = self.rotor.distributedAeroLoads(Uinf, Omega, pitch, azimuth)
+
+            for key in loads.keys():
+                np.testing.assert_allclose(loads_vec[key], loads[key], rtol=1e-10, atol=1e-10)
+
+    def test_vectorized_evaluate(self):
+        Uinf = np.array([3.0, 8.0, 11.0, 18.0, 25.0])
+        Omega = np.array([6.972, 9.156, 11.890, 0.0, 12.100])
+        pitch = np.array([0.0, 0.0, 0.0, 14.920, 23.469])
+        self.rotor.yaw = np.deg2rad(10.0)
+        self.rotor.nSector = 4
+
+        for derivatives in [False, True]:
+            self.rotor.derivatives = derivatives
+            self.rotor.vectorized = False
+            outputs, derivs = self.rotor.evaluate(Uinf, Omega, pitch)
+            self.rotor.vectorized = True
+            outputs_vec, derivs_vec = self.rotor.evaluate(Uinf, Omega, pitch)
+
+            for key in outputs.keys():
+                np.testing.assert_allclose(outputs_vec[key], outputs[key], rtol=1e-10, atol=1e-8)
+            for key in derivs.keys():
+                for wrt in derivs[key].keys():
+                    np.testing.assert_allclose(derivs_vec[key][wrt], derivs[key][wrt], rtol=1e-10, atol=1e-8)
+
+    def test_inverse_twist(self):
+        n = len(self.rotor.r)
+        alpha = np.deg2rad(np.linspace(12.0, 6.0, n))
+        cl = np.zeros(n)
+        cd = np.zeros(n)
+        for i in range(n):
+            cl[i], cd[i] = self.rotor.af[i].evaluate(alpha[i], 1e6)
+
+        Uinf = np.array([8.0, 10.0, 11.0])
+        Omega = np.array([7.5, 9.0, 0.0])
+        pitch = np.array([0.0, 1.0, 2.0])
+        # last sector, whose twist the sector by sector inverse analysis keeps
+        azimuth = 360.0 * (self.rotor.nSector - 1) / self.rotor.nSector
+
+        theta = self.rotor.inverseTwist(Uinf, Omega, pitch, alpha, cl, cd, azimuth=azimuth)
+        self.assertEqual(theta.shape, (3, n))
+
+        self.rotor.inverse_analysis = True
+        self.rotor.alpha = alpha
+        self.rotor.cl = cl
+        self.rotor.cd = cd
+        for k in range(len(Uinf)):
+            self.rotor.evaluate([Uinf[k]], [Omega[k]], [pitch[k]])
+            np.testing.assert_allclose(theta[k], self.rotor.theta, rtol=1e-8, atol=1e-8)
+            theta_k = self.rotor.inverseTwist(Uinf[k], Omega[k], pitch[k], alpha, cl, cd, azimuth=azimuth)
+            np.testing.assert_allclose(theta_k, theta[k], rtol=1e-12, atol=1e-12)
+        self.rotor.inverse_analysis = False
+
+        # The forward analysis with the inverted twist recovers the target angles of attack
+        self.rotor.theta = theta[0]
+        loads, _ = self.rotor.distributedAeroLoads(Uinf[0], Omega[0], pitch[0], azimuth)
+        np.testing.assert_allclose(np.deg2rad(loads["alpha"]), alpha, atol=1e-6)
+
+    def test_tabulated_airfoil(self):
+        baseyaml = os.path.join(
+            os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.realpath(__file__))))),
+            "examples",
+            "02_reference_turbines",
+            "nrel5mw.yaml",
+        )
+        data = load_geometry_yaml(baseyaml)
+        alpha = np.deg2rad(np.linspace(-185.0, 185.0, 371))
+        Re = np.full_like(alpha, 5e6)
+
+        for af in data["airfoils"]:
+            polars = af["polars"][0]
+            args = (
+                polars["re_sets"][0]["cl"]["grid"],
+                [polars["re_sets"][0]["re"]],
+                polars["re_sets"][0]["cl"]["values"],
+                polars["re_sets"][0]["cd"]["values"],
+                polars["re_sets"][0]["cm"]["values"],
+            )
+            spline = CCAirfoil(*args)
+            table = CCAirfoil(*args, tabulated=True)
+
+            np.testing.assert_allclose(
+                table.evaluate(alpha, Re, return_cm=True), spline.evaluate(alpha, Re, return_cm=True), atol=1e-12
+            )
+            for val, val_ref in zip(table.evaluate_all(alpha, Re), spline.evaluate_all(alpha, Re)):
+                np.testing.assert_allclose(val, val_ref, atol=1e-12)
+            for a in alpha[10:-10:20]:
+                np.testing.assert_allclose(table.derivatives(a, 5e6), spline.derivatives(a, 5e6), atol=1e-12)
+
+    def test_airfoil_cache(self):
+        alpha = np.linspace(-180.0, 180.0, 37)
+        cl = np.sin(2 * np.deg2rad(alpha))[:, np.newaxis]
+        cd = 0.01 + 1.0 - np.cos(2 * np.deg2rad(alpha))[:, np.newaxis]
+
+        cache = CCAirfoilCache(maxsize=2)
+        af1 = cache.get(alpha, [1e6], cl, cd)
+        af2 = cache.get(alpha.copy(), [1e6], cl.copy(), cd.copy())
+        self.assertIs(af1, af2)
+        self.assertEqual(cache.hits, 1)
+        self.assertEqual(cache.misses, 1)
+
+        # different data or backend gives a new airfoil
+        af3 = cache.get(alpha, [1e6], 1.1 * cl, cd)
+        af4 = cache.get(alpha, [1e6], cl, cd, tabulated=True)
+        self.assertIsNot(af3, af1)
+        self.assertIsNot(af4, af1)
+        self.assertTrue(af4.tabulated)
+
+        # least recently used entry was evicted
+        self.assertEqual(len(cache), 2)
+        self.assertIsNot(cache.get(alpha, [1e6], cl, cd), af1)
+        self.assertEqual(cache.misses, 4)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,6 +1,7 @@
 import os
 import glob
 import unittest
+from unittest import mock
 
 import numpy as np
 import openmdao.api as om
@@ -10,7 +11,7 @@ from wisdem.commonse import fileIO
 
 
 def clear_files():
-    flist = glob.glob("test.*")
+    flist = glob.glob("test.*") + glob.glob("test-columns.npz")
     for f in flist:
         os.remove(f)
 
@@ -57,29 +58,39 @@ class TestFileIO(unittest.TestCase):
 
     def testSaveFile(self):
         clear_files()
-        fileIO.save_data("test.junk", self.prob, mat_file=False, npz_file=False, xls_file=False)
+        fileIO.save_data("test.junk", self.prob, mat_file=False, npz_file=False, xls_file=False, pkl_file=True)
         self.assertTrue(os.path.exists("test.pkl"))
         self.assertFalse(os.path.exists("test.npz"))
         self.assertFalse(os.path.exists("test.mat"))
         self.assertFalse(os.path.exists("test.xlsx"))
 
         clear_files()
-        fileIO.save_data("test.junk", self.prob, mat_file=True)
-        self.assertTrue(os.path.exists("test.pkl"))
+        fileIO.save_data("test.junk", self.prob, npz_file=True, mat_file=True, xls_file=True)
+        self.assertFalse(os.path.exists("test.pkl"))
         self.assertTrue(os.path.exists("test.npz"))
         self.assertTrue(os.path.exists("test.mat"))
         self.assertTrue(os.path.exists("test.xlsx"))
+        self.assertTrue(os.path.exists("test.csv"))
 
+        # By default the model is only listed once, for the columnar archive
         clear_files()
-        fileIO.save_data("test.junk", self.prob)
-        self.assertTrue(os.path.exists("test.pkl"))
-        self.assertTrue(os.path.exists("test.npz"))
-        self.assertTrue(os.path.exists("test.xlsx"))
+        with mock.patch.object(fileIO, "get_variable_list") as get_variable_list:
+            fileIO.save_data("test.junk", self.prob)
+        get_variable_list.assert_not_called()
+        self.assertFalse(os.path.exists("test.pkl"))
+        self.assertFalse(os.path.exists("test.npz"))
+        self.assertTrue(os.path.exists("test-columns.npz"))
+        self.assertFalse(os.path.exists("test.xlsx"))
+        self.assertFalse(os.path.exists("test.csv"))
         self.assertFalse(os.path.exists("test.mat"))
 
+        clear_files()
+        fileIO.save_data("test.junk", self.prob, col_file=False)
+        self.assertEqual(glob.glob("test.*") + glob.glob("test-columns.npz"), [])
+
     def testLoadFile_pkl(self):
         clear_files()
-        fileIO.save_data("test", self.prob)
+        fileIO.save_data("test", self.prob, pkl_file=True)
 
         # Check pickle file
         newprob = fileIO.load_data("test.pkl", self.prob)
@@ -98,7 +109,7 @@ class TestFileIO(unittest.TestCase):
 
     def testLoadFile_npz(self):
         clear_files()
-        fileIO.save_data("test", self.prob)
+        fileIO.save_data("test", self.prob, npz_file=True)
 
         # Check pickle file
         newprob = fileIO.load_data("test.npz", self.prob)
@@ -132,7 +143,7 @@ class TestFileIO(unittest.TestCase):
 
     def testLoadFile_csv(self):
         clear_files()
-        fileIO.save_data("test", self.prob)
+        fileIO.save_data("test", self.prob, xls_file=True)
 
         # Check pickle file
         newprob = fileIO.load_data("test.csv", self.prob)
@@ -151,7 +162,7 @@ class TestFileIO(unittest.TestCase):
 
     def testLoadFile_xlsx(self):
         clear_files()
-        fileIO.save_data("test", self.prob)
+        fileIO.save_data("test", self.prob, xls_file=True)
 
         # Check pickle file
         newprob = fileIO.load_data("test.xlsx", self.prob)
@@ -168,6 +179,90 @@ class TestFileIO(unittest.TestCase):
         self.assertEqual(newprob["list_in"], ["empty"] * 3)
         self.assertEqual(newprob["list_out"], ["empty"] * 3 + ["full"] * 3)
 
+    def testLoadFile_columns(self):
+        clear_files()
+        fileIO.save_data("test", self.prob)
+
+        # Values are stored as-is by promoted name, with the metadata alongside
+        coldat = np.load("test-columns.npz", allow_pickle=True)
+        self.assertEqual(coldat["float_in"], 5.0)
+        self.assertEqual(coldat["float_out"], 6.0)
+        npt.assert_equal(coldat["array_out"], np.ones(3))
+        self.assertEqual(coldat["int_out"], 1)
+        self.assertEqual(coldat["string_out"], "empty_full")
+        npt.assert_equal(coldat["list_out"], ["empty"] * 3 + ["full"] * 3)
+        names = list(coldat["__variables__"])
+        self.assertEqual(len(names), 12)
+        self.assertEqual(coldat["__units__"][names.index("array_in")], "m")
+        self.assertEqual(coldat["__types__"][names.index("array_in")], "input")
+        self.assertEqual(coldat["__types__"][names.index("array_out")], "output")
+
+        # Load back into a problem
+        self.prob["float_in"] = 0.0
+        self.prob["array_out"] = np.zeros(3)
+        newprob = fileIO.load_data("test-columns.npz", self.prob)
+        self.assertEqual(newprob["float_in"], 5.0)
+        self.assertEqual(newprob["float_out"], 6.0)
+        npt.assert_equal(newprob["array_out"], np.ones(3))
+        self.assertEqual(newprob["int_out"], 1)
+        self.assertIsInstance(newprob["int_out"], int)
+        self.assertEqual(newprob["string_out"], "empty_full")
+        self.assertEqual(newprob["list_out"], ["empty"] * 3 + ["full"] * 3)
+
+        # Uncompressed arrays are read directly or, if large enough, memory mapped
+        archive = fileIO.NpzArchive("test-columns.npz")
+        self.assertNotIsInstance(archive["array_out"], np.memmap)
+        npt.assert_equal(archive["array_out"], np.ones(3))
+        archive.close()
+        archive = fileIO.NpzArchive("test-columns.npz", mmap_bytes=0)
+        self.assertIsInstance(archive["array_out"], np.memmap)
+        npt.assert_equal(archive["array_out"], np.ones(3))
+        self.assertEqual(archive["string_out"], "empty_full")
+        archive.close()
+        archive = fileIO.NpzArchive("test-columns.npz", mmap_mode=None)
+        self.assertNotIsInstance(archive["array_out"], np.memmap)
+        archive.close()
+
+        # Same table as the pkl file, for the GUI
+        df = fileIO.columns2df("test-columns.npz")
+        values = dict(zip(df["variables"], df["values"]))
+        self.assertEqual(values["float_out"], 6.0)
+        self.assertEqual(values["array_out"], [1.0] * 3)
+        self.assertEqual(values["int_out"], 1)
+        self.assertEqual(values["string_out"], "empty_full")
+        self.assertEqual(values["list_out"], ["empty"] * 3 + ["full"] * 3)
+        self.assertEqual(dict(zip(df["variables"], df["units"]))["array_in"], "m")
+
+        # Variable filters
+        clear_files()
+        self.setUp()
+        fileIO.save_data("test", self.prob, npz_file=True, includes=["*_out"], excludes=["list*"])
+        coldat = np.load("test-columns.npz", allow_pickle=True)
+        npt.assert_equal(
+            sorted(coldat["__variables__"]), ["array_out", "float_out", "fraction_out", "int_out", "string_out"]
+        )
+        npzdat = np.load("test.npz", allow_pickle=True)
+        self.assertEqual(sorted(npzdat.files), ["array_out_m", "float_out_N", "fraction_out", "int_out", "string_out"])
+
+    def testTransferData(self):
+        newprob = om.Problem(reports=False, model=MyGroup())
+        newprob.setup()
+
+        fileIO.transfer_data(self.prob, newprob, includes=["float_*", "*_out"], excludes=["string*"])
+        self.assertEqual(newprob["float_in"], 5.0)
+        self.assertEqual(newprob["float_out"], 6.0)
+        npt.assert_equal(newprob["array_in"], np.zeros(3))
+        npt.assert_equal(newprob["array_out"], np.ones(3))
+        self.assertEqual(newprob["int_out"], 1)
+        self.assertEqual(newprob["string_out"], "empty")
+        self.assertEqual(newprob["list_out"], ["empty"] * 3 + ["full"] * 3)
+
+        fileIO.transfer_data({"_in_N": ("N", 2.0)}, newprob, prefix_append="float")
+        self.assertEqual(newprob["float_in"], 2.0)
+
+        fileIO.transfer_data({"comp.fraction_out": ("", 0.3)}, newprob, prefix_remove="comp.")
+        self.assertEqual(newprob["fraction_out"], 0.3)
+
 
 if __name__ == "__main__":
     unittest.main()
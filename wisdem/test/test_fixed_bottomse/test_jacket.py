@@ -25,6 +25,7 @@ class Test(unittest.TestCase):
         modeling_options["WISDEM"]["FixedBottomSE"]["frame3dd"] = {}
         modeling_options["WISDEM"]["FixedBottomSE"]["frame3dd"]["shear"] = 1
         modeling_options["WISDEM"]["FixedBottomSE"]["frame3dd"]["geom"] = 1
+        modeling_options["WISDEM"]["FixedBottomSE"]["frame3dd"]["sparse"] = False
         modeling_options["WISDEM"]["FixedBottomSE"]["save_truss_figures"] = False
         modeling_options["materials"] = {}
         modeling_options["materials"]["n_mat"] = 1
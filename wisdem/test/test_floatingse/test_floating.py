@@ -34,6 +34,7 @@ class TestOC3Mass(unittest.TestCase):
         opt["WISDEM"]["FloatingSE"]["frame3dd"] = {}
         opt["WISDEM"]["FloatingSE"]["frame3dd"]["shear"] = False
         opt["WISDEM"]["FloatingSE"]["frame3dd"]["geom"] = False
+        opt["WISDEM"]["FloatingSE"]["frame3dd"]["sparse"] = False
         opt["WISDEM"]["FloatingSE"]["frame3dd"]["tol"] = 1e-8
         opt["WISDEM"]["FloatingSE"]["frame3dd"]["shift"] = 10.0
         opt["WISDEM"]["FloatingSE"]["frame3dd"]["modal_method"] = 2
@@ -30,6 +30,7 @@ class TestFrame(unittest.TestCase):
         opt["WISDEM"]["FloatingSE"]["frame3dd"] = {}
         opt["WISDEM"]["FloatingSE"]["frame3dd"]["shear"] = True
         opt["WISDEM"]["FloatingSE"]["frame3dd"]["geom"] = True
+        opt["WISDEM"]["FloatingSE"]["frame3dd"]["sparse"] = False
         opt["WISDEM"]["FloatingSE"]["frame3dd"]["tol"] = 1e-8
         opt["WISDEM"]["FloatingSE"]["frame3dd"]["modal"] = False
         opt["WISDEM"]["FloatingSE"]["gamma_f"] = 1.35  # Safety factor on loads
@@ -89,6 +90,7 @@ class TestFrame(unittest.TestCase):
         opt["WISDEM"]["FloatingSE"]["frame3dd"] = {}
         opt["WISDEM"]["FloatingSE"]["frame3dd"]["shear"] = True
         opt["WISDEM"]["FloatingSE"]["frame3dd"]["geom"] = True
+        opt["WISDEM"]["FloatingSE"]["frame3dd"]["sparse"] = False
         opt["WISDEM"]["FloatingSE"]["frame3dd"]["tol"] = 1e-8
         opt["WISDEM"]["FloatingSE"]["frame3dd"]["modal"] = False
         opt["WISDEM"]["FloatingSE"]["gamma_f"] = 1.35  # Safety factor on loads
@@ -29,6 +29,7 @@ class TestPlatform(unittest.TestCase):
         self.opt["WISDEM"]["FloatingSE"]["frame3dd"] = {}
         self.opt["WISDEM"]["FloatingSE"]["frame3dd"]["shear"] = True
         self.opt["WISDEM"]["FloatingSE"]["frame3dd"]["geom"] = True
+        self.opt["WISDEM"]["FloatingSE"]["frame3dd"]["sparse"] = False
         self.opt["WISDEM"]["FloatingSE"]["frame3dd"]["tol"] = 1e-8
         self.opt["WISDEM"]["FloatingSE"]["frame3dd"]["modal"] = False
         self.opt["WISDEM"]["FloatingSE"]["gamma_f"] = 1.35  # Safety factor on loads
@@ -1,7 +1,10 @@
 import os
 import unittest
 
+import openmdao.api as om
+
 import wisdem.glue_code.gc_LoadInputs as gcl
+from wisdem.glue_code.gc_PoseOptimization import PoseOptimization
 
 test_dir = os.path.join(
     os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.realpath(__file__))))),
@@ -60,6 +63,24 @@ class TestLoadInputs(unittest.TestCase):
             self.myobj.modeling_options["WISDEM"]["RotorSE"]["n_span"],
         )
 
+    def testFrequencyOnly(self):
+        # The tower load cases are skipped, so nothing may depend on them
+        self.myobj.modeling_options["WISDEM"]["TowerSE"]["frame3dd"]["frequency_only"] = True
+        self.myobj.set_run_flags()
+        self.myobj.set_opt_flags()
+        tower_constr = self.myobj.analysis_options["constraints"]["tower"]
+        tower_constr["frequency_1"]["flag"] = True
+        myopt = PoseOptimization(self.myobj.wt_init, self.myobj.modeling_options, self.myobj.analysis_options)
+        myopt.set_constraints(om.Problem(reports=False))
+
+        tower_constr["stress"]["flag"] = True
+        with self.assertRaisesRegex(ValueError, "frequency_only"):
+            myopt.set_constraints(om.Problem(reports=False))
+
+        self.myobj.wt_init["components"]["monopile"] = {}
+        with self.assertRaisesRegex(ValueError, "frequency_only"):
+            self.myobj.set_run_flags()
+
 
 if __name__ == "__main__":
     unittest.main()
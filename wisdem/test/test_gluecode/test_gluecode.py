@@ -5,7 +5,7 @@ from pathlib import Path
 import pytest
 
 import wisdem.inputs as sch
-from wisdem.glue_code.runWISDEM import run_wisdem
+from wisdem.glue_code.runWISDEM import WisdemSession, run_wisdem
 
 test_dir = Path(__file__).parents[3] / "examples" / "02_reference_turbines"
 fname_analysis_options = test_dir / "analysis_options.yaml"
@@ -92,3 +92,24 @@ def test_3p4MW(no_wombat_model_file, subtests):
         assert wt_opt["financese.lcoe"][0] * 1.0e3 == pytest.approx(39.62144631809757, abs=0.1)
         assert wt_opt["rotorse.rs.tip_pos.tip_deflection"][0] == pytest.approx(8.031667548036724, abs=0.1)
         assert wt_opt["towerse.z_param"][-1] == pytest.approx(108.0, abs=0.001)
+
+
+def test_session():
+    """WisdemSession cases match run_wisdem with the same overridden values."""
+    tower_dir = Path(__file__).parents[3] / "examples" / "05_tower_monopile"
+    fnames = [tower_dir / "nrel5mw_tower.yaml", tower_dir / "modeling_options.yaml"]
+    fnames += [tower_dir / "analysis_options.yaml"]
+    outputs = ["towerse.tower_mass", "towerse.tower.f1", "towerse.post.constr_stress"]
+
+    with WisdemSession(*fnames, outputs=outputs) as session:
+        d0 = session.problem["tower.diameter"].copy()
+        cases = [{"tower.diameter": 1.1 * d0}, {}, {"tower.diameter": 0.9 * d0}]
+        results = session.run(cases)
+        assert session.run(cases[:1], n_workers=1)[0]["towerse.tower.f1"] == pytest.approx(
+            results[0]["towerse.tower.f1"], rel=1e-10
+        )
+
+    for case, res in zip(cases, results):
+        wt_opt, _, _ = run_wisdem(*fnames, overridden_values=case, run_only=True)
+        for k in outputs:
+            assert res[k] == pytest.approx(wt_opt[k], rel=1e-10)
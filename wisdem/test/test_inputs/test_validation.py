@@ -1,5 +1,8 @@
 import os
+import shutil
+import tempfile
 import unittest
+from unittest import mock
 from pathlib import Path
 
 import numpy as np
@@ -8,6 +11,9 @@ import numpy as np
 import wisdem.inputs.validation as val
 
 sample_yaml = os.path.join(os.path.dirname(os.path.realpath(__file__)), "sample.yaml")
+example_dir = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.realpath(__file__))))),
+    "examples", "02_reference_turbines")
 
 class TestValidation(unittest.TestCase):
 
@@ -38,6 +44,54 @@ class TestValidation(unittest.TestCase):
         obj2p = val.load_yaml(ftemp2)
 
         self.assertEqual(obj1p, obj2p)
-        
+
+    def testCache(self):
+        temp_dir = tempfile.mkdtemp()
+        try:
+            fanalysis = os.path.join(example_dir, "analysis_options.yaml")
+            with mock.patch.dict(os.environ, {"WISDEM_CACHE_DIR": temp_dir}):
+                os.environ.pop("WISDEM_YAML_CACHE", None)
+                self.assertIsNone(val.get_yaml_cache_dir())
+                ref = val.load_analysis_yaml(fanalysis)
+                self.assertEqual(os.listdir(temp_dir), [])
+
+            with mock.patch.dict(os.environ, {"WISDEM_CACHE_DIR": temp_dir, "WISDEM_YAML_CACHE": "1"}):
+                cache_dir = val.get_yaml_cache_dir()
+                self.assertEqual(cache_dir, os.path.join(temp_dir, "yaml", val.__version__))
+
+                obj1 = val.load_analysis_yaml(fanalysis)
+                self.assertEqual(len(os.listdir(cache_dir)), 1)
+                obj2 = val.load_analysis_yaml(fanalysis)
+                self.assertEqual(len(os.listdir(cache_dir)), 1)
+                self.assertEqual(obj1, ref)
+                self.assertEqual(obj2, ref)
+                self.assertIsNot(obj1, obj2)
+
+                # A file with other contents is a new entry
+                fmodel = os.path.join(temp_dir, "modeling.yaml")
+                shutil.copy(os.path.join(example_dir, "modeling_options_iea15.yaml"), fmodel)
+                obj1 = val.load_modeling_yaml(fmodel)
+                self.assertEqual(len(os.listdir(cache_dir)), 2)
+                with open(fmodel, "a") as f:
+                    f.write("\n# changed\n")
+                self.assertEqual(val.load_modeling_yaml(fmodel), obj1)
+                self.assertEqual(len(os.listdir(cache_dir)), 3)
+
+                # A failed write leaves no temporary file behind
+                with open(fmodel, "a") as f:
+                    f.write("\n# changed again\n")
+                with mock.patch.object(val.pickle, "dump", side_effect=TypeError):
+                    self.assertEqual(val.load_modeling_yaml(fmodel), obj1)
+                self.assertEqual(len(os.listdir(cache_dir)), 3)
+
+                # Pickles that other users could have written are not loaded
+                if os.name == "posix":
+                    os.chmod(cache_dir, 0o777)
+                    with mock.patch.object(val.pickle, "load") as load:
+                        self.assertEqual(val.load_analysis_yaml(fanalysis), ref)
+                    load.assert_not_called()
+        finally:
+            shutil.rmtree(temp_dir)
+
 if __name__ == "__main__":
     unittest.main()
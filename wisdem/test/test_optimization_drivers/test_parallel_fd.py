@@ -0,0 +1,96 @@
+import unittest
+import multiprocessing
+from unittest import mock
+
+import numpy as np
+import openmdao.api as om
+
+from wisdem.optimization_drivers import parallel_fd
+from wisdem.optimization_drivers.parallel_fd import approx_totals_parallel
+
+
+class Paraboloid(om.ExplicitComponent):
+    def setup(self):
+        self.add_input("x", np.ones(4))
+        self.add_input("y", 2.0)
+        self.add_output("f", 0.0)
+        self.add_output("g", np.zeros(2))
+        self.ncalls = 0
+
+    def compute(self, inputs, outputs):
+        self.ncalls += 1
+        x = inputs["x"]
+        y = inputs["y"]
+        outputs["f"] = np.sum(x**2) * y
+        outputs["g"] = x[:2] * x[2:] + y**3
+
+
+def build_problem(parallel, form, step_calc, n_workers=3):
+    prob = om.Problem(reports=False)
+    ivc = prob.model.add_subsystem("ivc", om.IndepVarComp(), promotes=["*"])
+    ivc.add_output("x", np.arange(1.0, 5.0))
+    ivc.add_output("y", 2.0)
+    prob.model.add_subsystem("comp", Paraboloid(), promotes=["*"])
+    prob.model.add_design_var("x")
+    prob.model.add_design_var("y")
+    prob.model.add_objective("f")
+    prob.model.add_constraint("g", upper=0.0)
+
+    if parallel:
+        approx_totals_parallel(prob.model, n_workers, form=form, step_calc=step_calc)
+    else:
+        prob.model.approx_totals(method="fd", form=form, step_calc=step_calc)
+
+    prob.setup()
+    prob.run_model()
+    return prob
+
+
+@unittest.skipUnless("fork" in multiprocessing.get_all_start_methods(), "requires fork")
+class TestParallelFD(unittest.TestCase):
+    def test_matches_serial(self):
+        for form, step_calc in [("forward", "abs"), ("central", None), ("backward", "rel_element")]:
+            prob = build_problem(False, form, step_calc)
+            J_ref = prob.compute_totals()
+
+            prob = build_problem(True, form, step_calc)
+            ncalls = prob.model.comp.ncalls
+            J = prob.compute_totals()
+
+            # The perturbed runs happen in the workers only
+            self.assertEqual(prob.model.comp.ncalls, ncalls)
+            for key in J_ref:
+                np.testing.assert_allclose(J[key], J_ref[key], rtol=1e-12, atol=1e-12)
+
+            # The model is left at the unperturbed point
+            np.testing.assert_allclose(prob["x"], np.arange(1.0, 5.0))
+            np.testing.assert_allclose(prob["f"], 60.0)
+
+    def test_workers_per_problem(self):
+        # A later call with a different number of workers does not change an earlier problem
+        prob = build_problem(True, "forward", None)
+        prob_serial = build_problem(True, "forward", None, n_workers=1)
+
+        ncalls = prob.model.comp.ncalls
+        prob.compute_totals()
+        self.assertEqual(prob.model.comp.ncalls, ncalls)
+
+        ncalls = prob_serial.model.comp.ncalls
+        prob_serial.compute_totals()
+        self.assertEqual(prob_serial.model.comp.ncalls, ncalls + 5)
+
+    def test_unsupported_openmdao(self):
+        prob_ref = build_problem(False, "central", None)
+        with mock.patch.object(parallel_fd, "OPENMDAO_VERSIONS", ((0, 0), (0, 0))):
+            with self.assertWarns(UserWarning):
+                prob = build_problem(True, "central", None)
+        self.assertNotIn("fd_parallel", prob.model._approx_schemes)
+
+        J_ref = prob_ref.compute_totals()
+        J = prob.compute_totals()
+        for key in J_ref:
+            np.testing.assert_allclose(J[key], J_ref[key], rtol=1e-12, atol=1e-12)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,5 +1,6 @@
 import unittest
 import os
+import copy
 
 import numpy as np
 import numpy.testing as npt
@@ -119,6 +120,60 @@ class TestPreCompProperties(unittest.TestCase):
 
                         npt.assert_almost_equal(results_fort, results_py, decimal=5)
 
+    def test_properties_batch(self):
+        fnames = ['section_dump_nrel5mw.pkl', 'section_dump_iea15mw.pkl']
+
+        for f in fnames:
+            with self.subTest(f=f):
+                myitems = loadall(f)
+                nsec = myitems.__next__()
+                inputs = [[] for _ in range(30)]
+                results_fort = []
+                for k in range(nsec):
+                    for x in inputs:
+                        x.append(myitems.__next__())
+                    results_fort.append(myitems.__next__())
+
+                # The materials are shared by all sections
+                for i in range(6, 11):
+                    inputs[i] = inputs[i][0]
+
+                results_batch = prop.properties_batch(*inputs)
+                self.assertEqual(len(results_batch), 21)
+                for r in results_batch:
+                    self.assertEqual(r.shape, (nsec,))
+                npt.assert_almost_equal(np.array(results_fort), np.array(results_batch).T, decimal=5)
+
+                # Same as the sections one at a time
+                results_py = prop.properties(*[x[-1] if i not in range(6, 11) else x for i, x in enumerate(inputs)])
+                npt.assert_equal(np.array(results_batch)[:, -1], results_py)
+
+    def test_properties_complex_step(self):
+        myitems = loadall('section_dump_iea15mw.pkl')
+        nsec = myitems.__next__()
+        for k in range(16):
+            inputs = [myitems.__next__() for _ in range(31)][:30]
+        results = np.array(prop.properties(*inputs))
+
+        # chord, twist, twist rate, le location, a node y-coordinate and an upper and a web lamina thickness
+        h = 1e-30
+        for i, j, step in [(0, None, 1e-6), (1, None, 1e-4), (2, None, 1e-4), (3, None, 1e-6),
+                           (5, 40, 1e-7), (14, 3, 1e-7), (27, 0, 1e-7)]:
+            with self.subTest(i=i, j=j):
+                def perturb(dx):
+                    x = copy.deepcopy(inputs)
+                    if j is None:
+                        x[i] = x[i] + dx
+                    else:
+                        x[i] = np.array(x[i], dtype=np.result_type(x[i], dx))
+                        x[i][j] += dx
+                    return np.array(prop.properties(*x))
+
+                results_cs = perturb(1j * h)
+                npt.assert_allclose(results_cs.real, results, rtol=1e-12)
+                d_fd = (perturb(step) - perturb(-step)) / (2 * step)
+                npt.assert_allclose(results_cs.imag / h, d_fd, rtol=1e-4, atol=1e-6 * np.abs(results).max())
+
     def test_match_anba(self):
 
         # Stiffness and inertia matrices from https://github.com/WISDEM/SONATA/tree/develop/examples/1_IEA15MW
@@ -7,15 +7,27 @@ Created by Andrew Ning on 2013-11-04.
 Copyright (c) NREL. All rights reserved.
 """
 
+import copy
 import unittest
 from io import StringIO
 
 import numpy as np
 
-from wisdem.pyframe3dd import Frame, Options, NodeData, ElementData, ReactionData, StaticLoadCase
+from wisdem.pyframe3dd import (
+    Frame,
+    Options,
+    NodeData,
+    FrameCache,
+    ElementData,
+    FrameResults,
+    ReactionData,
+    StaticLoadCase,
+)
 
 
 class FrameTestEXA(unittest.TestCase):
+    sparse = False
+
     def setUp(self):
         # nodes
         node = np.arange(1, 13)
@@ -56,7 +68,7 @@ class FrameTestEXA(unittest.TestCase):
         shear = False  # 1: include shear deformation
         geom = False  # 1: include geometric stiffness
         dx = 10.0  # x-axis increment for internal forces
-        options = Options(shear, geom, dx)
+        options = Options(shear, geom, dx, self.sparse)
 
         frame = Frame(nodes, reactions, elements, options)
 
@@ -523,6 +535,9 @@ class FrameTestEXA(unittest.TestCase):
 
 
 class FrameTestEXB(unittest.TestCase):
+    sparse = False
+    Mmethod = 1  # 1: subspace Jacobi     2: Stodola     3: Lanczos
+
     def setUp(self):
         # nodes
         string = StringIO(
@@ -584,17 +599,16 @@ class FrameTestEXB(unittest.TestCase):
         shear = True  # 1: include shear deformation
         geom = True  # 1: include geometric stiffness
         dx = 20.0  # x-axis increment for internal forces
-        options = Options(shear, geom, dx)
+        options = Options(shear, geom, dx, self.sparse)
 
         frame = Frame(nodes, reactions, elements, options)
 
         # dynamics
         nM = 6  # number of desired dynamic modes of vibration
-        Mmethod = 1  # 1: subspace Jacobi     2: Stodola
         lump = 0  # 0: consistent mass ... 1: lumped mass matrix
         tol = 1e-9  # mode shape tolerance
         shift = 0.0  # shift value ... for unrestrained structures
-        frame.enableDynamics(nM, Mmethod, lump, tol, shift)
+        frame.enableDynamics(nM, self.Mmethod, lump, tol, shift)
 
         # load cases 1
         gx = 0.0
@@ -884,6 +898,221 @@ class FrameTestEXB(unittest.TestCase):
         np.testing.assert_array_almost_equal(modal.zrot[iM, :], out[:, 6], decimal=3)
 
 
+class FrameTestEXASparse(FrameTestEXA):
+    sparse = True
+
+
+class FrameTestEXBSparse(FrameTestEXB):
+    sparse = True
+
+
+class FrameTestEXBLanczos(FrameTestEXB):
+    Mmethod = 3
+
+
+def lattice_tower(sparse=False, Mmethod=1, geom=True, scale=1.0, cache=None, dx=0.5):
+    # lattice tower with the nodes numbered in random order, so that the
+    # banded solver has to renumber them to get a narrow band
+    nlev = 10
+    nnode = 4 * (nlev + 1)
+    new = np.random.default_rng(1).permutation(nnode) + 1  # node number of each lattice node
+    x = np.empty(nnode)
+    y = np.empty(nnode)
+    z = np.empty(nnode)
+    x[new - 1] = np.tile([0.0, 4.0, 4.0, 0.0], nlev + 1)
+    y[new - 1] = np.tile([0.0, 0.0, 4.0, 4.0], nlev + 1)
+    z[new - 1] = np.repeat(3.0 * np.arange(nlev + 1), 4)
+    nodes = NodeData(np.arange(1, nnode + 1), x, y, z, np.zeros(nnode))
+
+    base = new[:4]
+    rigid = np.ones(4)
+    reactions = ReactionData(base, rigid, rigid, rigid, rigid, rigid, rigid, 1)
+
+    N1 = []
+    N2 = []
+    for i in range(nlev + 1):
+        for k in range(4):
+            N1.append(new[4 * i + k])
+            N2.append(new[4 * i + (k + 1) % 4])
+            if i < nlev:
+                N1 += [new[4 * i + k], new[4 * i + k]]
+                N2 += [new[4 * (i + 1) + k], new[4 * (i + 1) + (k + 1) % 4]]
+    nE = len(N1)
+    one = np.ones(nE)
+    elements = ElementData(
+        np.arange(1, nE + 1),
+        np.array(N1),
+        np.array(N2),
+        1e-2 * one,
+        5e-3 * one,
+        5e-3 * one,
+        2e-4 * one,
+        1e-4 * one,
+        1e-4 * one,
+        2e11 * one,
+        8e10 * one,
+        0.0 * one,
+        7850.0 * one,
+    )
+
+    frame = Frame(nodes, reactions, elements, Options(True, geom, dx, sparse), cache=cache)
+    frame.enableDynamics(6, Mmethod, 0, 1e-9, 0.0)
+
+    top = new[-4:]
+    zero = np.zeros(4)
+    load = StaticLoadCase(0.0, 0.0, -9.81)
+    load.changePointLoads(top, scale * 1e4 * np.ones(4), zero, -scale * 1e4 * np.ones(4), zero, zero, zero)
+    frame.addLoadCase(load)
+    load = StaticLoadCase(0.0, 0.0, -9.81)
+    load.changePointLoads(top[:1], zero[:1], [scale * 5e3], zero[:1], zero[:1], zero[:1], zero[:1])
+    frame.addLoadCase(load)
+
+    return frame
+
+
+class SparseRenumbered(unittest.TestCase):
+    def frame(self, sparse, Mmethod):
+        return lattice_tower(sparse, Mmethod).run()
+
+    def compare(self, Mmethod):
+        dense = self.frame(False, Mmethod)
+        band = self.frame(True, Mmethod)
+
+        for k in ["dx", "dy", "dz", "dxrot", "dyrot", "dzrot"]:
+            np.testing.assert_allclose(getattr(band[0], k), getattr(dense[0], k), rtol=1e-8, atol=1e-12)
+        for k in ["Nx", "Vy", "Vz", "Txx", "Myy", "Mzz"]:
+            np.testing.assert_allclose(getattr(band[1], k), getattr(dense[1], k), rtol=1e-6, atol=1e-4)
+        for k in ["Fx", "Fy", "Fz", "Mxx", "Myy", "Mzz"]:
+            np.testing.assert_allclose(getattr(band[2], k), getattr(dense[2], k), rtol=1e-6, atol=1e-4)
+        for k in ["total_mass", "struct_mass", "xmass", "ymass", "zmass", "xinrta", "yinrta", "zinrta"]:
+            np.testing.assert_allclose(getattr(band[4], k), getattr(dense[4], k), rtol=1e-10)
+        np.testing.assert_allclose(band[5].freq, dense[5].freq, rtol=1e-8)
+        for k in ["xdsp", "ydsp", "zdsp", "xrot", "yrot", "zrot"]:
+            np.testing.assert_allclose(np.abs(getattr(band[5], k)), np.abs(getattr(dense[5], k)), atol=1e-6)
+
+    def test_subspace(self):
+        self.compare(1)
+
+    def test_stodola(self):
+        self.compare(2)
+
+
+class LanczosModes(unittest.TestCase):
+    def test_lattice_tower(self):
+        # the lattice tower is nearly symmetric, so its bending frequencies come in close pairs
+        subspace = lattice_tower(Mmethod=1).run()[5]
+        lanczos = lattice_tower(Mmethod=3).run()[5]
+
+        np.testing.assert_allclose(lanczos.freq, subspace.freq, rtol=1e-8)
+        self.assertAlmostEqual(lanczos.freq[0], lanczos.freq[1], 4)
+        for k in ["xdsp", "ydsp", "zdsp", "xrot", "yrot", "zrot"]:
+            for iM in [2, 5]:  # distinct frequencies
+                np.testing.assert_allclose(
+                    np.abs(getattr(lanczos, k)[iM]), np.abs(getattr(subspace, k)[iM]), rtol=1e-5, atol=1e-8
+                )
+
+
+class ReuseFactorization(unittest.TestCase):
+    def assertSameResults(self, out, ref):
+        np.testing.assert_array_equal(out[0].dx, ref[0].dx)
+        np.testing.assert_array_equal(out[0].dzrot, ref[0].dzrot)
+        np.testing.assert_array_equal(out[1].Nx, ref[1].Nx)
+        np.testing.assert_array_equal(out[1].Myy, ref[1].Myy)
+        np.testing.assert_array_equal(out[2].Fz, ref[2].Fz)
+        np.testing.assert_array_equal(out[4].xmass, ref[4].xmass)
+        np.testing.assert_array_equal(out[5].freq, ref[5].freq)
+        np.testing.assert_array_equal(out[5].xdsp, ref[5].xdsp)
+
+    def test_new_loads(self):
+        for sparse in [False, True]:
+            for geom in [False, True]:
+                cache = FrameCache()
+                first = lattice_tower(sparse, geom=geom, cache=cache).run()
+                self.assertIsNotNone(cache.key)
+
+                second = lattice_tower(sparse, geom=geom, scale=2.0, cache=cache).run()
+                self.assertSameResults(second, lattice_tower(sparse, geom=geom, scale=2.0).run())
+                self.assertFalse(np.allclose(first[0].dx, second[0].dx))
+
+    def test_rerun(self):
+        frame = lattice_tower(geom=False)
+        first = frame.run()
+        key = frame.cache.key
+        self.assertSameResults(frame.run(), first)
+        self.assertEqual(frame.cache.key, key)
+
+    def test_structure_change(self):
+        cache = FrameCache()
+        lattice_tower(geom=False, cache=cache).run()
+        key = cache.key
+
+        frame = lattice_tower(geom=False, cache=cache)
+        frame.eE *= 1.1
+        out = frame.run()
+        self.assertNotEqual(cache.key, key)
+
+        ref = lattice_tower(geom=False)
+        ref.eE *= 1.1
+        self.assertSameResults(out, ref.run())
+
+        frame = lattice_tower(geom=False, cache=cache)
+        i = np.array([44])
+        frame.changeExtraNodeMass(i, [1e3], [0.0], [0.0], [0.0], [0.0], [0.0], [0.0], [0.0], [0.0], [0.0], False)
+        out = frame.run()
+
+        ref = lattice_tower(geom=False)
+        ref.changeExtraNodeMass(i, [1e3], [0.0], [0.0], [0.0], [0.0], [0.0], [0.0], [0.0], [0.0], [0.0], False)
+        self.assertSameResults(out, ref.run())
+
+    def test_copy(self):
+        cache = FrameCache()
+        lattice_tower(cache=cache).run()
+        other = copy.deepcopy(cache)
+        self.assertIsNone(other.key)
+        self.assertNotEqual(other._cache, cache._cache)
+
+
+class CompactResults(unittest.TestCase):
+    def test_views(self):
+        frame = lattice_tower()
+        out = frame.run(compact=True)
+        self.assertIsInstance(out, FrameResults)
+
+        ref = lattice_tower().run()
+        dout, fout, rout, ifout, mout, modalout = out.unpack()
+        for k, name in enumerate(["dx", "dy", "dz", "dxrot", "dyrot", "dzrot"]):
+            np.testing.assert_array_equal(out.displacements[:, k, :], getattr(ref[0], name))
+            self.assertTrue(np.shares_memory(getattr(dout, name), out.displacements))
+        for k, name in enumerate(["Nx", "Vy", "Vz", "Txx", "Myy", "Mzz"]):
+            np.testing.assert_array_equal(out.forces[:, k, :], getattr(ref[1], name))
+        for k, name in enumerate(["Fx", "Fy", "Fz", "Mxx", "Myy", "Mzz"]):
+            np.testing.assert_array_equal(out.reactions[:, k, :], getattr(ref[2], name))
+        np.testing.assert_array_equal(fout.element, ref[1].element)
+        np.testing.assert_array_equal(rout.node, ref[2].node)
+
+        self.assertEqual(len(ifout), len(frame.eL))
+        for iE in [0, 17, len(frame.eL) - 1]:
+            i0, i1 = out.offsets[iE], out.offsets[iE + 1]
+            np.testing.assert_array_equal(out.internalForces[:, 1, i0:i1], ref[3][iE].Nx)
+            np.testing.assert_array_equal(ifout[iE].Dz, ref[3][iE].Dz)
+            self.assertAlmostEqual(ifout[iE].x[0, -1], frame.eL[iE])
+
+        self.assertEqual(mout.total_mass, ref[4].total_mass)
+        np.testing.assert_array_equal(mout.zinrta, ref[4].zinrta)
+        np.testing.assert_array_equal(out.modalFactors[0], ref[5].freq)
+        np.testing.assert_array_equal(modalout.zmpf, ref[5].zmpf)
+        np.testing.assert_array_equal(out.modes[:, 0, :], ref[5].xdsp)
+
+    def test_no_internal_forces(self):
+        out = lattice_tower(dx=-1).run(compact=True)
+        self.assertIsNone(out.internalForces)
+        self.assertEqual(out.unpack()[3], [])
+
+        ref = lattice_tower().run(compact=True)
+        np.testing.assert_array_equal(out.displacements, ref.displacements)
+        np.testing.assert_array_equal(out.forces, ref.forces)
+
+
 class GravityAdd(unittest.TestCase):
     def test_addgrav_working(self):
         # nodes
@@ -975,6 +1204,10 @@ def suite():
     suite = [
         unittest.TestLoader().loadTestsFromTestCase(FrameTestEXA),
         unittest.TestLoader().loadTestsFromTestCase(FrameTestEXB),
+        unittest.TestLoader().loadTestsFromTestCase(FrameTestEXASparse),
+        unittest.TestLoader().loadTestsFromTestCase(FrameTestEXBSparse),
+        unittest.TestLoader().loadTestsFromTestCase(SparseRenumbered),
+        unittest.TestLoader().loadTestsFromTestCase(ReuseFactorization),
         unittest.TestLoader().loadTestsFromTestCase(GravityAdd),
     ]
     return unittest.TestSuite(suite)
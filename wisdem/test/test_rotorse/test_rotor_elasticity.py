@@ -44,6 +44,8 @@ class TestRE(unittest.TestCase):
         self.options["WISDEM"]["RotorSE"]["te_ps"] = "none"
         self.options["WISDEM"]["RotorSE"]["spar_cap_ss"] = "none"
         self.options["WISDEM"]["RotorSE"]["spar_cap_ps"] = "none"
+        self.options["WISDEM"]["RotorSE"]["precomp_workers"] = 1
+        self.options["WISDEM"]["RotorSE"]["precomp_pool"] = "thread"
         self.options["WISDEM"]["RotorSE"]["layer_name"] = ["mylayer"]
         self.options["WISDEM"]["RotorSE"]["layer_mat"] = ["mymat"]
         self.options["materials"] = {}
@@ -84,9 +86,9 @@ class TestRE(unittest.TestCase):
 
         self.mytube = Tube(self.inputs["chord"][0], self.inputs["layer_thickness"][0,0])
 
-    def run_precomp(self):
+    def run_precomp(self, myobj=None):
 
-        self.myobj = rel.RunPreComp(modeling_options=self.options, opt_options={})
+        self.myobj = rel.RunPreComp(modeling_options=self.options, opt_options={}) if myobj is None else myobj
         rotorse_options = self.options["WISDEM"]["RotorSE"]
         self.myobj.n_span = rotorse_options["n_span"]
         self.myobj.n_webs = rotorse_options["n_webs"]
@@ -100,6 +102,8 @@ class TestRE(unittest.TestCase):
         self.myobj.te_ps_var = rotorse_options["te_ps"]
         self.myobj.spar_cap_ss_var = rotorse_options["spar_cap_ss"]
         self.myobj.spar_cap_ps_var = rotorse_options["spar_cap_ps"]
+        self.myobj.precomp_workers = rotorse_options["precomp_workers"]
+        self.myobj.precomp_pool = rotorse_options["precomp_pool"]
         self.myobj.compute(self.inputs, self.outputs, self.discrete_inputs, self.discrete_outputs)
         for k in self.outputs.keys():
             if type(self.outputs[k]) == type(np.array([])):
@@ -209,6 +213,139 @@ class TestRE(unittest.TestCase):
         npt.assert_almost_equal(self.outputs["blade_cg_hubcs"], self.inputs["r"][idx], decimal=1)
         npt.assert_almost_equal(self.outputs["blade_moment_of_inertia"], self.outputs["blade_mass"]*self.inputs["r"][-1]**2/3.0, decimal=-1)
 
+    def test_parallel_stations(self):
+        # Tapered blade so that every station is different
+        self.inputs["chord"] = np.linspace(3.0, 1.0, self.options["WISDEM"]["RotorSE"]["n_span"])
+        self.inputs["theta"] = np.linspace(20.0, -5.0, self.options["WISDEM"]["RotorSE"]["n_span"])
+        # Shifted profiles, which are normalized within each station
+        self.inputs["coord_xy_interp"][:, :, 0] += 0.1
+        coord_xy = self.inputs["coord_xy_interp"].copy()
+
+        self.run_precomp()
+        serial = {k: np.copy(v) for k, v in self.outputs.items()}
+
+        # The profiles are normalized on copies of the inputs
+        npt.assert_equal(self.inputs["coord_xy_interp"], coord_xy)
+
+        inputs = {k: np.copy(v) for k, v in self.inputs.items()}
+        for pool in ["thread", "process"]:
+            with self.subTest(pool=pool):
+                self.options["WISDEM"]["RotorSE"]["precomp_workers"] = 3
+                self.options["WISDEM"]["RotorSE"]["precomp_pool"] = pool
+                self.inputs = {k: np.copy(v) for k, v in inputs.items()}
+                self.outputs = {}
+                myobj = rel.RunPreComp(modeling_options=self.options, opt_options={})
+                self.run_precomp(myobj)
+                for k in serial:
+                    npt.assert_equal(self.outputs[k], serial[k], err_msg=k)
+
+                # The workers are kept for the next evaluation of the component
+                workers = myobj.station_pool.workers
+                self.assertIsNotNone(workers)
+                self.inputs = {k: np.copy(v) for k, v in inputs.items()}
+                self.inputs["layer_thickness"] *= 1.1
+                self.outputs = {}
+                self.run_precomp(myobj)
+                self.assertIs(myobj.station_pool.workers, workers)
+
+    def test_station_cache(self):
+        n_span = self.options["WISDEM"]["RotorSE"]["n_span"]
+        self.inputs["chord"] = np.linspace(3.0, 1.0, n_span)
+        self.inputs["theta"] = np.linspace(20.0, -5.0, n_span)
+        inputs = {k: np.copy(v) for k, v in self.inputs.items()}
+
+        myobj = rel.RunPreComp(modeling_options=self.options, opt_options={})
+        first = None
+
+        # Unchanged blade is served from the cache
+        for n_hit in [0, n_span]:
+            self.inputs = {k: np.copy(v) for k, v in inputs.items()}
+            self.outputs = {}
+            self.run_precomp(myobj)
+            self.assertEqual(myobj.station_cache.misses, n_span)
+            self.assertEqual(myobj.station_cache.hits, n_hit)
+            if first is None:
+                first = {k: np.copy(v) for k, v in self.outputs.items()}
+            for k in first:
+                npt.assert_equal(self.outputs[k], first[k], err_msg=k)
+
+        # Only the station with a new layup is recomputed
+        inputs["layer_thickness"][:, 10] *= 1.1
+        self.inputs = {k: np.copy(v) for k, v in inputs.items()}
+        self.outputs = {}
+        self.run_precomp(myobj)
+        self.assertEqual(myobj.station_cache.misses, n_span + 1)
+        cached = {k: np.copy(v) for k, v in self.outputs.items()}
+
+        self.inputs = {k: np.copy(v) for k, v in inputs.items()}
+        self.outputs = {}
+        self.run_precomp()
+        for k in cached:
+            npt.assert_allclose(cached[k], self.outputs[k], rtol=1e-10, atol=1e-10, err_msg=k)
+        self.assertFalse(np.allclose(cached["EA"], first["EA"]))
+
+    def test_partials(self):
+        # Tapered, twisted blade with a spar cap on the suction side and a joint
+        n_span = self.options["WISDEM"]["RotorSE"]["n_span"]
+        self.options["WISDEM"]["RotorSE"]["n_layers"] = 2
+        self.options["WISDEM"]["RotorSE"]["layer_name"] = ["mylayer", "myspar"]
+        self.options["WISDEM"]["RotorSE"]["layer_mat"] = ["mymat", "mymat"]
+        self.options["WISDEM"]["RotorSE"]["spar_cap_ss"] = "myspar"
+        self.discrete_inputs["build_layer"] = np.zeros(2)
+        self.inputs["chord"] = np.linspace(3.0, 1.0, n_span)
+        self.inputs["theta"] = np.linspace(20.0, -5.0, n_span) ** 2 / 20.0
+        self.inputs["section_offset_y"] = np.linspace(1.0, 0.3, n_span)
+        self.inputs["layer_thickness"] = np.vstack((np.linspace(0.02, 0.005, n_span), np.linspace(0.05, 0.01, n_span)))
+        self.inputs["layer_start_nd"] = np.vstack((np.zeros(n_span), 0.15 * np.ones(n_span)))
+        self.inputs["layer_end_nd"] = np.vstack((np.ones(n_span), 0.35 * np.ones(n_span)))
+        self.inputs["fiber_orientation"] = np.vstack((90 * np.ones(n_span), np.zeros(n_span)))
+        self.inputs["joint_position"] = 0.4
+        self.inputs["joint_mass"] = 100.0
+
+        def build_problem():
+            prob = om.Problem(reports=False)
+            prob.model.add_subsystem(
+                "precomp", rel.RunPreComp(modeling_options=self.options, opt_options={}), promotes=["*"]
+            )
+            prob.setup()
+            for k in ["r", "theta", "chord", "section_offset_y", "precurve", "presweep", "coord_xy_interp",
+                      "layer_thickness", "layer_start_nd", "layer_end_nd", "fiber_orientation", "joint_position",
+                      "joint_mass", "E", "G", "nu", "rho"]:
+                prob[k] = self.inputs[k]
+            for k in ["build_layer", "mat_name"]:
+                prob[k] = self.discrete_inputs[k]
+            prob.run_model()
+            return prob
+
+        # The profiles are only finite differenced when their derivatives are needed
+        prob = build_problem()
+        prob.compute_totals(of=["EA"], wrt=["layer_thickness"])
+        self.assertEqual(prob.model.precomp.iter_count, 1)
+
+        prob = build_problem()
+        of = ["EA", "EIxx", "EIyy", "GJ", "rhoA", "A", "rhoJ", "Tw_iner", "y_tc", "y_cg", "xu_spar"]
+        wrt = [("layer_thickness", (1, 10), 1e-5), ("layer_thickness", (0, 30), 1e-5), ("chord", 5, 1e-5),
+               ("theta", 15, 1e-4), ("r", 15, 1e-5), ("section_offset_y", 20, 1e-5), ("joint_mass", 0, 1e-2),
+               ("joint_position", 0, 1e-4), ("coord_xy_interp", (12, 30, 1), 1e-6)]
+        J = prob.compute_totals(of=of, wrt=list(set(k[0] for k in wrt)), return_format="dict")
+
+        # Central differences through the whole PreComp run
+        for name, idx, step in wrt:
+            x0 = prob[name].copy()
+            y = []
+            for sgn in [1.0, -1.0]:
+                x = x0.copy()
+                x[idx] += sgn * step
+                prob[name] = x
+                prob.run_model()
+                y.append({k: prob[k].copy() for k in of})
+            prob[name] = x0
+            col = np.ravel_multi_index(idx, x0.shape) if isinstance(idx, tuple) else idx
+            for k in of:
+                with self.subTest(of=k, wrt=name, idx=idx):
+                    dy_fd = (y[0][k] - y[1][k]) / (2 * step)
+                    npt.assert_allclose(J[k][name][:, col], dy_fd, rtol=1e-4, atol=1e-6 * np.abs(prob[k]).max())
+
     def test_KI_to_Elastic(self):
 
         fnames = ['../test_precomp/section_dump_iea15mw.pkl']
@@ -4,6 +4,7 @@ import unittest
 import numpy as np
 import openmdao.api as om
 import numpy.testing as npt
+from openmdao.utils.assert_utils import assert_check_partials
 
 import wisdem.rotorse.rotor_power as rp
 
@@ -643,6 +644,209 @@ class TestServo(unittest.TestCase):
         npt.assert_equal(prob["V"], V_expect1)
         npt.assert_equal(prob["V_spline"], V_spline.flatten())
 
+    def testRegulationTrajectory_WarmStart(self):
+        (n_span, n_aoa, n_Re) = NPZFILE["airfoils_cl"].shape
+        n_pc = 22
+
+        probs = []
+        derivs = []
+        for warm_start in [False, True]:
+            prob = om.Problem(reports=False)
+
+            modeling_options = {}
+            modeling_options["WISDEM"] = {}
+            modeling_options["WISDEM"]["RotorSE"] = {}
+            modeling_options["WISDEM"]["RotorSE"]["n_span"] = n_span
+            modeling_options["WISDEM"]["RotorSE"]["n_aoa"] = n_aoa
+            modeling_options["WISDEM"]["RotorSE"]["n_Re"] = n_Re
+            modeling_options["WISDEM"]["RotorSE"]["regulation_reg_III"] = True
+            modeling_options["WISDEM"]["RotorSE"]["fix_pitch_regI12"] = False
+            modeling_options["WISDEM"]["RotorSE"]["warm_start_power_curve"] = warm_start
+            modeling_options["WISDEM"]["RotorSE"]["n_pc"] = n_pc
+            modeling_options["WISDEM"]["RotorSE"]["n_pc_spline"] = n_pc
+
+            prob.model.add_subsystem(
+                "powercurve", rp.RegulatedPowerCurve(modeling_options=modeling_options), promotes=["*"]
+            )
+            prob = fillprob(prob, n_pc, n_span)
+            prob.run_model()
+            prob.run_model()
+            n_warm = len(prob.model.powercurve.compute_power_curve.ccblade.phi_warm)
+            y0 = {k: prob[k].copy() for k in ["rated_V", "P", "pitch"]}
+
+            # small change, as in a finite difference step
+            step = 1e-6
+            prob["chord"] *= 1.0 + step
+            prob.run_model()
+            probs.append(prob)
+            derivs.append({k: (prob[k] - y0[k]) / step for k in y0})
+
+            # inflow angles are not carried over between evaluations
+            self.assertLessEqual(len(prob.model.powercurve.compute_power_curve.ccblade.phi_warm), n_warm)
+
+        cold, warm = probs
+        self.assertAlmostEqual(warm["rated_V"][0], cold["rated_V"][0], 4)
+        npt.assert_allclose(warm["V"], cold["V"], atol=1e-4)
+        npt.assert_allclose(warm["pitch"], cold["pitch"], atol=1e-3)
+        npt.assert_allclose(warm["P"], cold["P"], rtol=1e-4)
+        npt.assert_allclose(warm["T"], cold["T"], rtol=1e-4)
+
+        # the warm started searches still move with the finite difference step
+        cold, warm = derivs
+        npt.assert_allclose(warm["rated_V"], cold["rated_V"], rtol=1e-4)
+        self.assertNotEqual(warm["rated_V"][0], 0.0)
+        npt.assert_allclose(warm["P"], cold["P"], rtol=0.0, atol=1e-2 * np.abs(cold["P"]).max())
+        npt.assert_allclose(warm["pitch"], cold["pitch"], rtol=0.0, atol=1e-2 * np.abs(cold["pitch"]).max())
+
+    def testRegulationTrajectory_Surrogate(self):
+        (n_span, n_aoa, n_Re) = NPZFILE["airfoils_cl"].shape
+        n_pc = 22
+
+        probs = []
+        for surrogate in [False, True]:
+            prob = om.Problem(reports=False)
+
+            modeling_options = {}
+            modeling_options["WISDEM"] = {}
+            modeling_options["WISDEM"]["RotorSE"] = {}
+            modeling_options["WISDEM"]["RotorSE"]["n_span"] = n_span
+            modeling_options["WISDEM"]["RotorSE"]["n_aoa"] = n_aoa
+            modeling_options["WISDEM"]["RotorSE"]["n_Re"] = n_Re
+            modeling_options["WISDEM"]["RotorSE"]["regulation_reg_III"] = True
+            modeling_options["WISDEM"]["RotorSE"]["fix_pitch_regI12"] = False
+            modeling_options["WISDEM"]["RotorSE"]["surrogate_power_curve"] = surrogate
+            modeling_options["WISDEM"]["RotorSE"]["n_tsr_perf_surfaces"] = 20
+            modeling_options["WISDEM"]["RotorSE"]["min_tsr_perf_surfaces"] = 2.0
+            modeling_options["WISDEM"]["RotorSE"]["max_tsr_perf_surfaces"] = 12.0
+            modeling_options["WISDEM"]["RotorSE"]["n_pitch_perf_surfaces"] = 20
+            modeling_options["WISDEM"]["RotorSE"]["min_pitch_perf_surfaces"] = -5.0
+            # Short of the Region 3 pitch, so the table has to be widened
+            modeling_options["WISDEM"]["RotorSE"]["max_pitch_perf_surfaces"] = 10.0
+            modeling_options["WISDEM"]["RotorSE"]["n_U_perf_surfaces"] = 1
+            modeling_options["WISDEM"]["RotorSE"]["n_pc"] = n_pc
+            modeling_options["WISDEM"]["RotorSE"]["n_pc_spline"] = n_pc
+
+            prob.model.add_subsystem(
+                "powercurve", rp.RegulatedPowerCurve(modeling_options=modeling_options), promotes=["*"]
+            )
+            prob = fillprob(prob, n_pc, n_span)
+            prob["omega_min"] = 7.0
+            prob["peak_thrust_shaving"] = 0.8
+            prob.run_model()
+            probs.append(prob)
+
+        bem, table = probs
+        self.assertAlmostEqual(table["rated_V"][0], bem["rated_V"][0], 2)
+        npt.assert_allclose(table["pitch"], bem["pitch"], atol=0.2)
+        npt.assert_allclose(table["Omega"], bem["Omega"], rtol=1e-3)
+        npt.assert_allclose(table["P"], bem["P"], rtol=0, atol=5e-3 * 5e6)
+        npt.assert_allclose(table["T"], bem["T"], rtol=0, atol=5e-3 * bem["T"].max())
+        npt.assert_allclose(table["P_spline"], bem["P_spline"], rtol=0, atol=5e-3 * 5e6)
+
+        # Tables cover the operating range and match the power curve points
+        self.assertEqual(table["Cp_aero_table"].shape, (20, 20, 1))
+        self.assertLessEqual(table["tsr_vector"][0], 2.0)
+        self.assertGreaterEqual(table["tsr_vector"][-1], 12.0)
+        self.assertEqual(table["pitch_vector"][0], -5.0)
+        self.assertGreater(table["pitch_vector"][-1], table["pitch"].max())
+        tsr = table["Omega"] * np.pi / 30.0 * 70.0 / table["V"]
+        self.assertGreaterEqual(tsr.min(), table["tsr_vector"][0])
+        self.assertLessEqual(tsr.max(), table["tsr_vector"][-1] + 1e-10)
+        self.assertGreater(table["Cp_aero_table"].max(), bem["Cp_aero"].max() - 1e-3)
+
+        # Derivatives follow the table lookups
+        of = ["P", "rated_V"]
+        J = table.compute_totals(of=of, wrt=["Rtip", "rated_power"], return_format="dict")
+        for name, step in [("Rtip", 1e-3), ("rated_power", 1e2)]:
+            x0 = table[name].copy()
+            y = []
+            for sgn in [1.0, -1.0]:
+                table[name] = x0 + sgn * step
+                table.run_model()
+                y.append({k: table[k].copy() for k in of})
+            table[name] = x0
+            for k in of:
+                fd = (y[0][k] - y[1][k]) / (2 * step)
+                npt.assert_allclose(J[k][name][:, 0], fd, rtol=0.0, atol=1e-3 * np.abs(fd).max())
+
+    def testRegulationTrajectory_Partials(self):
+        (n_span, n_aoa, n_Re) = NPZFILE["airfoils_cl"].shape
+        n_pc = 22
+
+        modeling_options = {}
+        modeling_options["WISDEM"] = {}
+        modeling_options["WISDEM"]["RotorSE"] = {}
+        modeling_options["WISDEM"]["RotorSE"]["n_span"] = n_span
+        modeling_options["WISDEM"]["RotorSE"]["n_aoa"] = n_aoa
+        modeling_options["WISDEM"]["RotorSE"]["n_Re"] = n_Re
+        modeling_options["WISDEM"]["RotorSE"]["regulation_reg_III"] = True
+        modeling_options["WISDEM"]["RotorSE"]["fix_pitch_regI12"] = False
+        modeling_options["WISDEM"]["RotorSE"]["n_pc"] = n_pc
+        modeling_options["WISDEM"]["RotorSE"]["n_pc_spline"] = n_pc
+
+        prob = om.Problem(reports=False)
+        prob.model.add_subsystem("powercurve", rp.ComputePowerCurve(modeling_options=modeling_options), promotes=["*"])
+        prob = fillprob(prob, n_pc, n_span)
+
+        of = ["P", "T", "pitch", "rated_V"]
+        wrt = [
+            ("chord", 10, 1e-3),
+            ("theta", 15, 1e-3),
+            ("rated_power", 0, 1e2),
+            ("rho", 0, 1e-4),
+        ]
+        for peak_thrust_shaving in [1.0, 0.8]:
+            prob["peak_thrust_shaving"] = peak_thrust_shaving
+            prob.run_model()
+            J = prob.compute_totals(of=of, wrt=[k[0] for k in wrt], return_format="dict")
+
+            # The pitch search at an interior optimum stops short of it, which the differences carry into the
+            # slope of the optimal pitch
+            pitch_kind = prob.model.powercurve.lin_state["pitch_kind"]
+            rtol = {k: np.where(pitch_kind == "opt", 5e-3, 2e-3) for k in ["P", "T", "pitch"]}
+            rtol["rated_V"] = 2e-3
+
+            # Central differences through the full regulation trajectory
+            for name, idx, step in wrt:
+                x0 = prob[name].copy()
+                y = []
+                for sgn in [1.0, -1.0]:
+                    x = x0.copy()
+                    x[idx] += sgn * step
+                    prob[name] = x
+                    prob.run_model()
+                    y.append({k: prob[k].copy() for k in of})
+                prob[name] = x0
+
+                for k in of:
+                    fd = (y[0][k] - y[1][k]) / (2 * step)
+                    err = np.abs(J[k][name][:, idx] - fd)
+                    self.assertTrue(np.all(err <= rtol[k] * np.abs(fd).max() + 1e-8), (k, name, err / np.abs(fd).max()))
+
+                # Partials that are finite differenced within the component must not be left at zero
+                if name == "rho":
+                    self.assertGreater(np.abs(J["P"][name][:, idx]).max(), 0.0)
+
+    def testAEP(self):
+        n_pc = 20
+        prob = om.Problem(reports=False)
+        prob.model.add_subsystem("aep", rp.AEP(nspline=n_pc), promotes=["*"])
+        prob.setup(force_alloc_complex=True)
+        prob["P"] = 5e6 * np.minimum(np.linspace(0.0, 2.0, n_pc) ** 3, 1.0)
+        prob["CDF_V"] = 1.0 - np.exp(-((np.linspace(3.0, 25.0, n_pc) / 8.0) ** 2))
+        prob["lossFactor"] = 0.9
+        prob.run_model()
+
+        try:
+            # Numpy v1/2 clash
+            AEP = np.trapezoid(prob["P"], prob["CDF_V"])
+        except AttributeError:
+            AEP = np.trapz(prob["P"], prob["CDF_V"])
+        npt.assert_almost_equal(prob["AEP"], 0.9 * AEP / 1e3 * 365.0 * 24.0)
+
+        check = prob.check_partials(out_stream=None, compact_print=True, method="cs")
+        assert_check_partials(check)
+
 
 def suite():
     suite = [
@@ -166,6 +166,7 @@ class TestRS(unittest.TestCase):
         options["WISDEM"] = {}
         options["WISDEM"]["RotorSE"] = {}
         options["WISDEM"]["RotorSE"]["n_span"] = npts
+        options["WISDEM"]["RotorSE"]["n_extra_load_cases"] = 0
         options["WISDEM"]["RotorSE"]["n_freq"] = nfreq
 
         myobj = rs.RunFrame3DD(modeling_options=options)
@@ -207,6 +208,50 @@ class TestRS(unittest.TestCase):
         npt.assert_almost_equal(outputs["dz"], dz, decimal=3)  # Very small numbers, so no precision
         npt.assert_almost_equal(outputs["freqs"], freqs, decimal=0)
 
+    def testRunFrame3DDCases(self):
+        inputs = {}
+        nrel5mw = np.load(ARCHIVE1)
+        for k in nrel5mw.files:
+            inputs[k] = nrel5mw[k]
+
+        npts = len(inputs["r"])
+        nfreq = 10
+        options = {}
+        options["WISDEM"] = {}
+        options["WISDEM"]["RotorSE"] = {}
+        options["WISDEM"]["RotorSE"]["n_span"] = npts
+        options["WISDEM"]["RotorSE"]["n_freq"] = nfreq
+        options["WISDEM"]["RotorSE"]["n_extra_load_cases"] = 0
+
+        # One run per load case
+        single = []
+        for scale in [0.5, -1.0, 1.0]:
+            outputs = {}
+            inputs_k = inputs.copy()
+            for k in ["Px_af", "Py_af", "Pz_af"]:
+                inputs_k[k] = scale * inputs[k]
+            myobj = rs.RunFrame3DD(modeling_options=options)
+            myobj.n_span = npts
+            myobj.n_freq = nfreq
+            myobj.compute(inputs_k, outputs)
+            single.append(outputs)
+
+        # All in one run, with the design case last
+        options["WISDEM"]["RotorSE"]["n_extra_load_cases"] = 2
+        outputs = {}
+        for k in ["Px_af", "Py_af", "Pz_af"]:
+            inputs[k + "_cases"] = np.c_[0.5 * inputs[k], -inputs[k]]
+        myobj = rs.RunFrame3DD(modeling_options=options)
+        myobj.n_span = npts
+        myobj.n_freq = nfreq
+        myobj.compute(inputs, outputs)
+
+        for k in ["dx", "dy", "dz", "M1", "M2", "F2", "F3", "root_F", "root_M", "freqs"]:
+            npt.assert_allclose(outputs[k], single[2][k], rtol=1e-8, atol=1e-8)
+        for i in range(2):
+            for k in ["dx", "dy", "dz", "M1", "M2", "F2", "F3", "root_F", "root_M"]:
+                npt.assert_allclose(outputs[k + "_cases"][:, i], single[i][k], rtol=1e-6, atol=1e-6)
+
     def testComputeStrains(self):
         inputs = {}
         outputs = {}
@@ -226,6 +271,7 @@ class TestRS(unittest.TestCase):
         options["WISDEM"] = {}
         options["WISDEM"]["RotorSE"] = {}
         options["WISDEM"]["RotorSE"]["n_span"] = npts
+        options["WISDEM"]["RotorSE"]["n_extra_load_cases"] = 0
 
         myobj = rs.ComputeStrains(modeling_options=options)
         myobj.n_span = npts
@@ -353,6 +399,37 @@ class TestRS(unittest.TestCase):
         npt.assert_almost_equal(outputs["axial_maxc_teL_load2stress"][3], -E * y_te / inputs["EI11"][k], decimal=2)
         npt.assert_almost_equal(outputs["axial_maxc_teL_load2stress"][4], E * x_te / inputs["EI22"][k], decimal=2)
 
+    def testComputeStrainsCases(self):
+        inputs = {}
+        nrel5mw = np.load(ARCHIVE1)
+        for k in nrel5mw.files:
+            inputs[k.replace("_strain_", "_")] = nrel5mw[k]
+
+        nrel5mw = np.load(ARCHIVE2)
+        for k in nrel5mw.files:
+            inputs[k.replace("_strain_", "_")] = nrel5mw[k]
+
+        npts = len(inputs["EA"])
+        inputs["chord"] = np.ones(npts)
+
+        options = {}
+        options["WISDEM"] = {}
+        options["WISDEM"]["RotorSE"] = {}
+        options["WISDEM"]["RotorSE"]["n_span"] = npts
+        options["WISDEM"]["RotorSE"]["n_extra_load_cases"] = 2
+        for k in ["M1", "M2", "F3"]:
+            inputs[k + "_cases"] = np.c_[inputs[k], -2.0 * inputs[k]]
+
+        outputs = {}
+        myobj = rs.ComputeStrains(modeling_options=options)
+        myobj.n_span = npts
+        myobj.compute(inputs, outputs)
+
+        # strains are linear in the loads
+        for k in ["strainU_spar", "strainL_spar", "strainU_te", "strainL_te"]:
+            npt.assert_equal(outputs[k + "_cases"][:, 0], outputs[k])
+            npt.assert_allclose(outputs[k + "_cases"][:, 1], -2.0 * outputs[k])
+
     def testConstraints(self):
         inputs = {}
         outputs = {}
@@ -201,6 +201,71 @@ class TestTowerSE(unittest.TestCase):
         myFz += 1e4
         npt.assert_almost_equal(prob["tower.tower_Fz"], myFz)
 
+    def testSplitModal(self):
+        self.modeling_options["WISDEM"]["n_dlc"] = 2
+
+        def run_tower(rna_F0):
+            prob = om.Problem(reports=False)
+            prob.model = tow.TowerSE(modeling_options=self.modeling_options)
+            prob.setup()
+            prob["hub_height"] = 80.0
+            prob["tower_s"] = np.linspace(0, 1, 3)
+            prob["foundation_height"] = 0.0
+            prob["tower_height"] = 80.0
+            prob["tower_outer_diameter_in"] = 10.0 * np.ones(3)
+            prob["tower_layer_thickness"] = 0.1 * np.ones((1, 3))
+            prob["outfitting_factor_in"] = 1.0
+            prob["tower_layer_materials"] = ["steel"]
+            prob["material_names"] = ["steel"]
+            prob["E_mat"] = 1e9 * np.ones((1, 3))
+            prob["G_mat"] = 1e8 * np.ones((1, 3))
+            prob["rho_mat"] = 1e4
+            prob["sigma_y_mat"] = 1e8
+            prob["sigma_ult_mat"] = 1e8 * np.ones((1, 3))
+            prob["wohler_exp_mat"] = 1e1
+            prob["wohler_A_mat"] = 1e1
+            prob["rna_mass"] = 2e5
+            prob["rna_I"] = np.r_[1e5, 1e5, 2e5, np.zeros(3)]
+            prob["rna_cg"] = np.array([-3.0, 0.0, 1.0])
+            prob["wind_reference_height"] = 80.0
+            prob["z0"] = 0.0
+            prob["cd_usr"] = -1.0
+            prob["rho_air"] = 1.225
+            prob["mu_air"] = 1.7934e-5
+            prob["shearExp"] = 0.2
+            prob["env1.Uref"] = 15.0
+            prob["env2.Uref"] = 10.0
+            prob["tower.rna_F"] = np.c_[rna_F0, [1e5, 0.0, -2e6]]
+            prob["tower.rna_M"] = 1e4 * np.ones((3, 2))
+            prob.run_model()
+            return prob
+
+        outputs = ["f1", "structural_frequencies", "fore_aft_modes", "tower_deflection", "tower_Fz", "tower_Myy"]
+        outputs += ["turbine_F", "turbine_M"]
+        rna_F0 = np.array([2e5, 0.0, -2e6])
+        ref = run_tower(rna_F0)
+
+        self.modeling_options["WISDEM"]["TowerSE"]["frame3dd"]["split_modal"] = True
+        prob = run_tower(rna_F0)
+        for k in outputs:
+            npt.assert_allclose(prob["tower." + k], ref["tower." + k], rtol=1e-10, atol=1e-12)
+
+        # with geometric stiffness the modes only depend on the last load case
+        myobj = prob.model.perf.tower
+        modal_key = myobj.modal_key
+        prob["tower.rna_F"][0, 0] += 1e5
+        prob.run_model()
+        self.assertEqual(myobj.modal_key, modal_key)
+        ref = run_tower(rna_F0 + np.r_[1e5, 0.0, 0.0])
+        for k in outputs:
+            npt.assert_allclose(prob["tower." + k], ref["tower." + k], rtol=1e-10, atol=1e-12)
+
+        # the load case outputs of the previous run are not left behind
+        myobj.options["frame3dd_opt"]["frequency_only"] = True
+        prob.run_model()
+        npt.assert_allclose(prob["tower.structural_frequencies"], ref["tower.structural_frequencies"], rtol=1e-10)
+        self.assertTrue(np.all(np.isnan(prob["tower.tower_Fz"])))
+
     def test15MWmode_shapes(self):
         # --- geometry ----
         h_param = np.array(
@@ -7,9 +7,26 @@ import wisdem.commonse.cylinder_member as mem
 from wisdem.commonse import NFREQ, gravity
 from wisdem.commonse.cylinder_member import get_nfull
 import copy
+import hashlib
 
 RIGID = 1e30
 
+
+def hash_inputs(inputs, names, load_names=(), cases=()):
+    """Hash of the inputs in names, and of the columns of the load case inputs in load_names for the given cases"""
+    h = hashlib.sha1()
+    for k in names:
+        x = np.ascontiguousarray(inputs[k], dtype=np.float64)
+        h.update(str(x.shape).encode())
+        h.update(x.tobytes())
+    cases = list(cases)
+    for k in load_names:
+        x = np.ascontiguousarray(inputs[k][..., cases], dtype=np.float64)
+        h.update(str(x.shape).encode())
+        h.update(x.tobytes())
+    return h.hexdigest()
+
+
 class PreDiscretization(om.ExplicitComponent):
     """
     Process some of the tower YAML inputs.
@@ -199,18 +216,37 @@ class TowerFrame(om.ExplicitComponent):
         Total force on cylinder
     base_M : numpy array[3], [N*m]
         Total moment on cylinder measured at base
+
+    With the split_modal Frame3DD option, the modes and the load cases are solved in separate runs,
+    and each is only repeated when its own inputs change: the modes on the geometry and the masses
+    (and the last load case with geometric stiffness), the load cases on the geometry and the loads.
+    With frequency_only, the load cases are not solved at all and their outputs are set to NaN.
     """
 
     def initialize(self):
         self.options.declare("n_full")
         self.options.declare("nLC")
         self.options.declare("frame3dd_opt")
+        self.frame_cache = pyframe3dd.FrameCache()
+        self.modal_cache = pyframe3dd.FrameCache()
 
     def setup(self):
         n_full = self.options["n_full"]
         nLC = self.options["nLC"]
         self.frame = None
 
+        # inputs of each half of the split analysis
+        self.structure_inputs = ["nodes_xyz", "section_A", "section_Asx", "section_Asy", "section_Ixx", "section_Iyy"]
+        self.structure_inputs += ["section_J0", "section_rho", "section_E", "section_G"]
+        self.mass_inputs = ["lumped_mass", "rna_mass", "rna_I", "rna_cg"]
+        self.load_inputs = ["rna_F", "rna_M", "Px", "Py", "Pz"]
+        self.modal_outputs_names = ["f1", "f2", "structural_frequencies", "fore_aft_modes", "side_side_modes"]
+        self.modal_outputs_names += ["torsion_modes", "fore_aft_freqs", "side_side_freqs", "torsion_freqs"]
+        self.static_outputs_names = ["tower_deflection", "top_deflection", "tower_Fz", "tower_Vx", "tower_Vy"]
+        self.static_outputs_names += ["tower_Mxx", "tower_Myy", "tower_Mzz", "turbine_F", "turbine_M"]
+        self.modal_key = self.static_key = None
+        self.modal_outputs = self.static_outputs = {}
+
         # cross-sectional data along cylinder.
         self.add_input("nodes_xyz", np.zeros((n_full, 3)), units="m")
         self.add_input("section_A", np.zeros(n_full - 1), units="m**2")
@@ -265,6 +301,57 @@ class TowerFrame(om.ExplicitComponent):
     def compute(self, inputs, outputs):
         frame3dd_opt = self.options["frame3dd_opt"]
         nLC = self.options["nLC"]
+        xyz = inputs["nodes_xyz"]
+        outputs["section_L"] = np.sqrt(np.sum(np.diff(xyz, axis=0) ** 2, axis=1))
+
+        frequency_only = frame3dd_opt.get("frequency_only", False)
+        if not (frame3dd_opt.get("split_modal", False) or frequency_only):
+            # one run for the load cases and the modes
+            self.frame = self.build_frame(inputs, self.frame_cache, modal=True)
+            self.add_load_cases(inputs, range(nLC))
+            self.add_node_mass(inputs)
+            displacements, forces, reactions, internalForces, mass, modal = self.frame.run()
+            self.set_modal_outputs(outputs, xyz[:, 2], modal)
+            self.set_static_outputs(outputs, displacements, forces, reactions)
+            return
+
+        # With geometric stiffness, Frame3DD solves for the modes about the last load case
+        modal_inputs = self.structure_inputs + self.mass_inputs
+        modal_cases = [nLC - 1] if frame3dd_opt["geom"] else []
+        modal_key = hash_inputs(inputs, modal_inputs, self.load_inputs, modal_cases)
+        if modal_key != self.modal_key:
+            self.frame = self.build_frame(inputs, self.modal_cache, modal=True)
+            self.add_load_cases(inputs, [nLC - 1])
+            self.add_node_mass(inputs)
+            modal = self.frame.run()[-1]
+            self.set_modal_outputs(outputs, xyz[:, 2], modal)
+            self.modal_outputs = {k: outputs[k].copy() for k in self.modal_outputs_names}
+            self.modal_key = modal_key
+        else:
+            for k, val in self.modal_outputs.items():
+                outputs[k] = val
+
+        if frequency_only:
+            # the load case outputs would otherwise keep the values of an earlier run
+            for k in self.static_outputs_names:
+                outputs[k] = np.nan
+            return
+
+        static_key = hash_inputs(inputs, self.structure_inputs, self.load_inputs, range(nLC))
+        if static_key != self.static_key:
+            # no eigen-solve, and the extra node masses do not carry gravity loads
+            self.frame = self.build_frame(inputs, self.frame_cache, modal=False)
+            self.add_load_cases(inputs, range(nLC))
+            displacements, forces, reactions = self.frame.run()[:3]
+            self.set_static_outputs(outputs, displacements, forces, reactions)
+            self.static_outputs = {k: outputs[k].copy() for k in self.static_outputs_names}
+            self.static_key = static_key
+        else:
+            for k, val in self.static_outputs.items():
+                outputs[k] = val
+
+    def build_frame(self, inputs, cache, modal):
+        frame3dd_opt = self.options["frame3dd_opt"]
 
         # ------- node data ----------------
         xyz = inputs["nodes_xyz"]
@@ -297,7 +384,6 @@ class TowerFrame(om.ExplicitComponent):
         E = inputs["section_E"]
         G = inputs["section_G"]
         rho = inputs["section_rho"]
-        outputs["section_L"] = L = np.sqrt(np.sum(np.diff(xyz, axis=0) ** 2, axis=1))
 
         elements = pyframe3dd.ElementData(element, N1, N2, Area, Asx, Asy, J0, Ixx, Iyy, E, G, roll, rho)
         # -----------------------------------
@@ -308,22 +394,31 @@ class TowerFrame(om.ExplicitComponent):
         # -----------------------------------
 
         # initialize frame3dd object
-        self.frame = pyframe3dd.Frame(nodes, reactions, elements, options)
+        frame = pyframe3dd.Frame(nodes, reactions, elements, options, cache=cache)
 
         # ------- enable dynamic analysis ----------
-        lump = 0
-        shift = 0.0
-        # Run twice the number of modes to ensure that we can ignore the torsional modes and still get the desired number of fore-aft, side-side modes
-        self.frame.enableDynamics(2 * NFREQ, frame3dd_opt["modal_method"], lump, frame3dd_opt["tol"], shift)
+        if modal:
+            lump = 0
+            shift = 0.0
+            # Run twice the number of modes to ensure that we can ignore the torsional modes
+            # and still get the desired number of fore-aft, side-side modes
+            frame.enableDynamics(2 * NFREQ, frame3dd_opt["modal_method"], lump, frame3dd_opt["tol"], shift)
         # ----------------------------
 
+        return frame
+
+    def add_load_cases(self, inputs, cases):
+        xyz = inputs["nodes_xyz"]
+        n = xyz.shape[0]
+        L = np.sqrt(np.sum(np.diff(xyz, axis=0) ** 2, axis=1))
+
         # ------ static load case 1 ------------
         # gravity in the X, Y, Z, directions (global)
         gx = 0.0
         gy = 0.0
         gz = -gravity
 
-        for k in range(nLC):
+        for k in cases:
             load = pyframe3dd.StaticLoadCase(gx, gy, gz)
 
             # Prepare point forces at RNA node
@@ -357,6 +452,9 @@ class TowerFrame(om.ExplicitComponent):
 
             self.frame.addLoadCase(load)
 
+    def add_node_mass(self, inputs):
+        n = inputs["nodes_xyz"].shape[0]
+
         # Add lumped masses
         # Add RNA mass to lumped mass
         total_lumped_mass = copy.copy(inputs["lumped_mass"])
@@ -388,9 +486,8 @@ class TowerFrame(om.ExplicitComponent):
         # Debugging
         # self.frame.write('tower_debug.3dd')
         # -----------------------------------
-        # run the analysis
-        displacements, forces, reactions, internalForces, mass, modal = self.frame.run()
 
+    def set_modal_outputs(self, outputs, z, modal):
         # natural frequncies
         outputs["f1"] = modal.freq[0]
         outputs["f2"] = modal.freq[1]
@@ -399,7 +496,7 @@ class TowerFrame(om.ExplicitComponent):
         # Get all mode shapes in batch
         NFREQ2 = int(NFREQ / 2)
         freq_x, freq_y, freq_z, mshapes_x, mshapes_y, mshapes_z = util.get_xyz_mode_shapes(
-            xyz[:, 2], modal.freq, modal.xdsp, modal.ydsp, modal.zdsp, modal.xmpf, modal.ympf, modal.zmpf,
+            z, modal.freq, modal.xdsp, modal.ydsp, modal.zdsp, modal.xmpf, modal.ympf, modal.zmpf,
         )
         outputs["fore_aft_freqs"] = freq_x[:NFREQ2]
         outputs["side_side_freqs"] = freq_y[:NFREQ2]
@@ -408,6 +505,9 @@ class TowerFrame(om.ExplicitComponent):
         outputs["side_side_modes"] = mshapes_y[:NFREQ2, :]
         outputs["torsion_modes"] = mshapes_z[:NFREQ2, :]
 
+    def set_static_outputs(self, outputs, displacements, forces, reactions):
+        nLC = self.options["nLC"]
+
         # deflections due to loading (from cylinder top and wind/wave loads)
         outputs["tower_deflection"] = np.sqrt(displacements.dx**2 + displacements.dy**2).T
         outputs["top_deflection"] = outputs["tower_deflection"][-1, :]